@@ -0,0 +1,109 @@
+"""
+Адмінка для великих таблиць: сторінка редагування будується за обмежений
+час незалежно від кількості користувачів, виробів чи рядків інлайна.
+
+* Великі FK (клієнт, виріб, тканина, категорія) — autocomplete_fields: замість
+  <select> з усіма рядками таблиці варіанти довантажуються пошуком
+  (індексований пошук DjangoFSM.search через get_search_results адмінки).
+* PreloadedAutocompleteAdminMixin — підпис обраного значення береться з уже
+  завантаженого (select_related) об'єкта, а не окремим запитом на кожен рядок
+  інлайна, як у стандартного AutocompleteSelect.
+* PaginatedInlineMixin — інлайн показує рядки сторінками по per_page.
+"""
+from django import forms
+from django.contrib.admin.widgets import AutocompleteSelect
+from django.core.paginator import Paginator
+
+
+class PreloadedAutocompleteSelect(AutocompleteSelect):
+    """AutocompleteSelect, якому форма може передати підписи обраних значень."""
+
+    def __init__(self, *args, **kwargs):
+        super().__init__(*args, **kwargs)
+        # {str(pk): підпис} — заповнює PreloadedAutocompleteForm
+        self.preloaded = None
+
+    def optgroups(self, name, value, attr=None):
+        selected = [str(v) for v in value if str(v) not in self.choices.field.empty_values]
+        if self.preloaded is None or not all(pk in self.preloaded for pk in selected):
+            return super().optgroups(name, value, attr)
+        options = []
+        if not self.is_required and not self.allow_multiple_selected:
+            options.append(self.create_option(name, "", "", False, 0))
+        for pk in selected:
+            options.append(self.create_option(name, pk, self.preloaded[pk], True, len(options)))
+        return [(None, options, 0)]
+
+
+class PreloadedAutocompleteForm(forms.ModelForm):
+    """ModelForm, що передає віджетам автодоповнення вже завантажені пов'язані об'єкти."""
+
+    def __init__(self, *args, **kwargs):
+        super().__init__(*args, **kwargs)
+        model_opts = self._meta.model._meta
+        for name, field in self.fields.items():
+            widget = getattr(field.widget, "widget", field.widget)
+            if not isinstance(widget, PreloadedAutocompleteSelect):
+                continue
+            model_field = model_opts.get_field(name)
+            if model_field.is_cached(self.instance):
+                related = model_field.get_cached_value(self.instance)
+                widget.preloaded = {str(related.pk): field.label_from_instance(related)} if related else {}
+
+
+class PreloadedAutocompleteAdminMixin:
+    """Міксин для ModelAdmin / InlineModelAdmin з autocomplete_fields."""
+    form = PreloadedAutocompleteForm
+
+    def formfield_for_foreignkey(self, db_field, request, **kwargs):
+        if db_field.name in self.get_autocomplete_fields(request) and "widget" not in kwargs:
+            kwargs["widget"] = PreloadedAutocompleteSelect(
+                db_field, self.admin_site, using=kwargs.get("using")
+            )
+        return super().formfield_for_foreignkey(db_field, request, **kwargs)
+
+
+class PaginatedInlineMixin:
+    """
+    Інлайн, що показує наявні рядки сторінками по per_page (параметр
+    <prefix>-page в URL; форма зберігається на ту саму адресу, тож редагується
+    саме показана сторінка). Порожніх форм за замовчуванням немає.
+    """
+    per_page = 20
+    extra = 0
+    template = "admin/edit_inline/tabular_paginated.html"
+
+    def get_formset(self, request, obj=None, **kwargs):
+        formset = super().get_formset(request, obj, **kwargs)
+        per_page = self.per_page
+
+        class PaginatedFormSet(formset):
+
+            @property
+            def page_param(self):
+                return f"{self.prefix}-page"
+
+            def get_queryset(self):
+                if not hasattr(self, "_queryset"):
+                    queryset = super().get_queryset()
+                    self.page = Paginator(queryset, per_page).get_page(request.GET.get(self.page_param))
+                    self._queryset = list(self.page.object_list)
+                    # Батьківський об'єкт уже є — str(рядок) не робитиме запит на кожен рядок
+                    for row in self._queryset:
+                        self.fk.set_cached_value(row, self.instance)
+                return self._queryset
+
+            def page_links(self):
+                """[(номер сторінки, URL або None для «…»)] для навігації під інлайном."""
+                self.get_queryset()
+                params = request.GET.copy()
+                links = []
+                for number in self.page.paginator.get_elided_page_range(self.page.number, on_each_side=2):
+                    if number == Paginator.ELLIPSIS:
+                        links.append((number, None))
+                    else:
+                        params[self.page_param] = number
+                        links.append((number, f"?{params.urlencode()}"))
+                return links
+
+        return PaginatedFormSet
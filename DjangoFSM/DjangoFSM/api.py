@@ -0,0 +1,72 @@
+"""
+Спільні помічники для read-only JSON API каталогу (sync та async представлення).
+
+Валідатори (ETag / Last-Modified) рахуються з легкого запиту по id та updated_at
+рядків сторінки. Якщо клієнт надіслав If-None-Match / If-Modified-Since і дані не
+змінилися, повертається 304 без вибірки та серіалізації самих об'єктів.
+"""
+import hashlib
+
+from django.core.serializers.json import DjangoJSONEncoder
+from django.http import JsonResponse
+from django.utils.cache import get_conditional_response, patch_cache_control
+from django.utils.http import http_date, quote_etag
+
+# Скільки секунд клієнти й проксі можуть використовувати відповідь без перевірки
+API_MAX_AGE = 60
+
+
+def int_param(request, name, default, maximum=None):
+    """Ціле невід'ємне значення з GET-параметра (некоректне — значення за замовчуванням)."""
+    try:
+        value = int(request.GET.get(name, default))
+    except (TypeError, ValueError):
+        return default
+    value = max(value, 0)
+    return min(value, maximum) if maximum is not None else value
+
+
+def page_validators(rows):
+    """
+    ETag та Last-Modified для набору рядків (кортежі id та дат оновлення).
+    ETag змінюється, якщо змінився склад сторінки або будь-яка дата.
+    """
+    digest = hashlib.sha1(repr(rows).encode()).hexdigest()
+    timestamps = [
+        value.timestamp() for row in rows for value in row if hasattr(value, "timestamp")
+    ]
+    last_modified = int(max(timestamps)) if timestamps else None
+    return quote_etag(digest), last_modified
+
+
+def _not_modified(request, rows):
+    etag, last_modified = page_validators(rows)
+    response = get_conditional_response(request, etag=etag, last_modified=last_modified)
+    return response, etag, last_modified
+
+
+def _with_validators(response, etag, last_modified, max_age):
+    response.headers.setdefault("ETag", etag)
+    if last_modified is not None:
+        response.headers.setdefault("Last-Modified", http_date(last_modified))
+    patch_cache_control(response, public=True, max_age=max_age)
+    return response
+
+
+def conditional_json(request, rows, build_payload, max_age=API_MAX_AGE):
+    """
+    Повертає 304, якщо валідатори збігаються з заголовками запиту,
+    інакше викликає build_payload() і віддає JSON з ETag / Last-Modified.
+    """
+    response, etag, last_modified = _not_modified(request, rows)
+    if response is None:
+        response = JsonResponse(build_payload(), encoder=DjangoJSONEncoder)
+    return _with_validators(response, etag, last_modified, max_age)
+
+
+async def aconditional_json(request, rows, build_payload, max_age=API_MAX_AGE):
+    """Те саме для async-представлень: build_payload — корутинна функція."""
+    response, etag, last_modified = _not_modified(request, rows)
+    if response is None:
+        response = JsonResponse(await build_payload(), encoder=DjangoJSONEncoder)
+    return _with_validators(response, etag, last_modified, max_age)
@@ -12,5 +12,7 @@ import os
 from django.core.asgi import get_asgi_application
 
 os.environ.setdefault('DJANGO_SETTINGS_MODULE', 'DjangoFSM.settings')
+# Профіль налаштувань для ASGI (див. SERVER_INTERFACE у settings.py)
+os.environ.setdefault('DJANGO_SERVER', 'asgi')
 
 application = get_asgi_application()
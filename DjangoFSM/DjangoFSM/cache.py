@@ -0,0 +1,157 @@
+"""
+Кеш з інвалідацією через ключі версій.
+
+Кожен запис зберігається разом із версіями, від яких він залежить
+(наприклад «виріб 5», «тканина 3», «категорії»). Сигнали моделей лише
+змінюють відповідні версії, а записи з застарілими версіями вважаються
+промахом під час читання. Так зміна однієї тканини інвалідує лише залежні
+картки, а решта кешу залишається «теплою».
+
+Версія — випадковий токен, а не лічильник: якщо ключ версії витіснено з кешу,
+новий токен гарантовано не збіжеться зі старими записами.
+
+Сигнали змінюють версії лише після коміту (bump_on_commit), інакше паралельний
+читач міг би перебудувати запис з ще не закоміченого стану під новою версією.
+Кожен bump також змінює «покоління» кешу: get_many запам'ятовує його до читання
+з БД і не зберігає побудовані записи, якщо під час побудови відбувся bump.
+"""
+import threading
+import uuid
+
+from django.conf import settings
+from django.core.cache import caches
+from django.db import transaction
+
+# Службова версія, що змінюється при кожному bump
+GENERATION = "generation"
+
+
+class VersionedCache:
+
+    def __init__(self, prefix, alias="default", timeout=None):
+        self.prefix = prefix
+        self.alias = alias
+        self._timeout = timeout
+        self._lock = threading.Lock()
+        self.hits = 0
+        self.misses = 0
+
+    @property
+    def cache(self):
+        return caches[self.alias]
+
+    @property
+    def timeout(self):
+        if self._timeout is not None:
+            return self._timeout
+        return getattr(settings, "CATALOG_CACHE_TIMEOUT", 60 * 60)
+
+    def _entry_key(self, key):
+        return f"{self.prefix}:entry:{key}"
+
+    def _version_key(self, name):
+        return f"{self.prefix}:version:{name}"
+
+
+    # ------------------------------------------------------------------
+    # Версії
+
+    def versions(self, names):
+        """Поточні токени версій; відсутні створюються одним set_many."""
+        names = list(dict.fromkeys(names))
+        stored = self.cache.get_many([self._version_key(name) for name in names])
+        result, missing = {}, {}
+        for name in names:
+            token = stored.get(self._version_key(name))
+            if token is None:
+                token = uuid.uuid4().hex
+                missing[self._version_key(name)] = token
+            result[name] = token
+        if missing:
+            self.cache.set_many(missing, timeout=None)
+        return result
+
+    def bump(self, *names):
+        """Інвалідує всі записи, що залежать від вказаних версій."""
+        if names:
+            # Покоління пишеться першим: хто побачив нову версію, побачить і нове покоління
+            self.cache.set_many(
+                {self._version_key(name): uuid.uuid4().hex for name in (GENERATION, *names)},
+                timeout=None,
+            )
+
+    def bump_on_commit(self, *names, using=None):
+        """bump після коміту поточної транзакції (одразу — поза транзакцією)."""
+        if names:
+            transaction.on_commit(lambda: self.bump(*names), using=using)
+
+    # ------------------------------------------------------------------
+    # Записи
+
+    def get_many(self, keys, build_missing):
+        """
+        Повертає {key: value} для всіх ключів.
+        build_missing(missing_keys) має повернути {key: (value, [імена версій])}
+        для тих ключів, які вдалося побудувати (відсутні в БД просто пропускаються).
+        """
+        keys = list(keys)
+        entries = self.cache.get_many([self._entry_key(key) for key in keys])
+        needed = {name for entry in entries.values() for name in entry["versions"]}
+        current = self.versions(needed) if needed else {}
+
+        result, missing = {}, []
+        for key in keys:
+            entry = entries.get(self._entry_key(key))
+            if entry is not None and all(
+                current.get(name) == token for name, token in entry["versions"].items()
+            ):
+                result[key] = entry["value"]
+            else:
+                missing.append(key)
+        self._count(hits=len(result), misses=len(missing))
+
+        if missing:
+            # Покоління до читання з БД: якщо під час побудови був bump, версії,
+            # прочитані після неї, можуть бути новішими за побудовані дані
+            generation = self.versions([GENERATION])[GENERATION]
+            built = build_missing(missing)
+            names = {name for _, dependencies in built.values() for name in dependencies}
+            current = self.versions([GENERATION, *names])
+            to_store = {}
+            for key, (value, dependencies) in built.items():
+                result[key] = value
+                to_store[self._entry_key(key)] = {
+                    "value": value,
+                    "versions": {name: current[name] for name in dependencies},
+                }
+            if current[GENERATION] == generation:
+                self.cache.set_many(to_store, timeout=self.timeout)
+        return result
+
+    def get(self, key, build, dependencies):
+        """Один запис: build() повертає значення, dependencies — імена версій."""
+        return self.get_many([key], lambda missing: {key: (build(), dependencies)})[key]
+
+    # ------------------------------------------------------------------
+    # Статистика
+
+    def _count(self, hits=0, misses=0):
+        with self._lock:
+            self.hits += hits
+            self.misses += misses
+
+    def stats(self):
+        total = self.hits + self.misses
+        return {
+            "hits": self.hits,
+            "misses": self.misses,
+            "hit_ratio": round(self.hits / total, 4) if total else None,
+        }
+
+    def reset_stats(self):
+        with self._lock:
+            self.hits = self.misses = 0
+
+
+# Кеш каталогу: дерево категорій, палітри тканин, картки виробів
+catalog_cache = VersionedCache("catalog")
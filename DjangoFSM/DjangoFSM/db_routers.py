@@ -0,0 +1,113 @@
+"""
+Маршрутизація читання на репліку PostgreSQL.
+
+Роутер Django не бачить запит, тому рішення «читати з репліки» передається
+через contextvar: його вмикає ReplicaReadMiddleware для безпечних запитів до
+списків адмінки та звітів або код через контекстний менеджер read_from_replica().
+Без налаштованої репліки все працює з базою default.
+"""
+import re
+from contextlib import contextmanager
+from contextvars import ContextVar
+
+from asgiref.sync import iscoroutinefunction, markcoroutinefunction
+from django.conf import settings
+from django.db import connections
+
+REPLICA_ALIAS = 'replica'
+# Сесії завжди читаються з default: щойно створена при вході сесія могла ще
+# не дійти до репліки, і користувача б «розлогінило»
+PRIMARY_MODELS = frozenset({'sessions.session'})
+# Cookie, яка після запису закріплює читання за default на час відставання репліки
+PIN_COOKIE = 'db_primary_pin'
+
+_use_replica = ContextVar('use_replica', default=False)
+
+
+def replica_configured():
+    return REPLICA_ALIAS in connections.databases
+
+
+@contextmanager
+def read_from_replica():
+    """Читання всередині блоку йде на репліку (запис — як і раніше на default)."""
+    token = _use_replica.set(True)
+    try:
+        yield
+    finally:
+        _use_replica.reset(token)
+
+
+class ReplicaRouter:
+
+    def db_for_read(self, model, **hints):
+        if model._meta.label_lower in PRIMARY_MODELS:
+            return None
+        if _use_replica.get() and replica_configured():
+            return REPLICA_ALIAS
+        return None
+
+    def db_for_write(self, model, **hints):
+        return 'default'
+
+    def allow_relation(self, obj1, obj2, **hints):
+        # Репліка містить ті самі дані, тож зв'язки між об'єктами з обох баз дозволені
+        return True
+
+    def allow_migrate(self, db, app_label, model_name=None, **hints):
+        return db != REPLICA_ALIAS
+
+
+class ReplicaReadMiddleware:
+    """
+    Вмикає читання з репліки для GET/HEAD запитів на URL, що відповідають
+    шаблонам DB_REPLICA_READ_URLS (списки адмінки та звіти; форми редагування
+    читаються з default, щоб не показувати застарілі дані).
+
+    Після будь-якого запису (POST тощо) відповідь ставить cookie PIN_COOKIE на
+    DB_REPLICA_PIN_SECONDS: поки вона є, запити користувача читаються з default
+    і бачать власні зміни, навіть якщо репліка ще відстає.
+
+    Працює і в синхронному, і в асинхронному ланцюжку: під ASGI async-представлення
+    не загортаються в sync_to_async заради цього middleware. Contextvar
+    копіюється в потоки sync_to_async, тож рішення діє і для синхронного ORM.
+    """
+
+    SAFE_METHODS = ('GET', 'HEAD')
+    sync_capable = True
+    async_capable = True
+
+    def __init__(self, get_response):
+        self.get_response = get_response
+        self.patterns = [re.compile(url) for url in getattr(settings, 'DB_REPLICA_READ_URLS', ())]
+        self.pin_seconds = getattr(settings, 'DB_REPLICA_PIN_SECONDS', 10)
+        self.is_async = iscoroutinefunction(get_response)
+        if self.is_async:
+            markcoroutinefunction(self)
+
+    def use_replica(self, request):
+        return (
+            request.method in self.SAFE_METHODS
+            and PIN_COOKIE not in request.COOKIES
+            and any(pattern.match(request.path) for pattern in self.patterns)
+            and replica_configured()
+        )
+
+    def pin_to_primary(self, request, response):
+        if request.method not in self.SAFE_METHODS and replica_configured():
+            response.set_cookie(PIN_COOKIE, '1', max_age=self.pin_seconds, httponly=True, samesite='Lax')
+        return response
+
+    def __call__(self, request):
+        if self.is_async:
+            return self.__acall__(request)
+        if self.use_replica(request):
+            with read_from_replica():
+                return self.get_response(request)
+        return self.pin_to_primary(request, self.get_response(request))
+
+    async def __acall__(self, request):
+        if self.use_replica(request):
+            with read_from_replica():
+                return await self.get_response(request)
+        return self.pin_to_primary(request, await self.get_response(request))
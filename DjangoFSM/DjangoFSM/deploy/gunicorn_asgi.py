@@ -0,0 +1,25 @@
+"""
+Профіль ASGI: gunicorn керує процесами uvicorn (uvicorn-worker).
+
+    gunicorn -c DjangoFSM/deploy/gunicorn_asgi.py DjangoFSM.asgi:application
+
+Async-представлення каталогу та статусів замовлень не тримають потік, поки
+чекають БД або повільного клієнта, тому воркерів потрібно менше, ніж для WSGI.
+З'єднання з PostgreSQL під ASGI не зберігаються між запитами (CONN_MAX_AGE=0) —
+для навантаження вмикайте пул DB_POOL або PgBouncer.
+"""
+import multiprocessing
+import os
+
+wsgi_app = "DjangoFSM.asgi:application"
+bind = os.getenv("GUNICORN_BIND", "0.0.0.0:8000")
+workers = int(os.getenv("GUNICORN_WORKERS", multiprocessing.cpu_count() + 1))
+worker_class = "uvicorn_worker.UvicornWorker"
+max_requests = int(os.getenv("GUNICORN_MAX_REQUESTS", 10000))
+max_requests_jitter = max_requests // 10
+timeout = int(os.getenv("GUNICORN_TIMEOUT", 30))
+# Скільки очікувати завершення відкритих запитів при перезапуску
+graceful_timeout = 30
+keepalive = 5
+accesslog = os.getenv("GUNICORN_ACCESS_LOG", "-")
+raw_env = ["DJANGO_SERVER=asgi"]
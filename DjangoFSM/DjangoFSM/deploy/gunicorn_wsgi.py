@@ -0,0 +1,23 @@
+"""
+Профіль WSGI: gunicorn з потоковими воркерами.
+
+    gunicorn -c DjangoFSM/deploy/gunicorn_wsgi.py DjangoFSM.wsgi:application
+
+Кожен запит займає потік на весь час обробки, включно з повільною віддачею
+відповіді клієнту, тож кількість одночасних запитів = workers * threads.
+"""
+import multiprocessing
+import os
+
+wsgi_app = "DjangoFSM.wsgi:application"
+bind = os.getenv("GUNICORN_BIND", "0.0.0.0:8000")
+workers = int(os.getenv("GUNICORN_WORKERS", multiprocessing.cpu_count() * 2 + 1))
+worker_class = "gthread"
+threads = int(os.getenv("GUNICORN_THREADS", 4))
+# Воркер перезапускається після N запитів — захист від поступового росту пам'яті
+max_requests = int(os.getenv("GUNICORN_MAX_REQUESTS", 2000))
+max_requests_jitter = max_requests // 10
+timeout = int(os.getenv("GUNICORN_TIMEOUT", 30))
+keepalive = 5
+accesslog = os.getenv("GUNICORN_ACCESS_LOG", "-")
+raw_env = ["DJANGO_SERVER=wsgi"]
@@ -0,0 +1,276 @@
+"""
+Фонова обробка зображень каталогу.
+
+Після збереження нового фото (ProductImage.image, Fabric.image) у пулі потоків
+генеруються зменшені варіанти — мініатюра JPEG та WebP, превʼю WebP — і
+в БД записуються ширина, висота та розмір оригіналу. Запит користувача на це
+не чекає. Для наявних фото є команда process_images (пул процесів).
+
+Режим задається налаштуванням IMAGE_PROCESSING: "thread" (за замовчуванням),
+"sync" (одразу в поточному потоці) або "off".
+
+Замінені та видалені файли звільняються після коміту (release_file): у сховищі
+з адресацією за вмістом (mediafiles.storage) це знімає одне посилання, і файл
+зникає, лише коли на нього більше ніхто не посилається.
+"""
+import logging
+import os
+from concurrent.futures import ThreadPoolExecutor
+from io import BytesIO
+
+from asgiref.sync import sync_to_async
+from django.apps import apps
+from django.conf import settings
+from django.core.files.base import ContentFile
+from django.db import close_old_connections, models, transaction
+from django.dispatch import Signal
+from django.utils.html import format_html
+
+logger = logging.getLogger(__name__)
+
+# Надсилається після запису варіантів (sender — клас моделі, pk — id об'єкта)
+image_variants_ready = Signal()
+
+# Назва варіанта -> (поле моделі, формат Pillow, налаштування розміру, розширення)
+VARIANTS = {
+    "thumbnail": ("thumbnail", "JPEG", "IMAGE_THUMBNAIL_SIZE", "jpg"),
+    "thumbnail_webp": ("thumbnail_webp", "WEBP", "IMAGE_THUMBNAIL_SIZE", "webp"),
+    "preview_webp": ("preview_webp", "WEBP", "IMAGE_PREVIEW_SIZE", "webp"),
+}
+DEFAULT_SIZES = {
+    "IMAGE_THUMBNAIL_SIZE": (320, 320),
+    "IMAGE_PREVIEW_SIZE": (1024, 1024),
+}
+
+
+def variant_upload_to(instance, filename):
+    """Варіанти лежать поруч з оригіналом у підкаталозі variants/."""
+    return os.path.join(os.path.dirname(instance.image.name), "variants", filename)
+
+
+class ImageVariantsMixin(models.Model):
+    """Поля з метаданими та зменшеними копіями поля image."""
+    image_width = models.PositiveIntegerField(null=True, blank=True, editable=False, verbose_name="Ширина (px)")
+    image_height = models.PositiveIntegerField(null=True, blank=True, editable=False, verbose_name="Висота (px)")
+    image_size = models.PositiveBigIntegerField(null=True, blank=True, editable=False, verbose_name="Розмір (байт)")
+    thumbnail = models.ImageField(
+        upload_to=variant_upload_to, max_length=255, blank=True, null=True, editable=False, verbose_name="Мініатюра"
+    )
+    thumbnail_webp = models.ImageField(
+        upload_to=variant_upload_to, max_length=255, blank=True, null=True, editable=False, verbose_name="Мініатюра WebP"
+    )
+    preview_webp = models.ImageField(
+        upload_to=variant_upload_to, max_length=255, blank=True, null=True, editable=False, verbose_name="Превʼю WebP"
+    )
+
+    @classmethod
+    def from_db(cls, db, field_names, values):
+        instance = super().from_db(db, field_names, values)
+        # Запам'ятовуємо файл з БД, щоб обробляти фото лише після його заміни
+        instance._loaded_image_name = instance.__dict__.get("image")
+        return instance
+
+    def save(self, *args, **kwargs):
+        # Чи треба після збереження звільнити попередній оригінал: завантажено новий
+        # файл (навіть з тим самим вмістом і ім'ям) або фото прибрано / замінено
+        loaded = getattr(self, "_loaded_image_name", None)
+        uploaded = bool(self.image) and not self.image._committed
+        self._replaced_image_name = loaded if loaded and (uploaded or self.image.name != loaded) else None
+        super().save(*args, **kwargs)
+
+    def image_changed(self):
+        loaded = getattr(self, "_loaded_image_name", None)
+        return bool(self.image) and (self.image.name != str(loaded or "") or not self.thumbnail)
+
+    @property
+    def thumbnail_url(self):
+        """URL найменшого доступного варіанта (або оригіналу, поки варіантів ще немає)."""
+        for field in (self.thumbnail_webp, self.thumbnail):
+            if field:
+                return field.url
+        return self.image.url if self.image else None
+
+    class Meta:
+        abstract = True
+
+
+def thumbnail_tag(obj):
+    """HTML-мініатюра для списків адмінки."""
+    url = obj.thumbnail_url
+    if not url:
+        return "—"
+    return format_html('<img src="{}" style="max-height: 60px; max-width: 90px;" loading="lazy">', url)
+
+
+def read_dimensions(storage, name):
+    """(ширина, висота) з заголовка файлу — Pillow не декодує саме зображення."""
+    from PIL import Image
+
+    with storage.open(name, "rb") as source:
+        return Image.open(source).size
+
+
+async def aimage_dimensions(instance):
+    """
+    Розміри фото для async-представлень: спершу з полів моделі, інакше —
+    читання заголовка файлу в окремому потоці (сховище може бути мережевим,
+    тож цикл подій на ньому не блокується). None, якщо файлу немає.
+    """
+    if instance.image_width and instance.image_height:
+        return instance.image_width, instance.image_height
+    if not instance.image:
+        return None
+    try:
+        return await sync_to_async(read_dimensions, thread_sensitive=False)(
+            instance.image.storage, instance.image.name
+        )
+    except (OSError, ValueError):
+        logger.warning("Не вдалося прочитати розміри %s", instance.image.name)
+        return None
+
+
+# ==========================================================================
+# Обробка
+
+
+def _render(image, fmt, size):
+    from PIL import Image
+
+    copy = image.copy()
+    copy.thumbnail(size, Image.Resampling.LANCZOS)
+    if fmt == "JPEG" and copy.mode not in ("RGB", "L"):
+        copy = copy.convert("RGB")
+    buffer = BytesIO()
+    copy.save(buffer, fmt, quality=82, optimize=fmt == "JPEG", method=4 if fmt == "WEBP" else 0)
+    return buffer.getvalue()
+
+
+def process_image(model_label, pk):
+    """
+    Генерує варіанти та метадані для одного об'єкта і записує їх одним UPDATE
+    (без save(), щоб не запускати сигнали та повторну обробку).
+    """
+    from PIL import ExifTags, Image, ImageOps
+
+    model = apps.get_model(model_label)
+    instance = model._default_manager.filter(pk=pk).first()
+    if instance is None or not instance.image:
+        return False
+
+    storage = instance.image.storage
+    name = instance.image.name
+    with storage.open(name, "rb") as source:
+        image = Image.open(source)
+        # Розміри оригіналу з урахуванням повороту: draft() нижче зменшує image.size,
+        # тож сторони міняються місцями за EXIF Orientation (5–8 — поворот на 90°)
+        width, height = image.size
+        if image.getexif().get(ExifTags.Base.Orientation) in (5, 6, 7, 8):
+            width, height = height, width
+        largest = max(getattr(settings, key, default) for key, default in DEFAULT_SIZES.items())
+        # Для JPEG декодуємо одразу в меншій роздільності — суттєво швидше
+        image.draft("RGB", largest)
+        image = ImageOps.exif_transpose(image)
+        image.load()
+
+    base = os.path.splitext(os.path.basename(name))[0]
+    values = {"image_width": width, "image_height": height, "image_size": storage.size(name)}
+    old_files, new_files = [], []
+    for variant, (field_name, fmt, size_setting, extension) in VARIANTS.items():
+        size = getattr(settings, size_setting, DEFAULT_SIZES[size_setting])
+        field = model._meta.get_field(field_name)
+        filename = field.generate_filename(instance, f"{base}_{variant}.{extension}")
+        values[field_name] = field.storage.save(filename, ContentFile(_render(image, fmt, size)))
+        new_files.append((field.storage, values[field_name]))
+        old_files.append((field.storage, getattr(instance, field_name).name))
+
+    # Фото могли замінити під час обробки: тоді рядок не оновлюється, у БД лишаються
+    # старі варіанти (їх звільнить обробка нового фото), а щойно записані — зайві.
+    # Навіть при тому самому імені файли звільняються: у сховищі за вмістом save() додав посилання
+    updated = model._default_manager.filter(pk=pk, image=name).update(**values)
+    for file_storage, file_name in old_files if updated else new_files:
+        if file_name:
+            file_storage.delete(file_name)
+    if not updated:
+        return False
+    image_variants_ready.send(sender=model, pk=pk)
+    return True
+
+
+def _run(model_label, pk):
+    close_old_connections()
+    try:
+        process_image(model_label, pk)
+    except Exception:
+        logger.exception("Не вдалося обробити зображення %s #%s", model_label, pk)
+    finally:
+        close_old_connections()
+
+
+def init_worker():
+    """Ініціалізація процесу пулу (у т.ч. для методу запуску spawn)."""
+    import django
+
+    os.environ.setdefault("DJANGO_SETTINGS_MODULE", "DjangoFSM.settings")
+    django.setup()
+
+
+def run_in_worker(model_label, pk):
+    """Обробка в окремому процесі: повертає (pk, успіх)."""
+    try:
+        return pk, process_image(model_label, pk)
+    except Exception:
+        logger.exception("Не вдалося обробити зображення %s #%s", model_label, pk)
+        return pk, False
+
+
+_executor = None
+
+
+def _get_executor():
+    global _executor
+    if _executor is None:
+        _executor = ThreadPoolExecutor(
+            max_workers=getattr(settings, "IMAGE_WORKERS", 2),
+            thread_name_prefix="image-pipeline",
+        )
+    return _executor
+
+
+def schedule_processing(instance):
+    """Ставить обробку фото в чергу після коміту транзакції."""
+    mode = getattr(settings, "IMAGE_PROCESSING", "thread")
+    if mode == "off":
+        return
+    label = instance._meta.label
+    if mode == "sync":
+        transaction.on_commit(lambda: process_image(label, instance.pk))
+    else:
+        transaction.on_commit(lambda: _get_executor().submit(_run, label, instance.pk))
+
+
+def release_file(storage, name):
+    """Видаляє файл (у сховищі за вмістом — знімає посилання) після коміту транзакції."""
+    if name:
+        transaction.on_commit(lambda: storage.delete(name))
+
+
+def release_files_on_delete(sender, instance, **kwargs):
+    """Обробник post_delete: звільняє оригінал і всі варіанти видаленого об'єкта."""
+    for field in instance._meta.concrete_fields:
+        if isinstance(field, models.FileField):
+            release_file(field.storage, getattr(instance, field.attname).name)
+
+
+def schedule_on_image_change(sender, instance, raw=False, **kwargs):
+    """Обробник post_save для моделей з ImageVariantsMixin."""
+    if raw:
+        return
+    replaced = getattr(instance, "_replaced_image_name", None)
+    if replaced:
+        instance._replaced_image_name = None
+        instance._loaded_image_name = instance.image.name
+        release_file(instance.image.storage, replaced)
+    if not instance.image_changed():
+        return
+    instance._loaded_image_name = instance.image.name
+    schedule_processing(instance)
@@ -0,0 +1,26 @@
+"""
+Операції міграцій для великих таблиць.
+
+AddIndexConcurrently на PostgreSQL будує індекс через CREATE INDEX CONCURRENTLY
+(без блокування запису в таблицю; міграція має бути atomic = False), а на інших
+СУБД — звичайним CREATE INDEX. Вбудована операція django.contrib.postgres
+працює лише з PostgreSQL і потребує psycopg навіть для профілю SQLite.
+"""
+from django.db import migrations
+
+
+class AddIndexConcurrently(migrations.AddIndex):
+    atomic = False
+
+    def _concurrently(self, schema_editor):
+        return {"concurrently": True} if schema_editor.connection.vendor == "postgresql" else {}
+
+    def database_forwards(self, app_label, schema_editor, from_state, to_state):
+        model = to_state.apps.get_model(app_label, self.model_name)
+        if self.allow_migrate_model(schema_editor.connection.alias, model):
+            schema_editor.add_index(model, self.index, **self._concurrently(schema_editor))
+
+    def database_backwards(self, app_label, schema_editor, from_state, to_state):
+        model = from_state.apps.get_model(app_label, self.model_name)
+        if self.allow_migrate_model(schema_editor.connection.alias, model):
+            schema_editor.remove_index(model, self.index, **self._concurrently(schema_editor))
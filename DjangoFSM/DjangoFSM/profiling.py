@@ -0,0 +1,156 @@
+"""
+Вимірювання запитів: час відповіді, кількість і час SQL, повторювані запити (N+1).
+
+ProfilingMiddleware вмикається налаштуванням PROFILING_ENABLED. Коли його
+вимкнено, middleware відмовляється від участі (MiddlewareNotUsed) і взагалі
+не потрапляє в ланцюжок обробки. Вибірка запитів — PROFILING_SAMPLE_RATE.
+
+Для кожного виміряного запиту:
+* заголовок Server-Timing (видно у вкладці Network браузера);
+* запис у лог DjangoFSM.profiling (поля — в extra["profile"]);
+* запис у кільцевий буфер процесу, який показує сторінка /admin/profiling/.
+
+Middleware лише синхронний: під ASGI Django виконує async-представлення
+через async_to_sync, тож для вимірів async-шляху профілювання краще вимикати.
+"""
+import heapq
+import logging
+import random
+import threading
+import time
+from collections import Counter, deque
+from contextlib import ExitStack
+
+from django.conf import settings
+from django.contrib import admin
+from django.contrib.admin.views.decorators import staff_member_required
+from django.core.exceptions import MiddlewareNotUsed
+from django.db import connections
+from django.http import JsonResponse
+from django.template.response import TemplateResponse
+from django.utils import timezone
+
+logger = logging.getLogger(__name__)
+
+_buffer = deque(maxlen=getattr(settings, "PROFILING_BUFFER_SIZE", 200))
+_buffer_lock = threading.Lock()
+
+
+class QueryRecorder:
+    """execute_wrapper, що рахує запити, їх час, повтори та найповільніші."""
+
+    def __init__(self, top=5):
+        self.top = top
+        self.count = 0
+        self.duration = 0.0
+        self.templates = Counter()
+        self.slowest = []
+
+    def __call__(self, execute, sql, params, many, context):
+        started = time.perf_counter()
+        try:
+            return execute(sql, params, many, context)
+        finally:
+            elapsed = time.perf_counter() - started
+            self.count += 1
+            self.duration += elapsed
+            # SQL з плейсхолдерами: однаковий шаблон з різними параметрами — ознака N+1
+            self.templates[sql] += 1
+            entry = (elapsed, self.count, sql)
+            if len(self.slowest) < self.top:
+                heapq.heappush(self.slowest, entry)
+            else:
+                heapq.heappushpop(self.slowest, entry)
+
+    def duplicates(self, threshold):
+        return [(sql, count) for sql, count in self.templates.most_common() if count >= threshold]
+
+    def slowest_queries(self):
+        return [(round(elapsed * 1000, 2), sql) for elapsed, _, sql in sorted(self.slowest, reverse=True)]
+
+
+def server_timing(record):
+    return ", ".join([
+        f'db;dur={record["db_ms"]};desc="{record["queries"]} SQL"',
+        f'app;dur={round(record["total_ms"] - record["db_ms"], 2)}',
+        f'total;dur={record["total_ms"]}',
+    ])
+
+
+class ProfilingMiddleware:
+
+    def __init__(self, get_response):
+        if not getattr(settings, "PROFILING_ENABLED", False):
+            raise MiddlewareNotUsed
+        self.get_response = get_response
+        self.sample_rate = getattr(settings, "PROFILING_SAMPLE_RATE", 1.0)
+        self.top = getattr(settings, "PROFILING_SLOW_QUERIES", 5)
+        self.duplicate_threshold = getattr(settings, "PROFILING_DUPLICATE_THRESHOLD", 3)
+
+    def __call__(self, request):
+        if self.sample_rate < 1 and random.random() >= self.sample_rate:
+            return self.get_response(request)
+
+        recorder = QueryRecorder(top=self.top)
+        started = time.perf_counter()
+        with ExitStack() as stack:
+            for connection in connections.all():
+                stack.enter_context(connection.execute_wrapper(recorder))
+            response = self.get_response(request)
+        total = time.perf_counter() - started
+
+        match = request.resolver_match
+        record = {
+            "time": timezone.now(),
+            "method": request.method,
+            "path": request.path,
+            "view": match.view_name if match else None,
+            "status": response.status_code,
+            "total_ms": round(total * 1000, 2),
+            "db_ms": round(recorder.duration * 1000, 2),
+            "queries": recorder.count,
+            "duplicates": recorder.duplicates(self.duplicate_threshold),
+            "slowest": recorder.slowest_queries(),
+        }
+        response.headers["Server-Timing"] = server_timing(record)
+        with _buffer_lock:
+            _buffer.append(record)
+
+        level = logging.WARNING if record["duplicates"] else logging.INFO
+        logger.log(
+            level,
+            "%s %s %s %.1f ms, SQL: %d за %.1f ms, повторів: %d",
+            record["method"], record["path"], record["status"], record["total_ms"],
+            record["queries"], record["db_ms"], len(record["duplicates"]),
+            extra={"profile": record},
+        )
+        return response
+
+
+def recent_profiles():
+    """Останні виміри цього процесу, новіші першими."""
+    with _buffer_lock:
+        return list(reversed(_buffer))
+
+
+def clear_profiles():
+    with _buffer_lock:
+        _buffer.clear()
+
+
+@staff_member_required
+def profiles_view(request):
+    """Сторінка адмінки з останніми вимірами (?format=json — у JSON)."""
+    profiles = recent_profiles()
+    if request.GET.get("format") == "json":
+        return JsonResponse({"results": profiles})
+    if request.GET.get("sort") == "slow":
+        profiles.sort(key=lambda record: record["total_ms"], reverse=True)
+    context = {
+        **admin.site.each_context(request),
+        "title": "Профілювання запитів",
+        "profiles": profiles,
+        "enabled": getattr(settings, "PROFILING_ENABLED", False),
+        "sample_rate": getattr(settings, "PROFILING_SAMPLE_RATE", 1.0),
+    }
+    return TemplateResponse(request, "admin/profiling.html", context)
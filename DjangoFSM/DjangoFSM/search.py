@@ -0,0 +1,227 @@
+"""
+Індексований пошук для адмінки та API.
+
+Замість ланцюжків icontains по всій таблиці пошук спирається на індекси:
+
+* PostgreSQL — GIN-індекси pg_trgm по UPPER(поле), які обслуговують LIKE '%...%'
+  (тобто звичайні icontains), і btree text_pattern_ops для пошуку за префіксом;
+* SQLite (розробка) — віртуальна таблиця FTS5 з токенайзером trigram,
+  синхронізована тригерами.
+
+Фрагменти, коротші за триграму (перші літери в полі автодоповнення адмінки),
+індекс триграм не обслуговує: для них лишається звичайний icontains, як у
+стандартному пошуку адмінки, щоб результати не залежали від довжини слова.
+
+Моделі реєструються через register() в AppConfig.ready(); індекси створюються
+(ідемпотентно) після кожного migrate обробником post_migrate.
+"""
+from django.db import connections
+from django.db.models import Q
+from django.db.models.expressions import RawSQL
+from django.utils.text import smart_split, unescape_string_literal
+
+# Мінімальна довжина фрагмента для індексу триграм
+MIN_TRIGRAM_LENGTH = 3
+
+
+class SearchSpec:
+    """
+    Опис пошуку по моделі:
+    fields — текстові поля для пошуку за входженням (триграми);
+    prefix_fields — коди, які шукаються за префіксом;
+    related — FK на інші зареєстровані моделі, пошук по яких іде підзапитом.
+    """
+
+    def __init__(self, model, fields=(), prefix_fields=(), related=()):
+        self.model = model
+        self.fields = tuple(fields)
+        self.prefix_fields = tuple(prefix_fields)
+        self.related = tuple(related)
+
+    @property
+    def table(self):
+        return self.model._meta.db_table
+
+    @property
+    def fts_table(self):
+        return f"{self.table}_fts"
+
+    def columns(self, names):
+        return [self.model._meta.get_field(name).column for name in names]
+
+
+_registry = {}
+
+
+def register(model, **kwargs):
+    _registry[model] = SearchSpec(model, **kwargs)
+
+
+def get_spec(model):
+    return _registry.get(model)
+
+
+def registered_specs():
+    return list(_registry.values())
+
+
+# ==========================================================================
+# Побудова запиту
+
+
+def split_terms(search_term):
+    """Розбиває рядок пошуку на слова так само, як це робить адмінка Django."""
+    terms = []
+    for bit in smart_split(search_term):
+        if bit.startswith(('"', "'")) and bit[0] == bit[-1]:
+            bit = unescape_string_literal(bit)
+        if bit:
+            terms.append(bit)
+    return terms
+
+
+def _fts_condition(spec, term, using):
+    """Умова pk IN (SELECT rowid FROM fts WHERE fts MATCH ...) для SQLite."""
+    quote = connections[using].ops.quote_name
+    phrase = '"%s"' % term.replace('"', '""')
+    return Q(pk__in=RawSQL(
+        f"SELECT rowid FROM {quote(spec.fts_table)} WHERE {quote(spec.fts_table)} MATCH %s",
+        [phrase],
+    ))
+
+
+def term_condition(spec, term, using="default"):
+    """Q-умова для одного слова пошуку (OR по всіх полях моделі)."""
+    vendor = connections[using].vendor
+    condition = Q()
+
+    if spec.fields:
+        if len(term) < MIN_TRIGRAM_LENGTH:
+            for name in spec.fields:
+                condition |= Q(**{f"{name}__icontains": term})
+        elif vendor == "sqlite":
+            condition |= _fts_condition(spec, term, using)
+        else:
+            for name in spec.fields:
+                condition |= Q(**{f"{name}__icontains": term})
+
+    for name in spec.prefix_fields:
+        condition |= Q(**{f"{name}__istartswith": term})
+
+    for name in spec.related:
+        related_model = spec.model._meta.get_field(name).related_model
+        related_spec = get_spec(related_model)
+        related_pks = related_model._default_manager.using(using).filter(
+            term_condition(related_spec, term, using)
+        ).values("pk")
+        condition |= Q(**{f"{name}__in": related_pks})
+
+    return condition
+
+
+def search(queryset, search_term):
+    """Фільтрує queryset зареєстрованої моделі за рядком пошуку (слова через AND)."""
+    spec = get_spec(queryset.model)
+    for term in split_terms(search_term):
+        queryset = queryset.filter(term_condition(spec, term, queryset.db))
+    return queryset
+
+
+# ==========================================================================
+# Індекси
+
+
+def _postgres_statements(spec, quote):
+    yield "CREATE EXTENSION IF NOT EXISTS pg_trgm"
+    for column in spec.columns(spec.fields):
+        yield (
+            f"CREATE INDEX CONCURRENTLY IF NOT EXISTS {quote(f'{spec.table}_{column}_trgm')} "
+            f"ON {quote(spec.table)} USING gin (UPPER({quote(column)}::text) gin_trgm_ops)"
+        )
+    for column in spec.columns(spec.fields + spec.prefix_fields):
+        yield (
+            f"CREATE INDEX CONCURRENTLY IF NOT EXISTS {quote(f'{spec.table}_{column}_prefix')} "
+            f"ON {quote(spec.table)} (UPPER({quote(column)}::text) text_pattern_ops)"
+        )
+
+
+def _sqlite_statements(spec, quote, rebuild):
+    table, fts = quote(spec.table), quote(spec.fts_table)
+    columns = [quote(column) for column in spec.columns(spec.fields)]
+    column_list = ", ".join(columns)
+    new_values = ", ".join(f"new.{column}" for column in columns)
+    old_values = ", ".join(f"old.{column}" for column in columns)
+    delete_row = (
+        f"INSERT INTO {fts}({fts}, rowid, {column_list}) VALUES ('delete', old.id, {old_values});"
+    )
+    insert_row = f"INSERT INTO {fts}(rowid, {column_list}) VALUES (new.id, {new_values});"
+
+    yield (
+        f"CREATE VIRTUAL TABLE IF NOT EXISTS {fts} USING fts5("
+        f"{column_list}, content={table}, content_rowid='id', tokenize='trigram')"
+    )
+    # Тригери зникають, коли міграції SQLite перебудовують таблицю, тому
+    # створюються повторно після кожного migrate
+    yield f"CREATE TRIGGER IF NOT EXISTS {quote(spec.table + '_fts_ai')} AFTER INSERT ON {table} BEGIN {insert_row} END"
+    yield f"CREATE TRIGGER IF NOT EXISTS {quote(spec.table + '_fts_ad')} AFTER DELETE ON {table} BEGIN {delete_row} END"
+    yield (
+        f"CREATE TRIGGER IF NOT EXISTS {quote(spec.table + '_fts_au')} AFTER UPDATE ON {table} "
+        f"BEGIN {delete_row} {insert_row} END"
+    )
+    if rebuild:
+        yield f"INSERT INTO {fts}({fts}) VALUES ('rebuild')"
+
+
+def _sqlite_index_is_current(connection, spec):
+    """Чи існують FTS-таблиця та всі три тригери (тоді перебудова індексу не потрібна)."""
+    names = [spec.fts_table] + [f"{spec.table}_fts_{suffix}" for suffix in ("ai", "ad", "au")]
+    with connection.cursor() as cursor:
+        cursor.execute(
+            "SELECT COUNT(*) FROM sqlite_master WHERE name IN (%s)" % ", ".join(["%s"] * len(names)),
+            names,
+        )
+        return cursor.fetchone()[0] == len(names)
+
+
+def ensure_search_index(spec, using="default", rebuild=False):
+    """Ідемпотентно створює пошукові індекси моделі для поточної СУБД."""
+    connection = connections[using]
+    quote = connection.ops.quote_name
+    if connection.vendor == "postgresql":
+        statements = _postgres_statements(spec, quote)
+    elif connection.vendor == "sqlite" and spec.fields:
+        rebuild = rebuild or not _sqlite_index_is_current(connection, spec)
+        statements = _sqlite_statements(spec, quote, rebuild)
+    else:
+        return
+    with connection.cursor() as cursor:
+        for statement in statements:
+            cursor.execute(statement)
+
+
+def ensure_search_indexes(sender, using="default", plan=None, **kwargs):
+    """Обробник post_migrate: створює індекси для зареєстрованих моделей застосунку."""
+    if plan == []:
+        return
+    table_names = connections[using].introspection.table_names()
+    for spec in registered_specs():
+        if spec.model._meta.app_config is sender and spec.table in table_names:
+            ensure_search_index(spec, using=using)
+
+
+# ==========================================================================
+# Адмінка
+
+
+class IndexedSearchAdminMixin:
+    """
+    Підключає індексований пошук до ModelAdmin через get_search_results.
+    Пошук іде підзапитами, тому дублікатів рядків не буває.
+    """
+
+    def get_search_results(self, request, queryset, search_term):
+        if get_spec(queryset.model) is None:
+            return super().get_search_results(request, queryset, search_term)
+        if not search_term:
+            return queryset, False
+        return search(queryset, search_term), False
@@ -10,11 +10,29 @@ For the full list of settings and their values, see
 https://docs.djangoproject.com/en/5.2/ref/settings/
 """
 
+import os
 from pathlib import Path
 
+from dotenv import load_dotenv
+
 # Build paths inside the project like this: BASE_DIR / 'subdir'.
 BASE_DIR = Path(__file__).resolve().parent.parent
 
+# Змінні оточення з файлу .env (якщо він є) — див. .env.example
+load_dotenv(BASE_DIR / '.env')
+
+
+def env_bool(name, default=False):
+    value = os.getenv(name)
+    if value is None:
+        return default
+    return value.strip().lower() in ('1', 'true', 'yes', 'on')
+
+
+def env_int(name, default):
+    value = os.getenv(name)
+    return int(value) if value not in (None, '') else default
+
 
 # Quick-start development settings - unsuitable for production
 # See https://docs.djangoproject.com/en/5.2/howto/deployment/checklist/
@@ -41,16 +59,24 @@ INSTALLED_APPS = [
     'products',
     'fabric',
     'client_orders',
+    'reporting',
+    'mediafiles',
+    'audit',
+    'benchmarks',
 ]
 
 MIDDLEWARE = [
     'django.middleware.security.SecurityMiddleware',
     'django.contrib.sessions.middleware.SessionMiddleware',
+    'users.sessions.SessionRefreshMiddleware',
     'django.middleware.common.CommonMiddleware',
     'django.middleware.csrf.CsrfViewMiddleware',
     'django.contrib.auth.middleware.AuthenticationMiddleware',
+    'audit.tracking.AuditUserMiddleware',
     'django.contrib.messages.middleware.MessageMiddleware',
     'django.middleware.clickjacking.XFrameOptionsMiddleware',
+    'DjangoFSM.db_routers.ReplicaReadMiddleware',
+    'DjangoFSM.profiling.ProfilingMiddleware',
 ]
 
 ROOT_URLCONF = 'DjangoFSM.urls'
@@ -58,7 +84,7 @@ ROOT_URLCONF = 'DjangoFSM.urls'
 TEMPLATES = [
     {
         'BACKEND': 'django.template.backends.django.DjangoTemplates',
-        'DIRS': [],
+        'DIRS': [BASE_DIR / 'DjangoFSM' / 'templates'],
         'APP_DIRS': True,
         'OPTIONS': {
             'context_processors': [
@@ -72,16 +98,142 @@ TEMPLATES = [
 
 WSGI_APPLICATION = 'DjangoFSM.wsgi.application'
 
+# Інтерфейс сервера: "wsgi" (gunicorn, синхронні воркери) або "asgi" (uvicorn).
+# asgi.py встановлює DJANGO_SERVER=asgi ще до завантаження налаштувань;
+# конфіги gunicorn для обох профілів — у DjangoFSM/deploy/
+SERVER_INTERFACE = os.getenv('DJANGO_SERVER', 'wsgi')
+
 
 # Database
 # https://docs.djangoproject.com/en/5.2/ref/settings/#databases
 
-DATABASES = {
-    'default': {
-        'ENGINE': 'django.db.backends.sqlite3',
-        'NAME': BASE_DIR / 'db.sqlite3',
+# Профіль БД обирається змінною DB_ENGINE: "sqlite" (локальна розробка) або "postgresql".
+
+DB_ENGINE = os.getenv('DB_ENGINE', 'sqlite')
+
+if DB_ENGINE == 'postgresql':
+    def postgres_database(prefix):
+        """Налаштування PostgreSQL зі змінних оточення з префіксом (DB_ або DB_REPLICA_)."""
+        database = {
+            'ENGINE': 'django.db.backends.postgresql',
+            'NAME': os.getenv(f'{prefix}NAME', os.getenv('DB_NAME', 'djangofsm')),
+            'USER': os.getenv(f'{prefix}USER', os.getenv('DB_USER', 'djangofsm')),
+            'PASSWORD': os.getenv(f'{prefix}PASSWORD', os.getenv('DB_PASSWORD', '')),
+            'HOST': os.getenv(f'{prefix}HOST', os.getenv('DB_HOST', 'localhost')),
+            'PORT': os.getenv(f'{prefix}PORT', os.getenv('DB_PORT', '5432')),
+            # Постійні з'єднання з перевіркою перед повторним використанням.
+            # Під ASGI з'єднання прив'язане до контексту запиту і не перевикористовується,
+            # тому за замовчуванням вимкнені — замість них пул (DB_POOL) або PgBouncer
+            'CONN_MAX_AGE': env_int('DB_CONN_MAX_AGE', 0 if SERVER_INTERFACE == 'asgi' else 60),
+            'CONN_HEALTH_CHECKS': True,
+            # Серверні курсори для .iterator(); вимикаються за PgBouncer у transaction mode
+            'DISABLE_SERVER_SIDE_CURSORS': env_bool('DB_PGBOUNCER'),
+            'OPTIONS': {
+                'connect_timeout': env_int('DB_CONNECT_TIMEOUT', 5),
+            },
+        }
+        if env_bool('DB_POOL'):
+            # Вбудований пул Django (psycopg 3 з psycopg[pool]); несумісний з CONN_MAX_AGE.
+            # Решта OPTIONS (connect_timeout) передається з'єднанням пулу
+            database['CONN_MAX_AGE'] = 0
+            database['OPTIONS']['pool'] = {
+                'min_size': env_int('DB_POOL_MIN_SIZE', 2),
+                'max_size': env_int('DB_POOL_MAX_SIZE', 10),
+                'timeout': env_int('DB_POOL_TIMEOUT', 10),
+            }
+        return database
+
+    DATABASES = {
+        'default': postgres_database('DB_'),
+    }
+
+    # Репліка для читання адмінки та звітів (маршрутизація — DjangoFSM.db_routers)
+    if os.getenv('DB_REPLICA_HOST'):
+        DATABASES['replica'] = postgres_database('DB_REPLICA_')
+        DATABASES['replica']['TEST'] = {'MIRROR': 'default'}
+else:
+    DATABASES = {
+        'default': {
+            'ENGINE': 'django.db.backends.sqlite3',
+            'NAME': os.getenv('DB_NAME', BASE_DIR / 'db.sqlite3'),
+            'OPTIONS': {
+                # WAL дозволяє читати паралельно із записом; IMMEDIATE прибирає
+                # помилки "database is locked" при оновленні блокування в транзакції
+                'transaction_mode': 'IMMEDIATE',
+                'timeout': env_int('DB_TIMEOUT', 20),
+                'init_command': (
+                    'PRAGMA journal_mode=WAL;'
+                    'PRAGMA synchronous=NORMAL;'
+                    'PRAGMA temp_store=MEMORY;'
+                    'PRAGMA mmap_size=134217728;'
+                    'PRAGMA cache_size=-20000;'
+                    'PRAGMA busy_timeout=5000;'
+                ),
+            },
+        }
     }
+
+DATABASE_ROUTERS = ['DjangoFSM.db_routers.ReplicaRouter']
+
+# Шаблони URL, безпечні (GET/HEAD) запити до яких читаються з репліки, якщо вона
+# налаштована: лише списки адмінки (серед них і звіти reporting), без форм редагування та входу
+DB_REPLICA_READ_URLS = (r'^/admin/\w+/\w+/$',)
+# Скільки секунд після запису читати з default (репліка може відставати)
+DB_REPLICA_PIN_SECONDS = env_int('DB_REPLICA_PIN_SECONDS', 10)
+
+
+# Cache
+# https://docs.djangoproject.com/en/5.2/topics/cache/
+# Локальна пам'ять процесу за замовчуванням; спільний Redis — якщо задано REDIS_URL
+
+if os.getenv('REDIS_URL'):
+    CACHES = {
+        'default': {
+            'BACKEND': 'django.core.cache.backends.redis.RedisCache',
+            'LOCATION': os.getenv('REDIS_URL'),
+            'KEY_PREFIX': 'djangofsm',
+        }
+    }
+else:
+    CACHES = {
+        'default': {
+            'BACKEND': 'django.core.cache.backends.locmem.LocMemCache',
+            'LOCATION': 'djangofsm',
+            'OPTIONS': {'MAX_ENTRIES': env_int('CACHE_MAX_ENTRIES', 20000)},
+        }
+    }
+
+# Час життя записів кешу каталогу (інвалідація — через версії, див. DjangoFSM.cache)
+CATALOG_CACHE_TIMEOUT = env_int('CATALOG_CACHE_TIMEOUT', 60 * 60)
+
+
+# Sessions
+# https://docs.djangoproject.com/en/5.2/topics/http/sessions/
+# SESSION_BACKEND: cached_db (читання з кешу, запис і в БД), db, cache або
+# signed_cookies (дані в підписаній cookie, без сховища — для API-клієнтів).
+# cached_db безпечний лише зі спільним кешем (Redis): з локальним кешем процесу
+# вихід з системи в одному процесі не був би видний іншим, тому тоді — db
+
+SESSION_ENGINES = {
+    name: f'django.contrib.sessions.backends.{name}'
+    for name in ('cached_db', 'db', 'cache', 'signed_cookies')
 }
+SESSION_ENGINE = SESSION_ENGINES[os.getenv('SESSION_BACKEND', 'cached_db' if os.getenv('REDIS_URL') else 'db')]
+SESSION_COOKIE_AGE = env_int('SESSION_COOKIE_AGE', 60 * 60 * 24 * 14)
+# Ковзний строк дії без запису на кожен запит (users.sessions.SessionRefreshMiddleware)
+SESSION_SAVE_EVERY_REQUEST = False
+SESSION_REFRESH_INTERVAL = env_int('SESSION_REFRESH_INTERVAL', 300)
+# last_login пишеться не частіше ніж раз на стільки секунд
+LAST_LOGIN_UPDATE_INTERVAL = env_int('LAST_LOGIN_UPDATE_INTERVAL', 60 * 60)
+
+
+# Authentication
+# Користувач разом з роллю та профілями читається з кешу (users.backends).
+# З локальним кешем процесу зміни користувача інші процеси побачать із затримкою
+# до USER_CACHE_TIMEOUT, тому без Redis час життя коротший
+
+AUTHENTICATION_BACKENDS = ['users.backends.CachedModelBackend']
+USER_CACHE_TIMEOUT = env_int('USER_CACHE_TIMEOUT', 300 if os.getenv('REDIS_URL') else 30)
 
 
 # Password validation
@@ -120,6 +272,89 @@ USE_TZ = True
 
 STATIC_URL = 'static/'
 
+# Media files
+# Фото та інші завантаження зберігаються за хешем вмісту (mediafiles.storage):
+# однаковий файл — один раз, URL незмінні й кешуються назавжди.
+# MEDIA_BACKEND: filesystem (MEDIA_ROOT) або s3 (S3 / MinIO, потрібен django-storages[s3])
+MEDIA_URL = os.getenv('MEDIA_URL', '/media/')
+MEDIA_ROOT = os.getenv('MEDIA_ROOT') or BASE_DIR / 'media'
+MEDIA_BACKEND = os.getenv('MEDIA_BACKEND', 'filesystem')
+
+MEDIA_STORAGES = {
+    'filesystem': {
+        'BACKEND': 'mediafiles.storage.ContentAddressedFileSystemStorage',
+    },
+    's3': {
+        'BACKEND': 'mediafiles.s3.ContentAddressedS3Storage',
+        'OPTIONS': {
+            'bucket_name': os.getenv('AWS_STORAGE_BUCKET_NAME'),
+            # Для MinIO / іншого S3-сумісного сервера, напр. http://localhost:9000
+            'endpoint_url': os.getenv('AWS_S3_ENDPOINT_URL') or None,
+            'region_name': os.getenv('AWS_S3_REGION_NAME') or None,
+            'custom_domain': os.getenv('AWS_S3_CUSTOM_DOMAIN') or None,
+            # Незмінні імена дозволяють віддавати публічні URL без підпису (CDN кешує їх)
+            'querystring_auth': env_bool('AWS_QUERYSTRING_AUTH', False),
+        },
+    },
+}
+
+STORAGES = {
+    'default': MEDIA_STORAGES[MEDIA_BACKEND],
+    'staticfiles': {
+        'BACKEND': 'django.contrib.staticfiles.storage.StaticFilesStorage',
+    },
+    # Файли експорту замовлень (client_orders.export): не публікуються, віддаються
+    # лише через адмінку. Для кількох серверів — спільний каталог або приватний бакет
+    'exports': {
+        'BACKEND': 'django.core.files.storage.FileSystemStorage',
+        'OPTIONS': {
+            'location': os.getenv('ORDER_EXPORT_ROOT') or BASE_DIR / 'exports',
+        },
+    },
+}
+
+# Завантаження, більші за цей розмір, Django пише порціями у тимчасовий файл
+# (FILE_UPLOAD_TEMP_DIR), а не тримає в пам'яті
+FILE_UPLOAD_MAX_MEMORY_SIZE = env_int('FILE_UPLOAD_MAX_MEMORY_SIZE', 2621440)
+FILE_UPLOAD_TEMP_DIR = os.getenv('FILE_UPLOAD_TEMP_DIR') or None
+
+# Фонова обробка фото каталогу (DjangoFSM.images): thread / sync / off
+IMAGE_PROCESSING = os.getenv('IMAGE_PROCESSING', 'thread')
+IMAGE_WORKERS = env_int('IMAGE_WORKERS', 2)
+IMAGE_THUMBNAIL_SIZE = (320, 320)
+IMAGE_PREVIEW_SIZE = (1024, 1024)
+
+# Профілювання запитів (DjangoFSM.profiling): вимкнене не додає накладних витрат
+PROFILING_ENABLED = env_bool('PROFILING_ENABLED', False)
+PROFILING_SAMPLE_RATE = float(os.getenv('PROFILING_SAMPLE_RATE', '1.0'))
+PROFILING_BUFFER_SIZE = env_int('PROFILING_BUFFER_SIZE', 200)
+PROFILING_SLOW_QUERIES = env_int('PROFILING_SLOW_QUERIES', 5)
+PROFILING_DUPLICATE_THRESHOLD = env_int('PROFILING_DUPLICATE_THRESHOLD', 3)
+
+# Префікс номерів замовлень без дилера / салону (client_orders.numbering)
+ORDER_NUMBER_PREFIX = os.getenv('ORDER_NUMBER_PREFIX', 'ZM')
+
+# Експорт замовлень (client_orders.export): до ORDER_EXPORT_STREAM_LIMIT рядків —
+# потокова відповідь, більше — фонове завдання зі стисненим файлом.
+# ORDER_EXPORT_MODE: thread (пул потоків процесу), sync або off (лише команда
+# process_order_exports, напр. з cron)
+ORDER_EXPORT_STREAM_LIMIT = env_int('ORDER_EXPORT_STREAM_LIMIT', 100000)
+ORDER_EXPORT_MODE = os.getenv('ORDER_EXPORT_MODE', 'thread')
+ORDER_EXPORT_CHUNK_SIZE = env_int('ORDER_EXPORT_CHUNK_SIZE', 2000)
+# Завдання без прогресу довше за стільки секунд вважається завданням померлого
+# воркера і повертається в чергу (process_order_exports)
+ORDER_EXPORT_STALE_AFTER = env_int('ORDER_EXPORT_STALE_AFTER', 900)
+
+# Журнал змін (audit.tracking): AUDIT_MODE — thread (пакетний запис у фоновому
+# потоці після коміту), sync (одразу після коміту) або off.
+# prune_audit видаляє записи, старші за AUDIT_RETENTION_DAYS днів
+AUDIT_MODE = os.getenv('AUDIT_MODE', 'thread')
+AUDIT_BATCH_SIZE = env_int('AUDIT_BATCH_SIZE', 1000)
+AUDIT_RETENTION_DAYS = env_int('AUDIT_RETENTION_DAYS', 730)
+
+# Звіти (reporting.rollups): перекриття позначки часу між запусками, секунди
+REPORTING_WATERMARK_OVERLAP = env_int('REPORTING_WATERMARK_OVERLAP', 300)
+
 # Default primary key field type
 # https://docs.djangoproject.com/en/5.2/ref/settings/#default-auto-field
 
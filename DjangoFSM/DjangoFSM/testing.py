@@ -0,0 +1,51 @@
+"""
+Допоміжні засоби для тестів адмінки: перевірка бюджету SQL-запитів.
+
+Бюджет перевіряється двічі — з кількома рядками і з більшою кількістю рядків.
+Кількість запитів має бути однаковою (немає N+1) і не перевищувати бюджет.
+"""
+from django.contrib.auth import get_user_model
+from django.db import connection
+from django.test.utils import CaptureQueriesContext
+from django.urls import reverse
+
+
+class AdminQueryBudgetMixin:
+    """Міксин для TestCase: логін суперкористувача та перевірка кількості запитів."""
+
+    def setUp(self):
+        super().setUp()
+        self.admin_user = get_user_model().objects.create_superuser(
+            username="budget_admin",
+            email="budget_admin@example.com",
+            password="password",
+            phone_number="+380500000000",
+        )
+        self.client.force_login(self.admin_user)
+
+    def count_queries(self, url):
+        with CaptureQueriesContext(connection) as context:
+            response = self.client.get(url)
+        self.assertEqual(response.status_code, 200, url)
+        return len(context.captured_queries)
+
+    def assertChangelistBudget(self, model, budget, make_rows, small=2, large=20):
+        """
+        Перевіряє, що сторінка списку моделі виконує сталу кількість запитів.
+        make_rows(start, count) має створити count рядків, нумерація з start.
+        """
+        url = reverse(f"admin:{model._meta.app_label}_{model._meta.model_name}_changelist")
+        make_rows(0, small)
+        few = self.count_queries(url)
+        make_rows(small, large - small)
+        many = self.count_queries(url)
+        self.assertEqual(few, many, f"{url}: {few} запитів для {small} рядків, {many} для {large}")
+        self.assertLessEqual(many, budget, f"{url}: бюджет {budget}, виконано {many}")
+
+    def assertChangeViewBudget(self, obj, budget):
+        """Перевіряє, що сторінка редагування об'єкта вкладається в бюджет запитів."""
+        url = reverse(
+            f"admin:{obj._meta.app_label}_{obj._meta.model_name}_change", args=[obj.pk]
+        )
+        queries = self.count_queries(url)
+        self.assertLessEqual(queries, budget, f"{url}: бюджет {budget}, виконано {queries}")
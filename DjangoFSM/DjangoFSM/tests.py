@@ -0,0 +1,213 @@
+import shutil
+import tempfile
+from decimal import Decimal
+from io import BytesIO
+from unittest import mock
+
+from django.contrib.auth import get_user_model
+from django.db import connection
+from django.core.files.uploadedfile import SimpleUploadedFile
+from django.http import HttpResponse
+from django.test import RequestFactory, SimpleTestCase, TestCase, override_settings
+from django.urls import reverse
+
+from client_orders.models import ClientOrder
+from client_orders.tests import make_orders
+from mediafiles.models import MediaBlob
+from products.models import Product, ProductImage
+from products.tests import make_products
+from .db_routers import PIN_COOKIE, ReplicaReadMiddleware, ReplicaRouter, _use_replica
+from .images import _render, process_image
+from .profiling import QueryRecorder, clear_profiles, recent_profiles
+from .search import search
+from .testing import AdminQueryBudgetMixin
+
+
+def jpeg(size=(40, 30), orientation=None):
+    from PIL import Image
+
+    exif = Image.Exif()
+    if orientation is not None:
+        exif[0x0112] = orientation
+    buffer = BytesIO()
+    Image.new("RGB", size, "red").save(buffer, "JPEG", exif=exif)
+    return buffer.getvalue()
+
+
+class ImagePipelineTests(TestCase):
+
+    def setUp(self):
+        self.media_root = tempfile.mkdtemp()
+        self.addCleanup(shutil.rmtree, self.media_root, ignore_errors=True)
+        settings = override_settings(
+            MEDIA_ROOT=self.media_root, IMAGE_PROCESSING="sync", IMAGE_THUMBNAIL_SIZE=(16, 16)
+        )
+        settings.enable()
+        self.addCleanup(settings.disable)
+        self.product = Product.objects.create(
+            name="Диван", code="P1", length=Decimal("200"), width=Decimal("90"),
+            height=Decimal("80"), base_price=Decimal("1000"),
+        )
+
+    def upload(self, content):
+        with self.captureOnCommitCallbacks(execute=True):
+            image = ProductImage.objects.create(
+                product=self.product, image=SimpleUploadedFile("photo.jpg", content)
+            )
+        image.refresh_from_db()
+        return image
+
+    def test_variants_and_dimensions(self):
+        image = self.upload(jpeg())
+        self.assertEqual((image.image_width, image.image_height), (40, 30))
+        self.assertEqual(image.image_size, image.image.size)
+        for field in (image.thumbnail, image.thumbnail_webp, image.preview_webp):
+            self.assertTrue(field.storage.exists(field.name), field.name)
+        self.assertTrue(image.thumbnail.name.endswith(".jpg"))
+        self.assertTrue(image.thumbnail_webp.name.endswith(".webp"))
+        self.assertEqual(max(image.thumbnail.width, image.thumbnail.height), 16)
+        self.assertEqual(image.thumbnail_url, image.thumbnail_webp.url)
+
+    def test_rotated_photo_dimensions(self):
+        # EXIF Orientation 6 — фото зняте з поворотом на 90°
+        image = self.upload(jpeg(orientation=6))
+        self.assertEqual((image.image_width, image.image_height), (30, 40))
+        self.assertEqual((image.preview_webp.width, image.preview_webp.height), (30, 40))
+
+    def test_replaced_image_keeps_current_variants(self):
+        image = self.upload(jpeg())
+        original = image.image.name
+        variants = [image.thumbnail.name, image.thumbnail_webp.name, image.preview_webp.name]
+
+        def replace_during_processing(*args):
+            ProductImage.objects.filter(pk=image.pk).update(image="product_images/other.jpg")
+            return _render(*args)
+
+        with mock.patch("DjangoFSM.images._render", side_effect=replace_during_processing), \
+                self.captureOnCommitCallbacks(execute=True):
+            # Інший розмір — інший вміст варіантів, ніж у вже збережених
+            with override_settings(IMAGE_THUMBNAIL_SIZE=(8, 8)):
+                self.assertFalse(process_image("products.ProductImage", image.pk))
+
+        image.refresh_from_db()
+        self.assertEqual(image.image.name, "product_images/other.jpg")
+        self.assertEqual([image.thumbnail.name, image.thumbnail_webp.name, image.preview_webp.name], variants)
+        for name in variants:
+            self.assertTrue(image.thumbnail.storage.exists(name), name)
+        # Щойно записані варіанти звільнено, посилання на поточні не зняті
+        blobs = dict(MediaBlob.objects.values_list("pk", "refcount"))
+        self.assertEqual(blobs, {name: 1 for name in [original, *variants]})
+
+
+class IndexedSearchTests(TestCase):
+
+    def setUp(self):
+        make_orders(0, 3)
+        for number in ("A-2026-0001", "A-2026-0002", "B-2025-0001"):
+            ClientOrder.objects.create(order_number=number)
+
+    def numbers(self, term):
+        return sorted(search(ClientOrder.objects.all(), term).values_list("order_number", flat=True))
+
+    def test_order_number_prefix(self):
+        self.assertEqual(self.numbers("A-2026"), ["A-2026-0001", "A-2026-0002"])
+        self.assertEqual(self.numbers("a-2026-0002"), ["A-2026-0002"])
+        # Слова через AND
+        self.assertEqual(self.numbers("A-2026 0001"), ["A-2026-0001"])
+
+    def test_related_client_fields(self):
+        self.assertEqual(self.numbers("client1"), ["N-1"])
+        self.assertEqual(self.numbers("client2@example"), ["N-2"])
+
+    def test_index_follows_updates_and_deletes(self):
+        ClientOrder.objects.filter(order_number="B-2025-0001").update(order_number="C-2027-0001")
+        self.assertEqual(self.numbers("B-2025"), [])
+        self.assertEqual(self.numbers("C-2027"), ["C-2027-0001"])
+
+        ClientOrder.objects.filter(order_number="C-2027-0001").delete()
+        self.assertEqual(self.numbers("C-2027"), [])
+        get_user_model().objects.filter(username="client1").update(username="renamed1")
+        self.assertEqual(self.numbers("renamed"), ["N-1"])
+
+    def test_short_terms_use_icontains(self):
+        # Фрагмент з середини номера, коротший за триграму
+        self.assertEqual(self.numbers("25"), ["B-2025-0001"])
+        self.assertEqual(self.numbers("n-"), ["N-0", "N-1", "N-2"])
+
+    def test_admin_changelist(self):
+        admin_user = get_user_model().objects.create_superuser(
+            username="admin", email="admin@example.com", password="password", phone_number="+380500000001"
+        )
+        self.client.force_login(admin_user)
+        response = self.client.get(reverse("admin:client_orders_clientorder_changelist"), {"q": "A-2026"})
+        self.assertEqual(
+            sorted(order.order_number for order in response.context["cl"].result_list),
+            ["A-2026-0001", "A-2026-0002"],
+        )
+
+
+@override_settings(PROFILING_ENABLED=True)
+class ProfilingMiddlewareTests(AdminQueryBudgetMixin, TestCase):
+
+    def setUp(self):
+        super().setUp()
+        clear_profiles()
+
+    def test_request_is_measured(self):
+        make_products(0, 3)
+        response = self.client.get(reverse("admin:products_product_changelist"))
+        self.assertIn("db;dur=", response.headers["Server-Timing"])
+        profile = recent_profiles()[0]
+        self.assertEqual(profile["view"], "admin:products_product_changelist")
+        self.assertGreater(profile["queries"], 0)
+        self.assertContains(self.client.get(reverse("profiling")), "/admin/products/product/")
+
+    def test_duplicate_queries_are_detected(self):
+        products = make_products(0, 3)
+        recorder = QueryRecorder()
+        with connection.execute_wrapper(recorder):
+            for product in products:
+                Product.objects.get(pk=product.pk)
+        (sql, count), = recorder.duplicates(threshold=3)
+        self.assertEqual(count, 3)
+        self.assertEqual(len(recorder.slowest_queries()), 3)
+
+    @override_settings(PROFILING_ENABLED=False)
+    def test_disabled(self):
+        response = self.client.get(reverse("admin:products_product_changelist"))
+        self.assertNotIn("Server-Timing", response.headers)
+        self.assertEqual(recent_profiles(), [])
+
+
+@mock.patch("DjangoFSM.db_routers.replica_configured", return_value=True)
+class ReplicaReadMiddlewareTests(SimpleTestCase):
+
+    def setUp(self):
+        self.factory = RequestFactory()
+        self.middleware = ReplicaReadMiddleware(
+            lambda request: HttpResponse("replica" if _use_replica.get() else "default")
+        )
+
+    def read_from(self, request):
+        return self.middleware(request).content.decode()
+
+    def test_only_changelists_use_replica(self, configured):
+        self.assertEqual(self.read_from(self.factory.get("/admin/products/product/")), "replica")
+        self.assertEqual(self.read_from(self.factory.get("/admin/reporting/dailyorderrollup/")), "replica")
+        self.assertEqual(self.read_from(self.factory.get("/admin/products/product/1/change/")), "default")
+        self.assertEqual(self.read_from(self.factory.get("/admin/login/")), "default")
+
+    def test_write_pins_reads_to_primary(self, configured):
+        response = self.middleware(self.factory.post("/admin/products/product/1/change/"))
+        self.assertEqual(response.cookies[PIN_COOKIE]["max-age"], 10)
+        request = self.factory.get("/admin/products/product/")
+        request.COOKIES[PIN_COOKIE] = "1"
+        self.assertEqual(self.read_from(request), "default")
+
+    def test_sessions_are_read_from_primary(self, configured):
+        from django.contrib.sessions.models import Session
+
+        with mock.patch("DjangoFSM.db_routers._use_replica") as use_replica:
+            use_replica.get.return_value = True
+            self.assertIsNone(ReplicaRouter().db_for_read(Session))
+            self.assertEqual(ReplicaRouter().db_for_read(Product), "replica")
@@ -14,9 +14,23 @@ Including another URLconf
     1. Import the include() function: from django.urls import include, path
     2. Add a URL to urlpatterns:  path('blog/', include('blog.urls'))
 """
+from django.conf import settings
 from django.contrib import admin
-from django.urls import path
+from django.urls import include, path, re_path
+
+from DjangoFSM.profiling import profiles_view
+from mediafiles.views import serve as serve_media
 
 urlpatterns = [
+    path('admin/profiling/', profiles_view, name='profiling'),
     path('admin/', admin.site.urls),
+    path('api/products/', include('products.urls')),
+    path('api/fabrics/', include('fabric.urls')),
+    path('api/orders/', include('client_orders.urls')),
 ]
+
+if settings.DEBUG and settings.MEDIA_BACKEND == 'filesystem' and settings.MEDIA_URL.startswith('/'):
+    # У продакшні медіафайли віддає nginx або CDN
+    urlpatterns += [
+        re_path(r'^%s(?P<path>.*)$' % settings.MEDIA_URL.lstrip('/'), serve_media, name='media'),
+    ]
@@ -0,0 +1,72 @@
+from django.contrib import admin
+from django.core.paginator import Paginator
+from django.db import connections
+from django.utils.functional import cached_property
+
+from users.permissions import RolePermissionAdminMixin
+from .models import AuditEntry
+from .tracking import tracked_fields
+
+# Register your models here.
+
+
+class TrackedFieldFilter(admin.SimpleListFilter):
+    """Фільтр «модель.поле» з реєстру audit.tracking — без SELECT DISTINCT по журналу."""
+    title = "Поле"
+    parameter_name = "tracked"
+
+    def lookups(self, request, model_admin):
+        return [
+            (f"{label}.{name}", f"{label}.{name}")
+            for label, fields in sorted(tracked_fields().items())
+            for name in fields
+        ]
+
+    def queryset(self, request, queryset):
+        if self.value():
+            label, name = self.value().rsplit(".", 1)
+            return queryset.filter(model=label, field=name)
+        return queryset
+
+
+class EstimatedCountPaginator(Paginator):
+    """На PostgreSQL без фільтрів кількість рядків береться з оцінки pg_class замість COUNT(*)."""
+
+    @cached_property
+    def count(self):
+        queryset = self.object_list
+        connection = connections[queryset.db]
+        if connection.vendor == "postgresql" and not queryset.query.where:
+            with connection.cursor() as cursor:
+                cursor.execute(
+                    "SELECT reltuples::bigint FROM pg_class WHERE oid = %s::regclass",
+                    [queryset.model._meta.db_table],
+                )
+                estimate = cursor.fetchone()[0]
+            # -1 — таблицю ще не аналізували
+            if estimate >= 0:
+                return estimate
+        return super().count
+
+
+@admin.register(AuditEntry)
+class AuditEntryAdmin(RolePermissionAdminMixin, admin.ModelAdmin):
+    """Журнал лише для перегляду; записи додає audit.tracking."""
+    list_display = ("created_at", "model", "object_id", "field", "old_value", "new_value", "user")
+    list_filter = (TrackedFieldFilter, "created_at")
+    # Точний пошук за ID об'єкта — індекс (model, object_id, created_at) разом з фільтром поля
+    search_fields = ("=object_id",)
+    list_select_related = ("user",)
+    # Первинний ключ зростає разом з часом, а BRIN за датою не вміє сортувати
+    ordering = ("-pk",)
+    paginator = EstimatedCountPaginator
+    show_full_result_count = False
+
+    def has_add_permission(self, request, *args):
+        return False
+
+    def has_change_permission(self, request, obj=None):
+        return False
+
+    def has_delete_permission(self, request, obj=None):
+        return False
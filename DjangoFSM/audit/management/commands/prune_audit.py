@@ -0,0 +1,36 @@
+from datetime import timedelta
+
+from django.conf import settings
+from django.core.management.base import BaseCommand
+from django.utils import timezone
+
+from audit.models import AuditEntry
+
+DELETE_BATCH_SIZE = 10000
+
+
+class Command(BaseCommand):
+    help = (
+        "Видаляє з журналу змін записи, старші за AUDIT_RETENTION_DAYS днів, "
+        "пакетами (короткі транзакції замість одного DELETE на мільйони рядків)."
+    )
+
+    def add_arguments(self, parser):
+        parser.add_argument(
+            "--days",
+            type=int,
+            default=settings.AUDIT_RETENTION_DAYS,
+            help="Скільки днів зберігати записи (за замовчуванням AUDIT_RETENTION_DAYS)",
+        )
+        parser.add_argument("--batch-size", type=int, default=DELETE_BATCH_SIZE)
+
+    def handle(self, *args, **options):
+        cutoff = timezone.now() - timedelta(days=options["days"])
+        old = AuditEntry.objects.filter(created_at__lt=cutoff)
+        deleted = 0
+        while True:
+            batch = list(old.values_list("pk", flat=True)[:options["batch_size"]])
+            if not batch:
+                break
+            deleted += AuditEntry.objects.filter(pk__in=batch).delete()[0]
+        self.stdout.write(self.style.SUCCESS(f"Видалено записів: {deleted}"))
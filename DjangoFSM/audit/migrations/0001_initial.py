@@ -0,0 +1,50 @@
+# Generated by Django 5.2.8 on 2026-10-18 11:35
+
+import django.db.models.deletion
+import django.utils.timezone
+from django.conf import settings
+from django.db import migrations, models
+
+DATE_INDEX = "audit_created_at_idx"
+
+
+def create_date_index(apps, schema_editor):
+    # PostgreSQL: BRIN (рядки додаються в порядку часу), в інших БД — B-tree
+    method = "USING brin " if schema_editor.connection.vendor == "postgresql" else ""
+    quote = schema_editor.quote_name
+    schema_editor.execute(f"CREATE INDEX {quote(DATE_INDEX)} ON {quote('audit_auditentry')} {method}({quote('created_at')})")
+
+
+def drop_date_index(apps, schema_editor):
+    schema_editor.execute(f"DROP INDEX IF EXISTS {schema_editor.quote_name(DATE_INDEX)}")
+
+
+class Migration(migrations.Migration):
+
+    initial = True
+
+    dependencies = [
+        migrations.swappable_dependency(settings.AUTH_USER_MODEL),
+    ]
+
+    operations = [
+        migrations.CreateModel(
+            name='AuditEntry',
+            fields=[
+                ('id', models.BigAutoField(auto_created=True, primary_key=True, serialize=False, verbose_name='ID')),
+                ('created_at', models.DateTimeField(default=django.utils.timezone.now, verbose_name='Час')),
+                ('model', models.CharField(max_length=100, verbose_name='Модель')),
+                ('object_id', models.PositiveBigIntegerField(verbose_name="ID об'єкта")),
+                ('field', models.CharField(max_length=100, verbose_name='Поле')),
+                ('old_value', models.TextField(blank=True, null=True, verbose_name='Було')),
+                ('new_value', models.TextField(blank=True, null=True, verbose_name='Стало')),
+                ('user', models.ForeignKey(blank=True, db_constraint=False, db_index=False, null=True, on_delete=django.db.models.deletion.DO_NOTHING, related_name='+', to=settings.AUTH_USER_MODEL, verbose_name='Хто змінив')),
+            ],
+            options={
+                'verbose_name': 'Зміна',
+                'verbose_name_plural': 'Журнал змін',
+                'indexes': [models.Index(fields=['model', 'object_id', '-created_at'], name='audit_object_idx')],
+            },
+        ),
+        migrations.RunPython(create_date_index, drop_date_index),
+    ]
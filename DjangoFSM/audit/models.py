@@ -0,0 +1,46 @@
+from django.conf import settings
+from django.db import models
+from django.utils import timezone
+
+# Create your models here.
+
+
+class AuditEntry(models.Model):
+    """
+    Зміна одного відстежуваного поля (див. audit.tracking). Таблиця лише
+    доповнюється і читається за об'єктом (індекс model, object_id, created_at)
+    або за періодом created_at.
+
+    Індекс за датою створює міграція: на PostgreSQL це BRIN — рядки додаються в
+    порядку часу, тож індекс займає кілобайти навіть на сотнях мільйонів рядків.
+    Секціонування таблиці за місяцями Django не підтримує (первинний ключ мав би
+    містити created_at), тому старі записи видаляє пакетами команда prune_audit.
+    """
+    created_at = models.DateTimeField(default=timezone.now, verbose_name="Час")
+    # label моделі в нижньому регістрі, напр. "fabric.fabric"
+    model = models.CharField(max_length=100, verbose_name="Модель")
+    object_id = models.PositiveBigIntegerField(verbose_name="ID об'єкта")
+    field = models.CharField(max_length=100, verbose_name="Поле")
+    old_value = models.TextField(null=True, blank=True, verbose_name="Було")
+    new_value = models.TextField(null=True, blank=True, verbose_name="Стало")
+    # Без зовнішнього ключа в БД: видалення користувача не оновлює мільйони рядків журналу
+    user = models.ForeignKey(
+        settings.AUTH_USER_MODEL,
+        null=True,
+        blank=True,
+        on_delete=models.DO_NOTHING,
+        db_constraint=False,
+        db_index=False,
+        related_name="+",
+        verbose_name="Хто змінив",
+    )
+
+    def __str__(self):
+        return f"{self.model} #{self.object_id}.{self.field}: {self.old_value} → {self.new_value}"
+
+    class Meta:
+        verbose_name = "Зміна"
+        verbose_name_plural = "Журнал змін"
+        indexes = [
+            models.Index(fields=["model", "object_id", "-created_at"], name="audit_object_idx"),
+        ]
@@ -0,0 +1,162 @@
+from datetime import timedelta
+from decimal import Decimal
+from unittest import mock
+
+from django.contrib.auth import get_user_model
+from django.core.management import call_command
+from django.db import transaction
+from django.http import HttpResponse
+from django.test import RequestFactory, TestCase, override_settings
+from django.utils import timezone
+
+from client_orders.fsm import bulk_transition, transition
+from client_orders.models import ClientOrder, OrderStatus
+from client_orders.tests import make_orders
+from DjangoFSM.testing import AdminQueryBudgetMixin
+from fabric.models import Fabric
+from products.import_export import import_products
+from products.models import Product
+from products.tests import make_products
+from . import tracking
+from .models import AuditEntry
+
+
+def make_entries(start, count):
+    AuditEntry.objects.bulk_create([
+        AuditEntry(model="products.product", object_id=i, field="base_price", old_value="1000", new_value="1100")
+        for i in range(start, start + count)
+    ])
+
+
+class AdminQueryBudgetTests(AdminQueryBudgetMixin, TestCase):
+
+    def test_audit_entry_changelist(self):
+        self.assertChangelistBudget(AuditEntry, 6, make_entries)
+
+
+@override_settings(AUDIT_MODE="sync")
+class AuditTrackingTests(TestCase):
+
+    def setUp(self):
+        self.user = get_user_model().objects.create_user(
+            username="designer", email="designer@example.com", phone_number="+380509990001",
+            role=get_user_model().Role.DESIGNER,
+        )
+
+    def entries(self):
+        return list(AuditEntry.objects.order_by("pk").values_list(
+            "model", "field", "old_value", "new_value", "user_id"
+        ))
+
+    def test_changes_written_after_commit(self):
+        fabric = Fabric.objects.create(name="Велюр", code="F1", color_name="Сірий", color_code="#808080")
+        fabric = Fabric.objects.get(pk=fabric.pk)
+        with self.captureOnCommitCallbacks() as callbacks, tracking.acting_as(self.user):
+            fabric.price_multiplier = Decimal("1.25")
+            fabric.save()
+            self.assertEqual(AuditEntry.objects.count(), 0)
+            # Та сама ціна в іншому записі та зміна невідстежуваного поля записів не додають
+            fabric.price_multiplier = "1.250"
+            fabric.name = "Велюр сірий"
+            fabric.save()
+        for callback in callbacks:
+            callback()
+        self.assertEqual(self.entries(), [("fabric.fabric", "price_multiplier", "1.00", "1.25", self.user.pk)])
+
+    def test_deferred_field_read_from_db(self):
+        product = Product.objects.only("pk").get(pk=make_products(0, 1)[0].pk)
+        with self.captureOnCommitCallbacks(execute=True):
+            product.base_price = Decimal("1200")
+            product.save(update_fields=["base_price"])
+        self.assertEqual(self.entries(), [("products.product", "base_price", "1000.00", "1200.00", None)])
+
+    def test_request_user_recorded(self):
+        product = Product.objects.get(pk=make_products(0, 1)[0].pk)
+
+        def view(request):
+            product.base_price = Decimal("1100")
+            product.save()
+            return HttpResponse()
+
+        request = RequestFactory().post("/")
+        request.user = self.user
+        with self.captureOnCommitCallbacks(execute=True):
+            tracking.AuditUserMiddleware(view)(request)
+        self.assertEqual(AuditEntry.objects.get().user_id, self.user.pk)
+
+    def test_rolled_back_changes_not_logged(self):
+        product = Product.objects.get(pk=make_products(0, 1)[0].pk)
+        with self.captureOnCommitCallbacks(execute=True):
+            with self.assertRaises(RuntimeError), transaction.atomic():
+                product.base_price = Decimal("1200")
+                product.save()
+                raise RuntimeError
+        self.assertEqual(AuditEntry.objects.count(), 0)
+
+    def test_fsm_and_import_logged_in_batches(self):
+        order, *others = make_orders(0, 3)
+        make_products(0, 2)
+        with self.captureOnCommitCallbacks() as callbacks:
+            transition(order, OrderStatus.IN_PROGRESS, user=self.user)
+            bulk_transition(ClientOrder.objects.filter(pk__in=[o.pk for o in others]), OrderStatus.CANCELED)
+            import_products([
+                {"code": code, "name": "Виріб", "length": "200", "width": "90", "height": "80", "base_price": price}
+                for code, price in (("P0", "1000"), ("P1", "1500"))
+            ])
+        # Один INSERT на кожен виклик record(), а не на кожну зміну
+        with self.assertNumQueries(3):
+            for callback in callbacks:
+                callback()
+        self.assertEqual(self.entries(), [
+            ("client_orders.clientorder", "status", "draft", "in_progress", self.user.pk),
+            ("client_orders.clientorder", "status", "draft", "canceled", None),
+            ("client_orders.clientorder", "status", "draft", "canceled", None),
+            ("products.product", "base_price", "1000.00", "1500.00", None),
+        ])
+
+    @override_settings(AUDIT_MODE="thread")
+    def test_thread_mode_buffers_until_flush(self):
+        products = [Product.objects.get(pk=p.pk) for p in make_products(0, 2)]
+        with mock.patch.object(tracking, "_get_executor") as executor:
+            for product in products:
+                with self.captureOnCommitCallbacks(execute=True):
+                    product.base_price = Decimal("900")
+                    product.save()
+            # Поки фоновий запис не виконався, нові записи потрапляють у той самий пакет
+            executor.return_value.submit.assert_called_once_with(tracking._run)
+        self.assertEqual(AuditEntry.objects.count(), 0)
+        with self.assertNumQueries(1):
+            self.assertEqual(tracking.flush(), 2)
+        self.assertEqual(AuditEntry.objects.count(), 2)
+
+    @override_settings(AUDIT_MODE="thread")
+    def test_failed_write_is_requeued(self):
+        self.addCleanup(tracking._buffer.clear)
+        products = [Product.objects.get(pk=p.pk) for p in make_products(0, 2)]
+        with mock.patch.object(tracking, "_get_executor"):
+            for product in products:
+                with self.captureOnCommitCallbacks(execute=True):
+                    product.base_price = Decimal("900")
+                    product.save()
+        with mock.patch.object(tracking, "write", side_effect=RuntimeError), \
+                self.assertLogs("audit.tracking", "ERROR"):
+            tracking._run()
+        self.assertEqual(len(tracking._buffer), 2)
+        self.assertEqual(tracking.flush(), 2)
+        self.assertEqual(AuditEntry.objects.count(), 2)
+
+    @override_settings(AUDIT_BUFFER_LIMIT=1)
+    def test_requeued_buffer_is_capped(self):
+        self.addCleanup(tracking._buffer.clear)
+        tracking._buffer.extend(["old", "new"])
+        with mock.patch.object(tracking, "write", side_effect=RuntimeError), \
+                self.assertLogs("audit.tracking", "ERROR") as logs:
+            tracking._run()
+        self.assertEqual(list(tracking._buffer), ["new"])
+        self.assertIn("відкинуто записів: 1", logs.output[0])
+
+    def test_prune_removes_old_entries(self):
+        make_entries(0, 5)
+        AuditEntry.objects.filter(object_id__lt=3).update(created_at=timezone.now() - timedelta(days=31))
+        call_command("prune_audit", days=30, batch_size=2, stdout=mock.Mock())
+        self.assertEqual(sorted(AuditEntry.objects.values_list("object_id", flat=True)), [3, 4])
@@ -0,0 +1,289 @@
+"""
+Журнал змін відстежуваних полів каталогу та замовлень.
+
+* register(model, fields) — викликається з AppConfig.ready застосунку моделі.
+  При завантаженні об'єкта (post_init) запам'ятовуються значення лише
+  відстежуваних полів, pre_save порівнює їх з тими, що зберігаються. Якщо
+  поле було відкладене (.only() / .defer()), pre_save читає з БД лише його.
+* Шляхи в обхід save() (переходи FSM, bulk_update імпорту) передають зміни
+  напряму в record().
+* record() не пише в БД під час збереження: записи додаються після коміту
+  (transaction.on_commit; при відкаті транзакції вони зникають разом з нею).
+  AUDIT_MODE=thread — у буфер процесу, який фоновий потік вставляє через
+  bulk_create: поки йде один запис, наступні накопичуються в один пакет.
+  Якщо запис не вдався, пакет повертається в буфер (не більше
+  AUDIT_BUFFER_LIMIT записів) і пишеться наступним разом; при завершенні
+  процесу буфер дописується (atexit).
+  sync — bulk_create одразу після коміту, off — журнал вимкнено.
+* Автор зміни — явно переданий user або користувач поточного запиту
+  (AuditUserMiddleware).
+"""
+import atexit
+import logging
+import threading
+from collections import deque
+from concurrent.futures import ThreadPoolExecutor
+from contextlib import contextmanager
+from contextvars import ContextVar
+
+from asgiref.sync import iscoroutinefunction, markcoroutinefunction
+from django.conf import settings
+from django.db import close_old_connections, models, transaction
+from django.db.backends.utils import format_number
+from django.db.models.signals import post_init, post_save, pre_save
+from django.utils import timezone
+
+from .models import AuditEntry
+
+logger = logging.getLogger(__name__)
+
+# Модель -> кортеж відстежуваних полів
+_tracked = {}
+
+_current_user = ContextVar("audit_user", default=None)
+# Запит, а не request.user: asgiref копіює contextvar-и в потоки і перевіряє їх
+# через isinstance, що завантажило б лінивого користувача в кожному запиті
+_current_request = ContextVar("audit_request", default=None)
+
+
+def register(model, fields, snapshot=True):
+    """
+    Відстежує зміни полів fields моделі. snapshot=False — лише реєстрація
+    (для фільтрів адмінки), коли поле змінюється тільки в обхід save().
+    """
+    _tracked[model] = tuple(fields)
+    if snapshot:
+        uid = f"audit_{model._meta.label_lower}"
+        post_init.connect(_remember, sender=model, dispatch_uid=uid)
+        pre_save.connect(_diff, sender=model, dispatch_uid=uid)
+        post_save.connect(_record_saved, sender=model, dispatch_uid=uid)
+
+
+def tracked_fields():
+    """{label моделі: поля} — для фільтрів журналу."""
+    return {model._meta.label_lower: fields for model, fields in _tracked.items()}
+
+
+@contextmanager
+def acting_as(user):
+    """Зміни всередині блоку записуються від імені user."""
+    token = _current_user.set(user)
+    try:
+        yield
+    finally:
+        _current_user.reset(token)
+
+
+class AuditUserMiddleware:
+    """Записує зміни, зроблені під час запиту, від імені request.user."""
+
+    sync_capable = True
+    async_capable = True
+
+    def __init__(self, get_response):
+        self.get_response = get_response
+        self.is_async = iscoroutinefunction(get_response)
+        if self.is_async:
+            markcoroutinefunction(self)
+
+    def __call__(self, request):
+        if self.is_async:
+            return self.__acall__(request)
+        token = _current_request.set(request)
+        try:
+            return self.get_response(request)
+        finally:
+            _current_request.reset(token)
+
+    async def __acall__(self, request):
+        token = _current_request.set(request)
+        try:
+            return await self.get_response(request)
+        finally:
+            _current_request.reset(token)
+
+
+# ==========================================================================
+# Знімки полів
+
+
+def _snapshot(instance, fields):
+    values = instance.__dict__
+    return {name: values[name] for name in fields if name in values}
+
+
+def _normalized(model, name, value):
+    # Decimal("1.10") і "1.1" з форми чи коду — одне й те саме значення
+    return model._meta.get_field(name).to_python(value)
+
+
+def _remember(sender, instance, **kwargs):
+    instance._audit_loaded = _snapshot(instance, _tracked[sender])
+
+
+def _diff(sender, instance, raw=False, update_fields=None, **kwargs):
+    instance._audit_changes = None
+    if raw or instance._state.adding:
+        return
+    fields = _tracked[sender]
+    if update_fields is not None:
+        fields = [name for name in fields if name in update_fields]
+    current = _snapshot(instance, fields)
+    if not current:
+        return
+    loaded = getattr(instance, "_audit_loaded", {})
+    missing = [name for name in current if name not in loaded]
+    if missing:
+        row = sender._base_manager.using(instance._state.db).filter(pk=instance.pk).values(*missing).first()
+        loaded = {**loaded, **(row or {})}
+    changes = []
+    for name, new in current.items():
+        if name not in loaded:
+            continue
+        old = _normalized(sender, name, loaded[name])
+        new = _normalized(sender, name, new)
+        if old != new:
+            changes.append((instance.pk, name, old, new))
+    instance._audit_changes = changes
+
+
+def _record_saved(sender, instance, created, raw=False, update_fields=None, **kwargs):
+    changes = getattr(instance, "_audit_changes", None)
+    if changes:
+        record(sender, changes)
+    instance._audit_changes = None
+    fields = _tracked[sender] if update_fields is None else [n for n in _tracked[sender] if n in update_fields]
+    instance._audit_loaded = {**getattr(instance, "_audit_loaded", {}), **_snapshot(instance, fields)}
+
+
+# ==========================================================================
+# Запис
+
+
+def _text(field, value):
+    if value is None:
+        return None
+    value = field.to_python(value)
+    if isinstance(field, models.DecimalField):
+        # Значення записується з точністю поля: "1000.00", а не "1000" чи "1E+3"
+        return format_number(value, field.max_digits, field.decimal_places)
+    return str(value)
+
+
+def _user_id(user):
+    if user is None:
+        # request.user — лінивий об'єкт: користувач читається, лише якщо щось змінилося
+        user = _current_user.get() or getattr(_current_request.get(), "user", None)
+    if user is None or not user.is_authenticated:
+        return None
+    return user.pk
+
+
+def record(model, changes, user=None):
+    """
+    Додає в журнал зміни [(pk, поле, старе значення, нове значення)] об'єктів
+    model. Записи потрапляють у БД після коміту поточної транзакції.
+    """
+    mode = getattr(settings, "AUDIT_MODE", "thread")
+    if mode == "off" or not changes:
+        return
+    now = timezone.now()
+    opts = model._meta
+    label = opts.label_lower
+    user_id = _user_id(user)
+    entries = [
+        AuditEntry(
+            created_at=now,
+            model=label,
+            object_id=pk,
+            field=name,
+            old_value=_text(opts.get_field(name), old),
+            new_value=_text(opts.get_field(name), new),
+            user_id=user_id,
+        )
+        for pk, name, old, new in changes
+    ]
+    if mode == "sync":
+        transaction.on_commit(lambda: write(entries))
+    else:
+        transaction.on_commit(lambda: _enqueue(entries))
+
+
+def write(entries):
+    AuditEntry.objects.bulk_create(entries, batch_size=getattr(settings, "AUDIT_BATCH_SIZE", 1000))
+
+
+_buffer = deque()
+_lock = threading.Lock()
+_scheduled = False
+_executor = None
+
+
+def _get_executor():
+    global _executor
+    if _executor is None:
+        # Один потік: пакети пишуться по черзі, а поки пишеться один, збирається наступний
+        _executor = ThreadPoolExecutor(max_workers=1, thread_name_prefix="audit")
+        atexit.register(_flush_at_exit)
+    return _executor
+
+
+def _enqueue(entries):
+    global _scheduled
+    with _lock:
+        _buffer.extend(entries)
+        if _scheduled:
+            return
+        _scheduled = True
+    _get_executor().submit(_run)
+
+
+def flush():
+    """
+    Записує все, що накопичилося в буфері процесу. Повертає кількість записів.
+    Якщо запис не вдався, записи повертаються в буфер, а виняток прокидається далі.
+    """
+    global _scheduled
+    with _lock:
+        entries = list(_buffer)
+        _buffer.clear()
+        _scheduled = False
+    if entries:
+        try:
+            write(entries)
+        except Exception:
+            _requeue(entries)
+            raise
+    return len(entries)
+
+
+def _requeue(entries):
+    """Повертає ненаписаний пакет на початок буфера, відкидаючи найстаріші понад ліміт."""
+    limit = getattr(settings, "AUDIT_BUFFER_LIMIT", 100000)
+    with _lock:
+        _buffer.extendleft(reversed(entries))
+        dropped = 0
+        while len(_buffer) > limit:
+            _buffer.popleft()
+            dropped += 1
+    if dropped:
+        logger.error("Буфер журналу змін переповнений, відкинуто записів: %s", dropped)
+
+
+def _run():
+    close_old_connections()
+    try:
+        flush()
+    except Exception:
+        logger.exception("Не вдалося записати пакет журналу змін, його буде повторено")
+    finally:
+        close_old_connections()
+
+
+def _flush_at_exit():
+    """Дочікується фонового запису і дописує залишок буфера перед завершенням процесу."""
+    _executor.shutdown(wait=True)
+    try:
+        flush()
+    except Exception:
+        logger.exception("Не вдалося записати журнал змін при завершенні процесу")
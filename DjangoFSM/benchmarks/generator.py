@@ -0,0 +1,286 @@
+"""
+Генератор синтетичних даних для всієї схеми.
+
+Обсяги задаються кількістю замовлень (--orders); решта сутностей
+масштабується від неї пропорційно. Усе створюється через bulk_create пакетами
+(без save() і сигналів), а значення беруться з random.Random(seed), тож при
+однакових параметрах набір даних однаковий. Згенеровані записи мають префікс
+GEN і видаляються clear_generated().
+"""
+import random
+from dataclasses import dataclass
+from datetime import timedelta
+from decimal import Decimal
+
+from django.contrib.auth import get_user_model
+from django.db import transaction
+from django.utils import timezone
+
+from DjangoFSM.cache import catalog_cache
+from client_orders.management.commands.benchmark_order_indexes import manual_created_at
+from client_orders.models import ClientOrder, OrderLine, OrderStatus
+from fabric.cache import FABRIC_CATEGORIES_VERSION
+from fabric.colors import COLOR_INDEX_VERSION, color_components
+from fabric.models import Fabric, FabricCategory
+from products.cache import CATEGORIES_VERSION, PRODUCTS_VERSION
+from products.models import Category, Product, ProductImage
+from users.models import DealerProfile, SalesManagerProfile
+
+PREFIX = "GEN"
+CITIES = ("Київ", "Львів", "Одеса", "Дніпро", "Харків", "Вінниця", "Полтава", "Запоріжжя")
+FABRIC_TYPES = ("Велюр", "Шеніл", "Мікровелюр", "Рогожка", "Шкіра", "Екошкіра", "Жакард", "Флок")
+COLORS = ("Сірий", "Бежевий", "Графіт", "Смарагд", "Гірчичний", "Теракота", "Молочний", "Синій")
+PRODUCT_TYPES = ("Диван", "Крісло", "Ліжко", "Пуф", "Кушетка", "Банкетка", "Софа", "Тахта")
+# Розподіл статусів: більшість історичних замовлень завершені
+STATUS_WEIGHTS = {
+    OrderStatus.DRAFT: 5,
+    OrderStatus.IN_PROGRESS: 15,
+    OrderStatus.COMPLETED: 70,
+    OrderStatus.CANCELED: 10,
+}
+HISTORY_DAYS = 730
+
+
+@dataclass
+class Scale:
+    """Кількості сутностей для заданої кількості замовлень."""
+    orders: int
+
+    @property
+    def clients(self):
+        return max(20, self.orders // 5)
+
+    @property
+    def dealers(self):
+        return max(5, self.orders // 2_000)
+
+    @property
+    def salons(self):
+        return max(3, self.orders // 5_000)
+
+    @property
+    def fabric_categories(self):
+        return len(FABRIC_TYPES)
+
+    @property
+    def fabrics(self):
+        return max(40, min(5_000, self.orders // 50))
+
+    @property
+    def categories(self):
+        return max(len(PRODUCT_TYPES), min(200, self.orders // 5_000))
+
+    @property
+    def products(self):
+        return max(50, min(200_000, self.orders // 10))
+
+    def as_dict(self):
+        return {
+            name: getattr(self, name)
+            for name in ("orders", "clients", "dealers", "salons", "fabric_categories",
+                         "fabrics", "categories", "products")
+        }
+
+
+def _batches(total, batch_size):
+    for start in range(0, total, batch_size):
+        yield start, min(start + batch_size, total)
+
+
+class DataGenerator:
+
+    def __init__(self, scale, seed=42, batch_size=5_000, stdout=None):
+        self.scale = scale
+        self.rng = random.Random(seed)
+        self.batch_size = batch_size
+        self.stdout = stdout
+        self.now = timezone.now()
+
+    def log(self, message):
+        if self.stdout is not None:
+            self.stdout.write(message)
+
+    def run(self):
+        self.users()
+        self.catalog()
+        self.orders()
+        # bulk_create обходить сигнали — інвалідуємо кеш каталогу вручну
+        catalog_cache.bump(CATEGORIES_VERSION, PRODUCTS_VERSION, FABRIC_CATEGORIES_VERSION, COLOR_INDEX_VERSION)
+
+    # ------------------------------------------------------------------
+    # Користувачі
+
+    def _create_users(self, kind, count, role, phone_prefix):
+        User = get_user_model()
+        for start, stop in _batches(count, self.batch_size):
+            User.objects.bulk_create(
+                [
+                    User(
+                        username=f"{PREFIX.lower()}_{kind}_{i}",
+                        email=f"{PREFIX.lower()}_{kind}_{i}@example.com",
+                        phone_number=f"+380{phone_prefix}{i:07d}",
+                        first_name=self.rng.choice(("Олена", "Андрій", "Ірина", "Максим", "Оксана", "Тарас")),
+                        role=role,
+                    )
+                    for i in range(start, stop)
+                ],
+                batch_size=self.batch_size,
+            )
+        return list(
+            User.objects.filter(username__startswith=f"{PREFIX.lower()}_{kind}_")
+            .order_by("pk").values_list("pk", flat=True)
+        )
+
+    def users(self):
+        Role = get_user_model().Role
+        self.client_ids = self._create_users("client", self.scale.clients, Role.RETAIL_MANAGER, "67")
+
+        dealer_users = self._create_users("dealer", self.scale.dealers, Role.DEALER_MANAGER, "66")
+        DealerProfile.objects.bulk_create([
+            DealerProfile(user_id=pk, company_name=f"{PREFIX} Дилер {i}", city=self.rng.choice(CITIES), country="Україна")
+            for i, pk in enumerate(dealer_users)
+        ])
+        self.dealer_ids = list(DealerProfile.objects.filter(user_id__in=dealer_users).order_by("pk").values_list("pk", flat=True))
+
+        salon_users = self._create_users("salon", self.scale.salons, Role.RETAIL_MANAGER, "63")
+        SalesManagerProfile.objects.bulk_create([
+            SalesManagerProfile(user_id=pk, salon_name=f"{PREFIX} Салон {i}", city=self.rng.choice(CITIES))
+            for i, pk in enumerate(salon_users)
+        ])
+        self.salon_ids = list(SalesManagerProfile.objects.filter(user_id__in=salon_users).order_by("pk").values_list("pk", flat=True))
+        self.log(f"Користувачі: {len(self.client_ids)} клієнтів, {len(self.dealer_ids)} дилерів, "
+                 f"{len(self.salon_ids)} салонів")
+
+    # ------------------------------------------------------------------
+    # Каталог
+
+    def catalog(self):
+        FabricCategory.objects.bulk_create([
+            FabricCategory(name=f"{PREFIX} {name}") for name in FABRIC_TYPES
+        ])
+        fabric_categories = list(FabricCategory.objects.filter(name__startswith=f"{PREFIX} ").order_by("pk").values_list("pk", flat=True))
+
+        for start, stop in _batches(self.scale.fabrics, self.batch_size):
+            fabrics = []
+            for i in range(start, stop):
+                fabric = Fabric(
+                    name=f"{self.rng.choice(FABRIC_TYPES)} {i}",
+                    code=f"{PREFIX}-F{i:06d}",
+                    category_id=self.rng.choice(fabric_categories),
+                    color_name=self.rng.choice(COLORS),
+                    color_code="#%06x" % self.rng.randrange(0x1000000),
+                    price_multiplier=Decimal(self.rng.randrange(90, 181)) / 100,
+                    is_active=self.rng.random() < 0.9,
+                )
+                # bulk_create не викликає save() — компоненти кольору рахуємо тут
+                for name, value in color_components(fabric.color_code).items():
+                    setattr(fabric, name, value)
+                fabrics.append(fabric)
+            Fabric.objects.bulk_create(fabrics, batch_size=self.batch_size)
+        self.fabrics = dict(
+            Fabric.objects.filter(code__startswith=f"{PREFIX}-F").order_by("pk").values_list("pk", "price_multiplier")
+        )
+
+        Category.objects.bulk_create([
+            Category(name=f"{PREFIX} {PRODUCT_TYPES[i % len(PRODUCT_TYPES)]} {i}")
+            for i in range(self.scale.categories)
+        ])
+        categories = list(Category.objects.filter(name__startswith=f"{PREFIX} ").order_by("pk").values_list("pk", flat=True))
+
+        fabric_ids = list(self.fabrics)
+        for start, stop in _batches(self.scale.products, self.batch_size):
+            products = []
+            for i in range(start, stop):
+                fabric_id = self.rng.choice(fabric_ids)
+                base_price = Decimal(self.rng.randrange(3_000, 60_000))
+                products.append(Product(
+                    name=f"{self.rng.choice(PRODUCT_TYPES)} {self.rng.choice(COLORS).lower()} {i}",
+                    code=f"{PREFIX}-P{i:07d}",
+                    category_id=self.rng.choice(categories),
+                    fabric_id=fabric_id,
+                    length=Decimal(self.rng.randrange(60, 320)),
+                    width=Decimal(self.rng.randrange(50, 200)),
+                    height=Decimal(self.rng.randrange(35, 120)),
+                    base_price=base_price,
+                    final_price=base_price * self.fabrics[fabric_id],
+                    is_active=self.rng.random() < 0.95,
+                ))
+            created = Product.objects.bulk_create(products, batch_size=self.batch_size)
+            ProductImage.objects.bulk_create(
+                [
+                    ProductImage(product_id=product.pk, image=f"product_images/{product.code}_{n}.jpg", is_main=n == 0)
+                    for product in created
+                    for n in range(self.rng.randint(1, 3))
+                ],
+                batch_size=self.batch_size,
+            )
+        self.products = dict(
+            Product.objects.filter(code__startswith=f"{PREFIX}-P").order_by("pk").values_list("pk", "base_price")
+        )
+        self.log(f"Каталог: {len(self.fabrics)} тканин, {len(categories)} категорій, {len(self.products)} виробів")
+
+    # ------------------------------------------------------------------
+    # Замовлення
+
+    def orders(self):
+        statuses, weights = zip(*STATUS_WEIGHTS.items())
+        product_ids = list(self.products)
+        fabric_ids = list(self.fabrics)
+
+        with manual_created_at(ClientOrder):
+            for start, stop in _batches(self.scale.orders, self.batch_size):
+                orders, lines = [], []
+                for i in range(start, stop):
+                    owner = self.rng.random()
+                    order_lines = []
+                    for _ in range(self.rng.randint(1, 3)):
+                        product_id = self.rng.choice(product_ids)
+                        fabric_id = self.rng.choice(fabric_ids)
+                        order_lines.append(OrderLine(
+                            product_id=product_id,
+                            fabric_id=fabric_id,
+                            quantity=self.rng.randint(1, 4),
+                            unit_price=self.products[product_id] * self.fabrics[fabric_id],
+                        ))
+                    subtotal = sum((line.amount for line in order_lines), Decimal("0"))
+                    discount = Decimal(self.rng.choice((0, 0, 0, 5, 10, 15)))
+                    created_at = self.now - timedelta(minutes=self.rng.randrange(HISTORY_DAYS * 24 * 60))
+                    orders.append(ClientOrder(
+                        order_number=f"{PREFIX}-{i:09d}",
+                        client_id=self.rng.choice(self.client_ids),
+                        dealer_id=self.rng.choice(self.dealer_ids) if owner < 0.4 else None,
+                        salon_id=self.rng.choice(self.salon_ids) if 0.4 <= owner < 0.8 else None,
+                        status=self.rng.choices(statuses, weights)[0],
+                        subtotal=subtotal,
+                        discount=discount,
+                        total_price=(subtotal * (100 - discount) / 100).quantize(Decimal("0.01")),
+                        created_at=created_at,
+                    ))
+                    lines.append(order_lines)
+
+                with transaction.atomic():
+                    created = ClientOrder.objects.bulk_create(orders, batch_size=self.batch_size)
+                    for order, order_lines in zip(created, lines):
+                        for line in order_lines:
+                            line.order_id = order.pk
+                    OrderLine.objects.bulk_create(
+                        [line for order_lines in lines for line in order_lines], batch_size=self.batch_size
+                    )
+                self.log(f"  замовлень: {stop} / {self.scale.orders}")
+
+
+def generate(orders, seed=42, batch_size=5_000, stdout=None):
+    scale = Scale(orders)
+    DataGenerator(scale, seed=seed, batch_size=batch_size, stdout=stdout).run()
+    return scale
+
+
+def clear_generated():
+    """Видаляє всі згенеровані записи (за префіксом GEN)."""
+    ClientOrder.objects.filter(order_number__startswith=f"{PREFIX}-").delete()
+    Product.objects.filter(code__startswith=f"{PREFIX}-P").delete()
+    Category.objects.filter(name__startswith=f"{PREFIX} ").delete()
+    Fabric.objects.filter(code__startswith=f"{PREFIX}-F").delete()
+    FabricCategory.objects.filter(name__startswith=f"{PREFIX} ").delete()
+    get_user_model().objects.filter(username__startswith=f"{PREFIX.lower()}_").delete()
+    catalog_cache.bump(CATEGORIES_VERSION, PRODUCTS_VERSION, FABRIC_CATEGORIES_VERSION, COLOR_INDEX_VERSION)
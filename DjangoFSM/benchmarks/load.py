@@ -0,0 +1,135 @@
+"""
+Навантажувальний тест HTTP-сервера з повільними клієнтами.
+
+Клієнт написаний на asyncio-сокетах (без сторонніх бібліотек), щоб однаково
+навантажувати будь-який сервер: WSGI (gunicorn gthread) чи ASGI (uvicorn).
+«Швидкі» клієнти виконують задану кількість запитів — за ними рахуються RPS
+та затримки. «Повільні» клієнти паралельно надсилають заголовки по кілька
+байтів і читають відповідь малими порціями з паузами: вони імітують мобільні
+мережі й тримають з'єднання відкритими, поки триває вимір.
+"""
+import asyncio
+import statistics
+import time
+from urllib.parse import urlsplit
+
+# Розмір порцій, якими повільний клієнт надсилає запит і читає відповідь
+SLOW_CHUNK = 16
+
+
+def percentile(values, p):
+    """p-й перцентиль (1..99) у мілісекундах; None для порожнього набору."""
+    if not values:
+        return None
+    if len(values) == 1:
+        return round(values[0], 2)
+    return round(statistics.quantiles(values, n=100, method="inclusive")[p - 1], 2)
+
+
+def _request_bytes(host, path):
+    return (
+        f"GET {path} HTTP/1.1\r\n"
+        f"Host: {host}\r\n"
+        "User-Agent: djangofsm-load-test\r\n"
+        "Accept: application/json\r\n"
+        "Connection: close\r\n\r\n"
+    ).encode()
+
+
+async def fetch(host, port, path, slow_delay=0.0):
+    """Один запит на новому з'єднанні: (HTTP-статус, мс до кінця відповіді)."""
+    started = time.perf_counter()
+    reader, writer = await asyncio.open_connection(host, port)
+    try:
+        request = _request_bytes(host, path)
+        if slow_delay:
+            for start in range(0, len(request), SLOW_CHUNK):
+                writer.write(request[start:start + SLOW_CHUNK])
+                await writer.drain()
+                await asyncio.sleep(slow_delay)
+        else:
+            writer.write(request)
+            await writer.drain()
+
+        status_line = await reader.readline()
+        while await reader.read(SLOW_CHUNK if slow_delay else 65536):
+            if slow_delay:
+                await asyncio.sleep(slow_delay)
+    finally:
+        writer.close()
+        try:
+            await writer.wait_closed()
+        except OSError:
+            pass
+    parts = status_line.split()
+    status = int(parts[1]) if len(parts) > 1 and parts[1].isdigit() else 0
+    return status, (time.perf_counter() - started) * 1000
+
+
+async def run_load(url, requests=1000, concurrency=50, slow_clients=0, slow_delay=0.05, timeout=30.0):
+    """Вимірює один URL; повертає словник з RPS, p50 / p99 та помилками."""
+    parts = urlsplit(url)
+    host, port = parts.hostname, parts.port or 80
+    path = parts.path or "/"
+    if parts.query:
+        path = f"{path}?{parts.query}"
+
+    latencies, errors = [], {}
+    remaining = requests
+    stop = asyncio.Event()
+    slow_completed = 0
+
+    def error(kind):
+        errors[kind] = errors.get(kind, 0) + 1
+
+    async def fast_worker():
+        nonlocal remaining
+        while remaining > 0:
+            remaining -= 1
+            try:
+                status, elapsed = await asyncio.wait_for(fetch(host, port, path), timeout)
+            except asyncio.TimeoutError:
+                error("timeout")
+                continue
+            except OSError as exc:
+                error(type(exc).__name__)
+                continue
+            if status == 200:
+                latencies.append(elapsed)
+            else:
+                error(f"HTTP {status}")
+
+    async def slow_worker():
+        nonlocal slow_completed
+        while not stop.is_set():
+            try:
+                await fetch(host, port, path, slow_delay=slow_delay)
+                slow_completed += 1
+            except OSError:
+                await asyncio.sleep(slow_delay)
+
+    slow_tasks = [asyncio.create_task(slow_worker()) for _ in range(slow_clients)]
+    started = time.perf_counter()
+    try:
+        await asyncio.gather(*(fast_worker() for _ in range(max(1, concurrency))))
+    finally:
+        duration = time.perf_counter() - started
+        stop.set()
+        for task in slow_tasks:
+            task.cancel()
+        await asyncio.gather(*slow_tasks, return_exceptions=True)
+
+    return {
+        "url": url,
+        "requests": requests,
+        "completed": len(latencies),
+        "errors": errors,
+        "concurrency": concurrency,
+        "slow_clients": slow_clients,
+        "slow_completed": slow_completed,
+        "duration_s": round(duration, 3),
+        "rps": round(len(latencies) / duration, 1) if duration else 0,
+        "p50_ms": percentile(latencies, 50),
+        "p99_ms": percentile(latencies, 99),
+        "max_ms": round(max(latencies), 2) if latencies else None,
+    }
@@ -0,0 +1,32 @@
+import time
+
+from django.core.management.base import BaseCommand
+
+from benchmarks.generator import Scale, clear_generated, generate
+
+
+class Command(BaseCommand):
+    help = (
+        "Генерує синтетичні дані для всієї схеми (користувачі з профілями, тканини, вироби з фото, "
+        "замовлення з позиціями) через bulk_create з фіксованим seed. Обсяг задається кількістю "
+        "замовлень, решта масштабується пропорційно."
+    )
+
+    def add_arguments(self, parser):
+        parser.add_argument("--orders", type=int, default=10_000, help="Кількість замовлень (10k - 10M)")
+        parser.add_argument("--seed", type=int, default=42)
+        parser.add_argument("--batch-size", type=int, default=5_000)
+        parser.add_argument("--clear", action="store_true", help="Спершу видалити раніше згенеровані дані")
+        parser.add_argument("--dry-run", action="store_true", help="Лише показати кількості")
+
+    def handle(self, *args, **options):
+        scale = Scale(options["orders"])
+        for name, count in scale.as_dict().items():
+            self.stdout.write(f"{name}: {count}")
+        if options["dry_run"]:
+            return
+        if options["clear"]:
+            clear_generated()
+        started = time.perf_counter()
+        generate(options["orders"], seed=options["seed"], batch_size=options["batch_size"], stdout=self.stdout)
+        self.stdout.write(self.style.SUCCESS(f"Готово за {time.perf_counter() - started:.1f} с"))
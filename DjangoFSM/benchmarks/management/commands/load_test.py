@@ -0,0 +1,68 @@
+import asyncio
+import json
+from pathlib import Path
+
+from django.conf import settings
+from django.core.management.base import BaseCommand, CommandError
+from django.utils import timezone
+
+from benchmarks.load import run_load
+
+
+class Command(BaseCommand):
+    help = (
+        "Навантажувальний тест запущених серверів з повільними клієнтами: RPS, p50 / p99 "
+        "та помилки для кожної цілі. Напр. --target wsgi=http://127.0.0.1:8001/api/products/ "
+        "--target asgi=http://127.0.0.1:8002/api/products/ --slow-clients 200."
+    )
+
+    def add_arguments(self, parser):
+        parser.add_argument(
+            "--target", action="append", required=True, metavar="NAME=URL",
+            help="Ціль вимірювання (можна кілька)",
+        )
+        parser.add_argument("--requests", type=int, default=1000, help="Запитів швидких клієнтів на ціль")
+        parser.add_argument("--concurrency", type=int, default=50, help="Одночасних швидких клієнтів")
+        parser.add_argument("--slow-clients", type=int, default=0, help="Одночасних повільних клієнтів")
+        parser.add_argument(
+            "--slow-delay", type=float, default=0.05,
+            help="Пауза повільного клієнта між порціями запиту / відповіді (с)",
+        )
+        parser.add_argument("--timeout", type=float, default=30.0, help="Тайм-аут одного запиту (с)")
+        parser.add_argument(
+            "--output",
+            default=str(Path(settings.BASE_DIR) / "benchmark_results"),
+            help="Каталог для JSON з результатами",
+        )
+
+    def handle(self, *args, **options):
+        targets = []
+        for value in options["target"]:
+            name, sep, url = value.partition("=")
+            if not sep or not url.startswith("http://"):
+                raise CommandError(f"Очікується NAME=http://host:port/path, отримано {value!r}")
+            targets.append((name, url))
+
+        report = {"started_at": timezone.now().isoformat(), "results": {}}
+        for name, url in targets:
+            self.stdout.write(f"{name}: {url}")
+            result = asyncio.run(run_load(
+                url,
+                requests=options["requests"],
+                concurrency=options["concurrency"],
+                slow_clients=options["slow_clients"],
+                slow_delay=options["slow_delay"],
+                timeout=options["timeout"],
+            ))
+            report["results"][name] = result
+            style = self.style.ERROR if result["errors"] else self.style.SUCCESS
+            self.stdout.write(style(
+                f"  {result['rps']:8.1f} RPS  p50 {result['p50_ms']} мс  p99 {result['p99_ms']} мс  "
+                f"помилок: {sum(result['errors'].values())} {result['errors'] or ''}"
+            ))
+
+        output = Path(options["output"])
+        output.mkdir(parents=True, exist_ok=True)
+        path = output / f"{timezone.now():%Y%m%d-%H%M%S}-load.json"
+        path.write_text(json.dumps(report, ensure_ascii=False, indent=2), encoding="utf-8")
+        self.stdout.write(self.style.SUCCESS(f"Результати: {path}"))
@@ -0,0 +1,59 @@
+import json
+from pathlib import Path
+
+from django.conf import settings
+from django.core.management.base import BaseCommand, CommandError
+from django.utils import timezone
+
+from benchmarks.suite import BENCHMARKS, compare, run_suite
+
+
+class Command(BaseCommand):
+    help = (
+        "Запускає набір бенчмарків (адмінка, пошук, API, ціни, замовлення) на поточних даних "
+        "і зберігає кількість запитів та час у JSON. --compare порівнює з попереднім запуском."
+    )
+
+    def add_arguments(self, parser):
+        parser.add_argument("--repeat", type=int, default=10, help="Повторів кожного бенчмарку")
+        parser.add_argument("--warmup", type=int, default=1, help="Повторів для прогріву (не враховуються)")
+        parser.add_argument("--only", action="append", choices=sorted(BENCHMARKS), help="Лише вказані бенчмарки")
+        parser.add_argument(
+            "--output",
+            default=str(Path(settings.BASE_DIR) / "benchmark_results"),
+            help="Каталог для JSON з результатами",
+        )
+        parser.add_argument("--compare", help="JSON попереднього запуску для порівняння")
+
+    def handle(self, *args, **options):
+        previous = None
+        if options["compare"]:
+            try:
+                previous = json.loads(Path(options["compare"]).read_text(encoding="utf-8"))
+            except (OSError, ValueError) as exc:
+                raise CommandError(f"Не вдалося прочитати {options['compare']}: {exc}")
+
+        def on_result(name, result):
+            self.stdout.write(
+                f"{name:30} {result['queries']:4d} SQL  "
+                f"мін {result['min_ms']:9.2f}  медіана {result['median_ms']:9.2f}  p95 {result['p95_ms']:9.2f} мс"
+            )
+
+        try:
+            report = run_suite(options["only"], options["repeat"], options["warmup"], on_result=on_result)
+        except ValueError as exc:
+            raise CommandError(str(exc))
+
+        output = Path(options["output"])
+        output.mkdir(parents=True, exist_ok=True)
+        path = output / f"{timezone.now():%Y%m%d-%H%M%S}-{report['vendor']}.json"
+        path.write_text(json.dumps(report, ensure_ascii=False, indent=2), encoding="utf-8")
+        self.stdout.write(self.style.SUCCESS(f"Результати: {path}"))
+
+        if previous is not None:
+            self.stdout.write(self.style.MIGRATE_HEADING("Порівняння (медіана, мс)"))
+            for name, before, after, change, queries_before, queries_after in compare(previous, report):
+                style = self.style.ERROR if change > 10 or queries_after > queries_before else self.style.SUCCESS
+                self.stdout.write(style(
+                    f"{name:30} {before:9.2f} -> {after:9.2f} ({change:+.1f}%)  SQL {queries_before} -> {queries_after}"
+                ))
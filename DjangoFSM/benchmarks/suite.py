@@ -0,0 +1,252 @@
+"""
+Набір бенчмарків: сторінки адмінки, пошук, API каталогу, збереження та
+перерахунок цін виробів, створення й переходи замовлень.
+
+Кожен бенчмарк виконується repeat разів у точці збереження, яка потім
+відкочується, тож дані між запусками не змінюються. Для кожного збираються
+кількість SQL-запитів та час (мін / медіана / p95). Результат — словник, який
+команда run_benchmarks зберігає в JSON для порівняння запусків.
+"""
+import statistics
+import subprocess
+import time
+from decimal import Decimal
+
+from django.conf import settings
+from django.contrib.auth import get_user_model
+from django.db import connection, transaction
+from django.test import Client, override_settings
+from django.test.utils import CaptureQueriesContext
+from django.urls import reverse
+from django.utils import timezone
+
+from DjangoFSM.search import search
+from client_orders.fsm import bulk_transition, transition
+from client_orders.models import ClientOrder, OrderLine, OrderStatus
+from fabric.colors import similar_fabrics
+from fabric.models import Fabric
+from products.models import Product
+from products.pricing import reprice_catalog, reprice_fabric
+
+BENCHMARKS = {}
+
+
+def benchmark(name):
+    """Реєструє функцію bench(context) під назвою name."""
+    def decorator(func):
+        BENCHMARKS[name] = func
+        return func
+    return decorator
+
+
+class Rollback(Exception):
+    """Відкочує дані, створені під час запуску набору."""
+
+
+class BenchmarkContext:
+    """Клієнт адмінки та зразкові об'єкти, на яких виконуються бенчмарки."""
+
+    def __init__(self):
+        User = get_user_model()
+        self.admin = User.objects.create_superuser(
+            username="bench_admin",
+            email="bench_admin@example.com",
+            phone_number="+380990000000",
+            password="bench",
+        )
+        self.client = Client()
+        self.client.force_login(self.admin)
+        self.product = Product.objects.filter(fabric__isnull=False).order_by("pk").first()
+        self.fabric = Fabric.objects.order_by("pk").first()
+        self.order = ClientOrder.objects.order_by("pk").first()
+        if self.product is None or self.order is None:
+            raise ValueError("Немає даних: спершу запустіть generate_data")
+        self.product_term = self.product.name.split()[0]
+        self.order_term = self.order.order_number[-5:]
+        self.drafts = list(
+            ClientOrder.objects.filter(status=OrderStatus.DRAFT).order_by("pk").values_list("pk", flat=True)[:500]
+        )
+
+    def get(self, url):
+        response = self.client.get(url)
+        if response.status_code != 200:
+            raise AssertionError(f"{url}: HTTP {response.status_code}")
+        return response
+
+
+# ==========================================================================
+# Адмінка
+
+
+@benchmark("admin.product_changelist")
+def product_changelist(context):
+    context.get(reverse("admin:products_product_changelist"))
+
+
+@benchmark("admin.fabric_changelist")
+def fabric_changelist(context):
+    context.get(reverse("admin:fabric_fabric_changelist"))
+
+
+@benchmark("admin.order_changelist")
+def order_changelist(context):
+    context.get(reverse("admin:client_orders_clientorder_changelist"))
+
+
+@benchmark("admin.user_changelist")
+def user_changelist(context):
+    context.get(reverse("admin:users_user_changelist"))
+
+
+@benchmark("admin.order_change_view")
+def order_change_view(context):
+    context.get(reverse("admin:client_orders_clientorder_change", args=[context.order.pk]))
+
+
+# ==========================================================================
+# Пошук та API
+
+
+@benchmark("search.admin_products")
+def admin_product_search(context):
+    context.get(f"{reverse('admin:products_product_changelist')}?q={context.product_term}")
+
+
+@benchmark("search.admin_orders")
+def admin_order_search(context):
+    context.get(f"{reverse('admin:client_orders_clientorder_changelist')}?q={context.order_term}")
+
+
+@benchmark("search.products")
+def product_search(context):
+    list(search(Product.objects.all(), context.product_term).values_list("pk", flat=True)[:50])
+
+
+@benchmark("api.product_list")
+def api_product_list(context):
+    context.get(f"{reverse('products:product-list')}?limit=50")
+
+
+@benchmark("fabric.similar_colors")
+def fabric_similar_colors(context):
+    similar_fabrics(context.fabric.rgb or (128, 128, 128), 20)
+
+
+# ==========================================================================
+# Запис
+
+
+@benchmark("product.save")
+def product_save(context):
+    product = Product.objects.get(pk=context.product.pk)
+    product.base_price += Decimal("1")
+    product.save()
+
+
+@benchmark("product.reprice_fabric")
+def product_reprice_fabric(context):
+    reprice_fabric(context.fabric)
+
+
+@benchmark("product.reprice_category")
+def product_reprice_category(context):
+    reprice_catalog(queryset=Product.objects.filter(category_id=context.product.category_id))
+
+
+@benchmark("order.create")
+def order_create(context):
+    order = ClientOrder.objects.create(client=context.admin)
+    OrderLine.objects.create(order=order, product=context.product, quantity=2)
+    OrderLine.objects.create(order=order, product=context.product, fabric=context.fabric, quantity=1)
+    transition(order, OrderStatus.IN_PROGRESS, user=context.admin)
+
+
+@benchmark("order.bulk_transition")
+def order_bulk_transition(context):
+    bulk_transition(ClientOrder.objects.filter(pk__in=context.drafts), OrderStatus.IN_PROGRESS)
+
+
+# ==========================================================================
+# Запуск
+
+
+def measure(func, context, repeat):
+    timings, queries = [], []
+    for _ in range(repeat):
+        with transaction.atomic():
+            with CaptureQueriesContext(connection) as captured:
+                started = time.perf_counter()
+                func(context)
+                timings.append((time.perf_counter() - started) * 1000)
+            queries.append(len(captured.captured_queries))
+            transaction.set_rollback(True)
+
+    result = {
+        "queries": queries[-1],
+        "min_ms": round(min(timings), 3),
+        "median_ms": round(statistics.median(timings), 3),
+        "p95_ms": round(statistics.quantiles(timings, n=20)[-1], 3) if len(timings) > 1 else round(timings[0], 3),
+    }
+    if min(queries) != max(queries):
+        result["queries_range"] = [min(queries), max(queries)]
+    return result
+
+
+def git_revision():
+    try:
+        return subprocess.run(
+            ["git", "rev-parse", "--short", "HEAD"],
+            cwd=settings.BASE_DIR, capture_output=True, text=True, check=True,
+        ).stdout.strip()
+    except (OSError, subprocess.CalledProcessError):
+        return None
+
+
+def dataset_summary():
+    return {
+        "orders": ClientOrder.objects.count(),
+        "order_lines": OrderLine.objects.count(),
+        "products": Product.objects.count(),
+        "fabrics": Fabric.objects.count(),
+        "users": get_user_model().objects.count(),
+    }
+
+
+def run_suite(names=None, repeat=10, warmup=1, on_result=None):
+    """Виконує бенчмарки (усі або names) і повертає словник результатів."""
+    names = names or list(BENCHMARKS)
+    report = {
+        "started_at": timezone.now().isoformat(),
+        "revision": git_revision(),
+        "vendor": connection.vendor,
+        "repeat": repeat,
+        "dataset": dataset_summary(),
+        "results": {},
+    }
+    hosts = [*settings.ALLOWED_HOSTS, "testserver"]
+    try:
+        with override_settings(ALLOWED_HOSTS=hosts), transaction.atomic():
+            context = BenchmarkContext()
+            for name in names:
+                func = BENCHMARKS[name]
+                if warmup:
+                    measure(func, context, warmup)
+                report["results"][name] = result = measure(func, context, repeat)
+                if on_result is not None:
+                    on_result(name, result)
+            raise Rollback
+    except Rollback:
+        pass
+    return report
+
+
+def compare(previous, current):
+    """[(назва, медіана до, медіана після, зміна %, запити до, запити після)]."""
+    rows = []
+    for name, result in current["results"].items():
+        before = previous["results"].get(name)
+        if before is None:
+            continue
+        change = (result["median_ms"] - before["median_ms"]) / before["median_ms"] * 100 if before["median_ms"] else 0
+        rows.append((name, before["median_ms"], result["median_ms"], round(change, 1), before["queries"], result["queries"]))
+    return rows
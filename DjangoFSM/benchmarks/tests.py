@@ -0,0 +1,75 @@
+import asyncio
+
+from django.test import SimpleTestCase, TestCase
+
+from client_orders.models import ClientOrder, OrderLine
+from products.models import Product
+from .generator import clear_generated, generate
+from .load import run_load
+from .suite import BENCHMARKS, run_suite
+
+
+class GeneratorTests(TestCase):
+
+    def snapshot(self):
+        return (
+            list(Product.objects.order_by("code").values_list("code", "base_price", "final_price")),
+            list(ClientOrder.objects.order_by("order_number").values_list("order_number", "status", "total_price")),
+        )
+
+    def test_generation_is_deterministic(self):
+        scale = generate(30, seed=7, batch_size=10)
+        self.assertEqual(ClientOrder.objects.count(), scale.orders)
+        self.assertEqual(Product.objects.count(), scale.products)
+        first = self.snapshot()
+
+        clear_generated()
+        self.assertFalse(ClientOrder.objects.exists())
+        generate(30, seed=7, batch_size=10)
+        self.assertEqual(self.snapshot(), first)
+
+    def test_order_totals_match_lines(self):
+        generate(30, seed=7, batch_size=10)
+        order = ClientOrder.objects.order_by("pk").first()
+        lines = OrderLine.objects.filter(order=order)
+        self.assertEqual(order.subtotal, sum(line.amount for line in lines))
+
+
+class SuiteTests(TestCase):
+
+    def test_suite_reports_every_benchmark(self):
+        generate(30, seed=7, batch_size=10)
+        report = run_suite(repeat=1, warmup=0)
+        self.assertEqual(set(report["results"]), set(BENCHMARKS))
+        self.assertGreater(report["results"]["admin.product_changelist"]["queries"], 0)
+        # Дані бенчмарків відкочуються
+        self.assertEqual(report["dataset"]["orders"], ClientOrder.objects.count())
+
+
+
+class LoadTests(SimpleTestCase):
+
+    def test_slow_clients_are_not_counted(self):
+        async def handle(reader, writer):
+            try:
+                await reader.readuntil(b"\r\n\r\n")
+                writer.write(b"HTTP/1.1 200 OK\r\nContent-Length: 2\r\nConnection: close\r\n\r\n{}")
+                await writer.drain()
+            except (asyncio.IncompleteReadError, ConnectionError):
+                # Повільний клієнт, перерваний наприкінці виміру
+                pass
+            finally:
+                writer.close()
+
+        async def scenario():
+            server = await asyncio.start_server(handle, "127.0.0.1", 0)
+            port = server.sockets[0].getsockname()[1]
+            async with server:
+                return await run_load(
+                    f"http://127.0.0.1:{port}/", requests=20, concurrency=4, slow_clients=2, slow_delay=0.001
+                )
+
+        result = asyncio.run(scenario())
+        self.assertEqual(result["completed"], 20)
+        self.assertEqual(result["errors"], {})
+        self.assertIsNotNone(result["p99_ms"])
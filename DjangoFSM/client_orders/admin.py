@@ -1,11 +1,184 @@
-from django.contrib import admin
-from .models import ClientOrder
+from django.conf import settings
+from django.contrib import admin, messages
+from django.core.exceptions import PermissionDenied
+from django.http import FileResponse, Http404
+from django.shortcuts import get_object_or_404, redirect
+from django.urls import path, reverse
+from django.utils.html import format_html
+
+from DjangoFSM.admin_utils import PaginatedInlineMixin, PreloadedAutocompleteAdminMixin
+from DjangoFSM.search import IndexedSearchAdminMixin
+from users.permissions import RolePermissionAdminMixin, has_role_perm
+from .export import FORMATS, create_job, export_response
+from .fsm import bulk_transition
+from .models import ClientOrder, ExportStatus, OrderExport, OrderLine, OrderStatus, OrderStatusLog, order_scope
 
 # Register your models here.
 
+class OrderLineInline(
+    RolePermissionAdminMixin, PreloadedAutocompleteAdminMixin, PaginatedInlineMixin, admin.TabularInline
+):
+    model = OrderLine
+    fields = ("product", "fabric", "quantity", "unit_price")
+    # Пошук замість <select> з усіма виробами / тканинами в кожному рядку
+    autocomplete_fields = ("product", "fabric")
+
+    def get_queryset(self, request):
+        return super().get_queryset(request).select_related("product", "fabric")
+
+
+def transition_action(status, description):
+    """Дія адмінки: масовий перехід виділених замовлень у status."""
+
+    def action(modeladmin, request, queryset):
+        selected = queryset.count()
+        moved = bulk_transition(queryset, status, user=request.user)
+        skipped = selected - moved
+        modeladmin.message_user(request, f"Переведено замовлень: {moved}.", messages.SUCCESS)
+        if skipped:
+            modeladmin.message_user(
+                request, f"Пропущено (перехід не дозволений): {skipped}.", messages.WARNING
+            )
+
+    action.__name__ = f"transition_to_{status}"
+    action.allowed_permissions = ("change",)
+    action.short_description = description
+    return action
+
+
 @admin.register(ClientOrder)
-class ClientOrderAdmin(admin.ModelAdmin):
+class ClientOrderAdmin(RolePermissionAdminMixin, IndexedSearchAdminMixin, admin.ModelAdmin):
     list_display = ("id", "order_number", "client", "status", "total_price", "created_at")
     list_filter = ("status", "created_at")
+    list_select_related = ("client",)
     search_fields = ("order_number", "client__email", "client__username")
-    ordering = ("-created_at",)
\ No newline at end of file
+    ordering = ("-created_at",)
+    # Статус змінюється лише діями переходів (client_orders.fsm)
+    readonly_fields = ("status", "created_by", "subtotal", "total_price")
+    raw_id_fields = ("dealer", "salon")
+    autocomplete_fields = ("client",)
+    inlines = [OrderLineInline]
+    actions = [
+        transition_action(OrderStatus.IN_PROGRESS, "Взяти в роботу"),
+        transition_action(OrderStatus.COMPLETED, "Завершити"),
+        transition_action(OrderStatus.CANCELED, "Скасувати"),
+    ]
+
+    def get_queryset(self, request):
+        # Дилери та менеджери салонів бачать лише замовлення свого профілю
+        return super().get_queryset(request).visible_to(request.user)
+
+    def get_readonly_fields(self, request, obj=None):
+        readonly = self.readonly_fields
+        if order_scope(request.user):
+            readonly += ("dealer", "salon")
+        return readonly
+
+    def save_model(self, request, obj, form, change):
+        if not change:
+            obj.assign_owner(request.user)
+        super().save_model(request, obj, form, change)
+
+    def get_urls(self):
+        info = self.opts.app_label, self.opts.model_name
+        urls = [
+            path("export/", self.admin_site.admin_view(self.export_view), name="%s_%s_export" % info),
+        ]
+        return urls + super().get_urls()
+
+    def export_view(self, request):
+        """
+        Експорт замовлень з урахуванням фільтрів і пошуку списку: невелика вибірка
+        віддається потоком, велика — фоновим завданням (див. client_orders.export).
+        """
+        if not self.has_view_permission(request):
+            raise PermissionDenied
+        # format — не фільтр списку, прибираємо його перед побудовою ChangeList
+        request.GET = request.GET.copy()
+        fmt = request.GET.pop("format", ["csv"])[-1]
+        if fmt not in FORMATS:
+            fmt = "csv"
+        queryset = self.get_changelist_instance(request).get_queryset(request)
+        if queryset.count() <= settings.ORDER_EXPORT_STREAM_LIMIT:
+            return export_response(queryset, fmt)
+        job = create_job(request.GET, fmt, user=request.user)
+        self.message_user(
+            request, f"Замовлень забагато для завантаження одразу — створено фоновий експорт #{job.pk}.",
+            messages.INFO,
+        )
+        return redirect("admin:client_orders_orderexport_changelist")
+
+
+@admin.register(OrderStatusLog)
+class OrderStatusLogAdmin(RolePermissionAdminMixin, admin.ModelAdmin):
+    list_display = ("order", "from_status", "to_status", "changed_by", "created_at")
+    list_filter = ("to_status", "created_at")
+    list_select_related = ("order", "changed_by")
+    search_fields = ("order__order_number",)
+    date_hierarchy = "created_at"
+
+    def get_queryset(self, request):
+        return super().get_queryset(request).filter(order_scope(request.user, prefix="order__"))
+
+    # Журнал лише для читання: записи додаються тільки переходами
+    def has_add_permission(self, request):
+        return False
+
+    def has_change_permission(self, request, obj=None):
+        return False
+
+    def has_delete_permission(self, request, obj=None):
+        return False
+
+
+@admin.register(OrderExport)
+class OrderExportAdmin(RolePermissionAdminMixin, admin.ModelAdmin):
+    """Фонові експорти: прогрес і завантаження файлу. Створюються кнопкою експорту в списку замовлень."""
+    list_display = ("id", "created_at", "created_by", "format", "status", "progress_display", "download")
+    list_filter = ("status",)
+    list_select_related = ("created_by",)
+    fields = ("created_by", "format", "status", "total", "processed", "download", "error", "created_at", "finished_at")
+    readonly_fields = fields
+
+    def get_queryset(self, request):
+        queryset = super().get_queryset(request)
+        # Експорти інших користувачів бачать лише ті, хто може їх видаляти (адміністратори)
+        if not has_role_perm(request.user, self.opts, "delete"):
+            queryset = queryset.filter(created_by=request.user)
+        return queryset
+
+    def get_urls(self):
+        info = self.opts.app_label, self.opts.model_name
+        urls = [
+            path(
+                "<int:pk>/download/",
+                self.admin_site.admin_view(self.download_view),
+                name="%s_%s_download" % info,
+            ),
+        ]
+        return urls + super().get_urls()
+
+    def download_view(self, request, pk):
+        if not self.has_view_permission(request):
+            raise PermissionDenied
+        job = get_object_or_404(self.get_queryset(request), pk=pk, status=ExportStatus.DONE)
+        if not job.file:
+            raise Http404
+        return FileResponse(job.file.open("rb"), as_attachment=True, filename=job.file.name.rsplit("/", 1)[-1])
+
+    @admin.display(description="Прогрес")
+    def progress_display(self, obj):
+        return f"{obj.progress}% ({obj.processed} / {obj.total})"
+
+    @admin.display(description="Файл")
+    def download(self, obj):
+        if obj.status != ExportStatus.DONE or not obj.file:
+            return "—"
+        url = reverse("admin:client_orders_orderexport_download", args=[obj.pk])
+        return format_html('<a href="{}">завантажити</a>', url)
+
+    def has_add_permission(self, request):
+        return False
+
+    def has_change_permission(self, request, obj=None):
+        return False
@@ -4,3 +4,19 @@ from django.apps import AppConfig
 class ClientOrdersConfig(AppConfig):
     default_auto_field = 'django.db.models.BigAutoField'
     name = 'client_orders'
+
+    def ready(self):
+        from django.db.models.signals import post_migrate
+        from audit import tracking
+        from DjangoFSM import search
+        from .models import ClientOrder
+
+        # Підключаємо сигнали (коригування суми замовлення при видаленні позицій)
+        from . import signals  # noqa: F401
+
+        # Пошук замовлень за номером та за клієнтом (підзапитом по індексу користувачів)
+        search.register(ClientOrder, fields=("order_number",), related=("client",))
+        post_migrate.connect(search.ensure_search_indexes, sender=self)
+
+        # Статус змінюють лише переходи FSM (UPDATE без save()) — вони пишуть журнал самі
+        tracking.register(ClientOrder, fields=("status",), snapshot=False)
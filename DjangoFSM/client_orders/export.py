@@ -0,0 +1,271 @@
+"""
+Експорт замовлень для бухгалтерії (CSV або JSON Lines).
+
+Рядки читаються через values_list().iterator() — без створення моделей і
+серверним курсором PostgreSQL, тож пам'ять не залежить від розміру вибірки.
+За PgBouncer серверні курсори вимкнені (DB_PGBOUNCER), і psycopg отримав би
+весь результат одразу — тоді вибірка читається пакетами за первинним ключем.
+
+До ORDER_EXPORT_STREAM_LIMIT замовлень файл віддається StreamingHttpResponse;
+більші вибірки експортуються фоновим завданням OrderExport у файл .gz зі
+сховища STORAGES["exports"] з прогресом у полі processed. Завдання зберігає
+лише параметри фільтрів списку, а вибірку будує заново від імені автора
+(ClientOrderAdmin.get_queryset, тобто з order_scope).
+"""
+import csv
+import gzip
+import io
+import logging
+import tempfile
+from datetime import timedelta
+from concurrent.futures import ThreadPoolExecutor
+
+from django.conf import settings
+from django.core.files import File
+from django.core.serializers.json import DjangoJSONEncoder
+from django.db import close_old_connections, connections, transaction
+from django.db.models import F
+from django.http import HttpRequest, QueryDict, StreamingHttpResponse
+from django.utils import timezone
+
+from DjangoFSM.db_routers import read_from_replica
+from products.import_export import Echo
+from .models import ClientOrder, ExportStatus, OrderExport
+
+logger = logging.getLogger(__name__)
+
+COLUMNS = (
+    "order_number",
+    "created_at",
+    "status",
+    "client_email",
+    "dealer",
+    "salon",
+    "subtotal",
+    "discount",
+    "total_price",
+)
+VALUES = (
+    "order_number",
+    "created_at",
+    "status",
+    "client__email",
+    "dealer__company_name",
+    "salon__salon_name",
+    "subtotal",
+    "discount",
+    "total_price",
+)
+# Позиція created_at у рядку: час пишеться в локальному часовому поясі
+CREATED_AT = VALUES.index("created_at")
+# Відповідь віддається шматками приблизно такого розміру, а не рядок за рядком
+BUFFER_SIZE = 64 * 1024
+# Як часто фонове завдання записує прогрес (рядків)
+PROGRESS_EVERY = 10000
+
+
+def iter_rows(queryset, chunk_size=None):
+    """Кортежі VALUES для замовлень queryset у порядку первинного ключа."""
+    chunk_size = chunk_size or settings.ORDER_EXPORT_CHUNK_SIZE
+    values = queryset.order_by("pk")
+    if not connections[queryset.db].settings_dict.get("DISABLE_SERVER_SIDE_CURSORS"):
+        yield from values.values_list(*VALUES).iterator(chunk_size=chunk_size)
+        return
+    # Keyset-пагінація: кожен пакет — окремий запит WHERE pk > останній
+    last_pk = None
+    while True:
+        page = values if last_pk is None else values.filter(pk__gt=last_pk)
+        rows = list(page.values_list("pk", *VALUES)[:chunk_size])
+        for row in rows:
+            yield row[1:]
+        if len(rows) < chunk_size:
+            return
+        last_pk = rows[-1][0]
+
+
+def _localized(row):
+    row = list(row)
+    row[CREATED_AT] = timezone.localtime(row[CREATED_AT]).isoformat()
+    return row
+
+
+def csv_lines(rows):
+    writer = csv.writer(Echo())
+    yield writer.writerow(COLUMNS)
+    for row in rows:
+        yield writer.writerow(["" if value is None else value for value in _localized(row)])
+
+
+def jsonl_lines(rows):
+    encoder = DjangoJSONEncoder(ensure_ascii=False)
+    for row in rows:
+        yield encoder.encode(dict(zip(COLUMNS, _localized(row)))) + "\n"
+
+
+# Формат -> (генератор рядків, content type, розширення)
+FORMATS = {
+    "csv": (csv_lines, "text/csv; charset=utf-8", "csv"),
+    "jsonl": (jsonl_lines, "application/x-ndjson; charset=utf-8", "jsonl"),
+}
+
+
+def buffered(lines, size=BUFFER_SIZE):
+    """Об'єднує дрібні рядки в шматки ~size символів."""
+    buffer, length = [], 0
+    for line in lines:
+        buffer.append(line)
+        length += len(line)
+        if length >= size:
+            yield "".join(buffer)
+            buffer, length = [], 0
+    if buffer:
+        yield "".join(buffer)
+
+
+def export_lines(queryset, fmt="csv", chunk_size=None):
+    return FORMATS[fmt][0](iter_rows(queryset, chunk_size))
+
+
+def export_response(queryset, fmt="csv"):
+    """StreamingHttpResponse з експортом замовлень."""
+    _, content_type, extension = FORMATS[fmt]
+    response = StreamingHttpResponse(buffered(export_lines(queryset, fmt)), content_type=content_type)
+    response["Content-Disposition"] = f'attachment; filename="orders-{timezone.localdate():%Y%m%d}.{extension}"'
+    return response
+
+
+# ==========================================================================
+# Фонові завдання
+
+
+class ExportError(Exception):
+    pass
+
+
+def create_job(params, fmt="csv", user=None):
+    """
+    Створює завдання для фільтрів списку params (QueryDict або рядок запиту)
+    і ставить його в чергу після коміту.
+    """
+    job = OrderExport.objects.create(
+        created_by=user,
+        format=fmt,
+        params=params if isinstance(params, str) else params.urlencode(),
+    )
+    schedule_job(job.pk)
+    return job
+
+
+def job_queryset(job):
+    """Вибірка завдання: список замовлень адмінки з фільтрами params від імені автора."""
+    from django.contrib import admin
+
+    user = job.created_by
+    if user is None or not user.is_active:
+        raise ExportError("Автор експорту видалений або деактивований")
+    request = HttpRequest()
+    request.GET = QueryDict(job.params)
+    request.user = user
+    model_admin = admin.site._registry[ClientOrder]
+    if not model_admin.has_view_permission(request):
+        raise ExportError("Автор експорту більше не має доступу до замовлень")
+    return model_admin.get_changelist_instance(request).get_queryset(request)
+
+
+def _counted(rows, job_id):
+    processed = 0
+    for processed, row in enumerate(rows, 1):
+        yield row
+        if processed % PROGRESS_EVERY == 0:
+            OrderExport.objects.filter(pk=job_id).update(processed=processed, heartbeat_at=timezone.now())
+    OrderExport.objects.filter(pk=job_id).update(processed=processed)
+
+
+def run_job(job_id):
+    """
+    Виконує завдання: пише стиснений файл порціями (у тимчасовий файл, потім у
+    сховище). Повертає False, якщо завдання вже взяв інший процес.
+    """
+    claimed = OrderExport.objects.filter(pk=job_id, status=ExportStatus.PENDING).update(
+        status=ExportStatus.RUNNING, processed=0, heartbeat_at=timezone.now()
+    )
+    if not claimed:
+        return False
+    job = OrderExport.objects.select_related("created_by").get(pk=job_id)
+    try:
+        with read_from_replica():
+            queryset = job_queryset(job)
+            OrderExport.objects.filter(pk=job_id).update(total=queryset.count())
+            with tempfile.TemporaryFile() as temporary:
+                with gzip.GzipFile(fileobj=temporary, mode="wb") as compressed:
+                    with io.TextIOWrapper(compressed, encoding="utf-8", newline="") as text:
+                        rows = _counted(iter_rows(queryset), job_id)
+                        for chunk in buffered(FORMATS[job.format][0](rows)):
+                            text.write(chunk)
+                temporary.seek(0)
+                extension = FORMATS[job.format][2]
+                job.file.save(f"orders-{job.pk}.{extension}.gz", File(temporary), save=False)
+    except Exception as exc:
+        logger.exception("Експорт замовлень #%s завершився з помилкою", job_id)
+        OrderExport.objects.filter(pk=job_id).update(
+            status=ExportStatus.FAILED, error=str(exc), finished_at=timezone.now()
+        )
+        return True
+    # total — фактична кількість записаних рядків (вибірка могла змінитися після count())
+    OrderExport.objects.filter(pk=job_id).update(
+        status=ExportStatus.DONE, file=job.file.name, total=F("processed"), finished_at=timezone.now()
+    )
+    return True
+
+
+def _run(job_id):
+    close_old_connections()
+    try:
+        run_job(job_id)
+    finally:
+        close_old_connections()
+
+
+_executor = None
+
+
+def _get_executor():
+    global _executor
+    if _executor is None:
+        # Один потік: експорти важкі для БД, паралельно їх не запускаємо
+        _executor = ThreadPoolExecutor(max_workers=1, thread_name_prefix="order-export")
+    return _executor
+
+
+def schedule_job(job_id):
+    """Запускає завдання після коміту (ORDER_EXPORT_MODE=off — лише process_order_exports)."""
+    mode = getattr(settings, "ORDER_EXPORT_MODE", "thread")
+    if mode == "off":
+        return
+    if mode == "sync":
+        transaction.on_commit(lambda: run_job(job_id))
+    else:
+        transaction.on_commit(lambda: _get_executor().submit(_run, job_id))
+
+
+def requeue_stale_jobs():
+    """
+    Повертає в чергу завдання RUNNING без прогресу довше за ORDER_EXPORT_STALE_AFTER
+    секунд (процес воркера завершився посеред експорту). Повертає кількість.
+    """
+    stale_before = timezone.now() - timedelta(seconds=getattr(settings, "ORDER_EXPORT_STALE_AFTER", 900))
+    return OrderExport.objects.filter(status=ExportStatus.RUNNING, heartbeat_at__lt=stale_before).update(
+        status=ExportStatus.PENDING
+    )
+
+
+def run_pending_jobs():
+    """
+    Виконує всі завдання в черзі разом із завислими (для команди process_order_exports).
+    Повертає кількість.
+    """
+    requeue_stale_jobs()
+    done = 0
+    for job_id in OrderExport.objects.filter(status=ExportStatus.PENDING).order_by("pk").values_list("pk", flat=True):
+        done += run_job(job_id)
+    return done
@@ -0,0 +1,113 @@
+"""
+Скінченний автомат статусу замовлення.
+
+    draft ──► in_progress ──► completed
+      │            │
+      └────────────┴────────► canceled
+
+Кожен перехід — умовний UPDATE ... WHERE status=<очікуваний>
+(оптимістично, без select_for_update). Якщо два менеджери одночасно змінюють
+одне замовлення, UPDATE оновить рядок лише для одного з них — інший отримає
+TransitionConflict. Кожен успішний перехід записується в OrderStatusLog
+і в журнал змін (audit.tracking).
+"""
+from django.db import transaction
+from django.utils import timezone
+
+from audit import tracking
+from .models import ClientOrder, OrderStatus, OrderStatusLog
+
+TRANSITIONS = {
+    OrderStatus.DRAFT: frozenset({OrderStatus.IN_PROGRESS, OrderStatus.CANCELED}),
+    OrderStatus.IN_PROGRESS: frozenset({OrderStatus.COMPLETED, OrderStatus.CANCELED}),
+    OrderStatus.COMPLETED: frozenset(),
+    OrderStatus.CANCELED: frozenset(),
+}
+
+# Кількість id в одному UPDATE та INSERT журналу
+BATCH_SIZE = 1000
+
+
+class InvalidTransition(Exception):
+    """Перехід між цими статусами не дозволений."""
+
+
+class TransitionConflict(Exception):
+    """Статус замовлення вже змінив хтось інший."""
+
+
+def can_transition(from_status, to_status):
+    return to_status in TRANSITIONS.get(from_status, ())
+
+
+def sources_for(to_status):
+    """Статуси, з яких можна перейти в to_status."""
+    return [status for status, targets in TRANSITIONS.items() if to_status in targets]
+
+
+def transition(order, to_status, user=None, comment=""):
+    """
+    Переводить одне замовлення з його поточного (завантаженого) статусу в to_status.
+    Повертає запис журналу; при гонці кидає TransitionConflict.
+    """
+    from_status = order.status
+    if not can_transition(from_status, to_status):
+        raise InvalidTransition(f"Перехід {from_status} → {to_status} не дозволений")
+
+    now = timezone.now()
+    with transaction.atomic():
+        updated = ClientOrder.objects.filter(pk=order.pk, status=from_status).update(
+            status=to_status, updated_at=now
+        )
+        if not updated:
+            raise TransitionConflict(f"Замовлення #{order.order_number} вже не в статусі {from_status}")
+        log = OrderStatusLog.objects.create(
+            order_id=order.pk,
+            from_status=from_status,
+            to_status=to_status,
+            changed_by=user,
+            comment=comment,
+            created_at=now,
+        )
+        tracking.record(ClientOrder, [(order.pk, "status", from_status, to_status)], user=user)
+    order.status = to_status
+    order.updated_at = now
+    return log
+
+
+def bulk_transition(queryset, to_status, user=None, comment=""):
+    """
+    Переводить у to_status усі замовлення queryset, для яких це дозволено.
+    Для кожного вихідного статусу id оновлюються пакетами умовних
+    UPDATE ... WHERE id IN (...) AND status=<вихідний>, а записи журналу
+    додаються через bulk_create. Повертає кількість переведених замовлень.
+    """
+    now = timezone.now()
+    moved = 0
+    with transaction.atomic():
+        for from_status in sources_for(to_status):
+            ids = list(queryset.filter(status=from_status).values_list("pk", flat=True))
+            for start in range(0, len(ids), BATCH_SIZE):
+                batch = ids[start:start + BATCH_SIZE]
+                updated = ClientOrder.objects.filter(pk__in=batch, status=from_status).update(
+                    status=to_status, updated_at=now
+                )
+                if updated < len(batch):
+                    # Частину замовлень змінили паралельно — журналюємо лише свої
+                    batch = list(ClientOrder.objects.filter(
+                        pk__in=batch, status=to_status, updated_at=now
+                    ).values_list("pk", flat=True))
+                OrderStatusLog.objects.bulk_create([
+                    OrderStatusLog(
+                        order_id=pk,
+                        from_status=from_status,
+                        to_status=to_status,
+                        changed_by=user,
+                        comment=comment,
+                        created_at=now,
+                    )
+                    for pk in batch
+                ])
+                tracking.record(ClientOrder, [(pk, "status", from_status, to_status) for pk in batch], user=user)
+                moved += updated
+    return moved
@@ -0,0 +1,129 @@
+import random
+import time
+from contextlib import contextmanager
+from datetime import timedelta
+
+from django.contrib.auth import get_user_model
+from django.core.management.base import BaseCommand
+from django.db import connection, transaction
+from django.utils import timezone
+
+from client_orders.models import ClientOrder, OrderStatus
+
+
+class Rollback(Exception):
+    """Відкочує транзакцію бенчмарку разом із засіяними даними."""
+
+
+@contextmanager
+def manual_created_at(model):
+    """Тимчасово вимикає auto_now_add, щоб засіяти замовлення з різними датами."""
+    field = model._meta.get_field("created_at")
+    field.auto_now_add = False
+    try:
+        yield
+    finally:
+        field.auto_now_add = True
+
+
+class Command(BaseCommand):
+    help = (
+        "Засіває замовлення та показує плани (EXPLAIN) і час запитів списку замовлень "
+        "та історії клієнта з індексами і без них. Дані відкочуються після запуску."
+    )
+
+    def add_arguments(self, parser):
+        parser.add_argument("--orders", type=int, default=1_000_000, help="Кількість замовлень")
+        parser.add_argument("--clients", type=int, default=5_000, help="Кількість клієнтів")
+        parser.add_argument("--batch-size", type=int, default=10_000)
+        parser.add_argument("--repeat", type=int, default=20, help="Скільки разів виконувати кожен запит")
+        parser.add_argument("--seed", type=int, default=42)
+
+    def handle(self, *args, **options):
+        try:
+            with transaction.atomic():
+                client_id = self.seed(options)
+                self.run_queries(client_id, options["repeat"], "З індексами")
+                self.drop_indexes()
+                self.run_queries(client_id, options["repeat"], "Без індексів")
+                raise Rollback
+        except Rollback:
+            self.stdout.write("Дані бенчмарку відкочено.")
+
+    def seed(self, options):
+        rng = random.Random(options["seed"])
+        User = get_user_model()
+        started = time.perf_counter()
+
+        User.objects.bulk_create(
+            [
+                User(
+                    username=f"bench_client_{i}",
+                    email=f"bench_client_{i}@example.com",
+                    phone_number=f"+38099{i:07d}",
+                )
+                for i in range(options["clients"])
+            ],
+            batch_size=options["batch_size"],
+        )
+        client_ids = list(User.objects.filter(username__startswith="bench_client_").values_list("pk", flat=True))
+
+        statuses = OrderStatus.values
+        now = timezone.now()
+        with manual_created_at(ClientOrder):
+            for start in range(0, options["orders"], options["batch_size"]):
+                stop = min(start + options["batch_size"], options["orders"])
+                ClientOrder.objects.bulk_create(
+                    [
+                        ClientOrder(
+                            order_number=f"BENCH-{i:08d}",
+                            client_id=rng.choice(client_ids),
+                            status=rng.choice(statuses),
+                            created_at=now - timedelta(minutes=i),
+                        )
+                        for i in range(start, stop)
+                    ],
+                    batch_size=options["batch_size"],
+                )
+
+        if connection.vendor == "postgresql":
+            with connection.cursor() as cursor:
+                cursor.execute("ANALYZE client_orders_clientorder")
+        self.stdout.write(
+            f"Засіяно {options['orders']} замовлень за {time.perf_counter() - started:.1f} с"
+        )
+        return client_ids[0]
+
+    def drop_indexes(self):
+        # Простий DROP INDEX: schema_editor SQLite не працює всередині atomic()
+        with connection.cursor() as cursor:
+            for index in ClientOrder._meta.indexes:
+                cursor.execute(f"DROP INDEX {connection.ops.quote_name(index.name)}")
+
+    def queries(self, client_id):
+        return {
+            "Список замовлень (status, -created_at)": ClientOrder.objects.filter(
+                status=OrderStatus.IN_PROGRESS
+            ).order_by("-created_at")[:100],
+            "Історія клієнта (client, -created_at)": ClientOrder.objects.filter(
+                client_id=client_id
+            ).order_by("-created_at")[:100],
+        }
+
+    def run_queries(self, client_id, repeat, title):
+        self.stdout.write(self.style.MIGRATE_HEADING(title))
+        for name, queryset in self.queries(client_id).items():
+            sql, params = queryset.values_list("pk", flat=True).query.sql_with_params()
+            # Коментар з назвою фази робить SQL унікальним: інакше кеш підготовлених
+            # запитів sqlite3 повертає старий план після DROP INDEX
+            sql = f"{sql} /* {title} */"
+            with connection.cursor() as cursor:
+                cursor.execute(f"{connection.ops.explain_query_prefix()} {sql}", params)
+                plan = "\n".join(" ".join(str(column) for column in row) for row in cursor.fetchall())
+                started = time.perf_counter()
+                for _ in range(repeat):
+                    cursor.execute(sql, params)
+                    cursor.fetchall()
+            elapsed = (time.perf_counter() - started) / repeat * 1000
+            self.stdout.write(f"{name}: {elapsed:.2f} мс")
+            self.stdout.write(plan)
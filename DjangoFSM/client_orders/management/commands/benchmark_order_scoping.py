@@ -0,0 +1,100 @@
+import random
+import time
+from datetime import timedelta
+
+from django.contrib.auth import get_user_model
+from django.core.management.base import BaseCommand
+from django.db import connection, transaction
+from django.utils import timezone
+
+from client_orders.models import ClientOrder
+from users.models import DealerProfile
+from .benchmark_order_indexes import Rollback, manual_created_at
+
+
+class Command(BaseCommand):
+    help = (
+        "Порівнює вартість списку замовлень дилера (visible_to) на таблицях різного розміру: "
+        "з індексом (dealer, -created_at) час не має залежати від кількості рядків. "
+        "Дані відкочуються після запуску."
+    )
+
+    def add_arguments(self, parser):
+        parser.add_argument(
+            "--sizes", default="10000,1000000",
+            help="Розміри таблиці через кому (наприклад 10000,10000000)",
+        )
+        parser.add_argument("--dealers", type=int, default=500, help="Кількість дилерів")
+        parser.add_argument("--batch-size", type=int, default=10_000)
+        parser.add_argument("--repeat", type=int, default=50, help="Скільки разів виконувати запит")
+        parser.add_argument("--seed", type=int, default=42)
+
+    def handle(self, *args, **options):
+        sizes = sorted(int(size) for size in options["sizes"].split(","))
+        rng = random.Random(options["seed"])
+        try:
+            with transaction.atomic():
+                dealer, profile_ids = self.seed_dealers(options["dealers"])
+                seeded = 0
+                for size in sizes:
+                    self.seed_orders(seeded, size, profile_ids, rng, options["batch_size"])
+                    seeded = size
+                    self.run_query(dealer, size, options["repeat"])
+                raise Rollback
+        except Rollback:
+            self.stdout.write("Дані бенчмарку відкочено.")
+
+    def seed_dealers(self, count):
+        User = get_user_model()
+        User.objects.bulk_create([
+            User(
+                username=f"bench_dealer_{i}",
+                email=f"bench_dealer_{i}@example.com",
+                phone_number=f"+38098{i:07d}",
+                role=User.Role.DEALER_MANAGER,
+            )
+            for i in range(count)
+        ])
+        users = list(User.objects.filter(username__startswith="bench_dealer_").order_by("pk"))
+        DealerProfile.objects.bulk_create([
+            DealerProfile(user=user, company_name=f"Дилер {user.pk}", city="Київ", country="Україна")
+            for user in users
+        ])
+        profile_ids = list(DealerProfile.objects.filter(user__in=users).values_list("pk", flat=True))
+        return users[0], profile_ids
+
+    def seed_orders(self, start, stop, profile_ids, rng, batch_size):
+        started = time.perf_counter()
+        now = timezone.now()
+        with manual_created_at(ClientOrder):
+            for batch_start in range(start, stop, batch_size):
+                ClientOrder.objects.bulk_create(
+                    [
+                        ClientOrder(
+                            order_number=f"SCOPE-{i:09d}",
+                            dealer_id=rng.choice(profile_ids),
+                            created_at=now - timedelta(seconds=i),
+                        )
+                        for i in range(batch_start, min(batch_start + batch_size, stop))
+                    ],
+                    batch_size=batch_size,
+                )
+        if connection.vendor == "postgresql":
+            with connection.cursor() as cursor:
+                cursor.execute("ANALYZE client_orders_clientorder")
+        self.stdout.write(f"Засіяно до {stop} замовлень за {time.perf_counter() - started:.1f} с")
+
+    def run_query(self, dealer, size, repeat):
+        queryset = ClientOrder.objects.visible_to(dealer).order_by("-created_at")[:100]
+        sql, params = queryset.values_list("pk", flat=True).query.sql_with_params()
+        with connection.cursor() as cursor:
+            cursor.execute(f"{connection.ops.explain_query_prefix()} {sql}", params)
+            plan = "\n".join(" ".join(str(column) for column in row) for row in cursor.fetchall())
+            started = time.perf_counter()
+            for _ in range(repeat):
+                cursor.execute(sql, params)
+                cursor.fetchall()
+        elapsed = (time.perf_counter() - started) / repeat * 1000
+        self.stdout.write(self.style.MIGRATE_HEADING(f"{size} рядків"))
+        self.stdout.write(f"Список замовлень дилера: {elapsed:.3f} мс")
+        self.stdout.write(plan)
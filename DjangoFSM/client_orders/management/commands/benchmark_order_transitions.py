@@ -0,0 +1,88 @@
+import random
+import threading
+import time
+from concurrent.futures import ThreadPoolExecutor
+
+from django.core.management.base import BaseCommand
+from django.db import close_old_connections
+
+from client_orders.fsm import TransitionConflict, bulk_transition, transition
+from client_orders.models import ClientOrder, OrderStatus, OrderStatusLog
+
+PREFIX = "FSMBENCH-"
+
+
+class Command(BaseCommand):
+    help = (
+        "Навантажувальний тест переходів статусів: кілька потоків одночасно переводять "
+        "ті самі замовлення в роботу (кожне має перейти рівно один раз), потім усі "
+        "замовлення завершуються одним масовим переходом. Засіяні дані видаляються."
+    )
+
+    def add_arguments(self, parser):
+        parser.add_argument("--orders", type=int, default=5_000, help="Кількість замовлень")
+        parser.add_argument("--workers", type=int, default=8, help="Кількість потоків")
+        parser.add_argument("--seed", type=int, default=42)
+
+    def handle(self, *args, **options):
+        ClientOrder.objects.filter(order_number__startswith=PREFIX).delete()
+        ClientOrder.objects.bulk_create(
+            [ClientOrder(order_number=f"{PREFIX}{i:08d}") for i in range(options["orders"])],
+            batch_size=1000,
+        )
+        orders = ClientOrder.objects.filter(order_number__startswith=PREFIX)
+        ids = list(orders.values_list("pk", flat=True))
+        try:
+            self.contended(ids, options["workers"], options["seed"])
+            self.bulk(orders, len(ids))
+        finally:
+            orders.delete()
+
+    def contended(self, ids, workers, seed):
+        counters = {"won": 0, "conflicts": 0}
+        lock = threading.Lock()
+
+        def worker(index):
+            order_ids = ids[:]
+            random.Random(seed + index).shuffle(order_ids)
+            won = conflicts = 0
+            try:
+                for pk in order_ids:
+                    try:
+                        transition(ClientOrder(pk=pk, status=OrderStatus.DRAFT), OrderStatus.IN_PROGRESS)
+                        won += 1
+                    except TransitionConflict:
+                        conflicts += 1
+            finally:
+                close_old_connections()
+            with lock:
+                counters["won"] += won
+                counters["conflicts"] += conflicts
+
+        started = time.perf_counter()
+        with ThreadPoolExecutor(max_workers=workers) as executor:
+            list(executor.map(worker, range(workers)))
+        elapsed = time.perf_counter() - started
+
+        attempts = counters["won"] + counters["conflicts"]
+        logged = OrderStatusLog.objects.filter(
+            order_id__in=ids, to_status=OrderStatus.IN_PROGRESS
+        ).count()
+        self.stdout.write(self.style.MIGRATE_HEADING(f"Конкурентні переходи ({workers} потоків)"))
+        self.stdout.write(
+            f"Спроб: {attempts}, успішних: {counters['won']}, конфліктів: {counters['conflicts']}, "
+            f"{attempts / elapsed:.0f} спроб/с"
+        )
+        if counters["won"] == len(ids) == logged:
+            self.stdout.write(self.style.SUCCESS("Кожне замовлення перейшло рівно один раз"))
+        else:
+            self.stdout.write(self.style.ERROR(
+                f"Очікувалось {len(ids)} переходів, успішних {counters['won']}, у журналі {logged}"
+            ))
+
+    def bulk(self, orders, count):
+        started = time.perf_counter()
+        moved = bulk_transition(orders, OrderStatus.COMPLETED)
+        elapsed = time.perf_counter() - started
+        self.stdout.write(self.style.MIGRATE_HEADING("Масовий перехід"))
+        self.stdout.write(f"Завершено {moved} з {count} замовлень за {elapsed * 1000:.0f} мс")
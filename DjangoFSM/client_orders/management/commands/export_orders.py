@@ -0,0 +1,56 @@
+import gzip
+import sys
+from datetime import datetime, timedelta
+
+from django.core.management.base import BaseCommand, CommandError
+from django.utils import timezone
+
+from client_orders.export import FORMATS, buffered, export_lines
+from client_orders.models import ClientOrder, OrderStatus
+
+
+def month_range(value):
+    """(початок, початок наступного місяця) для рядка РРРР-ММ у поточному часовому поясі."""
+    try:
+        start = datetime.strptime(value, "%Y-%m")
+    except ValueError:
+        raise CommandError("Місяць задається як РРРР-ММ, напр. 2026-09")
+    end = (start + timedelta(days=32)).replace(day=1)
+    return timezone.make_aware(start), timezone.make_aware(end)
+
+
+class Command(BaseCommand):
+    help = (
+        "Експортує замовлення (напр. за місяць для бухгалтерії) потоком у файл або stdout. "
+        "Файл з розширенням .gz стискається; пам'ять не залежить від кількості замовлень."
+    )
+
+    def add_arguments(self, parser):
+        parser.add_argument("--format", choices=sorted(FORMATS), default="csv")
+        parser.add_argument("--month", help="Місяць створення замовлень, РРРР-ММ")
+        parser.add_argument("--status", action="append", choices=OrderStatus.values, help="Можна кілька разів")
+        parser.add_argument("--output", help="Шлях до файлу (за замовчуванням stdout)")
+
+    def handle(self, *args, **options):
+        queryset = ClientOrder.objects.all()
+        if options["month"]:
+            start, end = month_range(options["month"])
+            queryset = queryset.filter(created_at__gte=start, created_at__lt=end)
+        if options["status"]:
+            queryset = queryset.filter(status__in=options["status"])
+
+        output = options["output"]
+        if output is None:
+            stream = sys.stdout
+        elif output.endswith(".gz"):
+            stream = gzip.open(output, "wt", encoding="utf-8", newline="")
+        else:
+            stream = open(output, "w", encoding="utf-8", newline="")
+        try:
+            for chunk in buffered(export_lines(queryset, options["format"])):
+                stream.write(chunk)
+        finally:
+            if stream is not sys.stdout:
+                stream.close()
+        if output:
+            self.stderr.write(self.style.SUCCESS(f"Експорт записано у {output}"))
@@ -0,0 +1,15 @@
+from django.core.management.base import BaseCommand
+
+from client_orders.export import run_pending_jobs
+
+
+class Command(BaseCommand):
+    help = (
+        "Виконує фонові експорти замовлень у черзі. Потрібна при ORDER_EXPORT_MODE=off "
+        "(окремий воркер / cron) або після перезапуску процесу, що не встиг їх виконати; "
+        "завислі завдання без прогресу довше ORDER_EXPORT_STALE_AFTER повертаються в чергу."
+    )
+
+    def handle(self, *args, **options):
+        done = run_pending_jobs()
+        self.stdout.write(self.style.SUCCESS(f"Виконано експортів: {done}"))
@@ -0,0 +1,71 @@
+from decimal import Decimal
+
+from django.core.management.base import BaseCommand
+from django.db import models, transaction
+from django.db.models import F, OuterRef, Subquery, Sum, Value
+from django.db.models.functions import Coalesce
+from django.utils import timezone
+
+from client_orders.models import ClientOrder, OrderLine, discounted
+
+AMOUNT_FIELD = models.DecimalField(max_digits=12, decimal_places=2)
+
+
+def lines_subtotal():
+    """Підзапит: сума quantity * unit_price по позиціях замовлення."""
+    total = (
+        OrderLine.objects.filter(order=OuterRef("pk"))
+        .values("order")
+        .annotate(total=Sum(F("quantity") * F("unit_price"), output_field=AMOUNT_FIELD))
+        .values("total")
+    )
+    return Coalesce(Subquery(total, output_field=AMOUNT_FIELD), Value(Decimal("0")), output_field=AMOUNT_FIELD)
+
+
+class Command(BaseCommand):
+    help = (
+        "Перераховує суми замовлень з позицій пакетами та звітує про розбіжності "
+        "з денормалізованими subtotal / total_price."
+    )
+
+    def add_arguments(self, parser):
+        parser.add_argument("--batch-size", type=int, default=5000, help="Кількість id замовлень в одному пакеті")
+        parser.add_argument("--dry-run", action="store_true", help="Лише показати розбіжності, не виправляючи їх")
+
+    def handle(self, *args, **options):
+        batch_size = options["batch_size"]
+        # Замовлення без позицій пропускаються: після міграції 0002 їхні subtotal
+        # та total_price — введені вручну історичні суми, а не сума позицій
+        orders = ClientOrder.objects.with_lines()
+        bounds = orders.aggregate(low=models.Min("pk"), high=models.Max("pk"))
+        if bounds["low"] is None:
+            self.stdout.write("Замовлень з позиціями немає.")
+            return
+
+        drifted_count = 0
+        drift_sum = Decimal("0")
+        start = bounds["low"]
+        while start <= bounds["high"]:
+            batch = orders.filter(pk__gte=start, pk__lt=start + batch_size)
+            drifted = list(
+                batch.annotate(computed=lines_subtotal())
+                .exclude(subtotal=F("computed"))
+                .values_list("pk", "order_number", "subtotal", "computed")
+            )
+            for pk, number, stored, computed in drifted:
+                drifted_count += 1
+                drift_sum += abs(computed - stored)
+                self.stdout.write(f"#{number}: збережено {stored}, за позиціями {computed}")
+
+            if drifted and not options["dry_run"]:
+                with transaction.atomic():
+                    computed = lines_subtotal()
+                    ClientOrder.objects.filter(pk__in=[row[0] for row in drifted]).update(
+                        subtotal=computed,
+                        total_price=discounted(computed),
+                        updated_at=timezone.now(),
+                    )
+            start += batch_size
+
+        verb = "Знайдено" if options["dry_run"] else "Виправлено"
+        self.stdout.write(self.style.SUCCESS(f"{verb} розбіжностей: {drifted_count}, сумарно {drift_sum} грн"))
@@ -0,0 +1,85 @@
+import os
+import time
+from collections import Counter
+from concurrent.futures import ProcessPoolExecutor
+from functools import partial
+
+from django.core.management.base import BaseCommand
+from django.db import close_old_connections, connections
+
+from client_orders.models import OrderNumberCounter
+from client_orders.numbering import allocate_numbers, counter_key, sequence_name
+
+PREFIX = "STRESS"
+
+
+def init_worker():
+    """Ініціалізація процесу пулу (у т.ч. для методу запуску spawn)."""
+    import django
+
+    os.environ.setdefault("DJANGO_SETTINGS_MODULE", "DjangoFSM.settings")
+    django.setup()
+
+
+def allocate_in_worker(per_worker, block, worker):
+    """Видає per_worker номерів поодинці (block=1) або блоками; повертає номери."""
+    numbers = []
+    try:
+        while len(numbers) < per_worker:
+            numbers.extend(allocate_numbers(min(block, per_worker - len(numbers)), prefix=PREFIX))
+    finally:
+        close_old_connections()
+    return numbers
+
+
+class Command(BaseCommand):
+    help = (
+        "Стрес-тест генератора номерів замовлень: кілька процесів одночасно отримують номери "
+        "(поодинці або блоками). Перевіряє відсутність дублікатів і порівнює пропускну "
+        "здатність з одним процесом. Лічильник STRESS видаляється після запуску."
+    )
+
+    def add_arguments(self, parser):
+        parser.add_argument("--processes", type=int, default=8, help="Кількість процесів")
+        parser.add_argument("--per-process", type=int, default=2_000, help="Номерів на процес")
+        parser.add_argument("--block", type=int, default=1, help="Розмір блоку (1 — поодинці)")
+
+    def handle(self, *args, **options):
+        try:
+            single = self.run(1, options)
+            parallel = self.run(options["processes"], options)
+            self.stdout.write(f"Масштабування: x{parallel / single:.2f} на {options['processes']} процесах")
+        finally:
+            self.cleanup()
+
+    def run(self, processes, options):
+        # Дочірні процеси не повинні успадкувати відкриті з'єднання з БД
+        connections.close_all()
+        task = partial(allocate_in_worker, options["per_process"], options["block"])
+        started = time.perf_counter()
+        with ProcessPoolExecutor(max_workers=processes, initializer=init_worker) as executor:
+            numbers = [number for chunk in executor.map(task, range(processes)) for number in chunk]
+        elapsed = time.perf_counter() - started
+
+        duplicates = [number for number, count in Counter(numbers).items() if count > 1]
+        throughput = len(numbers) / elapsed
+        self.stdout.write(self.style.MIGRATE_HEADING(f"{processes} процес(ів), блок {options['block']}"))
+        self.stdout.write(f"Номерів: {len(numbers)}, {throughput:.0f} номерів/с")
+        if duplicates:
+            self.stdout.write(self.style.ERROR(f"Дублікатів: {len(duplicates)}, наприклад {duplicates[:5]}"))
+        else:
+            self.stdout.write(self.style.SUCCESS("Дублікатів немає"))
+        return throughput
+
+    def cleanup(self):
+        connection = connections["default"]
+        if connection.vendor == "postgresql":
+            with connection.cursor() as cursor:
+                cursor.execute(
+                    "SELECT sequence_name FROM information_schema.sequences WHERE sequence_name LIKE %s",
+                    [sequence_name(counter_key(PREFIX, "")) + "%"],
+                )
+                for (name,) in cursor.fetchall():
+                    cursor.execute(f"DROP SEQUENCE {connection.ops.quote_name(name)}")
+        else:
+            OrderNumberCounter.objects.filter(name__startswith=f"{PREFIX}-").delete()
@@ -0,0 +1,51 @@
+# Generated by Django 5.2.8 on 2026-10-18 10:43
+
+import django.db.models.deletion
+from decimal import Decimal
+from django.db import migrations, models
+from django.db.models import Case, F, When
+
+
+def backfill_subtotal(apps, schema_editor):
+    """Для існуючих замовлень відновлює суму без знижки з введеної вручну total_price."""
+    ClientOrder = apps.get_model("client_orders", "ClientOrder")
+    ClientOrder.objects.update(
+        subtotal=Case(
+            When(discount__lt=100, then=F("total_price") * 100 / (100 - F("discount"))),
+            default=F("total_price"),
+            output_field=models.DecimalField(max_digits=12, decimal_places=2),
+        )
+    )
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('client_orders', '0001_initial'),
+        ('fabric', '0001_initial'),
+        ('products', '0003_product_final_price_alter_product_category'),
+    ]
+
+    operations = [
+        migrations.AddField(
+            model_name='clientorder',
+            name='subtotal',
+            field=models.DecimalField(decimal_places=2, default=Decimal('0.00'), editable=False, max_digits=12, verbose_name='Сума позицій'),
+        ),
+        migrations.CreateModel(
+            name='OrderLine',
+            fields=[
+                ('id', models.BigAutoField(auto_created=True, primary_key=True, serialize=False, verbose_name='ID')),
+                ('quantity', models.PositiveIntegerField(default=1, verbose_name='Кількість')),
+                ('unit_price', models.DecimalField(blank=True, decimal_places=2, max_digits=10, verbose_name='Ціна за одиницю (грн)')),
+                ('fabric', models.ForeignKey(blank=True, null=True, on_delete=django.db.models.deletion.PROTECT, related_name='order_lines', to='fabric.fabric', verbose_name='Тканина')),
+                ('order', models.ForeignKey(on_delete=django.db.models.deletion.CASCADE, related_name='lines', to='client_orders.clientorder', verbose_name='Замовлення')),
+                ('product', models.ForeignKey(on_delete=django.db.models.deletion.PROTECT, related_name='order_lines', to='products.product', verbose_name='Виріб')),
+            ],
+            options={
+                'verbose_name': 'Позиція замовлення',
+                'verbose_name_plural': 'Позиції замовлення',
+            },
+        ),
+        migrations.RunPython(backfill_subtotal, migrations.RunPython.noop),
+    ]
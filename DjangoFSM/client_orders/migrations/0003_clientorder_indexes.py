@@ -0,0 +1,27 @@
+# Generated by Django 5.2.8 on 2026-10-18 10:45
+
+from django.conf import settings
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('client_orders', '0002_orderline_clientorder_subtotal'),
+        migrations.swappable_dependency(settings.AUTH_USER_MODEL),
+    ]
+
+    operations = [
+        migrations.AddIndex(
+            model_name='clientorder',
+            index=models.Index(fields=['status', '-created_at'], name='order_status_created_idx'),
+        ),
+        migrations.AddIndex(
+            model_name='clientorder',
+            index=models.Index(fields=['client', '-created_at'], name='order_client_created_idx'),
+        ),
+        migrations.AddIndex(
+            model_name='clientorder',
+            index=models.Index(fields=['-created_at'], name='order_created_idx'),
+        ),
+    ]
@@ -0,0 +1,35 @@
+# Generated by Django 5.2.8 on 2026-10-18 10:55
+
+import django.db.models.deletion
+import django.utils.timezone
+from django.conf import settings
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('client_orders', '0003_clientorder_indexes'),
+        migrations.swappable_dependency(settings.AUTH_USER_MODEL),
+    ]
+
+    operations = [
+        migrations.CreateModel(
+            name='OrderStatusLog',
+            fields=[
+                ('id', models.BigAutoField(auto_created=True, primary_key=True, serialize=False, verbose_name='ID')),
+                ('from_status', models.CharField(choices=[('draft', 'Чернетка'), ('in_progress', 'В роботі'), ('completed', 'Завершено'), ('canceled', 'Скасовано')], max_length=20, verbose_name='Зі статусу')),
+                ('to_status', models.CharField(choices=[('draft', 'Чернетка'), ('in_progress', 'В роботі'), ('completed', 'Завершено'), ('canceled', 'Скасовано')], max_length=20, verbose_name='У статус')),
+                ('comment', models.CharField(blank=True, max_length=255, verbose_name='Коментар')),
+                ('created_at', models.DateTimeField(db_index=True, default=django.utils.timezone.now, verbose_name='Дата переходу')),
+                ('changed_by', models.ForeignKey(blank=True, null=True, on_delete=django.db.models.deletion.SET_NULL, related_name='+', to=settings.AUTH_USER_MODEL, verbose_name='Хто змінив')),
+                ('order', models.ForeignKey(on_delete=django.db.models.deletion.CASCADE, related_name='status_log', to='client_orders.clientorder', verbose_name='Замовлення')),
+            ],
+            options={
+                'verbose_name': 'Перехід статусу',
+                'verbose_name_plural': 'Журнал статусів',
+                'ordering': ['-created_at'],
+                'indexes': [models.Index(fields=['order', 'created_at'], name='status_log_order_idx')],
+            },
+        ),
+    ]
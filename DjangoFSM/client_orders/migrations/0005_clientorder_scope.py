@@ -0,0 +1,59 @@
+# Generated by Django 5.2.8 on 2026-10-18 10:57
+
+import django.db.models.deletion
+from django.conf import settings
+from django.db import migrations, models
+from django.db.models import OuterRef, Subquery
+
+
+def backfill_scope(apps, schema_editor):
+    """Існуючі замовлення дилерів / менеджерів прив'язуються до профілю клієнта."""
+    ClientOrder = apps.get_model("client_orders", "ClientOrder")
+    DealerProfile = apps.get_model("users", "DealerProfile")
+    SalesManagerProfile = apps.get_model("users", "SalesManagerProfile")
+    ClientOrder.objects.filter(client__dealer_profile__isnull=False).update(
+        dealer=Subquery(DealerProfile.objects.filter(user_id=OuterRef("client_id")).values("pk")[:1])
+    )
+    ClientOrder.objects.filter(client__sales_profile__isnull=False).update(
+        salon=Subquery(SalesManagerProfile.objects.filter(user_id=OuterRef("client_id")).values("pk")[:1])
+    )
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('client_orders', '0004_orderstatuslog'),
+        ('users', '0001_initial'),
+        migrations.swappable_dependency(settings.AUTH_USER_MODEL),
+    ]
+
+    operations = [
+        migrations.AddField(
+            model_name='clientorder',
+            name='created_by',
+            field=models.ForeignKey(blank=True, db_index=False, editable=False, null=True, on_delete=django.db.models.deletion.SET_NULL, related_name='created_orders', to=settings.AUTH_USER_MODEL, verbose_name='Створив'),
+        ),
+        migrations.AddField(
+            model_name='clientorder',
+            name='dealer',
+            field=models.ForeignKey(blank=True, db_index=False, null=True, on_delete=django.db.models.deletion.SET_NULL, related_name='orders', to='users.dealerprofile', verbose_name='Дилер'),
+        ),
+        migrations.AddField(
+            model_name='clientorder',
+            name='salon',
+            field=models.ForeignKey(blank=True, db_index=False, null=True, on_delete=django.db.models.deletion.SET_NULL, related_name='orders', to='users.salesmanagerprofile', verbose_name='Салон'),
+        ),
+        migrations.AddIndex(
+            model_name='clientorder',
+            index=models.Index(fields=['dealer', '-created_at'], name='order_dealer_created_idx'),
+        ),
+        migrations.AddIndex(
+            model_name='clientorder',
+            index=models.Index(fields=['salon', '-created_at'], name='order_salon_created_idx'),
+        ),
+        migrations.AddIndex(
+            model_name='clientorder',
+            index=models.Index(fields=['created_by', '-created_at'], name='order_author_created_idx'),
+        ),
+        migrations.RunPython(backfill_scope, migrations.RunPython.noop),
+    ]
@@ -0,0 +1,20 @@
+# Generated by Django 5.2.8 on 2026-10-18 11:00
+
+from django.conf import settings
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('client_orders', '0005_clientorder_scope'),
+        ('users', '0001_initial'),
+        migrations.swappable_dependency(settings.AUTH_USER_MODEL),
+    ]
+
+    operations = [
+        migrations.AddIndex(
+            model_name='clientorder',
+            index=models.Index(fields=['updated_at'], name='order_updated_idx'),
+        ),
+    ]
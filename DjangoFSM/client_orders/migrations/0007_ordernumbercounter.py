@@ -0,0 +1,30 @@
+# Generated by Django 5.2.8 on 2026-10-18 11:01
+
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('client_orders', '0006_clientorder_updated_idx'),
+    ]
+
+    operations = [
+        migrations.CreateModel(
+            name='OrderNumberCounter',
+            fields=[
+                ('id', models.BigAutoField(auto_created=True, primary_key=True, serialize=False, verbose_name='ID')),
+                ('name', models.CharField(max_length=100, unique=True, verbose_name='Лічильник')),
+                ('value', models.BigIntegerField(default=0, verbose_name='Останнє значення')),
+            ],
+            options={
+                'verbose_name': 'Лічильник номерів',
+                'verbose_name_plural': 'Лічильники номерів',
+            },
+        ),
+        migrations.AlterField(
+            model_name='clientorder',
+            name='order_number',
+            field=models.CharField(blank=True, help_text='Залиште порожнім, щоб згенерувати автоматично', max_length=50, unique=True, verbose_name='Номер замовлення'),
+        ),
+    ]
@@ -0,0 +1,38 @@
+# Generated by Django 5.2.8 on 2026-10-18 11:29
+
+import client_orders.models
+import django.db.models.deletion
+from django.conf import settings
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('client_orders', '0007_ordernumbercounter'),
+        migrations.swappable_dependency(settings.AUTH_USER_MODEL),
+    ]
+
+    operations = [
+        migrations.CreateModel(
+            name='OrderExport',
+            fields=[
+                ('id', models.BigAutoField(auto_created=True, primary_key=True, serialize=False, verbose_name='ID')),
+                ('format', models.CharField(default='csv', max_length=10, verbose_name='Формат')),
+                ('status', models.CharField(choices=[('pending', 'В черзі'), ('running', 'Виконується'), ('done', 'Готово'), ('failed', 'Помилка')], default='pending', max_length=20, verbose_name='Статус')),
+                ('query', models.BinaryField()),
+                ('total', models.PositiveIntegerField(default=0, verbose_name='Замовлень')),
+                ('processed', models.PositiveIntegerField(default=0, verbose_name='Оброблено')),
+                ('file', models.FileField(blank=True, max_length=255, storage=client_orders.models.export_storage, upload_to='order_exports/', verbose_name='Файл')),
+                ('error', models.TextField(blank=True, verbose_name='Помилка')),
+                ('created_at', models.DateTimeField(auto_now_add=True, verbose_name='Створено')),
+                ('finished_at', models.DateTimeField(blank=True, null=True, verbose_name='Завершено')),
+                ('created_by', models.ForeignKey(blank=True, null=True, on_delete=django.db.models.deletion.SET_NULL, related_name='+', to=settings.AUTH_USER_MODEL, verbose_name='Хто створив')),
+            ],
+            options={
+                'verbose_name': 'Експорт замовлень',
+                'verbose_name_plural': 'Експорти замовлень',
+                'ordering': ['-created_at'],
+            },
+        ),
+    ]
@@ -0,0 +1,18 @@
+# Generated by Django 5.2.8 on 2026-10-18 12:06
+
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('client_orders', '0008_orderexport'),
+    ]
+
+    operations = [
+        migrations.AlterField(
+            model_name='clientorder',
+            name='total_price',
+            field=models.DecimalField(decimal_places=2, default=0.0, max_digits=12, verbose_name='Загальна сума'),
+        ),
+    ]
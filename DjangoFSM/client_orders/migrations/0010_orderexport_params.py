@@ -0,0 +1,34 @@
+from django.db import migrations, models
+
+
+def fail_queued_exports(apps, schema_editor):
+    """Завдання з серіалізованим запитом відтворити неможливо — їх треба створити повторно."""
+    OrderExport = apps.get_model("client_orders", "OrderExport")
+    OrderExport.objects.filter(status__in=["pending", "running"]).update(
+        status="failed", error="Завдання створене до оновлення — запустіть експорт повторно"
+    )
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('client_orders', '0009_clientorder_total_price_digits'),
+    ]
+
+    operations = [
+        migrations.RunPython(fail_queued_exports, migrations.RunPython.noop),
+        migrations.RemoveField(
+            model_name='orderexport',
+            name='query',
+        ),
+        migrations.AddField(
+            model_name='orderexport',
+            name='params',
+            field=models.TextField(blank=True, editable=False, verbose_name='Фільтри списку'),
+        ),
+        migrations.AddField(
+            model_name='orderexport',
+            name='heartbeat_at',
+            field=models.DateTimeField(blank=True, editable=False, null=True),
+        ),
+    ]
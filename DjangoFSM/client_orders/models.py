@@ -1,8 +1,15 @@
-from django.db import models
+from decimal import Decimal
+
+from django.core.files.storage import storages
+from django.db import models, transaction
+from django.db.models import Exists, F, OuterRef, Q, Value
 from django.conf import settings
+from django.utils import timezone
 
 # Create your models here.
 
+CENT = Decimal("0.01")
+
 class OrderStatus(models.TextChoices):
     DRAFT = "draft", "Чернетка"
     IN_PROGRESS = "in_progress", "В роботі"
@@ -10,6 +17,90 @@ class OrderStatus(models.TextChoices):
     CANCELED = "canceled", "Скасовано"
 
 
+def discounted(subtotal):
+    """SQL-вираз суми зі знижкою: subtotal * (100 - discount) / 100."""
+    return models.ExpressionWrapper(
+        subtotal * (Value(Decimal("100")) - F("discount")) / Value(Decimal("100")),
+        output_field=models.DecimalField(max_digits=12, decimal_places=2),
+    )
+
+
+# Роль -> поле профілю замовлення: ці ролі бачать лише замовлення свого дилера / салону
+SCOPED_ROLES = {
+    "DEALER_MANAGER": "dealer",
+    "RETAIL_MANAGER": "salon",
+}
+
+
+def _scope_target(user):
+    """
+    (поле, значення) для умови видимості замовлень користувача або None,
+    якщо обмеження немає. Результат кешується на об'єкті користувача (ключ — роль),
+    тож профіль читається не частіше одного разу за запит.
+    """
+    cached = getattr(user, "_order_scope", None)
+    if cached is not None and cached[0] == user.role:
+        return cached[1]
+
+    target = None
+    if not user.is_superuser and user.role in SCOPED_ROLES:
+        field = SCOPED_ROLES[user.role]
+        profile_model = ClientOrder._meta.get_field(field).related_model
+        relation = profile_model._meta.get_field("user").remote_field
+        if relation.is_cached(user):
+            # Профіль уже завантажений разом з користувачем (users.backends) — без запиту
+            profile = relation.get_cached_value(user)
+            profile_id = profile.pk if profile is not None else None
+        else:
+            profile_id = profile_model.objects.filter(user_id=user.pk).values_list("pk", flat=True).first()
+        # Без профілю — лише замовлення, створені самим користувачем
+        target = (field, profile_id) if profile_id is not None else ("created_by", user.pk)
+    user._order_scope = (user.role, target)
+    return target
+
+
+def order_scope(user, prefix=""):
+    """Q-умова видимості замовлень для користувача: одна рівність по індексованій колонці."""
+    if not user.is_authenticated:
+        return Q(pk__in=[])
+    target = _scope_target(user)
+    if target is None:
+        return Q()
+    field, value = target
+    return Q(**{f"{prefix}{field}": value})
+
+
+class ClientOrderQuerySet(models.QuerySet):
+
+    def visible_to(self, user):
+        """Замовлення, доступні користувачу за роллю та профілем (для адмінки та API)."""
+        return self.filter(order_scope(user))
+
+    def add_to_subtotal(self, delta):
+        """
+        Атомарно додає delta до суми позицій і перераховує total_price зі знижкою
+        одним UPDATE (без перерахунку SUM по всіх позиціях).
+        """
+        subtotal = F("subtotal") + Value(delta)
+        return self.update(
+            subtotal=subtotal,
+            total_price=discounted(subtotal),
+            updated_at=timezone.now(),
+        )
+
+    def with_lines(self):
+        """
+        Замовлення, що мають позиції. Історичні замовлення без позицій зберігають
+        введену вручну total_price (міграція 0002 заповнила subtotal з неї),
+        тому перерахунок сум їх не торкається.
+        """
+        return self.filter(Exists(OrderLine.objects.filter(order=OuterRef("pk"))))
+
+    def apply_discount(self):
+        """Перераховує total_price з поточних subtotal та discount (лише для замовлень з позиціями)."""
+        return self.with_lines().update(total_price=discounted(F("subtotal")), updated_at=timezone.now())
+
+
 class ClientOrder(models.Model):
     """Основна модель замовлення клієнта"""
     client = models.ForeignKey(
@@ -20,23 +111,342 @@ class ClientOrder(models.Model):
         related_name="client_orders",
         verbose_name="Клієнт"
     )
-    order_number = models.CharField(max_length=50, unique=True, verbose_name="Номер замовлення")
+    # Поля видимості (order_scope); окремі індекси FK не потрібні —
+    # їх покривають складені індекси (поле, -created_at) у Meta
+    created_by = models.ForeignKey(
+        settings.AUTH_USER_MODEL,
+        on_delete=models.SET_NULL,
+        null=True,
+        blank=True,
+        db_index=False,
+        editable=False,
+        related_name="created_orders",
+        verbose_name="Створив"
+    )
+    dealer = models.ForeignKey(
+        "users.DealerProfile",
+        on_delete=models.SET_NULL,
+        null=True,
+        blank=True,
+        db_index=False,
+        related_name="orders",
+        verbose_name="Дилер"
+    )
+    salon = models.ForeignKey(
+        "users.SalesManagerProfile",
+        on_delete=models.SET_NULL,
+        null=True,
+        blank=True,
+        db_index=False,
+        related_name="orders",
+        verbose_name="Салон"
+    )
+    order_number = models.CharField(
+        max_length=50,
+        unique=True,
+        blank=True,
+        help_text="Залиште порожнім, щоб згенерувати автоматично",
+        verbose_name="Номер замовлення"
+    )
     status = models.CharField(
         max_length=20,
         choices=OrderStatus.choices,
         default=OrderStatus.DRAFT,
         verbose_name="Статус"
     )
-    total_price = models.DecimalField(max_digits=10, decimal_places=2, default=0.00, verbose_name="Загальна сума")
+    # Сума позицій без знижки — підтримується інкрементально позиціями замовлення
+    subtotal = models.DecimalField(
+        max_digits=12,
+        decimal_places=2,
+        default=Decimal("0.00"),
+        editable=False,
+        verbose_name="Сума позицій",
+    )
+    total_price = models.DecimalField(max_digits=12, decimal_places=2, default=0.00, verbose_name="Загальна сума")
     discount = models.DecimalField(max_digits=5, decimal_places=2, default=0.00, verbose_name="Знижка (%)")
     created_at = models.DateTimeField(auto_now_add=True, verbose_name="Дата створення")
     updated_at = models.DateTimeField(auto_now=True, verbose_name="Дата оновлення")
     comment = models.TextField(blank=True, null=True, verbose_name="Коментар")
 
+    objects = ClientOrderQuerySet.as_manager()
+
+    # Поля, які пишуться лише SQL-виразами, а не з копії в пам'яті
+    DENORMALIZED_FIELDS = ("subtotal", "total_price")
+    # Статус змінюється лише переходами client_orders.fsm
+    STATE_FIELDS = ("status",)
+
+    @classmethod
+    def from_db(cls, db, field_names, values):
+        instance = super().from_db(db, field_names, values)
+        # Запам'ятовуємо знижку з БД, щоб перераховувати суму лише при її зміні
+        instance._loaded_discount = instance.__dict__.get("discount")
+        return instance
+
+    def save(self, *args, **kwargs):
+        """
+        Для існуючого замовлення не перезаписує subtotal/total_price значеннями
+        з пам'яті (їх могли змінити позиції) та status (лише через переходи FSM),
+        а при зміні знижки перераховує total_price в БД (якщо є позиції).
+        Новому замовленню без номера видає номер з client_orders.numbering.
+        """
+        if self._state.adding:
+            if not self.order_number:
+                from .numbering import next_order_number
+
+                self.order_number = next_order_number(self, using=kwargs.get("using") or "default")
+            self.total_price = Decimal(self.subtotal) * (100 - Decimal(self.discount)) / 100
+            return super().save(*args, **kwargs)
+
+        if kwargs.get("update_fields") is None:
+            kwargs["update_fields"] = [
+                f.name for f in self._meta.concrete_fields
+                if not f.primary_key
+                and f.name not in self.DENORMALIZED_FIELDS + self.STATE_FIELDS
+            ]
+        with transaction.atomic():
+            super().save(*args, **kwargs)
+            if getattr(self, "_loaded_discount", None) != self.discount:
+                ClientOrder.objects.filter(pk=self.pk).apply_discount()
+                self.refresh_from_db(fields=self.DENORMALIZED_FIELDS)
+                self._loaded_discount = self.discount
+
+    def assign_owner(self, user):
+        """Заповнює автора, а також дилера / салон для замовлення, створеного менеджером."""
+        self.created_by = user
+        target = _scope_target(user)
+        if target is not None and target[0] in ("dealer", "salon"):
+            setattr(self, f"{target[0]}_id", target[1])
+
+    def transition_to(self, status, user=None, comment=""):
+        """Переводить замовлення в новий статус (див. client_orders.fsm.transition)."""
+        from .fsm import transition
+
+        return transition(self, status, user=user, comment=comment)
+
     def __str__(self):
         return f"Замовлення #{self.order_number} ({self.get_status_display()})"
 
     class Meta:
         verbose_name = "Замовлення клієнта"
         verbose_name_plural = "Замовлення клієнтів"
-        ordering = ["-created_at"]
\ No newline at end of file
+        ordering = ["-created_at"]
+        indexes = [
+            # Список замовлень в адмінці: фільтр за статусом, сортування за датою
+            models.Index(fields=["status", "-created_at"], name="order_status_created_idx"),
+            # Історія замовлень клієнта
+            models.Index(fields=["client", "-created_at"], name="order_client_created_idx"),
+            # Сортування / фільтр за датою без статусу
+            models.Index(fields=["-created_at"], name="order_created_idx"),
+            # Видимість для дилерів / салонів / авторів (order_scope)
+            models.Index(fields=["dealer", "-created_at"], name="order_dealer_created_idx"),
+            models.Index(fields=["salon", "-created_at"], name="order_salon_created_idx"),
+            models.Index(fields=["created_by", "-created_at"], name="order_author_created_idx"),
+            # Інкрементне оновлення звітів (reporting.rollups)
+            models.Index(fields=["updated_at"], name="order_updated_idx"),
+        ]
+
+
+class OrderLine(models.Model):
+    """Позиція замовлення: виріб у вибраній тканині, кількість та ціна за одиницю."""
+    order = models.ForeignKey(
+        ClientOrder,
+        on_delete=models.CASCADE,
+        related_name="lines",
+        verbose_name="Замовлення"
+    )
+    product = models.ForeignKey(
+        "products.Product",
+        on_delete=models.PROTECT,
+        related_name="order_lines",
+        verbose_name="Виріб"
+    )
+    fabric = models.ForeignKey(
+        "fabric.Fabric",
+        on_delete=models.PROTECT,
+        null=True,
+        blank=True,
+        related_name="order_lines",
+        verbose_name="Тканина"
+    )
+    quantity = models.PositiveIntegerField(default=1, verbose_name="Кількість")
+    # Якщо не вказана — береться з ціни виробу в обраній тканині
+    unit_price = models.DecimalField(
+        max_digits=10,
+        decimal_places=2,
+        blank=True,
+        verbose_name="Ціна за одиницю (грн)"
+    )
+
+    @classmethod
+    def from_db(cls, db, field_names, values):
+        instance = super().from_db(db, field_names, values)
+        # Запам'ятовуємо внесок позиції в суму замовлення на момент завантаження;
+        # для неповної вибірки (only/defer) знімок робиться в save / перед видаленням
+        if all(name in instance.__dict__ for name in ("order_id", "quantity", "unit_price")):
+            instance._loaded_order_id = instance.order_id
+            instance._loaded_amount = instance.amount
+        return instance
+
+    def remember_loaded_amount(self):
+        """Знімок (order_id, сума) з БД для позиції, завантаженої без потрібних полів."""
+        if self._state.adding or hasattr(self, "_loaded_amount"):
+            return
+        row = OrderLine.objects.filter(pk=self.pk).values_list("order_id", "quantity", "unit_price").first()
+        if row is None:
+            return
+        self._loaded_order_id = row[0]
+        self._loaded_amount = Decimal(row[2]) * row[1] if row[2] is not None else Decimal("0")
+
+    @property
+    def amount(self):
+        if self.quantity is None or self.unit_price is None:
+            return Decimal("0")
+        return Decimal(self.unit_price) * self.quantity
+
+    def get_unit_price(self):
+        """Ціна виробу в тканині позиції (або кінцева ціна виробу без тканини)."""
+        from products.price_matrix import quote
+
+        if self.fabric_id is not None:
+            # Готова ціна пари з матриці — одне читання за первинним ключем
+            price = quote(self.product_id, self.fabric_id)
+            if price is not None:
+                return price
+        if self.fabric_id is None or self.fabric_id == self.product.fabric_id:
+            return self.product.final_price
+        return self.product.base_price * Decimal(str(self.fabric.price_multiplier))
+
+    def save(self, *args, **kwargs):
+        """Зберігає позицію і в тій самій транзакції коригує суму замовлення на різницю."""
+        if self.unit_price is None:
+            self.unit_price = self.get_unit_price()
+        # Округлюємо до копійок, як у БД, щоб сума замовлення не розходилась зі збереженими позиціями
+        self.unit_price = Decimal(self.unit_price).quantize(CENT)
+        self.remember_loaded_amount()
+        old_order_id = getattr(self, "_loaded_order_id", None)
+        old_amount = getattr(self, "_loaded_amount", Decimal("0"))
+
+        with transaction.atomic():
+            super().save(*args, **kwargs)
+            if old_order_id is not None and old_order_id != self.order_id:
+                # Позицію перенесли в інше замовлення
+                ClientOrder.objects.filter(pk=old_order_id).add_to_subtotal(-old_amount)
+                old_amount = Decimal("0")
+            delta = self.amount - old_amount
+            if delta:
+                ClientOrder.objects.filter(pk=self.order_id).add_to_subtotal(delta)
+
+        self._loaded_order_id = self.order_id
+        self._loaded_amount = self.amount
+
+    def __str__(self):
+        return f"{self.product} × {self.quantity}"
+
+    class Meta:
+        verbose_name = "Позиція замовлення"
+        verbose_name_plural = "Позиції замовлення"
+
+
+class OrderNumberCounter(models.Model):
+    """Лічильник номерів замовлень (префікс-рік) для СУБД без послідовностей."""
+    name = models.CharField(max_length=100, unique=True, verbose_name="Лічильник")
+    value = models.BigIntegerField(default=0, verbose_name="Останнє значення")
+
+    def __str__(self):
+        return f"{self.name}: {self.value}"
+
+    class Meta:
+        verbose_name = "Лічильник номерів"
+        verbose_name_plural = "Лічильники номерів"
+
+
+class OrderStatusLog(models.Model):
+    """Журнал переходів статусу замовлення (лише додавання)."""
+    order = models.ForeignKey(
+        ClientOrder,
+        on_delete=models.CASCADE,
+        related_name="status_log",
+        verbose_name="Замовлення"
+    )
+    from_status = models.CharField(max_length=20, choices=OrderStatus.choices, verbose_name="Зі статусу")
+    to_status = models.CharField(max_length=20, choices=OrderStatus.choices, verbose_name="У статус")
+    changed_by = models.ForeignKey(
+        settings.AUTH_USER_MODEL,
+        on_delete=models.SET_NULL,
+        null=True,
+        blank=True,
+        related_name="+",
+        verbose_name="Хто змінив"
+    )
+    comment = models.CharField(max_length=255, blank=True, verbose_name="Коментар")
+    created_at = models.DateTimeField(default=timezone.now, db_index=True, verbose_name="Дата переходу")
+
+    def __str__(self):
+        return f"#{self.order_id}: {self.get_from_status_display()} → {self.get_to_status_display()}"
+
+    class Meta:
+        verbose_name = "Перехід статусу"
+        verbose_name_plural = "Журнал статусів"
+        ordering = ["-created_at"]
+        indexes = [
+            models.Index(fields=["order", "created_at"], name="status_log_order_idx"),
+        ]
+
+
+class ExportStatus(models.TextChoices):
+    PENDING = "pending", "В черзі"
+    RUNNING = "running", "Виконується"
+    DONE = "done", "Готово"
+    FAILED = "failed", "Помилка"
+
+
+def export_storage():
+    """Окреме (не публічне) сховище для файлів експорту — STORAGES["exports"]."""
+    return storages["exports"]
+
+
+class OrderExport(models.Model):
+    """
+    Фоновий експорт замовлень у стиснений файл (client_orders.export) — для
+    вибірок, завеликих для потокової відповіді. Вибірка зберігається як
+    параметри фільтрів списку адмінки (params) і відтворюється від імені автора,
+    прогрес — лічильником processed, heartbeat_at — час останнього прогресу
+    (за ним завдання померлого воркера повертається в чергу).
+    """
+    created_by = models.ForeignKey(
+        settings.AUTH_USER_MODEL,
+        on_delete=models.SET_NULL,
+        null=True,
+        blank=True,
+        related_name="+",
+        verbose_name="Хто створив"
+    )
+    format = models.CharField(max_length=10, default="csv", verbose_name="Формат")
+    status = models.CharField(
+        max_length=20, choices=ExportStatus.choices, default=ExportStatus.PENDING, verbose_name="Статус"
+    )
+    params = models.TextField(blank=True, editable=False, verbose_name="Фільтри списку")
+    total = models.PositiveIntegerField(default=0, verbose_name="Замовлень")
+    processed = models.PositiveIntegerField(default=0, verbose_name="Оброблено")
+    file = models.FileField(
+        upload_to="order_exports/", storage=export_storage, max_length=255, blank=True, verbose_name="Файл"
+    )
+    error = models.TextField(blank=True, verbose_name="Помилка")
+    created_at = models.DateTimeField(auto_now_add=True, verbose_name="Створено")
+    finished_at = models.DateTimeField(null=True, blank=True, verbose_name="Завершено")
+    heartbeat_at = models.DateTimeField(null=True, blank=True, editable=False)
+
+    @property
+    def progress(self):
+        """Відсоток виконання (0-100)."""
+        if self.status == ExportStatus.DONE:
+            return 100
+        return int(self.processed * 100 / self.total) if self.total else 0
+
+    def __str__(self):
+        return f"Експорт #{self.pk} ({self.get_status_display()})"
+
+    class Meta:
+        verbose_name = "Експорт замовлень"
+        verbose_name_plural = "Експорти замовлень"
+        ordering = ["-created_at"]
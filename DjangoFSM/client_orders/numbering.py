@@ -0,0 +1,129 @@
+"""
+Генерація номерів замовлень без гонок і блокувань таблиці.
+
+Номер має вигляд <префікс>-<рік>-<лічильник>, наприклад D12-2026-000042:
+префікс дилера (D<id профілю>), салону (S<id профілю>) або загальний
+ORDER_NUMBER_PREFIX. Для кожної пари (префікс, рік) ведеться окремий лічильник:
+
+* PostgreSQL — послідовність (nextval не блокує інші транзакції і не
+  відкочується, тому можливі пропуски, але не дублікати). Вона створюється
+  при першому номері року; якщо два перші замовлення створюють її одночасно,
+  друге отримує помилку унікальності каталогу і повторює спробу, бачачи вже
+  створену послідовність;
+* SQLite та інші — таблиця OrderNumberCounter, яка збільшується одним
+  INSERT ... ON CONFLICT DO UPDATE ... RETURNING.
+
+allocate_numbers(count) видає одразу блок значень — для масового імпорту.
+"""
+import re
+
+from django.conf import settings
+from django.db import IntegrityError, connections, transaction
+from django.db.models import F
+from django.utils import timezone
+
+from .models import OrderNumberCounter
+
+COUNTER_WIDTH = 6
+SEQUENCE_CREATE_ATTEMPTS = 3
+
+# Послідовності PostgreSQL, вже створені в цьому процесі: (alias, name)
+_known_sequences = set()
+
+
+def counter_key(prefix, year):
+    return f"{prefix}-{year}"
+
+
+def sequence_name(key):
+    return "order_number_" + re.sub(r"[^a-z0-9_]", "_", key.lower())
+
+
+def _create_sequence(connection, name):
+    """
+    CREATE SEQUENCE IF NOT EXISTS у точці збереження. Паралельна транзакція,
+    що створює ту саму послідовність, змушує чекати на свій коміт, після чого
+    тут виникає дубль у pg_type (IntegrityError). Повторна спроба бачить уже
+    створену послідовність (або створює її, якщо та транзакція відкотилася).
+    """
+    for attempt in range(SEQUENCE_CREATE_ATTEMPTS):
+        try:
+            with transaction.atomic(using=connection.alias), connection.cursor() as cursor:
+                cursor.execute(f"CREATE SEQUENCE IF NOT EXISTS {connection.ops.quote_name(name)}")
+            return
+        except IntegrityError:
+            if attempt == SEQUENCE_CREATE_ATTEMPTS - 1:
+                raise
+
+
+def _postgres_values(connection, key, count):
+    name = sequence_name(key)
+    if (connection.alias, name) not in _known_sequences:
+        _create_sequence(connection, name)
+        # Запам'ятовуємо лише після коміту: відкат прибере і саму послідовність
+        transaction.on_commit(lambda: _known_sequences.add((connection.alias, name)), using=connection.alias)
+    with connection.cursor() as cursor:
+        if count == 1:
+            cursor.execute("SELECT nextval(%s)", [name])
+        else:
+            cursor.execute("SELECT nextval(%s) FROM generate_series(1, %s)", [name, count])
+        return [row[0] for row in cursor.fetchall()]
+
+
+def _sqlite_values(connection, key, count):
+    table = connection.ops.quote_name(OrderNumberCounter._meta.db_table)
+    with connection.cursor() as cursor:
+        cursor.execute(
+            f"INSERT INTO {table} (name, value) VALUES (%s, %s) "
+            f"ON CONFLICT (name) DO UPDATE SET value = value + excluded.value "
+            f"RETURNING value",
+            [key, count],
+        )
+        last = cursor.fetchone()[0]
+    return list(range(last - count + 1, last + 1))
+
+
+def _counter_values(using, key, count):
+    """Переносний варіант для інших СУБД: UPDATE та читання в одній транзакції."""
+    with transaction.atomic(using=using):
+        counters = OrderNumberCounter.objects.using(using)
+        if not counters.filter(name=key).update(value=F("value") + count):
+            counters.get_or_create(name=key)
+            counters.filter(name=key).update(value=F("value") + count)
+        last = counters.filter(name=key).values_list("value", flat=True).get()
+    return list(range(last - count + 1, last + 1))
+
+
+def next_values(key, count=1, using="default"):
+    """count унікальних значень лічильника key."""
+    connection = connections[using]
+    if connection.vendor == "postgresql":
+        return _postgres_values(connection, key, count)
+    if connection.vendor == "sqlite":
+        return _sqlite_values(connection, key, count)
+    return _counter_values(using, key, count)
+
+
+def format_number(prefix, year, value):
+    return f"{prefix}-{year}-{value:0{COUNTER_WIDTH}d}"
+
+
+def order_prefix(order=None):
+    """Префікс номера: дилер, салон або загальний."""
+    if order is not None and order.dealer_id:
+        return f"D{order.dealer_id}"
+    if order is not None and order.salon_id:
+        return f"S{order.salon_id}"
+    return getattr(settings, "ORDER_NUMBER_PREFIX", "ZM")
+
+
+def allocate_numbers(count, prefix=None, using="default"):
+    """Блок із count номерів для масового створення замовлень."""
+    prefix = prefix or order_prefix()
+    year = timezone.localdate().year
+    key = counter_key(prefix, year)
+    return [format_number(prefix, year, value) for value in next_values(key, count, using)]
+
+
+def next_order_number(order=None, using="default"):
+    return allocate_numbers(1, order_prefix(order), using)[0]
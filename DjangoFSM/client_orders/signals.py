@@ -0,0 +1,28 @@
+from decimal import Decimal
+
+from django.db.models.signals import post_delete, pre_delete
+from django.dispatch import receiver
+
+from DjangoFSM.images import release_files_on_delete
+from .models import ClientOrder, OrderExport, OrderLine
+
+
+@receiver(pre_delete, sender=OrderLine)
+def remember_deleted_line(sender, instance, **kwargs):
+    """Знімок суми позиції, завантаженої через only/defer, поки рядок ще в БД."""
+    instance.remember_loaded_amount()
+
+
+@receiver(post_delete, sender=OrderLine)
+def subtract_deleted_line(sender, instance, **kwargs):
+    """Віднімає суму видаленої позиції від замовлення (спрацьовує і для queryset.delete())."""
+    if hasattr(instance, "_loaded_amount"):
+        order_id, amount = instance._loaded_order_id, instance._loaded_amount
+    else:
+        order_id, amount = instance.order_id, instance.amount
+    if amount:
+        ClientOrder.objects.filter(pk=order_id).add_to_subtotal(-Decimal(amount))
+
+
+# Файл видаленого експорту прибирається зі сховища після коміту
+post_delete.connect(release_files_on_delete, sender=OrderExport, dispatch_uid="order_export_files")
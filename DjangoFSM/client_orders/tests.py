@@ -1,3 +1,415 @@
-from django.test import TestCase
+import csv
+import gzip
+import io
+import json
+import tempfile
+from datetime import timedelta
+from decimal import Decimal
+from unittest import mock
 
-# Create your tests here.
+from django.contrib.auth import get_user_model
+from django.core.management import call_command
+from django.core.files.storage import FileSystemStorage
+from django.test import TestCase, override_settings
+from django.urls import reverse
+from django.utils import timezone
+
+from DjangoFSM.testing import AdminQueryBudgetMixin
+from fabric.models import Fabric
+from products.tests import make_products
+from users.tests import make_users
+from .export import iter_rows, run_pending_jobs
+from .fsm import InvalidTransition, TransitionConflict, bulk_transition
+from .models import ClientOrder, ExportStatus, OrderExport, OrderLine, OrderStatus, OrderStatusLog
+from .numbering import _create_sequence, allocate_numbers
+
+
+def make_orders(start, count):
+    orders = []
+    for i in range(start, start + count):
+        client = get_user_model().objects.create_user(
+            username=f"client{i}",
+            email=f"client{i}@example.com",
+            phone_number=f"+38050100{i:04d}",
+        )
+        orders.append(ClientOrder.objects.create(client=client, order_number=f"N-{i}"))
+    return orders
+
+
+class AdminQueryBudgetTests(AdminQueryBudgetMixin, TestCase):
+
+    def test_client_order_changelist(self):
+        self.assertChangelistBudget(ClientOrder, 6, make_orders)
+
+    def test_client_order_change_view(self):
+        order = make_orders(0, 5)[0]
+        self.assertChangeViewBudget(order, 11)
+
+    def test_client_order_change_view_many_lines(self):
+        order = make_orders(0, 1)[0]
+        product = make_products(0, 1)[0]
+
+        def add_lines(count):
+            for _ in range(count):
+                OrderLine.objects.create(order=order, product=product, fabric=product.fabric, quantity=1)
+
+        url = reverse("admin:client_orders_clientorder_change", args=[order.pk])
+        add_lines(2)
+        few = self.count_queries(url)
+        add_lines(48)
+        # Рядки сторінкою, виріб / тканина — з select_related, без запиту на рядок
+        self.assertEqual(self.count_queries(url), few)
+        response = self.client.get(url)
+        self.assertContains(response, "Усього: 50")
+        self.assertEqual(response.context["inline_admin_formsets"][0].formset.initial_form_count(), 20)
+
+    def test_client_autocomplete(self):
+        dealer = make_users(0, 1)[0]
+        dealer.is_staff = True
+        dealer.save()
+        url = reverse("admin:autocomplete")
+        params = {"app_label": "client_orders", "model_name": "clientorder", "field_name": "client", "term": "de"}
+
+        # Менеджер, що редагує замовлення, обирає клієнта без доступу до списку користувачів
+        self.client.force_login(dealer)
+        response = self.client.get(url, params)
+        self.assertEqual(response.status_code, 200)
+        results = response.json()["results"]
+        self.assertEqual([row["id"] for row in results], [str(dealer.pk)])
+        self.assertEqual(self.client.get(reverse("admin:users_user_changelist")).status_code, 403)
+
+        dealer.role = dealer.Role.LOGIST_MANAGER
+        dealer.save()
+        self.assertEqual(self.client.get(url, params).status_code, 403)
+
+
+class OrderTotalsTests(TestCase):
+
+    def setUp(self):
+        self.product = make_products(0, 1)[0]
+        self.order = ClientOrder.objects.create(order_number="T-1", discount=Decimal("10"))
+
+    def assertTotals(self, order, subtotal, total):
+        order.refresh_from_db()
+        self.assertEqual((order.subtotal, order.total_price), (Decimal(subtotal), Decimal(total)))
+
+    def add_line(self, quantity=1, unit_price="100.00", order=None):
+        return OrderLine.objects.create(
+            order=order or self.order, product=self.product, quantity=quantity, unit_price=Decimal(unit_price)
+        )
+
+    def test_add_change_and_delete_lines(self):
+        line = self.add_line(quantity=2)
+        self.add_line(unit_price="50.00")
+        self.assertTotals(self.order, "250.00", "225.00")
+
+        line.quantity = 3
+        line.save()
+        self.assertTotals(self.order, "350.00", "315.00")
+
+        line.delete()
+        self.assertTotals(self.order, "50.00", "45.00")
+
+    def test_move_line_to_another_order(self):
+        other = ClientOrder.objects.create(order_number="T-2")
+        line = self.add_line(quantity=2)
+        line.order = other
+        line.save()
+        self.assertTotals(self.order, "0.00", "0.00")
+        self.assertTotals(other, "200.00", "200.00")
+
+    def test_unit_price_is_rounded_before_totals(self):
+        fabric = Fabric.objects.create(name="Велюр", code="V1", color_name="Синій", color_code="#0000ff",
+                                       price_multiplier=Decimal("1.15"))
+        product = make_products(1, 1)[0]
+        product.base_price = Decimal("100.50")
+        product.fabric = fabric
+        product.save()
+        self.assertEqual(product.final_price, Decimal("115.58"))
+
+        line = OrderLine(order=self.order, product=product, quantity=3)
+        line.save()
+        self.assertEqual(line.unit_price, Decimal("115.58"))
+        self.assertTotals(self.order, "346.74", "312.07")
+        line.delete()
+        self.assertTotals(self.order, "0.00", "0.00")
+
+    def test_deferred_line_keeps_totals(self):
+        self.add_line(quantity=2)
+        line = OrderLine.objects.only("id").get()
+        line.quantity = 1
+        line.save()
+        self.assertTotals(self.order, "100.00", "90.00")
+
+        OrderLine.objects.only("id").get().delete()
+        self.assertTotals(self.order, "0.00", "0.00")
+
+    def test_queryset_delete(self):
+        self.add_line(quantity=2)
+        self.add_line()
+        OrderLine.objects.filter(order=self.order).delete()
+        self.assertTotals(self.order, "0.00", "0.00")
+
+    def test_reconcile_order_totals(self):
+        self.add_line(quantity=2)
+        other = ClientOrder.objects.create(order_number="T-2")
+        self.add_line(order=other)
+        ClientOrder.objects.filter(pk=self.order.pk).update(subtotal=Decimal("1.00"), total_price=Decimal("1.00"))
+        ClientOrder.objects.filter(pk=other.pk).update(subtotal=Decimal("99.99"), total_price=Decimal("99.99"))
+
+        out = io.StringIO()
+        call_command("reconcile_order_totals", "--dry-run", stdout=out)
+        self.assertIn("Знайдено розбіжностей: 2", out.getvalue())
+        self.assertTotals(other, "99.99", "99.99")
+
+        call_command("reconcile_order_totals", "--batch-size", "1", stdout=io.StringIO())
+        self.assertTotals(self.order, "200.00", "180.00")
+        self.assertTotals(other, "100.00", "100.00")
+
+    def test_legacy_orders_keep_manual_totals(self):
+        # Стан після міграції 0002: позицій немає, subtotal відновлено з total_price
+        legacy = ClientOrder.objects.create(order_number="T-2", discount=Decimal("20"))
+        ClientOrder.objects.filter(pk=legacy.pk).update(subtotal=Decimal("625.00"), total_price=Decimal("500.00"))
+
+        out = io.StringIO()
+        call_command("reconcile_order_totals", stdout=out)
+        self.assertIn("Замовлень з позиціями немає", out.getvalue())
+        self.assertTotals(legacy, "625.00", "500.00")
+
+        legacy.refresh_from_db()
+        legacy.discount = Decimal("50")
+        legacy.save()
+        self.assertTotals(legacy, "625.00", "500.00")
+
+
+class OrderTransitionTests(TestCase):
+
+    def setUp(self):
+        self.order = ClientOrder.objects.create(order_number="FSM-1")
+
+    def test_transition_writes_log(self):
+        self.order.transition_to(OrderStatus.IN_PROGRESS)
+        self.order.refresh_from_db()
+        self.assertEqual(self.order.status, OrderStatus.IN_PROGRESS)
+        log = self.order.status_log.get()
+        self.assertEqual((log.from_status, log.to_status), (OrderStatus.DRAFT, OrderStatus.IN_PROGRESS))
+
+    def test_invalid_transition(self):
+        with self.assertRaises(InvalidTransition):
+            self.order.transition_to(OrderStatus.COMPLETED)
+
+    def test_stale_status_conflicts(self):
+        stale = ClientOrder.objects.get(pk=self.order.pk)
+        self.order.transition_to(OrderStatus.CANCELED)
+        with self.assertRaises(TransitionConflict):
+            stale.transition_to(OrderStatus.IN_PROGRESS)
+        self.assertEqual(OrderStatusLog.objects.count(), 1)
+
+    def test_save_does_not_overwrite_status(self):
+        stale = ClientOrder.objects.get(pk=self.order.pk)
+        self.order.transition_to(OrderStatus.IN_PROGRESS)
+        stale.comment = "Оновлено"
+        stale.save()
+        self.order.refresh_from_db()
+        self.assertEqual(self.order.status, OrderStatus.IN_PROGRESS)
+
+    def test_bulk_transition(self):
+        ClientOrder.objects.create(order_number="FSM-2", status=OrderStatus.IN_PROGRESS)
+        ClientOrder.objects.create(order_number="FSM-3", status=OrderStatus.COMPLETED)
+        moved = bulk_transition(ClientOrder.objects.all(), OrderStatus.CANCELED)
+        self.assertEqual(moved, 2)
+        self.assertEqual(
+            set(OrderStatusLog.objects.values_list("order__order_number", "from_status")),
+            {("FSM-1", OrderStatus.DRAFT), ("FSM-2", OrderStatus.IN_PROGRESS)},
+        )
+        self.assertEqual(ClientOrder.objects.get(order_number="FSM-3").status, OrderStatus.COMPLETED)
+
+
+class OrderScopeTests(TestCase):
+
+    def setUp(self):
+        self.dealer, self.other = make_users(0, 2)
+        self.manager = get_user_model().objects.get(username="manager0")
+        self.dealer_order = ClientOrder.objects.create(order_number="D-1", dealer=self.dealer.dealer_profile)
+        ClientOrder.objects.create(order_number="D-2", dealer=self.other.dealer_profile)
+        self.salon_order = ClientOrder.objects.create(order_number="S-1", salon=self.manager.sales_profile)
+
+    def test_visible_to_dealer(self):
+        orders = ClientOrder.objects.visible_to(self.dealer)
+        self.assertEqual(list(orders), [self.dealer_order])
+        self.assertEqual(list(ClientOrder.objects.visible_to(self.manager)), [self.salon_order])
+
+    def test_scope_is_resolved_once(self):
+        list(ClientOrder.objects.visible_to(self.dealer))
+        with self.assertNumQueries(1):
+            list(ClientOrder.objects.visible_to(self.dealer))
+
+    def test_unscoped_roles_see_everything(self):
+        head = get_user_model()(role=get_user_model().Role.SALES_HEAD)
+        self.assertEqual(ClientOrder.objects.visible_to(head).count(), 3)
+
+    def test_assign_owner(self):
+        order = ClientOrder(order_number="D-3")
+        order.assign_owner(self.dealer)
+        order.save()
+        self.assertEqual(order.created_by, self.dealer)
+        self.assertIn(order, ClientOrder.objects.visible_to(self.dealer))
+
+
+class OrderStatusApiTests(TestCase):
+
+    def setUp(self):
+        self.dealer, self.other = make_users(0, 2)
+        get_user_model().objects.filter(pk=self.dealer.pk).update(is_staff=True)
+        self.order = ClientOrder.objects.create(order_number="D-1", dealer=self.dealer.dealer_profile)
+        ClientOrder.objects.create(order_number="D-2", dealer=self.other.dealer_profile)
+
+    def test_requires_authentication(self):
+        response = self.client.get("/api/orders/D-1/status/")
+        self.assertEqual(response.status_code, 401)
+
+    def test_status_with_history(self):
+        self.order.transition_to(OrderStatus.IN_PROGRESS, user=self.dealer)
+        self.client.force_login(self.dealer)
+        data = self.client.get("/api/orders/D-1/status/").json()
+        self.assertEqual(data["status"], OrderStatus.IN_PROGRESS)
+        self.assertEqual([(item["from"], item["to"]) for item in data["history"]], [("draft", "in_progress")])
+
+    def test_other_dealer_orders_are_hidden(self):
+        self.client.force_login(self.dealer)
+        self.assertEqual(self.client.get("/api/orders/D-2/status/").status_code, 404)
+        data = self.client.get("/api/orders/status/").json()
+        self.assertEqual(data, {"total": 1, "by_status": {"draft": 1}})
+
+
+class OrderNumberingTests(TestCase):
+
+    def test_generated_numbers_are_sequential_per_prefix(self):
+        year = timezone.localdate().year
+        first = ClientOrder.objects.create()
+        second = ClientOrder.objects.create()
+        self.assertEqual(first.order_number, f"ZM-{year}-000001")
+        self.assertEqual(second.order_number, f"ZM-{year}-000002")
+
+    def test_dealer_prefix(self):
+        dealer = make_users(0, 1)[0]
+        order = ClientOrder.objects.create(dealer=dealer.dealer_profile)
+        self.assertTrue(order.order_number.startswith(f"D{dealer.dealer_profile.pk}-"))
+
+    def test_block_allocation(self):
+        block = allocate_numbers(3, prefix="IMP")
+        self.assertEqual([number[-6:] for number in block], ["000001", "000002", "000003"])
+        self.assertTrue(allocate_numbers(1, prefix="IMP")[0].endswith("000004"))
+
+    def test_concurrent_sequence_creation_is_retried(self):
+        from django.db import IntegrityError, connection
+
+        attempts = []
+
+        def concurrent_create(execute, sql, params, many, context):
+            if not sql.startswith("CREATE SEQUENCE"):
+                return execute(sql, params, many, context)
+            # Перша спроба — дубль у pg_type від паралельної транзакції
+            attempts.append(sql)
+            if len(attempts) == 1:
+                raise IntegrityError("pg_type_typname_nsp_index")
+
+        with connection.execute_wrapper(concurrent_create):
+            _create_sequence(connection, "order_number_zm_2027")
+        self.assertEqual(len(attempts), 2)
+
+    def test_manual_number_is_kept(self):
+        self.assertEqual(ClientOrder.objects.create(order_number="MANUAL-1").order_number, "MANUAL-1")
+
+
+class OrderExportTests(AdminQueryBudgetMixin, TestCase):
+
+    def setUp(self):
+        super().setUp()
+        make_orders(0, 5)
+        ClientOrder.objects.filter(order_number="N-1").update(status=OrderStatus.COMPLETED)
+        self.url = reverse("admin:client_orders_clientorder_export")
+
+    def read(self, response):
+        return b"".join(response.streaming_content).decode()
+
+    def test_streamed_csv_respects_filters(self):
+        response = self.client.get(self.url, {"format": "csv", "status__exact": "draft"})
+        rows = list(csv.DictReader(io.StringIO(self.read(response))))
+        self.assertEqual([row["order_number"] for row in rows], ["N-0", "N-2", "N-3", "N-4"])
+        self.assertEqual(rows[0]["client_email"], "client0@example.com")
+
+    def test_streamed_jsonl(self):
+        response = self.client.get(self.url, {"format": "jsonl"})
+        self.assertEqual(response["Content-Type"], "application/x-ndjson; charset=utf-8")
+        lines = [json.loads(line) for line in self.read(response).splitlines()]
+        self.assertEqual(len(lines), 5)
+        self.assertEqual(lines[1]["status"], "completed")
+
+    def test_keyset_fallback_without_server_side_cursors(self):
+        from django.db import connection
+
+        with mock.patch.dict(connection.settings_dict, {"DISABLE_SERVER_SIDE_CURSORS": True}):
+            with self.assertNumQueries(3):
+                rows = list(iter_rows(ClientOrder.objects.all(), chunk_size=2))
+        self.assertEqual([row[0] for row in rows], [f"N-{i}" for i in range(5)])
+
+    @override_settings(ORDER_EXPORT_STREAM_LIMIT=3, ORDER_EXPORT_MODE="sync")
+    def test_large_export_runs_as_background_job(self):
+        field = OrderExport._meta.get_field("file")
+        with tempfile.TemporaryDirectory() as root, \
+                mock.patch.object(field, "storage", FileSystemStorage(location=root)):
+            with self.captureOnCommitCallbacks(execute=True):
+                response = self.client.get(self.url, {"format": "csv"})
+            self.assertRedirects(response, reverse("admin:client_orders_orderexport_changelist"))
+
+            job = OrderExport.objects.get()
+            self.assertEqual(job.status, ExportStatus.DONE)
+            self.assertEqual((job.total, job.processed, job.progress), (5, 5, 100))
+            download = self.client.get(reverse("admin:client_orders_orderexport_download", args=[job.pk]))
+            content = gzip.decompress(b"".join(download.streaming_content)).decode()
+            self.assertEqual(len(content.splitlines()), 6)
+
+            # Чужі експорти звичайний користувач не бачить
+            dealer = make_users(10, 1)[0]
+            dealer.is_staff = True
+            dealer.save()
+            self.client.force_login(dealer)
+            self.assertEqual(
+                self.client.get(reverse("admin:client_orders_orderexport_download", args=[job.pk])).status_code,
+                404,
+            )
+
+    @override_settings(ORDER_EXPORT_MODE="off")
+    def test_job_rebuilds_filters_for_its_author(self):
+        dealer = make_users(10, 1)[0]
+        dealer.is_staff = True
+        dealer.save()
+        ClientOrder.objects.filter(order_number__in=["N-0", "N-1"]).update(dealer=dealer.dealer_profile)
+        field = OrderExport._meta.get_field("file")
+        with tempfile.TemporaryDirectory() as root, \
+                mock.patch.object(field, "storage", FileSystemStorage(location=root)):
+            job = OrderExport.objects.create(created_by=dealer, params="status__exact=draft")
+            self.assertEqual(run_pending_jobs(), 1)
+            job.refresh_from_db()
+            self.assertEqual((job.status, job.total), (ExportStatus.DONE, 1))
+            with job.file.open() as stored:
+                content = gzip.decompress(stored.read()).decode()
+            self.assertIn("N-0", content)
+            self.assertNotIn("N-2", content)
+
+    @override_settings(ORDER_EXPORT_MODE="off", ORDER_EXPORT_STALE_AFTER=60)
+    def test_stale_running_job_is_requeued(self):
+        user = self.admin_user
+        stale = OrderExport.objects.create(
+            created_by=user, status=ExportStatus.RUNNING, heartbeat_at=timezone.now() - timedelta(minutes=5),
+        )
+        fresh = OrderExport.objects.create(created_by=user, status=ExportStatus.RUNNING, heartbeat_at=timezone.now())
+        field = OrderExport._meta.get_field("file")
+        with tempfile.TemporaryDirectory() as root, \
+                mock.patch.object(field, "storage", FileSystemStorage(location=root)):
+            self.assertEqual(run_pending_jobs(), 1)
+        stale.refresh_from_db()
+        fresh.refresh_from_db()
+        self.assertEqual((stale.status, stale.total), (ExportStatus.DONE, 5))
+        self.assertEqual(fresh.status, ExportStatus.RUNNING)
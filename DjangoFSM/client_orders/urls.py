@@ -0,0 +1,10 @@
+from django.urls import path
+
+from . import views
+
+app_name = "client_orders"
+
+urlpatterns = [
+    path("status/", views.order_status_summary, name="order-status-summary"),
+    path("<str:order_number>/status/", views.order_status, name="order-status"),
+]
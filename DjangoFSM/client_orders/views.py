@@ -1,3 +1,68 @@
-from django.shortcuts import render
+"""
+Read-only API статусів замовлень (async-представлення для ASGI).
 
-# Create your views here.
+Видимість замовлень та сама, що й в адмінці: перевірка дозволу ролі та
+order_scope(). Доступ до сесії / користувача — через request.auser().
+"""
+from asgiref.sync import sync_to_async
+from django.db.models import Count
+from django.http import JsonResponse
+from django.views.decorators.http import require_safe
+
+from users.permissions import has_role_perm
+from .models import ClientOrder, OrderStatusLog, order_scope
+
+
+async def _orders_for(request):
+    """Queryset видимих замовлень або JsonResponse з помилкою доступу."""
+    user = await request.auser()
+    if not user.is_authenticated:
+        return JsonResponse({"detail": "Потрібна автентифікація"}, status=401)
+    if not has_role_perm(user, ClientOrder._meta, "view"):
+        return JsonResponse({"detail": "Недостатньо прав"}, status=403)
+    # order_scope може прочитати профіль дилера / салону — це синхронний ORM
+    scope = await sync_to_async(order_scope)(user)
+    return ClientOrder.objects.filter(scope)
+
+
+@require_safe
+async def order_status(request, order_number):
+    """Поточний статус замовлення та історія переходів."""
+    orders = await _orders_for(request)
+    if isinstance(orders, JsonResponse):
+        return orders
+    try:
+        order = await orders.only(
+            "pk", "order_number", "status", "total_price", "created_at", "updated_at"
+        ).aget(order_number=order_number)
+    except ClientOrder.DoesNotExist:
+        return JsonResponse({"detail": "Замовлення не знайдено"}, status=404)
+
+    history = [
+        {"from": from_status, "to": to_status, "at": created_at}
+        async for from_status, to_status, created_at in OrderStatusLog.objects.filter(order_id=order.pk)
+        .order_by("created_at", "pk")
+        .values_list("from_status", "to_status", "created_at")
+    ]
+    return JsonResponse({
+        "order_number": order.order_number,
+        "status": order.status,
+        "status_display": order.get_status_display(),
+        "total_price": order.total_price,
+        "created_at": order.created_at,
+        "updated_at": order.updated_at,
+        "history": history,
+    })
+
+
+@require_safe
+async def order_status_summary(request):
+    """Кількість видимих користувачу замовлень за статусами."""
+    orders = await _orders_for(request)
+    if isinstance(orders, JsonResponse):
+        return orders
+    by_status = {
+        status: count
+        async for status, count in orders.order_by().values_list("status").annotate(count=Count("pk"))
+    }
+    return JsonResponse({"total": await orders.acount(), "by_status": by_status})
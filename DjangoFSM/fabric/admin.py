@@ -1,16 +1,82 @@
 from django.contrib import admin
+from django.urls import reverse
+from django.utils.html import format_html, format_html_join
+
+from DjangoFSM.images import thumbnail_tag
+from DjangoFSM.search import IndexedSearchAdminMixin
+from users.permissions import RolePermissionAdminMixin
+from .colors import similar_fabrics, to_hex
 from .models import FabricCategory, Fabric
 
 # Register your models here.
 
 @admin.register(FabricCategory)
-class FabricCategoryAdmin(admin.ModelAdmin):
+class FabricCategoryAdmin(RolePermissionAdminMixin, admin.ModelAdmin):
     list_display = ("id", "name", "description")
     search_fields = ("name",)
+    ordering = ("name",)
 
 
 @admin.register(Fabric)
-class FabricAdmin(admin.ModelAdmin):
-    list_display = ("id", "name", "code", "category", "color_name", "is_active")
+class FabricAdmin(RolePermissionAdminMixin, IndexedSearchAdminMixin, admin.ModelAdmin):
+    list_display = (
+        "id", "preview", "name", "code", "category", "swatch", "color_name", "price_multiplier", "is_active",
+    )
     list_filter = ("category", "is_active")
-    search_fields = ("name", "code", "color_name")
\ No newline at end of file
+    list_select_related = ("category",)
+    list_editable = ("price_multiplier",)
+    search_fields = ("name", "^code", "color_name")
+    # Стабільний порядок для сторінок автодоповнення тканин у виробах і замовленнях
+    ordering = ("-pk",)
+    autocomplete_fields = ("category",)
+    readonly_fields = ("lab", "similar")
+    actions = ["reprice_products"]
+
+    # Скільки схожих за кольором тканин показувати на сторінці тканини
+    similar_limit = 8
+
+    @admin.display(description="Зразок")
+    def preview(self, obj):
+        return thumbnail_tag(obj)
+
+    @admin.display(description="Колір")
+    def swatch(self, obj):
+        if obj.rgb is None:
+            return "—"
+        return format_html(
+            '<span style="display:inline-block;width:24px;height:16px;border:1px solid #999;'
+            'background:{};" title="{}"></span>', to_hex(obj.rgb), to_hex(obj.rgb)
+        )
+
+    @admin.display(description="Lab")
+    def lab(self, obj):
+        if obj.lab_l is None:
+            return "—"
+        return f"L* {obj.lab_l:.1f}, a* {obj.lab_a:.1f}, b* {obj.lab_b:.1f}"
+
+    @admin.display(description="Схожі кольори")
+    def similar(self, obj):
+        if obj.pk is None or obj.rgb is None:
+            return "—"
+        fabrics = similar_fabrics(obj.rgb, self.similar_limit, exclude=obj.pk)
+        if not fabrics:
+            return "—"
+        return format_html_join(
+            "", '<div>{} <a href="{}">{}</a> — ΔE {}</div>',
+            (
+                (
+                    self.swatch(fabric),
+                    reverse("admin:fabric_fabric_change", args=[fabric.pk]),
+                    fabric,
+                    fabric.distance,
+                )
+                for fabric in fabrics
+            ),
+        )
+
+    @admin.action(description="Перерахувати ціни виробів з обраними тканинами", permissions=["change"])
+    def reprice_products(self, request, queryset):
+        from products.pricing import reprice_fabrics
+
+        updated = reprice_fabrics(queryset.values_list("pk", flat=True))
+        self.message_user(request, f"Перераховано цін виробів: {updated}")
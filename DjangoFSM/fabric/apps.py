@@ -4,3 +4,19 @@ from django.apps import AppConfig
 class FabricConfig(AppConfig):
     default_auto_field = 'django.db.models.BigAutoField'
     name = 'fabric'
+
+    def ready(self):
+        from django.db.models.signals import post_migrate
+        from audit import tracking
+        from DjangoFSM import search
+        from .models import Fabric
+
+        # Підключаємо сигнали (інвалідація кешу палітр)
+        from . import signals  # noqa: F401
+
+        # Індексований пошук тканин: назви за входженням, код за префіксом
+        search.register(Fabric, fields=("name", "color_name"), prefix_fields=("code",))
+        post_migrate.connect(search.ensure_search_indexes, sender=self)
+
+        # Журнал змін множника ціни
+        tracking.register(Fabric, fields=("price_multiplier",))
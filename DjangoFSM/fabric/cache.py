@@ -0,0 +1,33 @@
+"""Кешовані палітри тканин (за категорією тканини)."""
+from django.db.models import Q
+
+from DjangoFSM.cache import catalog_cache
+from .serializers import active_fabrics, serialize_palette
+
+FABRIC_CATEGORIES_VERSION = "fabric_categories"
+
+
+def fabric_version(pk):
+    return f"fabric:{pk}"
+
+
+def palette_version(category_id):
+    return f"palette:{category_id}"
+
+
+def _build_palettes(keys, category_ids):
+    wanted = [category_ids[key] for key in keys]
+    condition = Q(category_id__in=[pk for pk in wanted if pk is not None])
+    if None in wanted:
+        condition |= Q(category__isnull=True)
+    return {
+        palette_version(group["id"]): (group, [FABRIC_CATEGORIES_VERSION, palette_version(group["id"])])
+        for group in serialize_palette(active_fabrics().filter(condition))
+    }
+
+
+def get_palettes(category_ids):
+    """Палітри для вказаних категорій тканин, відсортовані за назвою категорії."""
+    keys = {palette_version(pk): pk for pk in category_ids}
+    palettes = catalog_cache.get_many(keys, lambda missing: _build_palettes(missing, keys))
+    return sorted(palettes.values(), key=lambda group: (group["name"] is not None, group["name"] or ""))
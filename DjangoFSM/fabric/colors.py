@@ -0,0 +1,211 @@
+"""
+Кольори тканин: розбір color_code, перетворення в CIELAB і пошук схожих.
+
+color_code — довільний рядок (HEX або RGB). При збереженні тканини він
+розбирається в компоненти sRGB та Lab, які зберігаються в БД. Схожість
+рахується як евклідова відстань у Lab (ΔE76): вона близька до того, як
+різницю кольорів сприймає око, на відміну від відстані в RGB.
+
+Для пошуку найближчих кольорів над активними тканинами будується k-d дерево
+(3 виміри, чистий Python — без NumPy). Дерево будується один раз на процес і
+перебудовується ліниво, коли змінюється версія COLOR_INDEX_VERSION у кеші
+каталогу (її змінюють сигнали Fabric), тож усі процеси бачать зміни.
+"""
+import heapq
+import math
+import re
+import threading
+
+from DjangoFSM.cache import catalog_cache
+
+COLOR_INDEX_VERSION = "color_index"
+
+_HEX_RE = re.compile(r"^#?([0-9a-f]{3}|[0-9a-f]{6})$")
+_RGB_RE = re.compile(r"^(?:rgb\s*\()?\s*(\d{1,3})\s*[,;\s]\s*(\d{1,3})\s*[,;\s]\s*(\d{1,3})\s*\)?$")
+
+# Опорна біла точка D65 для перетворення XYZ -> Lab
+_WHITE = (0.95047, 1.0, 1.08883)
+
+
+def parse_color(value):
+    """
+    (r, g, b) з рядка "#a1b2c3", "a1b2c3", "#abc", "rgb(10, 20, 30)" або
+    "10,20,30". None, якщо рядок не схожий на колір.
+    """
+    value = (value or "").strip().lower()
+    match = _HEX_RE.match(value)
+    if match:
+        digits = match.group(1)
+        if len(digits) == 3:
+            digits = "".join(digit * 2 for digit in digits)
+        return tuple(int(digits[i:i + 2], 16) for i in (0, 2, 4))
+    match = _RGB_RE.match(value)
+    if match:
+        rgb = tuple(int(component) for component in match.groups())
+        if all(component <= 255 for component in rgb):
+            return rgb
+    return None
+
+
+def to_hex(rgb):
+    return "#%02x%02x%02x" % rgb
+
+
+def _linear(component):
+    component /= 255
+    return component / 12.92 if component <= 0.04045 else ((component + 0.055) / 1.055) ** 2.4
+
+
+def _f(t):
+    return t ** (1 / 3) if t > 216 / 24389 else (24389 / 27 * t + 16) / 116
+
+
+def rgb_to_lab(rgb):
+    """sRGB (0..255) -> CIELAB (L, a, b), біла точка D65."""
+    r, g, b = (_linear(component) for component in rgb)
+    x = (0.4124564 * r + 0.3575761 * g + 0.1804375 * b) / _WHITE[0]
+    y = (0.2126729 * r + 0.7151522 * g + 0.0721750 * b) / _WHITE[1]
+    z = (0.0193339 * r + 0.1191920 * g + 0.9503041 * b) / _WHITE[2]
+    fx, fy, fz = _f(x), _f(y), _f(z)
+    return round(116 * fy - 16, 3), round(500 * (fx - fy), 3), round(200 * (fy - fz), 3)
+
+
+def color_components(value):
+    """Значення полів rgb_* та lab_* для color_code (None, якщо не розібрано)."""
+    rgb = parse_color(value)
+    lab = rgb_to_lab(rgb) if rgb else (None, None, None)
+    rgb = rgb or (None, None, None)
+    return dict(zip(("rgb_r", "rgb_g", "rgb_b", "lab_l", "lab_a", "lab_b"), (*rgb, *lab)))
+
+
+# ==========================================================================
+# k-d дерево
+
+
+class KDTree:
+    """
+    k-d дерево над точками однакової розмірності з пошуком k найближчих.
+    Вузол — кортеж (індекс точки, вісь, лівий, правий).
+    """
+
+    def __init__(self, points, payloads):
+        self.points = points
+        self.payloads = payloads
+        self.dimensions = len(points[0]) if points else 0
+        self.root = self._build(list(range(len(points))), 0)
+
+    def __len__(self):
+        return len(self.points)
+
+    def _build(self, indices, depth):
+        if not indices:
+            return None
+        axis = depth % self.dimensions
+        indices.sort(key=lambda index: self.points[index][axis])
+        middle = len(indices) // 2
+        return (
+            indices[middle],
+            axis,
+            self._build(indices[:middle], depth + 1),
+            self._build(indices[middle + 1:], depth + 1),
+        )
+
+    def nearest(self, target, k=10, accept=None):
+        """
+        [(payload, відстань)] для k найближчих точок, від найближчої.
+        accept(payload) відкидає точки, що не підходять (напр. інша категорія).
+        """
+        if k <= 0:
+            return []
+        points, payloads = self.points, self.payloads
+        # Max-heap (через від'ємні квадрати відстаней) з k кращих кандидатів
+        best = []
+        stack = [self.root]
+        while stack:
+            node = stack.pop()
+            if node is None:
+                continue
+            index, axis, left, right = node
+            point = points[index]
+            if accept is None or accept(payloads[index]):
+                distance = sum((p - t) * (p - t) for p, t in zip(point, target))
+                if len(best) < k:
+                    heapq.heappush(best, (-distance, index))
+                elif distance < -best[0][0]:
+                    heapq.heapreplace(best, (-distance, index))
+            diff = target[axis] - point[axis]
+            near, far = (left, right) if diff < 0 else (right, left)
+            # Дальню гілку відвідуємо, лише якщо площина поділу ближча за гірший з кращих
+            if far is not None and (len(best) < k or diff * diff < -best[0][0]):
+                stack.append(far)
+            stack.append(near)
+        return [(payloads[index], math.sqrt(-distance)) for distance, index in sorted(best, reverse=True)]
+
+
+# ==========================================================================
+# Індекс активних тканин процесу
+
+
+class ColorIndex:
+
+    def __init__(self):
+        self._lock = threading.Lock()
+        self._tree = None
+        self._token = None
+
+    def _current_token(self):
+        return catalog_cache.versions([COLOR_INDEX_VERSION])[COLOR_INDEX_VERSION]
+
+    def _build(self):
+        from .models import Fabric
+
+        rows = list(
+            Fabric.objects.filter(is_active=True, lab_l__isnull=False)
+            .order_by("pk")
+            .values_list("lab_l", "lab_a", "lab_b", "pk", "category_id")
+        )
+        return KDTree([row[:3] for row in rows], [row[3:] for row in rows])
+
+    def tree(self):
+        """Дерево для поточної версії (перебудовується після змін тканин)."""
+        token = self._current_token()
+        if self._tree is None or token != self._token:
+            with self._lock:
+                if self._tree is None or token != self._token:
+                    self._tree = self._build()
+                    self._token = token
+        return self._tree
+
+    def nearest(self, rgb, k=10, category_id=None, exclude=None):
+        """[(id тканини, ΔE)] для k найближчих до кольору rgb активних тканин."""
+        def accept(payload):
+            pk, category = payload
+            return pk != exclude and (category_id is None or category == category_id)
+
+        filtered = category_id is not None or exclude is not None
+        return [
+            (payload[0], round(distance, 2))
+            for payload, distance in self.tree().nearest(rgb_to_lab(rgb), k, accept if filtered else None)
+        ]
+
+    def reset(self):
+        with self._lock:
+            self._tree = self._token = None
+
+
+color_index = ColorIndex()
+
+
+def similar_fabrics(rgb, limit=10, category_id=None, exclude=None):
+    """Тканини, найближчі за кольором, з відстанню ΔE (атрибут distance)."""
+    from .models import Fabric
+
+    found = color_index.nearest(rgb, limit, category_id=category_id, exclude=exclude)
+    fabrics = Fabric.objects.select_related("category").in_bulk([pk for pk, _ in found])
+    result = []
+    for pk, distance in found:
+        fabric = fabrics.get(pk)
+        if fabric is not None:
+            fabric.distance = distance
+            result.append(fabric)
+    return result
@@ -0,0 +1,46 @@
+import random
+import statistics
+import time
+
+from django.core.management.base import BaseCommand
+
+from fabric.colors import KDTree, rgb_to_lab
+
+
+class Command(BaseCommand):
+    help = (
+        "Вимірює пошук найближчих кольорів у k-d дереві на синтетичній палітрі "
+        "(без БД) і порівнює з повним перебором."
+    )
+
+    def add_arguments(self, parser):
+        parser.add_argument("--size", type=int, default=50_000, help="Кількість тканин у палітрі")
+        parser.add_argument("--queries", type=int, default=500, help="Кількість запитів")
+        parser.add_argument("--limit", type=int, default=10, help="Скільки найближчих шукати")
+        parser.add_argument("--seed", type=int, default=42)
+
+    def handle(self, *args, **options):
+        rng = random.Random(options["seed"])
+        colors = [tuple(rng.randrange(256) for _ in range(3)) for _ in range(options["size"])]
+        points = [rgb_to_lab(rgb) for rgb in colors]
+
+        started = time.perf_counter()
+        tree = KDTree(points, list(range(len(points))))
+        self.stdout.write(f"Побудова дерева на {len(points)} кольорах: {(time.perf_counter() - started) * 1000:.1f} мс")
+
+        targets = [rgb_to_lab(tuple(rng.randrange(256) for _ in range(3))) for _ in range(options["queries"])]
+        timings = []
+        for target in targets:
+            started = time.perf_counter()
+            tree.nearest(target, options["limit"])
+            timings.append((time.perf_counter() - started) * 1000)
+        self.stdout.write(
+            f"k-d дерево: медіана {statistics.median(timings):.3f} мс, "
+            f"p99 {statistics.quantiles(timings, n=100)[98]:.3f} мс"
+        )
+
+        started = time.perf_counter()
+        for target in targets[:20]:
+            sorted(points, key=lambda point: sum((p - t) ** 2 for p, t in zip(point, target)))[:options["limit"]]
+        brute = (time.perf_counter() - started) * 1000 / 20
+        self.stdout.write(f"Повний перебір: {brute:.1f} мс на запит")
@@ -0,0 +1,21 @@
+# Generated by Django 5.2.8 on 2026-10-18 10:45
+
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('fabric', '0001_initial'),
+    ]
+
+    operations = [
+        migrations.AddIndex(
+            model_name='fabric',
+            index=models.Index(fields=['is_active', 'category'], name='fabric_active_category_idx'),
+        ),
+        migrations.AddIndex(
+            model_name='fabric',
+            index=models.Index(condition=models.Q(('is_active', True)), fields=['category'], name='fabric_category_active_idx'),
+        ),
+    ]
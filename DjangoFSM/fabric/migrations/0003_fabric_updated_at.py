@@ -0,0 +1,20 @@
+# Generated by Django 5.2.8 on 2026-10-18 11:05
+
+from django.db import migrations, models
+import django.utils.timezone
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('fabric', '0002_fabric_indexes'),
+    ]
+
+    operations = [
+        migrations.AddField(
+            model_name='fabric',
+            name='updated_at',
+            field=models.DateTimeField(auto_now=True, default=django.utils.timezone.now, verbose_name='Дата оновлення'),
+            preserve_default=False,
+        ),
+    ]
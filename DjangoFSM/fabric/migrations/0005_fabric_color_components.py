@@ -0,0 +1,63 @@
+# Generated by Django 5.2.8 on 2026-10-18 11:13
+
+from django.db import migrations, models
+
+from fabric.colors import color_components
+
+COLOR_FIELDS = ("rgb_r", "rgb_g", "rgb_b", "lab_l", "lab_a", "lab_b")
+
+
+def backfill_colors(apps, schema_editor):
+    """Розбирає color_code наявних тканин у компоненти RGB / Lab."""
+    Fabric = apps.get_model("fabric", "Fabric")
+    batch = []
+    for fabric in Fabric.objects.only("pk", "color_code").iterator(chunk_size=2000):
+        for name, value in color_components(fabric.color_code).items():
+            setattr(fabric, name, value)
+        batch.append(fabric)
+        if len(batch) == 2000:
+            Fabric.objects.bulk_update(batch, COLOR_FIELDS)
+            batch = []
+    if batch:
+        Fabric.objects.bulk_update(batch, COLOR_FIELDS)
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('fabric', '0004_fabric_image_variants'),
+    ]
+
+    operations = [
+        migrations.AddField(
+            model_name='fabric',
+            name='lab_a',
+            field=models.FloatField(blank=True, editable=False, null=True, verbose_name='a*'),
+        ),
+        migrations.AddField(
+            model_name='fabric',
+            name='lab_b',
+            field=models.FloatField(blank=True, editable=False, null=True, verbose_name='b*'),
+        ),
+        migrations.AddField(
+            model_name='fabric',
+            name='lab_l',
+            field=models.FloatField(blank=True, editable=False, null=True, verbose_name='L*'),
+        ),
+        migrations.AddField(
+            model_name='fabric',
+            name='rgb_b',
+            field=models.PositiveSmallIntegerField(blank=True, editable=False, null=True, verbose_name='B'),
+        ),
+        migrations.AddField(
+            model_name='fabric',
+            name='rgb_g',
+            field=models.PositiveSmallIntegerField(blank=True, editable=False, null=True, verbose_name='G'),
+        ),
+        migrations.AddField(
+            model_name='fabric',
+            name='rgb_r',
+            field=models.PositiveSmallIntegerField(blank=True, editable=False, null=True, verbose_name='R'),
+        ),
+        migrations.RunPython(backfill_colors, migrations.RunPython.noop),
+    ]
@@ -0,0 +1,18 @@
+# Generated by Django 5.2.8 on 2026-10-18 12:09
+
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('fabric', '0005_fabric_color_components'),
+    ]
+
+    operations = [
+        migrations.AddField(
+            model_name='fabriccategory',
+            name='updated_at',
+            field=models.DateTimeField(auto_now=True, verbose_name='Дата оновлення'),
+        ),
+    ]
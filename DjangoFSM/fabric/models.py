@@ -1,11 +1,22 @@
+from decimal import Decimal
+
+from django.core.exceptions import ValidationError
 from django.db import models
 
+from DjangoFSM.images import ImageVariantsMixin
+from .colors import color_components
+
+# Компоненти кольору, що обчислюються з color_code при збереженні
+COLOR_FIELDS = ("rgb_r", "rgb_g", "rgb_b", "lab_l", "lab_a", "lab_b")
+
 # Create your models here.
 
 class FabricCategory(models.Model):
     """Категорія тканини (наприклад: Велюр, Шеніл, Мікровелюр)"""
     name = models.CharField(max_length=100, unique=True, verbose_name="Назва категорії")
     description = models.TextField(blank=True, null=True, verbose_name="Опис категорії")
+    # Входить у валідатори (ETag / Last-Modified) палітри тканин
+    updated_at = models.DateTimeField(auto_now=True, verbose_name="Дата оновлення")
 
     def __str__(self):
         return self.name
@@ -15,13 +26,19 @@ class FabricCategory(models.Model):
         verbose_name_plural = "Категорії тканин"
 
 
-class Fabric(models.Model):
+class Fabric(ImageVariantsMixin, models.Model):
     """Модель тканини, яка може використовуватись у виробах."""
     name = models.CharField(max_length=100, verbose_name="Назва тканини")
     code = models.CharField(max_length=50, unique=True, verbose_name="Код тканини")
     category = models.ForeignKey(FabricCategory, on_delete=models.SET_NULL, null=True, related_name="fabrics")
     color_name = models.CharField(max_length=100, verbose_name="Назва кольору")
     color_code = models.CharField(max_length=20, verbose_name="Код кольору (наприклад HEX або RGB)")
+    rgb_r = models.PositiveSmallIntegerField(null=True, blank=True, editable=False, verbose_name="R")
+    rgb_g = models.PositiveSmallIntegerField(null=True, blank=True, editable=False, verbose_name="G")
+    rgb_b = models.PositiveSmallIntegerField(null=True, blank=True, editable=False, verbose_name="B")
+    lab_l = models.FloatField(null=True, blank=True, editable=False, verbose_name="L*")
+    lab_a = models.FloatField(null=True, blank=True, editable=False, verbose_name="a*")
+    lab_b = models.FloatField(null=True, blank=True, editable=False, verbose_name="b*")
     image = models.ImageField(upload_to="fabric_images/", blank=True, null=True, verbose_name="Фото зразка")
     price_multiplier = models.DecimalField(
         max_digits=5,
@@ -30,10 +47,70 @@ class Fabric(models.Model):
         verbose_name="Коефіцієнт ціни (множник для базової ціни виробу)"
     )
     is_active = models.BooleanField(default=True, verbose_name="Доступна для вибору")
+    updated_at = models.DateTimeField(auto_now=True, verbose_name="Дата оновлення")
+
+    @classmethod
+    def from_db(cls, db, field_names, values):
+        instance = super().from_db(db, field_names, values)
+        # Запам'ятовуємо множник з БД, щоб перераховувати ціни виробів лише при його зміні
+        instance._loaded_price_multiplier = instance.__dict__.get("price_multiplier")
+        # і категорію — щоб інвалідувати кеш палітри, з якої тканину перенесли
+        instance._loaded_category_id = instance.__dict__.get("category_id")
+        # і все, що потрапляє в індекс кольорів, — щоб не перебудовувати його при зміні ціни
+        instance._loaded_color_state = instance.color_state()
+        # і поля, від яких залежить матриця цін виробів (products.price_matrix)
+        instance._loaded_matrix_state = instance.matrix_state()
+        return instance
+
+    def matrix_state(self):
+        multiplier = self.__dict__.get("price_multiplier")
+        return (
+            Decimal(str(multiplier)) if multiplier is not None else None,
+            self.__dict__.get("is_active"),
+            self.__dict__.get("category_id"),
+        )
+
+    def color_state(self):
+        return tuple(self.__dict__.get(name) for name in ("lab_l", "lab_a", "lab_b", "is_active", "category_id"))
+
+    def price_multiplier_changed(self):
+        """Чи змінився множник ціни відносно значення, завантаженого з БД."""
+        if "price_multiplier" not in self.__dict__:
+            return False
+        return getattr(self, "_loaded_price_multiplier", None) != self.price_multiplier
+
+    @property
+    def rgb(self):
+        """(r, g, b) або None, якщо color_code не розібрано."""
+        if self.rgb_r is None:
+            return None
+        return self.rgb_r, self.rgb_g, self.rgb_b
+
+    def clean(self):
+        super().clean()
+        if self.color_code and color_components(self.color_code)["rgb_r"] is None:
+            raise ValidationError({"color_code": "Очікується HEX (#a1b2c3, #abc) або RGB (rgb(10, 20, 30))"})
+
+    def save(self, *args, **kwargs):
+        for name, value in color_components(self.color_code).items():
+            setattr(self, name, value)
+        update_fields = kwargs.get("update_fields")
+        if update_fields is not None and "color_code" in update_fields:
+            kwargs["update_fields"] = {*update_fields, *COLOR_FIELDS}
+        super().save(*args, **kwargs)
 
     def __str__(self):
         return f"{self.name} ({self.color_name})"
 
     class Meta:
         verbose_name = "Тканина"
-        verbose_name_plural = "Тканини"
\ No newline at end of file
+        verbose_name_plural = "Тканини"
+        indexes = [
+            models.Index(fields=["is_active", "category"], name="fabric_active_category_idx"),
+            # Палітра активних тканин за категорією
+            models.Index(
+                fields=["category"],
+                condition=models.Q(is_active=True),
+                name="fabric_category_active_idx",
+            ),
+        ]
\ No newline at end of file
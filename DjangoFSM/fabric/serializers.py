@@ -0,0 +1,39 @@
+"""Перетворення тканин на словники для JSON API (без DRF)."""
+from itertools import groupby
+
+from .colors import to_hex
+from .models import Fabric
+
+
+def active_fabrics():
+    """Активні тканини, впорядковані для групування за категорією."""
+    return (
+        Fabric.objects.filter(is_active=True)
+        .select_related("category")
+        .order_by("category__name", "category_id", "name", "pk")
+    )
+
+
+def serialize_fabric(fabric):
+    return {
+        "id": fabric.pk,
+        "code": fabric.code,
+        "name": fabric.name,
+        "color_name": fabric.color_name,
+        "color_code": fabric.color_code,
+        "color_hex": to_hex(fabric.rgb) if fabric.rgb else None,
+        "image": fabric.thumbnail_url,
+        "price_multiplier": fabric.price_multiplier,
+    }
+
+
+def serialize_palette(fabrics):
+    """Групує (вже впорядковані) тканини за категорією."""
+    groups = []
+    for category, items in groupby(fabrics, key=lambda fabric: fabric.category):
+        groups.append({
+            "id": category.pk if category else None,
+            "name": category.name if category else None,
+            "fabrics": [serialize_fabric(fabric) for fabric in items],
+        })
+    return groups
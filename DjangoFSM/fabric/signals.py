@@ -0,0 +1,42 @@
+from django.db.models.signals import post_delete, post_save
+from django.dispatch import receiver
+from django.utils import timezone
+
+from DjangoFSM.cache import catalog_cache
+from DjangoFSM.images import image_variants_ready, release_files_on_delete, schedule_on_image_change
+from .cache import FABRIC_CATEGORIES_VERSION, fabric_version, palette_version
+from .colors import COLOR_INDEX_VERSION
+from .models import Fabric, FabricCategory
+
+
+@receiver([post_save, post_delete], sender=Fabric)
+def invalidate_fabric_cache(sender, instance, **kwargs):
+    """Інвалідує картки виробів цієї тканини та палітру(и) її категорії."""
+    versions = {fabric_version(instance.pk), palette_version(instance.category_id)}
+    loaded_category_id = getattr(instance, "_loaded_category_id", instance.category_id)
+    versions.add(palette_version(loaded_category_id))
+    # Індекс кольорів перебудовується лише при зміні кольору, активності або категорії
+    if kwargs.get("signal") is post_delete or getattr(instance, "_loaded_color_state", None) != instance.color_state():
+        versions.add(COLOR_INDEX_VERSION)
+    catalog_cache.bump_on_commit(*versions)
+    instance._loaded_category_id = instance.category_id
+    instance._loaded_color_state = instance.color_state()
+
+
+@receiver([post_save, post_delete], sender=FabricCategory)
+def invalidate_fabric_category_cache(sender, instance, **kwargs):
+    catalog_cache.bump_on_commit(FABRIC_CATEGORIES_VERSION)
+
+
+# Фонова генерація мініатюр / WebP після завантаження нового фото зразка;
+# файли видаленої тканини звільняються після коміту
+post_save.connect(schedule_on_image_change, sender=Fabric, dispatch_uid="fabric_image_variants")
+post_delete.connect(release_files_on_delete, sender=Fabric, dispatch_uid="fabric_image_files")
+
+
+@receiver(image_variants_ready, sender=Fabric)
+def invalidate_palette_on_variants_ready(sender, pk, **kwargs):
+    # Нова мініатюра — нова дата тканини для ETag / Last-Modified палітри
+    Fabric.objects.filter(pk=pk).update(updated_at=timezone.now())
+    category_id = Fabric.objects.filter(pk=pk).values_list("category_id", flat=True).first()
+    catalog_cache.bump_on_commit(fabric_version(pk), palette_version(category_id))
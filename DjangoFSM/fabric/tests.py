@@ -1,3 +1,119 @@
-from django.test import TestCase
+import random
 
-# Create your tests here.
+from django.test import SimpleTestCase, TestCase, override_settings
+
+from DjangoFSM.testing import AdminQueryBudgetMixin
+from .colors import KDTree, color_index, parse_color, rgb_to_lab
+from .models import Fabric, FabricCategory
+
+
+def make_fabrics(start, count):
+    category = FabricCategory.objects.create(name=f"Категорія {start}")
+    return [
+        Fabric.objects.create(
+            name=f"Тканина {i}",
+            code=f"F{i}",
+            category=category,
+            color_name="Сірий",
+            color_code="#808080",
+        )
+        for i in range(start, start + count)
+    ]
+
+
+class AdminQueryBudgetTests(AdminQueryBudgetMixin, TestCase):
+
+    def test_fabric_category_changelist(self):
+        self.assertChangelistBudget(FabricCategory, 6, make_fabrics)
+
+    def test_fabric_changelist(self):
+        self.assertChangelistBudget(Fabric, 7, make_fabrics)
+
+    def test_fabric_change_view(self):
+        fabric = make_fabrics(0, 5)[0]
+        # + індекс кольорів (холодний старт) та схожі тканини
+        self.assertChangeViewBudget(fabric, 8)
+
+
+class ColorParsingTests(SimpleTestCase):
+
+    def test_formats(self):
+        for value in ("#A1B2C3", "a1b2c3", " rgb(161, 178, 195) ", "161,178,195", "161 178 195"):
+            self.assertEqual(parse_color(value), (161, 178, 195), value)
+        self.assertEqual(parse_color("#abc"), (170, 187, 204))
+        for value in ("", "сірий", "#12345", "300,0,0"):
+            self.assertIsNone(parse_color(value), value)
+
+    def test_lab(self):
+        self.assertEqual(rgb_to_lab((255, 255, 255)), (100.0, 0.0, 0.0))
+        lab = rgb_to_lab((255, 0, 0))
+        self.assertAlmostEqual(lab[0], 53.24, places=1)
+        self.assertAlmostEqual(lab[1], 80.09, places=1)
+
+    def test_kd_tree_matches_brute_force(self):
+        rng = random.Random(1)
+        points = [tuple(rng.uniform(-100, 100) for _ in range(3)) for _ in range(2000)]
+        tree = KDTree(points, list(range(len(points))))
+        for _ in range(20):
+            target = tuple(rng.uniform(-100, 100) for _ in range(3))
+            expected = sorted(range(len(points)), key=lambda i: sum((p - t) ** 2 for p, t in zip(points[i], target)))
+            self.assertEqual([index for index, _ in tree.nearest(target, 5)], expected[:5])
+            odd = [index for index, _ in tree.nearest(target, 5, accept=lambda index: index % 2)]
+            self.assertEqual(odd, [index for index in expected if index % 2][:5])
+
+
+@override_settings(AUDIT_MODE="sync")
+class ColorIndexTests(TestCase):
+
+    def setUp(self):
+        # Версії кешу змінюються після коміту
+        with self.captureOnCommitCallbacks(execute=True):
+            category = FabricCategory.objects.create(name="Велюр")
+            self.grey, self.dark, self.red = [
+                Fabric.objects.create(name=name, code=name, category=category, color_name=name, color_code=code)
+                for name, code in (("grey", "#808080"), ("dark", "rgb(90, 90, 90)"), ("red", "#e01010"))
+            ]
+
+    def test_components_are_stored(self):
+        self.grey.refresh_from_db()
+        self.assertEqual(self.grey.rgb, (128, 128, 128))
+        self.assertAlmostEqual(self.grey.lab_l, 53.59, places=1)
+
+    def test_similar_endpoint(self):
+        response = self.client.get("/api/fabrics/similar/", {"color": "#858585", "limit": 2})
+        self.assertEqual([item["code"] for item in response.json()["results"]], ["grey", "dark"])
+        response = self.client.get("/api/fabrics/similar/", {"fabric": self.grey.pk, "limit": 1})
+        self.assertEqual([item["code"] for item in response.json()["results"]], ["dark"])
+        self.assertEqual(self.client.get("/api/fabrics/similar/", {"color": "сірий"}).status_code, 400)
+
+    def test_index_is_refreshed_on_change(self):
+        self.assertEqual(color_index.nearest((200, 20, 20), 1)[0][0], self.red.pk)
+        self.red.is_active = False
+        with self.captureOnCommitCallbacks(execute=True):
+            self.red.save()
+        self.assertNotEqual(color_index.nearest((200, 20, 20), 1)[0][0], self.red.pk)
+
+    def test_price_change_keeps_index(self):
+        tree = color_index.tree()
+        fabric = Fabric.objects.get(pk=self.grey.pk)
+        fabric.price_multiplier = 2
+        with self.captureOnCommitCallbacks(execute=True):
+            fabric.save()
+        self.assertIs(color_index.tree(), tree)
+
+
+@override_settings(AUDIT_MODE="sync")
+class PaletteApiTests(TestCase):
+
+    def test_category_rename_invalidates_etag(self):
+        category = FabricCategory.objects.create(name="Велюр")
+        Fabric.objects.create(name="grey", code="grey", category=category, color_name="grey", color_code="#808080")
+        etag = self.client.get("/api/fabrics/")["ETag"]
+        self.assertEqual(self.client.get("/api/fabrics/", HTTP_IF_NONE_MATCH=etag).status_code, 304)
+
+        category.name = "Шеніл"
+        with self.captureOnCommitCallbacks(execute=True):
+            category.save()
+        response = self.client.get("/api/fabrics/", HTTP_IF_NONE_MATCH=etag)
+        self.assertEqual(response.status_code, 200)
+        self.assertEqual(response.json()["categories"][0]["name"], "Шеніл")
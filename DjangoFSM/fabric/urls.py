@@ -0,0 +1,10 @@
+from django.urls import path
+
+from . import views
+
+app_name = "fabric"
+
+urlpatterns = [
+    path("", views.fabric_palette, name="fabric-palette"),
+    path("similar/", views.fabric_similar, name="fabric-similar"),
+]
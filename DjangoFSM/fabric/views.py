@@ -1,3 +1,56 @@
-from django.shortcuts import render
+from asgiref.sync import sync_to_async
+from django.http import JsonResponse
+from django.views.decorators.http import require_safe
+
+from DjangoFSM.api import aconditional_json, int_param
+from .cache import get_palettes
+from .colors import parse_color, similar_fabrics, to_hex
+from .models import Fabric
+from .serializers import active_fabrics, serialize_fabric
+
+DEFAULT_SIMILAR = 10
+MAX_SIMILAR = 100
 
 # Create your views here.
+
+
+@require_safe
+async def fabric_palette(request):
+    """Активні тканини, згруповані за категорією тканини: ?category=<id>."""
+    queryset = active_fabrics()
+    if "category" in request.GET:
+        queryset = queryset.filter(category_id=int_param(request, "category", 0))
+
+    # Дата категорії — у валідаторах, бо назва категорії є в палітрі
+    rows = [row async for row in queryset.values_list("pk", "updated_at", "category_id", "category__updated_at")]
+
+    async def build_payload():
+        return {"categories": await sync_to_async(get_palettes)({row[2] for row in rows})}
+
+    return await aconditional_json(request, rows, build_payload)
+
+
+@require_safe
+async def fabric_similar(request):
+    """
+    Активні тканини, найближчі за кольором (ΔE у Lab):
+    ?color=<HEX або RGB> або ?fabric=<id>, &limit=<n>&category=<id>.
+    """
+    exclude = None
+    if "fabric" in request.GET:
+        exclude = int_param(request, "fabric", 0)
+        fabric = await Fabric.objects.only("rgb_r", "rgb_g", "rgb_b").filter(pk=exclude).afirst()
+        rgb = fabric.rgb if fabric else None
+    else:
+        rgb = parse_color(request.GET.get("color"))
+    if rgb is None:
+        return JsonResponse({"detail": "Вкажіть color (HEX / RGB) або fabric з розібраним кольором"}, status=400)
+
+    limit = int_param(request, "limit", DEFAULT_SIMILAR, MAX_SIMILAR) or DEFAULT_SIMILAR
+    category_id = int_param(request, "category", 0) if "category" in request.GET else None
+    # Побудова індексу та вибірка тканин — синхронний ORM
+    fabrics = await sync_to_async(similar_fabrics)(rgb, limit, category_id=category_id, exclude=exclude)
+    return JsonResponse({
+        "color": to_hex(rgb),
+        "results": [{**serialize_fabric(fabric), "distance": fabric.distance} for fabric in fabrics],
+    })
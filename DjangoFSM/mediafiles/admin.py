@@ -0,0 +1,31 @@
+from django.contrib import admin
+from django.core.files.storage import default_storage
+from django.utils.html import format_html
+
+from users.permissions import RolePermissionAdminMixin
+from .models import MediaBlob
+
+# Register your models here.
+
+
+@admin.register(MediaBlob)
+class MediaBlobAdmin(RolePermissionAdminMixin, admin.ModelAdmin):
+    """Облік файлів сховища лише для перегляду: посилання змінює саме сховище."""
+    list_display = ("name", "size", "refcount", "created_at", "link")
+    list_filter = ("created_at",)
+    search_fields = ("name",)
+    ordering = ("-created_at",)
+    show_full_result_count = False
+
+    def has_add_permission(self, request, *args):
+        return False
+
+    def has_change_permission(self, request, obj=None):
+        return False
+
+    def has_delete_permission(self, request, obj=None):
+        return False
+
+    @admin.display(description="Файл")
+    def link(self, obj):
+        return format_html('<a href="{}" target="_blank">відкрити</a>', default_storage.url(obj.name))
@@ -0,0 +1,94 @@
+"""
+Обслуговування сховища з адресацією за вмістом.
+
+* recount_references() — перераховує MediaBlob.refcount за фактичними
+  значеннями всіх FileField (після завантаження даних в обхід save(), збоїв
+  між записом файлу та коміту тощо). Запускати у спокійний період: паралельні
+  завантаження під час підрахунку не враховуються.
+* collect_garbage() — видаляє файли, на які ніхто не посилається.
+* migrate_to_cas() — переносить файли, завантажені до сховища за вмістом,
+  і оновлює посилання в БД (UPDATE без сигналів, варіанти фото не генеруються).
+"""
+from collections import Counter
+
+from django.db import transaction
+
+from .models import MediaBlob
+from .storage import PREFIX, ContentAddressedMixin, file_fields
+
+UPDATE_BATCH_SIZE = 1000
+
+
+def count_references():
+    """Counter(ім'я файлу -> кількість посилань) за всіма FileField проєкту."""
+    counts = Counter()
+    for model, field in file_fields():
+        names = model._default_manager.filter(**{f"{field.attname}__startswith": f"{PREFIX}/"})
+        counts.update(names.values_list(field.attname, flat=True).iterator())
+    return counts
+
+
+def recount_references(storage):
+    """
+    Приводить refcount у відповідність з БД. Повертає (виправлено, додано записів,
+    імена, на які є посилання, але файлу в сховищі немає).
+    """
+    counts = count_references()
+    with transaction.atomic():
+        changed = []
+        for blob in MediaBlob.objects.select_for_update().only("name", "refcount").iterator():
+            refcount = counts.pop(blob.name, 0)
+            if blob.refcount != refcount:
+                blob.refcount = refcount
+                changed.append(blob)
+        MediaBlob.objects.bulk_update(changed, ["refcount"], batch_size=UPDATE_BATCH_SIZE)
+
+        created, missing = [], []
+        for name, refcount in counts.items():
+            if storage.exists(name):
+                created.append(MediaBlob(name=name, size=storage.size(name), refcount=refcount))
+            else:
+                missing.append(name)
+        MediaBlob.objects.bulk_create(created, batch_size=UPDATE_BATCH_SIZE)
+    return len(changed), len(created), missing
+
+
+def collect_garbage(storage, dry_run=False):
+    """Видаляє файли з refcount = 0. Повертає список імен (при dry_run — лише кандидатів)."""
+    if not isinstance(storage, ContentAddressedMixin):
+        raise TypeError(f"{type(storage).__name__} не є сховищем з адресацією за вмістом")
+    names = list(MediaBlob.objects.filter(refcount=0).values_list("name", flat=True))
+    if dry_run:
+        return names
+    return [name for name in names if storage.purge(name)]
+
+
+def migrate_to_cas(storage, source, stdout=None):
+    """
+    Зберігає файли полів, що ще не в cas/, у storage (вміст читається з source)
+    і записує нові імена. Повертає (перенесено, імена відсутніх файлів).
+    Вихідні файли не видаляються.
+    """
+    migrated, missing = 0, []
+    for model, field in file_fields():
+        manager = model._default_manager
+        rows = (
+            manager.exclude(**{f"{field.attname}__startswith": f"{PREFIX}/"})
+            .exclude(**{f"{field.attname}__isnull": True})
+            .exclude(**{field.attname: ""})
+            .values_list("pk", field.attname)
+        )
+        for pk, name in rows.iterator():
+            if not source.exists(name):
+                missing.append(name)
+                continue
+            with source.open(name, "rb") as content:
+                new_name = storage.save(name, content)
+            # Рядок могли змінити, поки файл копіювався, — тоді посилання знімається
+            if not manager.filter(pk=pk, **{field.attname: name}).update(**{field.attname: new_name}):
+                storage.delete(new_name)
+                continue
+            migrated += 1
+        if stdout is not None:
+            stdout.write(f"  {model._meta.label}.{field.name}: перенесено всього {migrated}")
+    return migrated, missing
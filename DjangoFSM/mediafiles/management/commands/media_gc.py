@@ -0,0 +1,36 @@
+from django.core.files.storage import default_storage
+from django.core.management.base import BaseCommand, CommandError
+
+from mediafiles.maintenance import collect_garbage, recount_references
+
+
+class Command(BaseCommand):
+    help = (
+        "Видаляє зі сховища медіафайли, на які не посилається жодне поле "
+        "(refcount = 0). З --recount спершу перераховує посилання за даними БД."
+    )
+
+    def add_arguments(self, parser):
+        parser.add_argument(
+            "--recount",
+            action="store_true",
+            help="Перерахувати refcount за всіма FileField (запускати у спокійний період)",
+        )
+        parser.add_argument("--dry-run", action="store_true", help="Лише показати файли без посилань")
+
+    def handle(self, *args, **options):
+        if options["recount"]:
+            changed, created, missing = recount_references(default_storage)
+            self.stdout.write(f"Виправлено лічильників: {changed}, додано записів: {created}")
+            for name in missing:
+                self.stderr.write(f"  файл відсутній у сховищі: {name}")
+        try:
+            names = collect_garbage(default_storage, dry_run=options["dry_run"])
+        except TypeError as error:
+            raise CommandError(str(error))
+        if options["dry_run"]:
+            for name in names:
+                self.stdout.write(f"  {name}")
+            self.stdout.write(f"Файлів без посилань: {len(names)}")
+        else:
+            self.stdout.write(self.style.SUCCESS(f"Видалено файлів: {len(names)}"))
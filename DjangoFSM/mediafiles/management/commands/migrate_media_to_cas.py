@@ -0,0 +1,29 @@
+from django.conf import settings
+from django.core.files.storage import FileSystemStorage, default_storage
+from django.core.management.base import BaseCommand
+
+from mediafiles.maintenance import migrate_to_cas
+
+
+class Command(BaseCommand):
+    help = (
+        "Переносить файли, завантажені до сховища з адресацією за вмістом, у поточне "
+        "сховище: однаковий вміст зберігається один раз, посилання в БД оновлюються."
+    )
+
+    def add_arguments(self, parser):
+        parser.add_argument(
+            "--source",
+            default=str(settings.BASE_DIR),
+            help="Каталог, відносно якого лежать старі файли (раніше MEDIA_ROOT не був заданий)",
+        )
+
+    def handle(self, *args, **options):
+        source = FileSystemStorage(location=options["source"])
+        migrated, missing = migrate_to_cas(default_storage, source, stdout=self.stdout)
+        for name in missing:
+            self.stderr.write(f"  файл не знайдено: {name}")
+        self.stdout.write(self.style.SUCCESS(
+            f"Перенесено посилань: {migrated}, відсутніх файлів: {len(missing)}. "
+            "Старі файли не видалялися."
+        ))
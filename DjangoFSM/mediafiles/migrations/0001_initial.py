@@ -0,0 +1,27 @@
+# Generated by Django 5.2.8 on 2026-10-18 11:23
+
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    initial = True
+
+    dependencies = [
+    ]
+
+    operations = [
+        migrations.CreateModel(
+            name='MediaBlob',
+            fields=[
+                ('name', models.CharField(max_length=255, primary_key=True, serialize=False, verbose_name='Файл')),
+                ('size', models.PositiveBigIntegerField(verbose_name='Розмір (байт)')),
+                ('refcount', models.PositiveIntegerField(default=0, verbose_name='Посилань')),
+                ('created_at', models.DateTimeField(auto_now_add=True, verbose_name='Завантажено')),
+            ],
+            options={
+                'verbose_name': 'Файл (вміст)',
+                'verbose_name_plural': 'Файли (вміст)',
+            },
+        ),
+    ]
@@ -0,0 +1,22 @@
+from django.db import models
+
+# Create your models here.
+
+
+class MediaBlob(models.Model):
+    """
+    Унікальний вміст у сховищі медіафайлів (ім'я файлу — хеш SHA-256 вмісту).
+    refcount — скільки полів FileField посилаються на цей файл; файл
+    видаляється зі сховища, лише коли лічильник падає до нуля.
+    """
+    name = models.CharField(max_length=255, primary_key=True, verbose_name="Файл")
+    size = models.PositiveBigIntegerField(verbose_name="Розмір (байт)")
+    refcount = models.PositiveIntegerField(default=0, verbose_name="Посилань")
+    created_at = models.DateTimeField(auto_now_add=True, verbose_name="Завантажено")
+
+    def __str__(self):
+        return self.name
+
+    class Meta:
+        verbose_name = "Файл (вміст)"
+        verbose_name_plural = "Файли (вміст)"
@@ -0,0 +1,19 @@
+"""
+Сховище з адресацією за вмістом у S3-сумісному бакеті (AWS S3, MinIO тощо).
+
+Потрібен django-storages[s3] (boto3) — в requirements.txt він не входить,
+як і redis: встановлюється лише там, де MEDIA_BACKEND=s3. Локально бекенд
+перевіряється на MinIO (AWS_S3_ENDPOINT_URL) або в тестах на moto.
+"""
+from storages.backends.s3 import S3Storage
+
+from .storage import IMMUTABLE_CACHE_CONTROL, ContentAddressedMixin
+
+
+class ContentAddressedS3Storage(ContentAddressedMixin, S3Storage):
+
+    def get_default_settings(self):
+        defaults = super().get_default_settings()
+        # Вміст за ім'ям ніколи не змінюється: CDN та браузери кешують об'єкт назавжди
+        defaults["object_parameters"] = {"CacheControl": IMMUTABLE_CACHE_CONTROL, **defaults["object_parameters"]}
+        return defaults
@@ -0,0 +1,103 @@
+"""
+Сховища медіафайлів з адресацією за вмістом.
+
+Ім'я файлу — SHA-256 його вмісту (cas/ab/cd/<hash>.jpg), тож однакове фото,
+завантажене для десятків виробів, зберігається один раз. Хеш рахується
+порціями (File.chunks()), великі завантаження Django і так пише у тимчасовий
+файл (FILE_UPLOAD_MAX_MEMORY_SIZE), тому весь файл ніколи не потрапляє в пам'ять.
+
+Облік посилань — MediaBlob.refcount: save() додає посилання, delete() знімає.
+Сам файл видаляється після коміту транзакції і лише тоді, коли посилань не
+залишилося. Вміст за таким ім'ям ніколи не змінюється, тому URL можна кешувати
+назавжди (IMMUTABLE_CACHE_CONTROL).
+
+Бекенди: ContentAddressedFileSystemStorage (локальний диск) та
+ContentAddressedS3Storage у mediafiles.s3 (S3-сумісне сховище, потрібен
+django-storages[s3]).
+"""
+import hashlib
+import os
+import posixpath
+
+from django.core.files.storage import FileSystemStorage
+from django.db import models, transaction
+from django.db.models import F
+
+PREFIX = "cas"
+IMMUTABLE_CACHE_CONTROL = "public, max-age=31536000, immutable"
+
+
+def content_digest(content):
+    """(sha256 hex, розмір) вмісту файлу, прочитаного порціями."""
+    hasher = hashlib.sha256()
+    size = 0
+    for chunk in content.chunks():
+        hasher.update(chunk)
+        size += len(chunk)
+    return hasher.hexdigest(), size
+
+
+def blob_name(digest, original_name):
+    extension = os.path.splitext(original_name)[1].lower()[:10]
+    return posixpath.join(PREFIX, digest[:2], digest[2:4], f"{digest}{extension}")
+
+
+def is_blob_name(name):
+    return bool(name) and name.startswith(f"{PREFIX}/")
+
+
+def file_fields():
+    """[(модель, поле)] для FileField / ImageField проєкту у сховищі з адресацією за вмістом."""
+    from django.apps import apps
+
+    return [
+        (model, field)
+        for model in apps.get_models()
+        for field in model._meta.concrete_fields
+        if isinstance(field, models.FileField) and isinstance(field.storage, ContentAddressedMixin)
+    ]
+
+
+class ContentAddressedMixin:
+    """Міксин для класу Storage: ім'я за вмістом і облік посилань у MediaBlob."""
+
+    def get_available_name(self, name, max_length=None):
+        # Остаточне ім'я визначається вмістом у _save(): однаковий вміст — той самий файл
+        return name
+
+    def _save(self, name, content):
+        from .models import MediaBlob
+
+        digest, size = content_digest(content)
+        name = blob_name(digest, name)
+        with transaction.atomic():
+            # Блокування рядка серіалізує паралельні завантаження того самого вмісту з purge()
+            MediaBlob.objects.select_for_update().get_or_create(name=name, defaults={"size": size})
+            if not super().exists(name):
+                super()._save(name, content)
+            MediaBlob.objects.filter(pk=name).update(refcount=F("refcount") + 1)
+        return name
+
+    def delete(self, name):
+        """Знімає одне посилання; файл видаляється після коміту, якщо посилань не лишилося."""
+        from .models import MediaBlob
+
+        if not is_blob_name(name):
+            # Файл, завантажений до адресації за вмістом
+            return super().delete(name)
+        MediaBlob.objects.filter(pk=name, refcount__gt=0).update(refcount=F("refcount") - 1)
+        transaction.on_commit(lambda: self.purge(name))
+
+    def purge(self, name):
+        """Видаляє файл і його запис, якщо на вміст ніхто не посилається."""
+        from .models import MediaBlob
+
+        with transaction.atomic():
+            if MediaBlob.objects.filter(pk=name, refcount=0).delete()[0]:
+                super().delete(name)
+                return True
+        return False
+
+
+class ContentAddressedFileSystemStorage(ContentAddressedMixin, FileSystemStorage):
+    pass
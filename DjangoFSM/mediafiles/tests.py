@@ -0,0 +1,136 @@
+import importlib.util
+import shutil
+import tempfile
+from decimal import Decimal
+from io import BytesIO
+
+from django.core.files.base import ContentFile
+from django.core.files.storage import default_storage
+from django.core.files.uploadedfile import SimpleUploadedFile
+from django.test import RequestFactory, TestCase, override_settings
+
+from products.models import Product, ProductImage
+from .maintenance import collect_garbage, recount_references
+from .models import MediaBlob
+from .storage import IMMUTABLE_CACHE_CONTROL, ContentAddressedFileSystemStorage
+from .views import serve
+
+HAS_S3 = all(importlib.util.find_spec(module) for module in ("storages", "boto3", "moto"))
+
+
+def jpeg(color):
+    from PIL import Image
+
+    buffer = BytesIO()
+    Image.new("RGB", (40, 30), color).save(buffer, "JPEG")
+    return buffer.getvalue()
+
+
+class ContentAddressedStorageTests(TestCase):
+
+    def setUp(self):
+        self.media_root = tempfile.mkdtemp()
+        self.addCleanup(shutil.rmtree, self.media_root, ignore_errors=True)
+        settings = override_settings(MEDIA_ROOT=self.media_root, IMAGE_PROCESSING="off")
+        settings.enable()
+        self.addCleanup(settings.disable)
+        self.storage = ContentAddressedFileSystemStorage()
+
+    def test_same_content_stored_once(self):
+        first = self.storage.save("a/photo.JPG", ContentFile(b"same bytes"))
+        second = self.storage.save("b/other.jpg", ContentFile(b"same bytes"))
+        self.assertEqual(first, second)
+        self.assertTrue(first.startswith("cas/") and first.endswith(".jpg"))
+        self.assertEqual(MediaBlob.objects.get(pk=first).refcount, 2)
+        self.assertNotEqual(self.storage.save("c.jpg", ContentFile(b"other bytes")), first)
+
+    def test_file_deleted_with_last_reference(self):
+        name = self.storage.save("photo.jpg", ContentFile(b"bytes"))
+        self.storage.save("photo.jpg", ContentFile(b"bytes"))
+
+        with self.captureOnCommitCallbacks(execute=True):
+            self.storage.delete(name)
+        self.assertTrue(self.storage.exists(name))
+        self.assertEqual(MediaBlob.objects.get(pk=name).refcount, 1)
+
+        with self.captureOnCommitCallbacks(execute=True):
+            self.storage.delete(name)
+        self.assertFalse(self.storage.exists(name))
+        self.assertFalse(MediaBlob.objects.filter(pk=name).exists())
+
+    def test_product_images_share_and_release_blob(self):
+        product = Product.objects.create(
+            name="Диван", code="P1", length=Decimal("200"), width=Decimal("90"),
+            height=Decimal("80"), base_price=Decimal("1000"),
+        )
+        content = jpeg("red")
+        with self.captureOnCommitCallbacks(execute=True):
+            images = [
+                ProductImage.objects.create(product=product, image=SimpleUploadedFile(f"{i}.jpg", content))
+                for i in range(2)
+            ]
+        name = images[0].image.name
+        self.assertEqual(images[1].image.name, name)
+        self.assertEqual(MediaBlob.objects.get(pk=name).refcount, 2)
+
+        # Заміна фото звільняє старий файл, видалення об'єкта — його поточний
+        with self.captureOnCommitCallbacks(execute=True):
+            images[0].image = SimpleUploadedFile("new.jpg", jpeg("blue"))
+            images[0].save()
+            images[1].delete()
+        self.assertFalse(default_storage.exists(name))
+        self.assertEqual(MediaBlob.objects.get(pk=images[0].image.name).refcount, 1)
+
+    def test_recount_and_gc(self):
+        name = self.storage.save("photo.jpg", ContentFile(b"bytes"))
+        orphan = self.storage.save("orphan.jpg", ContentFile(b"orphan"))
+        product = Product.objects.create(
+            name="Диван", code="P1", length=Decimal("200"), width=Decimal("90"),
+            height=Decimal("80"), base_price=Decimal("1000"),
+        )
+        # Посилання, записане в обхід save(), і лічильник, що «загубив» посилання
+        ProductImage.objects.create(product=product, image=name)
+        ProductImage.objects.create(product=product, image=name)
+
+        self.assertEqual(recount_references(self.storage), (2, 0, []))
+        self.assertEqual(MediaBlob.objects.get(pk=name).refcount, 2)
+        self.assertEqual(collect_garbage(self.storage), [orphan])
+        self.assertFalse(self.storage.exists(orphan))
+        self.assertTrue(self.storage.exists(name))
+
+    def test_serve_sets_immutable_cache(self):
+        name = self.storage.save("photo.jpg", ContentFile(b"bytes"))
+        response = serve(RequestFactory().get(f"/media/{name}"), name)
+        self.assertEqual(response["Cache-Control"], IMMUTABLE_CACHE_CONTROL)
+
+
+@override_settings(AWS_ACCESS_KEY_ID="test", AWS_SECRET_ACCESS_KEY="test")
+class S3StorageTests(TestCase):
+    """Бекенд S3 на локальній імітації (moto); пропускається без django-storages[s3] і moto."""
+
+    def setUp(self):
+        if not HAS_S3:
+            self.skipTest("потрібні django-storages[s3], boto3 та moto")
+        import boto3
+        from moto import mock_aws
+
+        mock = mock_aws()
+        mock.start()
+        self.addCleanup(mock.stop)
+        self.client = boto3.client("s3", region_name="us-east-1")
+        self.client.create_bucket(Bucket="media")
+
+    def test_dedup_and_cache_headers(self):
+        from .s3 import ContentAddressedS3Storage
+
+        storage = ContentAddressedS3Storage(bucket_name="media", region_name="us-east-1")
+        name = storage.save("photo.jpg", ContentFile(b"bytes"))
+        self.assertEqual(storage.save("copy.jpg", ContentFile(b"bytes")), name)
+        self.assertEqual(self.client.list_objects_v2(Bucket="media")["KeyCount"], 1)
+        head = self.client.head_object(Bucket="media", Key=name)
+        self.assertEqual(head["CacheControl"], IMMUTABLE_CACHE_CONTROL)
+
+        with self.captureOnCommitCallbacks(execute=True):
+            storage.delete(name)
+            storage.delete(name)
+        self.assertEqual(self.client.list_objects_v2(Bucket="media")["KeyCount"], 0)
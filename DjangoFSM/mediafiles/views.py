@@ -0,0 +1,18 @@
+from django.conf import settings
+from django.views import static
+
+from .storage import IMMUTABLE_CACHE_CONTROL, is_blob_name
+
+# Create your views here.
+
+
+def serve(request, path):
+    """
+    Віддає файли з MEDIA_ROOT для розробки та тестових стендів (у продакшні —
+    nginx, див. DjangoFSM/deploy/nginx_media.conf). Вміст за ім'ям-хешем не
+    змінюється, тому такі файли кешуються браузером назавжди.
+    """
+    response = static.serve(request, path, document_root=settings.MEDIA_ROOT)
+    if is_blob_name(path) and response.status_code == 200:
+        response.headers["Cache-Control"] = IMMUTABLE_CACHE_CONTROL
+    return response
@@ -1,28 +1,133 @@
-from django.contrib import admin
+from django.contrib import admin, messages
+from django.core.exceptions import PermissionDenied
+from django.shortcuts import redirect
+from django.template.response import TemplateResponse
+from django.urls import path
+
+from DjangoFSM.admin_utils import PaginatedInlineMixin
+from DjangoFSM.images import thumbnail_tag
+from DjangoFSM.search import IndexedSearchAdminMixin
+from client_orders.models import OrderLine, order_scope
+from users.permissions import RolePermissionAdminMixin
+from .forms import ProductImportForm
+from .import_export import COLUMNS, ProductImportError, export_response, import_products, iter_rows
 from .models import Category, Product, ProductImage
 
 # Register your models here.
 
 @admin.register(Category)
-class CategoryAdmin(admin.ModelAdmin):
+class CategoryAdmin(RolePermissionAdminMixin, admin.ModelAdmin):
     list_display = ("id", "name", "description")
     search_fields = ("name",)
     ordering = ("name",)
+    filter_horizontal = ("allowed_fabric_categories",)
 
 
-class ProductImageInline(admin.TabularInline):
+class ProductImageInline(RolePermissionAdminMixin, PaginatedInlineMixin, admin.TabularInline):
     model = ProductImage
-    extra = 1
+    per_page = 12
+    fields = ("preview", "image", "is_main")
+    readonly_fields = ("preview",)
+
+    @admin.display(description="Мініатюра")
+    def preview(self, obj):
+        return thumbnail_tag(obj)
+
+
+class ProductOrderLineInline(RolePermissionAdminMixin, PaginatedInlineMixin, admin.TabularInline):
+    """Рядки замовлень з виробом (лише перегляд, у межах видимих користувачу замовлень)."""
+    model = OrderLine
+    fields = ("order", "fabric", "quantity", "unit_price")
+    readonly_fields = fields
+    ordering = ("-pk",)
+    verbose_name_plural = "Замовлення з цим виробом"
+
+    def get_queryset(self, request):
+        return (
+            super().get_queryset(request)
+            .filter(order_scope(request.user, prefix="order__"))
+            .select_related("order", "fabric")
+        )
+
+    def has_add_permission(self, request, obj=None):
+        return False
+
+    def has_change_permission(self, request, obj=None):
+        return False
+
+    def has_delete_permission(self, request, obj=None):
+        return False
 
 
 @admin.register(Product)
-class ProductAdmin(admin.ModelAdmin):
+class ProductAdmin(RolePermissionAdminMixin, IndexedSearchAdminMixin, admin.ModelAdmin):
     list_display = ("id", "name", "code", "category", "base_price", "final_price", "is_active")
     list_filter = ("category", "is_active", "fabric")
-    search_fields = ("name", "code")
-    inlines = [ProductImageInline]
+    list_select_related = ("category",)
+    search_fields = ("name", "^code")
+    # Стабільний порядок для сторінок автодоповнення (у списку — як і раніше, новіші зверху)
+    ordering = ("-pk",)
+    autocomplete_fields = ("category", "fabric")
+    inlines = [ProductImageInline, ProductOrderLineInline]
+    actions = ["export_selected"]
+
+    def get_urls(self):
+        info = self.opts.app_label, self.opts.model_name
+        urls = [
+            path("import/", self.admin_site.admin_view(self.import_view), name="%s_%s_import" % info),
+            path("export/", self.admin_site.admin_view(self.export_view), name="%s_%s_export" % info),
+        ]
+        return urls + super().get_urls()
+
+    def import_view(self, request):
+        """Потоковий імпорт виробів з CSV/XLSX файлу."""
+        if not self.has_add_permission(request) or not self.has_change_permission(request):
+            return redirect("admin:products_product_changelist")
+
+        form = ProductImportForm(request.POST or None, request.FILES or None)
+        if request.method == "POST" and form.is_valid():
+            upload = form.cleaned_data["file"]
+            try:
+                result = import_products(
+                    iter_rows(upload, upload.name),
+                    batch_size=form.cleaned_data["batch_size"],
+                )
+            except ProductImportError as exc:
+                self.message_user(request, str(exc), messages.ERROR)
+            else:
+                self.message_user(request, str(result), messages.SUCCESS)
+                for line, error in result.errors[:20]:
+                    self.message_user(request, f"Рядок {line}: {error}", messages.WARNING)
+                return redirect("admin:products_product_changelist")
+
+        context = {
+            **self.admin_site.each_context(request),
+            "opts": self.opts,
+            "title": "Імпорт виробів",
+            "form": form,
+            "columns": COLUMNS,
+        }
+        return TemplateResponse(request, "admin/products/product/import.html", context)
+
+    def export_view(self, request):
+        """Потоковий CSV-експорт з урахуванням фільтрів списку."""
+        if not self.has_view_permission(request):
+            raise PermissionDenied
+        changelist = self.get_changelist_instance(request)
+        return export_response(changelist.get_queryset(request))
+
+    @admin.action(description="Експортувати обрані вироби в CSV")
+    def export_selected(self, request, queryset):
+        return export_response(queryset)
 
 
 @admin.register(ProductImage)
-class ProductImageAdmin(admin.ModelAdmin):
-    list_display = ("id", "product", "is_main")
+class ProductImageAdmin(RolePermissionAdminMixin, admin.ModelAdmin):
+    list_display = ("id", "preview", "product", "is_main", "image_width", "image_height")
+    list_select_related = ("product",)
+    raw_id_fields = ("product",)
+    readonly_fields = ("image_width", "image_height", "image_size")
+
+    @admin.display(description="Мініатюра")
+    def preview(self, obj):
+        return thumbnail_tag(obj)
@@ -4,3 +4,19 @@ from django.apps import AppConfig
 class ProductsConfig(AppConfig):
     default_auto_field = 'django.db.models.BigAutoField'
     name = 'products'
+
+    def ready(self):
+        from django.db.models.signals import post_migrate
+        from audit import tracking
+        from DjangoFSM import search
+        from .models import Product
+
+        # Підключаємо сигнали (перерахунок цін при зміні тканини)
+        from . import signals  # noqa: F401
+
+        # Індексований пошук виробів: назва за входженням, артикул за префіксом
+        search.register(Product, fields=("name",), prefix_fields=("code",))
+        post_migrate.connect(search.ensure_search_indexes, sender=self)
+
+        # Журнал змін базової ціни (імпорт з bulk_update пише його сам)
+        tracking.register(Product, fields=("base_price",))
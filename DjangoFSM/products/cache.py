@@ -0,0 +1,43 @@
+"""Кешовані дерево категорій та картки виробів."""
+from DjangoFSM.cache import catalog_cache
+from fabric.cache import fabric_version
+from .models import Category
+from .serializers import catalog_products, serialize_product
+
+CATEGORIES_VERSION = "categories"
+# Загальна версія всіх карток — для масових операцій повз сигнали (імпорт, перерахунок)
+PRODUCTS_VERSION = "products"
+
+
+def product_version(pk):
+    return f"product:{pk}"
+
+
+def get_category_tree():
+    """Усі категорії виробів (назва та опис)."""
+    def build():
+        return [
+            {"id": pk, "name": name, "description": description}
+            for pk, name, description in Category.objects.order_by("name").values_list(
+                "pk", "name", "description"
+            )
+        ]
+
+    return catalog_cache.get("categories", build, [CATEGORIES_VERSION])
+
+
+def _build_cards(keys, ids):
+    cards = {}
+    for product in catalog_products().filter(pk__in=[ids[key] for key in keys]):
+        dependencies = [product_version(product.pk), PRODUCTS_VERSION, CATEGORIES_VERSION]
+        if product.fabric_id is not None:
+            dependencies.append(fabric_version(product.fabric_id))
+        cards[product_version(product.pk)] = (serialize_product(product), dependencies)
+    return cards
+
+
+def get_product_cards(product_ids):
+    """Картки активних виробів у порядку product_ids (неактивні / відсутні пропускаються)."""
+    ids = {product_version(pk): pk for pk in product_ids}
+    cards = catalog_cache.get_many(ids, lambda missing: _build_cards(missing, ids))
+    return [cards[key] for key in ids if key in cards]
@@ -0,0 +1,13 @@
+from django import forms
+
+from .import_export import DEFAULT_BATCH_SIZE
+
+
+class ProductImportForm(forms.Form):
+    """Форма завантаження файлу постачальника в адмінці."""
+    file = forms.FileField(label="Файл (CSV або XLSX)")
+    batch_size = forms.IntegerField(
+        label="Розмір пакета",
+        min_value=1,
+        initial=DEFAULT_BATCH_SIZE,
+    )
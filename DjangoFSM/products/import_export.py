@@ -0,0 +1,325 @@
+"""
+Потоковий імпорт та експорт каталогу виробів.
+
+Імпорт читає CSV/XLSX построчно, звіряє категорії й тканини через один
+заздалегідь завантажений словник, рахує final_price в пам'яті (з округленням
+до копійок, як матриця цін) та пише пакетами через bulk_create / bulk_update.
+Експорт віддає CSV через StreamingHttpResponse з .iterator(), тому пам'ять не залежить від розміру каталогу.
+"""
+import csv
+import io
+from contextlib import nullcontext
+from dataclasses import dataclass, field
+from decimal import Decimal, InvalidOperation
+from itertools import islice
+
+from django.core.exceptions import ValidationError
+from django.db import transaction
+from django.http import StreamingHttpResponse
+from django.utils import timezone
+
+from audit import tracking
+from DjangoFSM.cache import catalog_cache
+from fabric.models import Fabric, FabricCategory
+from .cache import PRODUCTS_VERSION
+from .models import Category, Product
+from .price_matrix import matrix_price, rebuild_products
+
+DEFAULT_BATCH_SIZE = 1000
+# Скільки помилок зберігати з текстом: решта лише рахується (файл може мати мільйони рядків)
+MAX_REPORTED_ERRORS = 1000
+
+# Колонки файлу імпорту / експорту
+COLUMNS = (
+    "code",
+    "name",
+    "category",
+    "fabric",
+    "fabric_category",
+    "length",
+    "width",
+    "height",
+    "base_price",
+    "description",
+    "is_active",
+)
+REQUIRED_COLUMNS = ("code", "name", "length", "width", "height", "base_price")
+# Зв'язки вже перевірені через CatalogLookup
+UNVALIDATED_FIELDS = ("category", "fabric")
+
+# Поля, які оновлюються для вже існуючих виробів
+UPDATE_FIELDS = [
+    "name",
+    "category",
+    "fabric",
+    "length",
+    "width",
+    "height",
+    "base_price",
+    "final_price",
+    "description",
+    "is_active",
+    "updated_at",
+]
+
+TRUE_VALUES = {"1", "true", "yes", "так", "+"}
+
+
+class ProductImportError(Exception):
+    """Помилка в рядку файлу імпорту."""
+
+
+@dataclass
+class ImportResult:
+    created: int = 0
+    updated: int = 0
+    # Перші MAX_REPORTED_ERRORS помилок (рядок, текст); error_count — усі
+    errors: list = field(default_factory=list)
+    error_count: int = 0
+
+    def add_error(self, line, message):
+        self.error_count += 1
+        if len(self.errors) < MAX_REPORTED_ERRORS:
+            self.errors.append((line, message))
+
+    def __str__(self):
+        return f"Створено: {self.created}, оновлено: {self.updated}, помилок: {self.error_count}"
+
+
+class CatalogLookup:
+    """
+    Довідники для звірки кодів у рядках імпорту.
+    Завантажуються одним запитом на таблицю до початку обробки рядків.
+    """
+
+    def __init__(self):
+        self.categories = dict(Category.objects.values_list("name", "pk"))
+        self.fabric_categories = dict(FabricCategory.objects.values_list("name", "pk"))
+        self.fabrics = {
+            code: (pk, multiplier, category_id)
+            for code, pk, multiplier, category_id in Fabric.objects.values_list(
+                "code", "pk", "price_multiplier", "category_id"
+            )
+        }
+
+    def category_id(self, name):
+        if not name:
+            return None
+        try:
+            return self.categories[name]
+        except KeyError:
+            raise ProductImportError(f"Невідома категорія «{name}»")
+
+    def fabric(self, code, fabric_category=None):
+        """Повертає (id, множник) тканини, перевіряючи її категорію, якщо вона вказана."""
+        if not code:
+            return None, None
+        try:
+            pk, multiplier, category_id = self.fabrics[code]
+        except KeyError:
+            raise ProductImportError(f"Невідома тканина «{code}»")
+        if fabric_category:
+            if fabric_category not in self.fabric_categories:
+                raise ProductImportError(f"Невідома категорія тканини «{fabric_category}»")
+            if self.fabric_categories[fabric_category] != category_id:
+                raise ProductImportError(f"Тканина «{code}» не належить до категорії «{fabric_category}»")
+        return pk, multiplier
+
+
+# ==========================================================================
+# Читання файлів
+
+
+def iter_csv_rows(stream, encoding="utf-8-sig"):
+    """Построчно читає CSV (байтовий або текстовий потік) як словники."""
+    if isinstance(stream.read(0), bytes):
+        stream = io.TextIOWrapper(stream, encoding=encoding, newline="")
+    yield from csv.DictReader(stream)
+
+
+def iter_xlsx_rows(stream):
+    """Построчно читає перший аркуш XLSX у режимі read_only (потрібен openpyxl)."""
+    try:
+        from openpyxl import load_workbook
+    except ImportError:
+        raise ProductImportError("Для імпорту XLSX потрібно встановити пакет openpyxl")
+
+    workbook = load_workbook(stream, read_only=True, data_only=True)
+    try:
+        rows = workbook.worksheets[0].iter_rows(values_only=True)
+        header = [str(cell).strip() if cell is not None else "" for cell in next(rows, ())]
+        for values in rows:
+            yield {
+                name: ("" if value is None else str(value))
+                for name, value in zip(header, values)
+            }
+    finally:
+        workbook.close()
+
+
+def iter_rows(stream, filename):
+    """Вибирає читач за розширенням файлу."""
+    if filename.lower().endswith(".xlsx"):
+        return iter_xlsx_rows(stream)
+    return iter_csv_rows(stream)
+
+
+# ==========================================================================
+# Імпорт
+
+
+def _decimal(row, name):
+    value = (row.get(name) or "").strip().replace(",", ".")
+    try:
+        return Decimal(value)
+    except InvalidOperation:
+        raise ProductImportError(f"Некоректне число в колонці {name}: «{value}»")
+
+
+def _build_product(row, lookup):
+    """Перетворює рядок файлу на (незбережений) Product з порахованою final_price."""
+    for name in REQUIRED_COLUMNS:
+        if not (row.get(name) or "").strip():
+            raise ProductImportError(f"Не заповнена колонка {name}")
+
+    fabric_id, multiplier = lookup.fabric(
+        (row.get("fabric") or "").strip(),
+        (row.get("fabric_category") or "").strip(),
+    )
+    base_price = _decimal(row, "base_price")
+    is_active = (row.get("is_active") or "1").strip().lower() in TRUE_VALUES
+
+    product = Product(
+        code=row["code"].strip(),
+        name=row["name"].strip(),
+        category_id=lookup.category_id((row.get("category") or "").strip()),
+        fabric_id=fabric_id,
+        length=_decimal(row, "length"),
+        width=_decimal(row, "width"),
+        height=_decimal(row, "height"),
+        base_price=base_price,
+        final_price=matrix_price(base_price, multiplier) if multiplier is not None else base_price,
+        description=(row.get("description") or "").strip() or None,
+        is_active=is_active,
+    )
+    _validate(product)
+    return product
+
+
+def _validate(product):
+    """
+    Перевіряє обмеження полів (довжину рядків, кількість цифр), щоб некоректний
+    рядок потрапив у помилки імпорту, а не обірвав запис пакета помилкою БД.
+    """
+    try:
+        product.clean_fields(exclude=UNVALIDATED_FIELDS)
+    except ValidationError as exc:
+        raise ProductImportError("; ".join(
+            f"{name}: {' '.join(messages)}" for name, messages in exc.message_dict.items()
+        ))
+
+
+def _write_batch(products, result, batch_size):
+    """Розділяє пакет на нові та існуючі вироби і пише їх bulk-запитами."""
+    # Поточна ціна читається тим самим запитом — для журналу змін (audit)
+    existing = {
+        code: (pk, base_price)
+        for code, pk, base_price in Product.objects.filter(
+            code__in=[p.code for p in products]
+        ).values_list("code", "pk", "base_price")
+    }
+    to_create, to_update, price_changes = [], [], []
+    now = timezone.now()
+    for product in products:
+        if product.code not in existing:
+            to_create.append(product)
+        else:
+            product.pk, base_price = existing[product.code]
+            product.updated_at = now
+            to_update.append(product)
+            if base_price != product.base_price:
+                price_changes.append((product.pk, "base_price", base_price, product.base_price))
+
+    if to_create:
+        Product.objects.bulk_create(to_create, batch_size=batch_size)
+    if to_update:
+        Product.objects.bulk_update(to_update, UPDATE_FIELDS, batch_size=batch_size)
+        tracking.record(Product, price_changes)
+    # bulk-запити не надсилають сигналів — рядки матриці цін перебудовуємо пакетом
+    rebuild_products([product.pk for product in products])
+    result.created += len(to_create)
+    result.updated += len(to_update)
+
+
+def import_products(rows, batch_size=DEFAULT_BATCH_SIZE, atomic=True):
+    """
+    Імпортує вироби з ітератора рядків-словників.
+    Рядки з помилками пропускаються і потрапляють у result.errors
+    (номер рядка з урахуванням заголовка, текст помилки; не більше
+    MAX_REPORTED_ERRORS, загальна кількість — result.error_count).
+    """
+    result = ImportResult()
+    lookup = CatalogLookup()
+    numbered = enumerate(rows, start=2)
+
+    with transaction.atomic() if atomic else nullcontext():
+        while True:
+            chunk = list(islice(numbered, batch_size))
+            if not chunk:
+                break
+            batch = {}
+            for line, row in chunk:
+                try:
+                    product = _build_product(row, lookup)
+                except ProductImportError as exc:
+                    result.add_error(line, str(exc))
+                    continue
+                # Якщо код повторюється в пакеті — перемагає останній рядок
+                batch[product.code] = product
+            if batch:
+                _write_batch(list(batch.values()), result, batch_size)
+        # bulk_create / bulk_update не надсилають сигналів — інвалідуємо картки разом
+        transaction.on_commit(lambda: catalog_cache.bump(PRODUCTS_VERSION))
+    return result
+
+
+# ==========================================================================
+# Експорт
+
+
+class Echo:
+    """Псевдо-буфер для csv.writer: повертає рядок замість запису у файл."""
+
+    def write(self, value):
+        return value
+
+
+def export_rows(queryset, chunk_size=2000):
+    """Генерує рядки CSV (із заголовком) для queryset виробів без створення моделей."""
+    writer = csv.writer(Echo())
+    yield writer.writerow(COLUMNS)
+    values = queryset.order_by("pk").values_list(
+        "code",
+        "name",
+        "category__name",
+        "fabric__code",
+        "fabric__category__name",
+        "length",
+        "width",
+        "height",
+        "base_price",
+        "description",
+        "is_active",
+    )
+    for row in values.iterator(chunk_size=chunk_size):
+        *fields, is_active = row
+        yield writer.writerow(
+            ["" if value is None else value for value in fields] + [int(is_active)]
+        )
+
+
+def export_response(queryset, filename="products.csv"):
+    """StreamingHttpResponse з CSV-експортом виробів."""
+    response = StreamingHttpResponse(export_rows(queryset), content_type="text/csv; charset=utf-8")
+    response["Content-Disposition"] = f'attachment; filename="{filename}"'
+    return response
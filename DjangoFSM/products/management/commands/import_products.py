@@ -0,0 +1,44 @@
+from django.core.management.base import BaseCommand, CommandError
+
+from products.import_export import (
+    DEFAULT_BATCH_SIZE,
+    ProductImportError,
+    import_products,
+    iter_rows,
+)
+
+
+class Command(BaseCommand):
+    help = "Потоково імпортує вироби з CSV/XLSX файлу постачальника (bulk_create / bulk_update)."
+
+    def add_arguments(self, parser):
+        parser.add_argument("path", help="Шлях до CSV або XLSX файлу")
+        parser.add_argument(
+            "--batch-size",
+            type=int,
+            default=DEFAULT_BATCH_SIZE,
+            help="Кількість рядків в одному пакеті запису",
+        )
+        parser.add_argument(
+            "--no-atomic",
+            action="store_true",
+            help="Не загортати весь імпорт в одну транзакцію",
+        )
+
+    def handle(self, *args, **options):
+        path = options["path"]
+        try:
+            with open(path, "rb") as stream:
+                result = import_products(
+                    iter_rows(stream, path),
+                    batch_size=options["batch_size"],
+                    atomic=not options["no_atomic"],
+                )
+        except (OSError, ProductImportError) as exc:
+            raise CommandError(str(exc))
+
+        for line, error in result.errors:
+            self.stderr.write(f"Рядок {line}: {error}")
+        if result.error_count > len(result.errors):
+            self.stderr.write(f"… та ще {result.error_count - len(result.errors)} помилок")
+        self.stdout.write(self.style.SUCCESS(str(result)))
@@ -0,0 +1,60 @@
+from concurrent.futures import ProcessPoolExecutor
+from functools import partial
+
+from django.core.management.base import BaseCommand
+from django.db import connections
+from django.db.models import Q
+
+from DjangoFSM.images import init_worker, run_in_worker
+from fabric.models import Fabric
+from products.models import ProductImage
+
+MODELS = {
+    "product": ProductImage,
+    "fabric": Fabric,
+}
+
+
+class Command(BaseCommand):
+    help = "Генерує мініатюри / WebP та метадані для наявних фото виробів і тканин паралельно."
+
+    def add_arguments(self, parser):
+        parser.add_argument(
+            "--model",
+            choices=[*MODELS, "all"],
+            default="all",
+            help="Які фото обробляти",
+        )
+        parser.add_argument("--workers", type=int, default=4, help="Кількість процесів")
+        parser.add_argument(
+            "--force",
+            action="store_true",
+            help="Обробити повторно й ті фото, для яких варіанти вже є",
+        )
+
+    def handle(self, *args, **options):
+        models = MODELS.values() if options["model"] == "all" else [MODELS[options["model"]]]
+        for model in models:
+            queryset = model._default_manager.exclude(image="").exclude(image__isnull=True)
+            if not options["force"]:
+                queryset = queryset.filter(Q(thumbnail="") | Q(thumbnail__isnull=True))
+            pks = list(queryset.order_by("pk").values_list("pk", flat=True))
+            self.stdout.write(f"{model._meta.verbose_name_plural}: {len(pks)} фото")
+            if pks:
+                self.process(model, pks, options["workers"])
+
+    def process(self, model, pks, workers):
+        # Дочірні процеси не повинні успадкувати відкриті з'єднання з БД
+        connections.close_all()
+        done = failed = 0
+        with ProcessPoolExecutor(max_workers=workers, initializer=init_worker) as executor:
+            task = partial(run_in_worker, model._meta.label)
+            for pk, ok in executor.map(task, pks, chunksize=max(1, len(pks) // (workers * 8))):
+                if ok:
+                    done += 1
+                else:
+                    failed += 1
+                    self.stderr.write(f"#{pk}: помилка обробки")
+                if (done + failed) % 500 == 0:
+                    self.stdout.write(f"  оброблено {done + failed} / {len(pks)}")
+        self.stdout.write(self.style.SUCCESS(f"Готово: {done}, з помилками: {failed}"))
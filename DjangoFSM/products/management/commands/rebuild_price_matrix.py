@@ -0,0 +1,25 @@
+from django.core.management.base import BaseCommand
+
+from products.models import ProductFabricPrice
+from products.price_matrix import DEFAULT_BATCH_SIZE, rebuild_matrix
+
+
+class Command(BaseCommand):
+    help = (
+        "Повністю перебудовує матрицю цін «виріб × тканина» пакетами виробів. "
+        "Потрібна після масового завантаження даних в обхід сигналів (напр. generate_data)."
+    )
+
+    def add_arguments(self, parser):
+        parser.add_argument(
+            "--batch-size",
+            type=int,
+            default=DEFAULT_BATCH_SIZE,
+            help="Кількість виробів в одній транзакції",
+        )
+
+    def handle(self, *args, **options):
+        written = rebuild_matrix(batch_size=options["batch_size"], stdout=self.stdout)
+        self.stdout.write(self.style.SUCCESS(
+            f"Записано пар: {written}, у матриці: {ProductFabricPrice.objects.count()}"
+        ))
@@ -0,0 +1,31 @@
+from django.core.management.base import BaseCommand
+
+from products.models import Product
+from products.pricing import DEFAULT_BATCH_SIZE, reprice_catalog
+
+
+class Command(BaseCommand):
+    help = "Перераховує кінцеві ціни виробів пакетними UPDATE (без збереження кожного виробу)."
+
+    def add_arguments(self, parser):
+        parser.add_argument(
+            "--batch-size",
+            type=int,
+            default=DEFAULT_BATCH_SIZE,
+            help="Кількість id виробів в одному UPDATE",
+        )
+        parser.add_argument(
+            "--fabric",
+            action="append",
+            dest="fabric_codes",
+            default=[],
+            help="Код тканини (можна вказати кілька разів); за замовчуванням — весь каталог",
+        )
+
+    def handle(self, *args, **options):
+        queryset = Product.objects.all()
+        if options["fabric_codes"]:
+            queryset = queryset.filter(fabric__code__in=options["fabric_codes"])
+
+        updated = reprice_catalog(batch_size=options["batch_size"], queryset=queryset)
+        self.stdout.write(self.style.SUCCESS(f"Перераховано цін: {updated}"))
@@ -0,0 +1,39 @@
+# Generated by Django 5.2.8 on 2026-10-18 10:45
+
+import django.db.models.deletion
+from django.db import migrations, models
+
+from DjangoFSM.migration_operations import AddIndexConcurrently
+
+
+class Migration(migrations.Migration):
+
+    # Індекси великої таблиці будуються CONCURRENTLY (PostgreSQL) — поза транзакцією
+    atomic = False
+
+    dependencies = [
+        ('fabric', '0002_fabric_indexes'),
+        ('products', '0003_product_final_price_alter_product_category'),
+    ]
+
+    operations = [
+        AddIndexConcurrently(
+            model_name='product',
+            index=models.Index(fields=['category', 'is_active'], name='product_category_active_idx'),
+        ),
+        AddIndexConcurrently(
+            model_name='product',
+            index=models.Index(fields=['fabric', 'is_active'], name='product_fabric_active_idx'),
+        ),
+        # Окремі індекси FK тепер покриваються складеними
+        migrations.AlterField(
+            model_name='product',
+            name='category',
+            field=models.ForeignKey(blank=True, db_index=False, null=True, on_delete=django.db.models.deletion.SET_NULL, related_name='products', to='products.category', verbose_name='Категорія'),
+        ),
+        migrations.AlterField(
+            model_name='product',
+            name='fabric',
+            field=models.ForeignKey(blank=True, db_index=False, null=True, on_delete=django.db.models.deletion.SET_NULL, related_name='products', to='fabric.fabric', verbose_name='Основна тканина'),
+        ),
+    ]
@@ -0,0 +1,44 @@
+# Generated by Django 5.2.8 on 2026-10-18 10:52
+
+import DjangoFSM.images
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('products', '0004_product_indexes'),
+    ]
+
+    operations = [
+        migrations.AddField(
+            model_name='productimage',
+            name='image_height',
+            field=models.PositiveIntegerField(blank=True, editable=False, null=True, verbose_name='Висота (px)'),
+        ),
+        migrations.AddField(
+            model_name='productimage',
+            name='image_size',
+            field=models.PositiveBigIntegerField(blank=True, editable=False, null=True, verbose_name='Розмір (байт)'),
+        ),
+        migrations.AddField(
+            model_name='productimage',
+            name='image_width',
+            field=models.PositiveIntegerField(blank=True, editable=False, null=True, verbose_name='Ширина (px)'),
+        ),
+        migrations.AddField(
+            model_name='productimage',
+            name='preview_webp',
+            field=models.ImageField(blank=True, editable=False, max_length=255, null=True, upload_to=DjangoFSM.images.variant_upload_to, verbose_name='Превʼю WebP'),
+        ),
+        migrations.AddField(
+            model_name='productimage',
+            name='thumbnail',
+            field=models.ImageField(blank=True, editable=False, max_length=255, null=True, upload_to=DjangoFSM.images.variant_upload_to, verbose_name='Мініатюра'),
+        ),
+        migrations.AddField(
+            model_name='productimage',
+            name='thumbnail_webp',
+            field=models.ImageField(blank=True, editable=False, max_length=255, null=True, upload_to=DjangoFSM.images.variant_upload_to, verbose_name='Мініатюра WebP'),
+        ),
+    ]
@@ -0,0 +1,33 @@
+# Generated by Django 5.2.8 on 2026-10-18 11:15
+
+import django.db.models.deletion
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('fabric', '0005_fabric_color_components'),
+        ('products', '0005_productimage_variants'),
+    ]
+
+    operations = [
+        migrations.AddField(
+            model_name='category',
+            name='allowed_fabric_categories',
+            field=models.ManyToManyField(blank=True, related_name='+', to='fabric.fabriccategory', verbose_name='Дозволені категорії тканин'),
+        ),
+        migrations.CreateModel(
+            name='ProductFabricPrice',
+            fields=[
+                ('pk', models.CompositePrimaryKey('product_id', 'fabric_id', blank=True, editable=False, primary_key=True, serialize=False)),
+                ('price', models.DecimalField(decimal_places=2, max_digits=10, verbose_name='Ціна (грн)')),
+                ('fabric', models.ForeignKey(on_delete=django.db.models.deletion.CASCADE, related_name='product_prices', to='fabric.fabric', verbose_name='Тканина')),
+                ('product', models.ForeignKey(db_index=False, on_delete=django.db.models.deletion.CASCADE, related_name='fabric_prices', to='products.product', verbose_name='Виріб')),
+            ],
+            options={
+                'verbose_name': 'Ціна в тканині',
+                'verbose_name_plural': 'Матриця цін',
+            },
+        ),
+    ]
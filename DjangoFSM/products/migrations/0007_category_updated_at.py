@@ -0,0 +1,18 @@
+# Generated by Django 5.2.8 on 2026-10-18 12:09
+
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('products', '0006_price_matrix'),
+    ]
+
+    operations = [
+        migrations.AddField(
+            model_name='category',
+            name='updated_at',
+            field=models.DateTimeField(auto_now=True, verbose_name='Дата оновлення'),
+        ),
+    ]
@@ -1,13 +1,27 @@
+from decimal import ROUND_HALF_UP, Decimal
+
 from django.db import models
-from fabric.models import Fabric
+from DjangoFSM.images import ImageVariantsMixin
+from fabric.models import Fabric, FabricCategory
 
 # Create your models here.
 
+CENT = Decimal("0.01")
+
 
 class Category(models.Model):
     """Категорія товару (наприклад: дивани, крісла, ліжка)."""
     name = models.CharField(max_length=100, unique=True, verbose_name="Назва категорії")
     description = models.TextField(blank=True, null=True, verbose_name="Опис категорії")
+    # Порожньо — вироби категорії доступні в усіх тканинах (див. products.price_matrix)
+    allowed_fabric_categories = models.ManyToManyField(
+        FabricCategory,
+        blank=True,
+        related_name="+",
+        verbose_name="Дозволені категорії тканин",
+    )
+    # Входить у валідатори (ETag / Last-Modified) API каталогу: назва є в картці виробу
+    updated_at = models.DateTimeField(auto_now=True, verbose_name="Дата оновлення")
 
     def __str__(self):
         return self.name
@@ -32,6 +46,7 @@ class Product(models.Model):
         on_delete=models.SET_NULL,
         null=True,
         blank=True,
+        db_index=False,
         related_name="products",
         verbose_name="Категорія"
     )
@@ -50,6 +65,7 @@ class Product(models.Model):
         on_delete=models.SET_NULL,
         null=True,
         blank=True,
+        db_index=False,
         related_name="products",
         verbose_name="Основна тканина"
     )
@@ -69,28 +85,101 @@ class Product(models.Model):
     created_at = models.DateTimeField(auto_now_add=True)
     updated_at = models.DateTimeField(auto_now=True)
 
+    @classmethod
+    def from_db(cls, db, field_names, values):
+        instance = super().from_db(db, field_names, values)
+        # Запам'ятовуємо поля, від яких залежить матриця цін, щоб оновлювати її лише при їх зміні
+        instance._loaded_matrix_state = instance.matrix_state()
+        return instance
+
+    def matrix_state(self):
+        base_price = self.__dict__.get("base_price")
+        return (
+            Decimal(str(base_price)) if base_price is not None else None,
+            self.__dict__.get("is_active"),
+            self.__dict__.get("category_id"),
+        )
+
     def save(self, *args, **kwargs):
         """Під час збереження автоматично розраховує кінцеву ціну виробу."""
-        if self.fabric and hasattr(self.fabric, "price_multiplier"):
+        multiplier = self.get_price_multiplier()
+        if multiplier is not None:
             # Якщо у тканини заданий множник ціни — рахуємо фінальну вартість
-            self.final_price = self.base_price * self.fabric.price_multiplier
+            # (округлення до копійок — як у SQL-перерахунку products.pricing)
+            self.final_price = (Decimal(str(self.base_price)) * multiplier).quantize(CENT, rounding=ROUND_HALF_UP)
         else:
             # Якщо тканина не обрана або без коефіцієнта — залишаємо базову ціну
             self.final_price = self.base_price
         super().save(*args, **kwargs)
 
+    def get_price_multiplier(self):
+        """
+        Повертає множник ціни тканини.
+        Якщо тканина вже завантажена — бере його з неї, інакше читає лише
+        одне поле price_multiplier, не підвантажуючи весь рядок тканини.
+        """
+        if self.fabric_id is None:
+            return None
+        if Product.fabric.is_cached(self):
+            # Для щойно створеної тканини множник може бути float (default=1.00)
+            return Decimal(str(self.fabric.price_multiplier))
+        return (
+            Fabric.objects.filter(pk=self.fabric_id)
+            .values_list("price_multiplier", flat=True)
+            .first()
+        )
+
     def __str__(self):
         return f"{self.name} ({self.code})"
 
     class Meta:
         verbose_name = "Виріб"
         verbose_name_plural = "Вироби"
+        indexes = [
+            # Один індекс на FK замість окремого індексу FK, складеного та часткового:
+            # обслуговує і фільтр каталогу (category, is_active), і пошук за самою категорією
+            models.Index(fields=["category", "is_active"], name="product_category_active_idx"),
+            models.Index(fields=["fabric", "is_active"], name="product_fabric_active_idx"),
+        ]
+
+
+# ==========================================================================
+
+
+class ProductFabricPrice(models.Model):
+    """
+    Ціна виробу в тканині (матриця цін, див. products.price_matrix).
+    Складений первинний ключ (виріб, тканина) — без окремого id, а пошук ціни пари
+    йде за індексом первинного ключа.
+    """
+    pk = models.CompositePrimaryKey("product_id", "fabric_id")
+    product = models.ForeignKey(
+        Product,
+        on_delete=models.CASCADE,
+        db_index=False,
+        related_name="fabric_prices",
+        verbose_name="Виріб"
+    )
+    fabric = models.ForeignKey(
+        Fabric,
+        on_delete=models.CASCADE,
+        related_name="product_prices",
+        verbose_name="Тканина"
+    )
+    price = models.DecimalField(max_digits=10, decimal_places=2, verbose_name="Ціна (грн)")
+
+    def __str__(self):
+        return f"{self.product_id} × {self.fabric_id}: {self.price}"
+
+    class Meta:
+        verbose_name = "Ціна в тканині"
+        verbose_name_plural = "Матриця цін"
 
 
 # ==========================================================================
 
 
-class ProductImage(models.Model):
+class ProductImage(ImageVariantsMixin, models.Model):
     """Фото виробу (може бути кілька, одне — головне)."""
 
     product = models.ForeignKey(
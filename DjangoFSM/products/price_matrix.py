@@ -0,0 +1,163 @@
+"""
+Матриця цін «виріб × тканина».
+
+Для кожного активного виробу та кожної дозволеної для нього активної тканини
+зберігається готова ціна base_price * price_multiplier (ProductFabricPrice).
+Дозволені тканини задаються на категорії виробу (allowed_fabric_categories);
+категорія без обмежень (або виріб без категорії) допускає всі активні тканини.
+
+Матриця оновлюється інкрементально сигналами:
+* змінилася базова ціна виробу — один UPDATE рядка матриці цього виробу;
+* змінився множник тканини — один UPDATE стовпця цієї тканини;
+* змінилися активність / категорія виробу чи тканини або дозволи категорії —
+  рядок / стовпець перебудовується (DELETE + bulk_create).
+Повна перебудова — команда rebuild_price_matrix.
+
+Ціна для пари — quote(): читання одного рядка за первинним ключем.
+
+Обидва шляхи округлюють до копійок однаково — половину від нуля (ROUND_HALF_UP
+в Python, ROUND(..., 2) у SQL), тож інкрементне оновлення й перебудова дають
+ту саму ціну пари.
+"""
+from collections import defaultdict
+from decimal import ROUND_HALF_UP, Decimal
+
+from django.db import models, transaction
+from django.db.models import OuterRef, Q, Subquery, Value
+from django.db.models.functions import Round
+
+from fabric.models import Fabric
+from .models import CENT, Category, Product, ProductFabricPrice
+
+DEFAULT_BATCH_SIZE = 1000
+# Скільки рядків матриці писати одним INSERT
+INSERT_BATCH_SIZE = 5000
+
+PRICE_FIELD = models.DecimalField(max_digits=10, decimal_places=2)
+
+
+def matrix_price(base_price, multiplier):
+    return (Decimal(base_price) * Decimal(str(multiplier))).quantize(CENT, rounding=ROUND_HALF_UP)
+
+
+def quote(product_id, fabric_id):
+    """Ціна виробу в тканині з матриці або None, якщо пара не дозволена / неактивна."""
+    return (
+        ProductFabricPrice.objects.filter(product_id=product_id, fabric_id=fabric_id)
+        .values_list("price", flat=True)
+        .first()
+    )
+
+
+def _allowed_fabrics(category_ids):
+    """{id категорії виробу: [(id тканини, множник)]} для активних тканин."""
+    restrictions = defaultdict(set)
+    for category_id, fabric_category_id in Category.allowed_fabric_categories.through.objects.filter(
+        category_id__in=[pk for pk in category_ids if pk is not None]
+    ).values_list("category_id", "fabriccategory_id"):
+        restrictions[category_id].add(fabric_category_id)
+
+    fabrics = list(Fabric.objects.filter(is_active=True).values_list("pk", "price_multiplier", "category_id"))
+    result = {}
+    for category_id in category_ids:
+        allowed = restrictions.get(category_id)
+        result[category_id] = [
+            (pk, multiplier) for pk, multiplier, fabric_category_id in fabrics
+            if allowed is None or fabric_category_id in allowed
+        ]
+    return result
+
+
+def _insert(rows):
+    ProductFabricPrice.objects.bulk_create(rows, batch_size=INSERT_BATCH_SIZE)
+    return len(rows)
+
+
+def rebuild_products(product_ids):
+    """Перебудовує рядки матриці для виробів. Повертає кількість записаних пар."""
+    product_ids = list(product_ids)
+    with transaction.atomic():
+        ProductFabricPrice.objects.filter(product_id__in=product_ids).delete()
+        products = list(
+            Product.objects.filter(pk__in=product_ids, is_active=True).values_list("pk", "base_price", "category_id")
+        )
+        if not products:
+            return 0
+        allowed = _allowed_fabrics({category_id for _, _, category_id in products})
+        return _insert([
+            ProductFabricPrice(product_id=pk, fabric_id=fabric_id, price=matrix_price(base_price, multiplier))
+            for pk, base_price, category_id in products
+            for fabric_id, multiplier in allowed[category_id]
+        ])
+
+
+def rebuild_fabrics(fabric_ids):
+    """Перебудовує стовпці матриці для тканин. Повертає кількість записаних пар."""
+    fabric_ids = list(fabric_ids)
+    written = 0
+    with transaction.atomic():
+        ProductFabricPrice.objects.filter(fabric_id__in=fabric_ids).delete()
+        for pk, multiplier, fabric_category_id in Fabric.objects.filter(
+            pk__in=fabric_ids, is_active=True
+        ).values_list("pk", "price_multiplier", "category_id"):
+            # Вироби, категорія яких не обмежує тканини або дозволяє категорію цієї тканини
+            allowed = Q(category__isnull=True) | Q(category__allowed_fabric_categories__isnull=True)
+            if fabric_category_id is not None:
+                allowed |= Q(category__allowed_fabric_categories=fabric_category_id)
+            products = (
+                Product.objects.filter(allowed, is_active=True)
+                .values_list("pk", "base_price")
+                .distinct()
+            )
+            written += _insert([
+                ProductFabricPrice(product_id=product_id, fabric_id=pk, price=matrix_price(base_price, multiplier))
+                for product_id, base_price in products
+            ])
+    return written
+
+
+def rebuild_category(category):
+    """Перебудовує рядки всіх виробів категорії (після зміни дозволених тканин)."""
+    product_ids = list(category.products.values_list("pk", flat=True))
+    written = 0
+    for start in range(0, len(product_ids), DEFAULT_BATCH_SIZE):
+        written += rebuild_products(product_ids[start:start + DEFAULT_BATCH_SIZE])
+    return written
+
+
+def update_product_price(product):
+    """Нова базова ціна виробу: перераховує його рядок матриці одним UPDATE."""
+    multiplier = Subquery(
+        Fabric.objects.filter(pk=OuterRef("fabric_id")).values("price_multiplier")[:1],
+        output_field=PRICE_FIELD,
+    )
+    return ProductFabricPrice.objects.filter(product_id=product.pk).update(
+        price=Round(Value(Decimal(product.base_price), output_field=PRICE_FIELD) * multiplier, 2),
+    )
+
+
+def update_fabric_price(fabric):
+    """Новий множник тканини: перераховує її стовпець матриці одним UPDATE."""
+    base_price = Subquery(
+        Product.objects.filter(pk=OuterRef("product_id")).values("base_price")[:1],
+        output_field=PRICE_FIELD,
+    )
+    return ProductFabricPrice.objects.filter(fabric_id=fabric.pk).update(
+        price=Round(base_price * Value(Decimal(str(fabric.price_multiplier)), output_field=PRICE_FIELD), 2),
+    )
+
+
+def rebuild_matrix(batch_size=DEFAULT_BATCH_SIZE, stdout=None):
+    """
+    Повна перебудова пакетами виробів (кожен пакет — окрема транзакція).
+    Повертає кількість пар у матриці.
+    """
+    # Рядки неактивних / видалених виробів прибираються одним запитом
+    ProductFabricPrice.objects.exclude(product__is_active=True).delete()
+    product_ids = list(Product.objects.filter(is_active=True).order_by("pk").values_list("pk", flat=True))
+    written = 0
+    for start in range(0, len(product_ids), batch_size):
+        written += rebuild_products(product_ids[start:start + batch_size])
+        if stdout is not None:
+            stdout.write(f"  виробів: {min(start + batch_size, len(product_ids))} / {len(product_ids)}")
+    return written
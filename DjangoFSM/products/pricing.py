@@ -0,0 +1,90 @@
+"""
+Масовий перерахунок кінцевих цін виробів.
+
+Замість збереження кожного виробу окремо (Product.save() з підвантаженням тканини)
+ціни перераховуються одним UPDATE на рівні БД або пакетами UPDATE за діапазонами id.
+Ціни округлюються до копійок у SQL (Round), так само як у Product.save().
+"""
+from decimal import Decimal
+
+from django.db import models, transaction
+from django.db.models import F, OuterRef, Subquery, Value
+from django.db.models.functions import Coalesce, Round
+from django.utils import timezone
+
+from DjangoFSM.cache import catalog_cache
+from fabric.cache import fabric_version
+from fabric.models import Fabric
+from .cache import PRODUCTS_VERSION
+from .models import Product
+
+# Розмір пакета за замовчуванням для перерахунку всього каталогу
+DEFAULT_BATCH_SIZE = 10000
+
+PRICE_FIELD = models.DecimalField(max_digits=10, decimal_places=2)
+
+
+def final_price_expression():
+    """
+    SQL-вираз кінцевої ціни: base_price * fabric.price_multiplier, округлена
+    до копійок, або base_price, якщо тканина не обрана.
+    """
+    multiplier = Subquery(
+        Fabric.objects.filter(pk=OuterRef("fabric_id")).values("price_multiplier")[:1],
+        output_field=PRICE_FIELD,
+    )
+    return Coalesce(
+        Round(F("base_price") * multiplier, 2, output_field=PRICE_FIELD),
+        F("base_price"),
+        output_field=PRICE_FIELD,
+    )
+
+
+def reprice_fabric(fabric):
+    """
+    Перераховує ціни всіх виробів однієї тканини одним UPDATE.
+    Множник вже відомий, тому підзапит до таблиці тканин не потрібен.
+    Повертає кількість оновлених рядків.
+    """
+    multiplier = Decimal(str(fabric.price_multiplier))
+    return Product.objects.filter(fabric_id=fabric.pk).update(
+        final_price=Round(F("base_price") * Value(multiplier, output_field=PRICE_FIELD), 2),
+        updated_at=timezone.now(),
+    )
+
+
+def reprice_fabrics(fabric_ids):
+    """Перераховує ціни виробів для набору тканин одним UPDATE."""
+    fabric_ids = list(fabric_ids)
+    updated = Product.objects.filter(fabric_id__in=fabric_ids).update(
+        final_price=final_price_expression(),
+        updated_at=timezone.now(),
+    )
+    catalog_cache.bump_on_commit(*[fabric_version(pk) for pk in fabric_ids])
+    return updated
+
+
+def reprice_catalog(batch_size=DEFAULT_BATCH_SIZE, queryset=None):
+    """
+    Перераховує кінцеві ціни всього каталогу (або переданого queryset)
+    пакетами UPDATE за діапазонами id, щоб не тримати довгих блокувань.
+    Кожен пакет виконується у власній транзакції. Повертає кількість оновлених рядків.
+    """
+    queryset = Product.objects.all() if queryset is None else queryset
+    bounds = queryset.aggregate(low=models.Min("pk"), high=models.Max("pk"))
+    if bounds["low"] is None:
+        return 0
+
+    updated = 0
+    start = bounds["low"]
+    while start <= bounds["high"]:
+        end = start + batch_size
+        with transaction.atomic():
+            updated += queryset.filter(pk__gte=start, pk__lt=end).update(
+                final_price=final_price_expression(),
+                updated_at=timezone.now(),
+            )
+        start = end
+    # UPDATE обходить сигнали, тому інвалідуємо всі картки виробів разом
+    catalog_cache.bump_on_commit(PRODUCTS_VERSION)
+    return updated
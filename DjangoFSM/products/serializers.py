@@ -0,0 +1,52 @@
+"""Перетворення моделей каталогу на словники для JSON API (без DRF)."""
+from django.db.models import Prefetch
+
+from .models import Product, ProductImage
+
+
+def catalog_products():
+    """Активні вироби з усім потрібним для картки за фіксовану кількість запитів."""
+    return (
+        Product.objects.filter(is_active=True)
+        .select_related("category", "fabric")
+        .prefetch_related(
+            Prefetch(
+                "images",
+                queryset=ProductImage.objects.filter(is_main=True),
+                to_attr="main_images",
+            )
+        )
+    )
+
+
+def serialize_product(product):
+    """Картка виробу. Очікує queryset з catalog_products()."""
+    category = product.category
+    fabric = product.fabric
+    main_image = product.main_images[0] if product.main_images else None
+    return {
+        "id": product.pk,
+        "code": product.code,
+        "name": product.name,
+        "category": {"id": category.pk, "name": category.name} if category else None,
+        "fabric": {
+            "id": fabric.pk,
+            "code": fabric.code,
+            "name": fabric.name,
+            "color_name": fabric.color_name,
+        } if fabric else None,
+        "dimensions": {
+            "length": product.length,
+            "width": product.width,
+            "height": product.height,
+        },
+        "main_image": {
+            "thumbnail": main_image.thumbnail_url,
+            "preview": main_image.preview_webp.url if main_image.preview_webp else None,
+            "original": main_image.image.url,
+            "width": main_image.image_width,
+            "height": main_image.image_height,
+        } if main_image else None,
+        "final_price": product.final_price,
+        "updated_at": product.updated_at,
+    }
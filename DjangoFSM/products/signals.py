@@ -0,0 +1,98 @@
+from django.db.models.signals import m2m_changed, post_delete, post_save
+from django.dispatch import receiver
+from django.utils import timezone
+
+from DjangoFSM.cache import catalog_cache
+from DjangoFSM.images import image_variants_ready, release_files_on_delete, schedule_on_image_change
+from fabric.models import Fabric
+from .cache import CATEGORIES_VERSION, product_version
+from .models import Category, Product, ProductImage
+from .price_matrix import rebuild_category, rebuild_fabrics, rebuild_products, update_fabric_price, update_product_price
+from .pricing import reprice_fabric
+
+# Поля, зміна яких впливає на матрицю цін
+PRODUCT_MATRIX_FIELDS = {"base_price", "is_active", "category", "category_id"}
+FABRIC_MATRIX_FIELDS = {"price_multiplier", "is_active", "category", "category_id"}
+
+
+@receiver(post_save, sender=Fabric)
+def reprice_products_on_multiplier_change(sender, instance, created, update_fields=None, **kwargs):
+    """Після зміни множника тканини перераховує ціни всіх її виробів одним UPDATE."""
+    if created or kwargs.get("raw"):
+        return
+    if update_fields is not None and "price_multiplier" not in update_fields:
+        return
+    if not instance.price_multiplier_changed():
+        return
+    reprice_fabric(instance)
+    instance._loaded_price_multiplier = instance.price_multiplier
+
+
+def _refresh_matrix(instance, created, update_fields, fields, rebuild, update_price):
+    """
+    Оновлює матрицю цін після збереження виробу / тканини: при зміні лише ціни —
+    одним UPDATE, при зміні активності або категорії — перебудовою.
+    """
+    if update_fields is not None and not fields & set(update_fields):
+        return
+    loaded = getattr(instance, "_loaded_matrix_state", None)
+    state = instance.matrix_state()
+    if created or loaded is None or loaded[1:] != state[1:]:
+        rebuild([instance.pk])
+    elif loaded[0] != state[0]:
+        update_price(instance)
+    instance._loaded_matrix_state = state
+
+
+@receiver(post_save, sender=Fabric)
+def update_price_matrix_on_fabric_change(sender, instance, created, update_fields=None, raw=False, **kwargs):
+    if not raw:
+        _refresh_matrix(instance, created, update_fields, FABRIC_MATRIX_FIELDS, rebuild_fabrics, update_fabric_price)
+
+
+@receiver(post_save, sender=Product)
+def update_price_matrix_on_product_change(sender, instance, created, update_fields=None, raw=False, **kwargs):
+    if not raw:
+        _refresh_matrix(instance, created, update_fields, PRODUCT_MATRIX_FIELDS, rebuild_products, update_product_price)
+
+
+@receiver(m2m_changed, sender=Category.allowed_fabric_categories.through)
+def update_price_matrix_on_allowed_fabrics_change(sender, instance, action, **kwargs):
+    if action in ("post_add", "post_remove", "post_clear"):
+        rebuild_category(instance)
+
+
+@receiver([post_save, post_delete], sender=Product)
+def invalidate_product_card(sender, instance, **kwargs):
+    catalog_cache.bump_on_commit(product_version(instance.pk))
+
+
+def touch_product(product_id):
+    """Оновлює дату виробу, щоб змінилися ETag / Last-Modified його картки в API."""
+    Product.objects.filter(pk=product_id).update(updated_at=timezone.now())
+
+
+@receiver([post_save, post_delete], sender=ProductImage)
+def invalidate_product_card_on_image_change(sender, instance, raw=False, **kwargs):
+    if not raw:
+        touch_product(instance.product_id)
+    catalog_cache.bump_on_commit(product_version(instance.product_id))
+
+
+@receiver([post_save, post_delete], sender=Category)
+def invalidate_categories(sender, instance, **kwargs):
+    catalog_cache.bump_on_commit(CATEGORIES_VERSION)
+
+
+# Фонова генерація мініатюр / WebP після завантаження нового фото;
+# файли видаленого фото звільняються після коміту
+post_save.connect(schedule_on_image_change, sender=ProductImage, dispatch_uid="product_image_variants")
+post_delete.connect(release_files_on_delete, sender=ProductImage, dispatch_uid="product_image_files")
+
+
+@receiver(image_variants_ready, sender=ProductImage)
+def invalidate_card_on_variants_ready(sender, pk, **kwargs):
+    product_id = ProductImage.objects.filter(pk=pk).values_list("product_id", flat=True).first()
+    if product_id is not None:
+        touch_product(product_id)
+        catalog_cache.bump_on_commit(product_version(product_id))
@@ -1,3 +1,487 @@
-from django.test import TestCase
+import csv
+import io
+from decimal import Decimal
+from unittest import mock
 
-# Create your tests here.
+from django.contrib.auth import get_user_model
+from django.core.cache import cache
+from django.core.files.uploadedfile import SimpleUploadedFile
+from django.core.management import call_command
+from django.db import connection
+from django.test import TestCase, override_settings
+from django.test.utils import CaptureQueriesContext
+from django.urls import reverse
+
+from DjangoFSM.cache import catalog_cache
+from DjangoFSM.testing import AdminQueryBudgetMixin
+from fabric.models import Fabric, FabricCategory
+from .cache import get_product_cards, product_version
+from .import_export import COLUMNS, export_response, import_products, iter_csv_rows
+from .models import Category, Product, ProductFabricPrice, ProductImage
+from .price_matrix import quote, rebuild_matrix
+from .pricing import reprice_catalog, reprice_fabric, reprice_fabrics
+
+
+def make_products(start, count):
+    category = Category.objects.create(name=f"Категорія {start}")
+    fabric = Fabric.objects.create(
+        name=f"Тканина {start}", code=f"F{start}", color_name="Сірий", color_code="#808080"
+    )
+    products = []
+    for i in range(start, start + count):
+        product = Product.objects.create(
+            name=f"Виріб {i}",
+            code=f"P{i}",
+            category=category,
+            fabric=fabric,
+            length=Decimal("200"),
+            width=Decimal("90"),
+            height=Decimal("80"),
+            base_price=Decimal("1000"),
+        )
+        ProductImage.objects.create(product=product, image=f"product_images/{i}.jpg", is_main=True)
+        products.append(product)
+    return products
+
+
+class AdminQueryBudgetTests(AdminQueryBudgetMixin, TestCase):
+
+    def test_category_changelist(self):
+        self.assertChangelistBudget(Category, 6, make_products)
+
+    def test_product_changelist(self):
+        self.assertChangelistBudget(Product, 8, make_products)
+
+    def test_product_image_changelist(self):
+        self.assertChangelistBudget(ProductImage, 6, make_products)
+
+    def test_product_change_view(self):
+        product = make_products(0, 5)[0]
+        self.assertChangeViewBudget(product, 9)
+
+    def test_product_change_view_many_images(self):
+        product = make_products(0, 1)[0]
+        url = reverse("admin:products_product_change", args=[product.pk])
+        few = self.count_queries(url)
+        ProductImage.objects.bulk_create(
+            ProductImage(product=product, image=f"product_images/extra{i}.jpg") for i in range(30)
+        )
+        self.assertEqual(self.count_queries(url), few)
+        response = self.client.get(f"{url}?images-page=3")
+        self.assertEqual(response.context["inline_admin_formsets"][0].formset.initial_form_count(), 7)
+
+    def test_product_image_change_view(self):
+        image = make_products(0, 5)[0].images.get()
+        self.assertChangeViewBudget(image, 7)
+
+
+class RepricingTests(TestCase):
+
+    def setUp(self):
+        self.velour = make_products(0, 2)
+        self.chenille = make_products(2, 1)
+        self.fabric = self.velour[0].fabric
+
+    def prices(self):
+        return dict(Product.objects.values_list("code", "final_price"))
+
+    def product_updates(self, context):
+        return [query["sql"] for query in context.captured_queries
+                if query["sql"].startswith('UPDATE "products_product"')]
+
+    def test_multiplier_change_reprices_fabric_products_in_one_update(self):
+        self.fabric.price_multiplier = Decimal("1.50")
+        with CaptureQueriesContext(connection) as context:
+            self.fabric.save()
+        self.assertEqual(len(self.product_updates(context)), 1)
+        self.assertEqual(self.prices(), {"P0": Decimal("1500.00"), "P1": Decimal("1500.00"), "P2": Decimal("1000.00")})
+
+    def test_half_cent_prices_round_alike(self):
+        # 100.50 * 1.15 = 115.575 — половина копійки округлюється вгору всюди
+        Product.objects.update(base_price=Decimal("100.50"))
+        Fabric.objects.filter(pk=self.fabric.pk).update(price_multiplier=Decimal("1.15"))
+        self.fabric.refresh_from_db()
+        product = Product.objects.get(code="P0")
+        product.save()
+        product.refresh_from_db()
+        self.assertEqual(product.final_price, Decimal("115.58"))
+
+        for reprice in (lambda: reprice_fabric(self.fabric), lambda: reprice_fabrics([self.fabric.pk]), reprice_catalog):
+            Product.objects.update(final_price=0)
+            reprice()
+            self.assertEqual(self.prices()["P1"], Decimal("115.58"))
+
+        result = import_products(iter_csv_rows(io.BytesIO(csv_rows(
+            {"code": "N1", "name": "Крісло", "fabric": self.fabric.code, "base_price": "100.50"},
+        ))))
+        self.assertEqual(result.errors, [])
+        self.assertEqual(self.prices()["N1"], Decimal("115.58"))
+
+    def test_save_without_multiplier_is_noop(self):
+        self.fabric.price_multiplier = Decimal("1.50")
+        self.fabric.name = "Велюр"
+        with CaptureQueriesContext(connection) as context:
+            self.fabric.save(update_fields=["name"])
+        self.assertEqual(self.product_updates(context), [])
+
+        fabric = Fabric.objects.get(pk=self.fabric.pk)
+        fabric.color_name = "Синій"
+        with CaptureQueriesContext(connection) as context:
+            fabric.save()
+        self.assertEqual(self.product_updates(context), [])
+        self.assertEqual(set(self.prices().values()), {Decimal("1000.00")})
+
+    def test_reprice_command(self):
+        Fabric.objects.filter(pk=self.fabric.pk).update(price_multiplier=Decimal("1.20"))
+        Product.objects.update(final_price=0)
+
+        call_command("reprice_products", "--fabric", self.fabric.code, stdout=io.StringIO())
+        self.assertEqual(self.prices(), {"P0": Decimal("1200.00"), "P1": Decimal("1200.00"), "P2": Decimal("0.00")})
+
+        out = io.StringIO()
+        call_command("reprice_products", "--batch-size", "1", stdout=out)
+        self.assertIn("Перераховано цін: 3", out.getvalue())
+        self.assertEqual(self.prices()["P2"], Decimal("1000.00"))
+
+    def test_admin_action(self):
+        admin_user = get_user_model().objects.create_superuser(
+            username="admin", email="admin@example.com", password="password", phone_number="+380500000001"
+        )
+        self.client.force_login(admin_user)
+        Fabric.objects.filter(pk=self.fabric.pk).update(price_multiplier=Decimal("0.80"))
+
+        response = self.client.post(
+            reverse("admin:fabric_fabric_changelist"),
+            {"action": "reprice_products", "_selected_action": [self.fabric.pk]},
+            follow=True,
+        )
+        self.assertContains(response, "Перераховано цін виробів: 2")
+        self.assertEqual(self.prices(), {"P0": Decimal("800.00"), "P1": Decimal("800.00"), "P2": Decimal("1000.00")})
+
+
+# Поля виробу, що проходять через експорт / імпорт без змін
+EXPORTED_FIELDS = ("code", "name", "category_id", "fabric_id", "length", "width", "height",
+                   "base_price", "final_price", "description", "is_active")
+
+
+def csv_rows(*rows):
+    """CSV-файл імпорту (байти) з колонками COLUMNS."""
+    buffer = io.StringIO()
+    writer = csv.DictWriter(buffer, fieldnames=COLUMNS)
+    writer.writeheader()
+    for row in rows:
+        writer.writerow({"length": "200", "width": "90", "height": "80", "base_price": "1000", **row})
+    return buffer.getvalue().encode()
+
+
+class ImportExportTests(TestCase):
+
+    def setUp(self):
+        self.product = make_products(0, 1)[0]
+        self.fabric = self.product.fabric
+        self.fabric.price_multiplier = Decimal("1.50")
+        self.fabric.save()
+
+    def import_csv(self, content, **kwargs):
+        return import_products(iter_csv_rows(io.BytesIO(content)), **kwargs)
+
+    def test_create_and_update_by_code(self):
+        result = self.import_csv(csv_rows(
+            {"code": "P0", "name": "Диван", "fabric": "F0", "base_price": "1200"},
+            {"code": "N1", "name": "Крісло", "category": "Категорія 0", "is_active": "0"},
+        ))
+        self.assertEqual((result.created, result.updated, result.errors), (1, 1, []))
+
+        self.product.refresh_from_db()
+        self.assertEqual((self.product.name, self.product.final_price), ("Диван", Decimal("1800.00")))
+        self.assertIsNone(self.product.category_id)
+        created = Product.objects.get(code="N1")
+        self.assertEqual((created.category.name, created.fabric_id, created.is_active), ("Категорія 0", None, False))
+        self.assertEqual(created.final_price, Decimal("1000.00"))
+
+    def test_unknown_references_are_reported(self):
+        result = self.import_csv(csv_rows(
+            {"code": "N1", "name": "Крісло", "category": "Немає"},
+            {"code": "N2", "name": "Крісло", "fabric": "XX"},
+            {"code": "N3", "name": "Крісло", "fabric": "F0", "fabric_category": "Шеніл"},
+            {"code": "N4", "name": "Крісло", "base_price": "дорого"},
+            {"code": "N5", "name": "Крісло"},
+        ))
+        self.assertEqual(result.created, 1)
+        self.assertEqual([line for line, _ in result.errors], [2, 3, 4, 5])
+        self.assertIn("Невідома категорія «Немає»", result.errors[0][1])
+        self.assertIn("Невідома тканина «XX»", result.errors[1][1])
+        self.assertEqual(str(result), "Створено: 1, оновлено: 0, помилок: 4")
+
+    def test_field_constraints_are_reported(self):
+        result = self.import_csv(csv_rows(
+            {"code": "N1", "name": "Д" * 151},
+            {"code": "N2", "name": "Крісло", "base_price": "123456789"},
+            {"code": "N3", "name": "Крісло", "fabric": "F0", "base_price": "99999999"},
+            {"code": "N4", "name": "Крісло", "base_price": "99999999"},
+        ))
+        self.assertEqual(result.created, 1)
+        self.assertEqual([line for line, _ in result.errors], [2, 3, 4])
+        self.assertIn("name:", result.errors[0][1])
+        self.assertIn("base_price:", result.errors[1][1])
+        self.assertIn("final_price:", result.errors[2][1])
+
+    def test_reported_errors_are_capped(self):
+        rows = [{"code": f"N{i}", "name": "Крісло", "fabric": "XX"} for i in range(5)]
+        with mock.patch("products.import_export.MAX_REPORTED_ERRORS", 2):
+            result = self.import_csv(csv_rows(*rows))
+        self.assertEqual((len(result.errors), result.error_count), (2, 5))
+
+    def test_batch_boundaries(self):
+        rows = [{"code": f"N{i}", "name": f"Виріб {i}"} for i in range(5)]
+        # Повтор коду в тому ж пакеті (перемагає останній) і в наступному (оновлення)
+        rows[1] = {"code": "N0", "name": "Той самий пакет"}
+        rows.append({"code": "N0", "name": "Наступний пакет"})
+        with CaptureQueriesContext(connection) as context:
+            result = self.import_csv(csv_rows(*rows), batch_size=2)
+        self.assertEqual((result.created, result.updated), (4, 1))
+        self.assertEqual(Product.objects.get(code="N0").name, "Наступний пакет")
+        inserts = [query for query in context.captured_queries
+                   if query["sql"].startswith('INSERT INTO "products_product"')]
+        self.assertEqual(len(inserts), 3)
+
+    def test_streamed_csv_round_trip(self):
+        make_products(1, 2)
+        response = export_response(Product.objects.all())
+        self.assertTrue(response.streaming)
+        content = b"".join(response.streaming_content)
+        self.assertEqual(len(content.decode().splitlines()), 4)
+        before = list(Product.objects.order_by("code").values_list(*EXPORTED_FIELDS))
+
+        Product.objects.all().delete()
+        result = self.import_csv(content)
+        self.assertEqual((result.created, result.errors), (3, []))
+        self.assertEqual(list(Product.objects.order_by("code").values_list(*EXPORTED_FIELDS)), before)
+
+    def test_admin_import_view(self):
+        admin_user = get_user_model().objects.create_superuser(
+            username="admin", email="admin@example.com", password="password", phone_number="+380500000001"
+        )
+        self.client.force_login(admin_user)
+        upload = SimpleUploadedFile("products.csv", csv_rows(
+            {"code": "N1", "name": "Крісло"}, {"code": "N2", "name": "Крісло", "fabric": "XX"},
+        ))
+        response = self.client.post(
+            reverse("admin:products_product_import"), {"file": upload, "batch_size": 100}, follow=True
+        )
+        self.assertContains(response, "Створено: 1, оновлено: 0, помилок: 1")
+        self.assertContains(response, "Рядок 3: Невідома тканина «XX»")
+        self.assertTrue(Product.objects.filter(code="N1").exists())
+
+        response = self.client.get(reverse("admin:products_product_export"))
+        self.assertIn("N1", b"".join(response.streaming_content).decode())
+
+    def test_admin_export_requires_view_permission(self):
+        logist = get_user_model().objects.create_user(
+            username="logist", email="logist@example.com", phone_number="+380500000002",
+            role="LOGIST_MANAGER", is_staff=True,
+        )
+        self.client.force_login(logist)
+        self.assertEqual(self.client.get(reverse("admin:products_product_export")).status_code, 403)
+
+
+@override_settings(AUDIT_MODE="sync")
+class ProductApiTests(TestCase):
+
+    def test_keyset_pagination(self):
+        make_products(0, 5)
+        response = self.client.get("/api/products/", {"limit": 3})
+        self.assertEqual([item["code"] for item in response.json()["results"]], ["P0", "P1", "P2"])
+        response = self.client.get(response.json()["next"])
+        self.assertEqual([item["code"] for item in response.json()["results"]], ["P3", "P4"])
+        self.assertIsNone(response.json()["next"])
+
+    def test_unchanged_page_returns_304_without_serializing(self):
+        make_products(0, 5)
+        etag = self.client.get("/api/products/")["ETag"]
+        with self.assertNumQueries(1):
+            response = self.client.get("/api/products/", HTTP_IF_NONE_MATCH=etag)
+        self.assertEqual(response.status_code, 304)
+
+    def test_price_change_invalidates_etag(self):
+        fabric = make_products(0, 2)[0].fabric
+        etag = self.client.get("/api/products/")["ETag"]
+        fabric.price_multiplier = Decimal("1.20")
+        with self.captureOnCommitCallbacks(execute=True):
+            fabric.save()
+        response = self.client.get("/api/products/", HTTP_IF_NONE_MATCH=etag)
+        self.assertEqual(response.status_code, 200)
+        self.assertEqual(response.json()["results"][0]["final_price"], "1200.00")
+
+    @override_settings(IMAGE_PROCESSING="off")
+    def test_related_changes_invalidate_etag(self):
+        product = make_products(0, 1)[0]
+        # Розміри вже відомі — деталі не читають заголовки (неіснуючих) файлів
+        product.images.update(image_width=800, image_height=600)
+        image = product.images.get()
+
+        def rename_category():
+            product.category.name = "Дивани"
+            product.category.save()
+
+        def add_image():
+            ProductImage.objects.create(
+                product=product, image="product_images/extra.jpg", image_width=800, image_height=600
+            )
+
+        def flip_main():
+            image.is_main = False
+            image.save()
+
+        changes = [rename_category, add_image, flip_main, lambda: product.images.last().delete()]
+        for url in ("/api/products/", f"/api/products/{product.pk}/"):
+            for change in changes:
+                etag = self.client.get(url)["ETag"]
+                self.assertEqual(self.client.get(url, HTTP_IF_NONE_MATCH=etag).status_code, 304)
+                with self.captureOnCommitCallbacks(execute=True):
+                    change()
+                self.assertEqual(self.client.get(url, HTTP_IF_NONE_MATCH=etag).status_code, 200, change)
+                image.is_main = True
+                image.save()
+
+        product.category.name = "Крісла"
+        with self.captureOnCommitCallbacks(execute=True):
+            product.category.save()
+        card = self.client.get("/api/products/").json()["results"][0]
+        self.assertEqual(card["category"]["name"], "Крісла")
+
+    def test_product_detail(self):
+        product = make_products(0, 1)[0]
+        ProductImage.objects.filter(product=product).update(image_width=800, image_height=600)
+        response = self.client.get(f"/api/products/{product.pk}/")
+        self.assertEqual(response.json()["code"], "P0")
+        self.assertEqual(response.json()["images"][0]["width"], 800)
+        self.assertEqual(self.client.get("/api/products/999/").status_code, 404)
+
+
+class PriceMatrixTests(TestCase):
+
+    def setUp(self):
+        self.product = make_products(0, 1)[0]
+        self.velour = FabricCategory.objects.create(name="Велюр")
+        self.leather = FabricCategory.objects.create(name="Шкіра")
+        self.soft = Fabric.objects.create(
+            name="Велюр 1", code="V1", category=self.velour, color_name="Сірий", color_code="#808080",
+            price_multiplier=Decimal("1.50"),
+        )
+        self.hard = Fabric.objects.create(
+            name="Шкіра 1", code="L1", category=self.leather, color_name="Чорний", color_code="#000000",
+            price_multiplier=Decimal("2.00"),
+        )
+
+    def prices(self):
+        return dict(ProductFabricPrice.objects.filter(product=self.product).values_list("fabric__code", "price"))
+
+    def test_unrestricted_category_gets_every_active_fabric(self):
+        self.assertEqual(self.prices(), {"F0": Decimal("1000"), "V1": Decimal("1500"), "L1": Decimal("2000")})
+        with self.assertNumQueries(1):
+            self.assertEqual(quote(self.product.pk, self.soft.pk), Decimal("1500"))
+
+    def test_allowed_fabric_categories(self):
+        self.product.category.allowed_fabric_categories.set([self.velour])
+        self.assertEqual(set(self.prices()), {"V1"})
+        self.assertIsNone(quote(self.product.pk, self.hard.pk))
+
+    def test_incremental_updates(self):
+        self.soft.price_multiplier = Decimal("1.20")
+        self.soft.save()
+        product = Product.objects.get(pk=self.product.pk)
+        product.base_price = Decimal("2000")
+        product.save()
+        self.assertEqual(quote(product.pk, self.soft.pk), Decimal("2400"))
+        self.hard.is_active = False
+        self.hard.save()
+        self.assertNotIn("L1", self.prices())
+        product.is_active = False
+        product.save()
+        self.assertEqual(self.prices(), {})
+
+    def test_incremental_and_rebuild_round_alike(self):
+        # 10.10 * 1.25 = 12.625: половина копійки, що при банківському округленні дала б 12.62
+        product = Product.objects.get(pk=self.product.pk)
+        product.base_price = Decimal("10.10")
+        product.save()
+        self.soft.price_multiplier = Decimal("1.25")
+        self.soft.save()
+        incremental = self.prices()
+        self.assertEqual(incremental["V1"], Decimal("12.63"))
+
+        rebuild_matrix()
+        self.assertEqual(self.prices(), incremental)
+
+    def test_full_rebuild(self):
+        ProductFabricPrice.objects.all().delete()
+        self.assertEqual(rebuild_matrix(), 3)
+        self.assertEqual(quote(self.product.pk, self.hard.pk), Decimal("2000"))
+
+    def test_prices_endpoint(self):
+        response = self.client.get(f"/api/products/{self.product.pk}/prices/", {"fabric": self.soft.pk})
+        self.assertEqual(response.json()["results"], [
+            {"fabric": {"id": self.soft.pk, "code": "V1", "name": "Велюр 1"}, "price": "1500.00"},
+        ])
+        self.assertEqual(self.client.get("/api/products/999/prices/").status_code, 404)
+
+
+@override_settings(AUDIT_MODE="sync")
+class CatalogCacheTests(TestCase):
+
+    def setUp(self):
+        cache.clear()
+        catalog_cache.reset_stats()
+
+    def test_cards_are_served_from_cache(self):
+        ids = [product.pk for product in make_products(0, 3)]
+        get_product_cards(ids)
+        with self.assertNumQueries(0):
+            cards = get_product_cards(ids)
+        self.assertEqual([card["id"] for card in cards], ids)
+        self.assertEqual(catalog_cache.stats()["hits"], 3)
+
+    def test_fabric_change_evicts_only_dependent_cards(self):
+        velour = make_products(0, 2)
+        chenille = make_products(2, 2)
+        ids = [product.pk for product in velour + chenille]
+        get_product_cards(ids)
+
+        fabric = velour[0].fabric
+        fabric.price_multiplier = Decimal("2.00")
+        with self.captureOnCommitCallbacks(execute=True):
+            fabric.save()
+        catalog_cache.reset_stats()
+
+        cards = get_product_cards(ids)
+        self.assertEqual(catalog_cache.stats(), {"hits": 2, "misses": 2, "hit_ratio": 0.5})
+        self.assertEqual([card["final_price"] for card in cards[:2]], [Decimal("2000.00")] * 2)
+
+    def test_versions_are_bumped_after_commit(self):
+        product = make_products(0, 1)[0]
+        get_product_cards([product.pk])
+        product.name = "Нова назва"
+        with self.captureOnCommitCallbacks() as callbacks:
+            product.save()
+            # До коміту читач бачить старі дані під старою версією
+            self.assertEqual(get_product_cards([product.pk])[0]["name"], "Виріб 0")
+        for callback in callbacks:
+            callback()
+        self.assertEqual(get_product_cards([product.pk])[0]["name"], "Нова назва")
+
+    def test_cards_built_during_bump_are_not_stored(self):
+        product = make_products(0, 1)[0]
+        build = catalog_cache.get
+
+        def write_during_build():
+            # Запис комітиться між читанням з БД і читанням версій
+            Product.objects.filter(pk=product.pk).update(name="Нова назва")
+            catalog_cache.bump(product_version(product.pk))
+            return "Виріб 0"
+
+        self.assertEqual(build("race", write_during_build, [product_version(product.pk)]), "Виріб 0")
+        self.assertEqual(build("race", lambda: "Нова назва", [product_version(product.pk)]), "Нова назва")
+        catalog_cache.reset_stats()
+        self.assertEqual(build("race", lambda: "інше", [product_version(product.pk)]), "Нова назва")
+        self.assertEqual(catalog_cache.stats()["hits"], 1)
@@ -0,0 +1,13 @@
+from django.urls import path
+
+from . import views
+
+app_name = "products"
+
+urlpatterns = [
+    path("", views.product_list, name="product-list"),
+    path("<int:pk>/", views.product_detail, name="product-detail"),
+    path("<int:pk>/prices/", views.product_prices, name="product-prices"),
+    path("categories/", views.category_list, name="category-list"),
+    path("cache-stats/", views.cache_stats, name="cache-stats"),
+]
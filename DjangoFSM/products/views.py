@@ -1,3 +1,122 @@
-from django.shortcuts import render
+"""
+Read-only API каталогу.
+
+Представлення асинхронні: під ASGI запит не займає потік на час очікування БД.
+Читання йдуть через async ORM, а кеш каталогу та серіалізація (доступ до
+сховища файлів) виконуються через sync_to_async.
+"""
+from asgiref.sync import sync_to_async
+from django.contrib.admin.views.decorators import staff_member_required
+from django.http import Http404, JsonResponse
+from django.urls import reverse
+from django.views.decorators.http import require_safe
+
+from DjangoFSM.api import aconditional_json, int_param
+from DjangoFSM.cache import catalog_cache
+from DjangoFSM.images import aimage_dimensions
+from .cache import get_category_tree, get_product_cards
+from .models import Product, ProductFabricPrice, ProductImage
+from .serializers import catalog_products, serialize_product
 
 # Create your views here.
+
+DEFAULT_PAGE_SIZE = 50
+MAX_PAGE_SIZE = 200
+
+
+@require_safe
+async def product_list(request):
+    """
+    Активні вироби з keyset-пагінацією: ?after=<id>&limit=<n>&category=<id>&fabric=<id>.
+    Спершу читаються лише id та дати оновлення сторінки (виробу, тканини, категорії;
+    зміна фото оновлює дату виробу) — для ETag / 304.
+    """
+    after = int_param(request, "after", 0)
+    limit = int_param(request, "limit", DEFAULT_PAGE_SIZE, MAX_PAGE_SIZE) or DEFAULT_PAGE_SIZE
+
+    queryset = catalog_products().filter(pk__gt=after).order_by("pk")
+    for name in ("category", "fabric"):
+        if name in request.GET:
+            queryset = queryset.filter(**{f"{name}_id": int_param(request, name, 0)})
+
+    rows = [
+        row async for row in queryset.values_list(
+            "pk", "updated_at", "fabric__updated_at", "category__updated_at"
+        )[:limit + 1]
+    ]
+    has_next = len(rows) > limit
+    rows = rows[:limit]
+
+    async def build_payload():
+        next_url = None
+        if has_next:
+            params = request.GET.copy()
+            params["after"] = rows[-1][0]
+            next_url = f"{reverse('products:product-list')}?{params.urlencode()}"
+        return {
+            "results": await sync_to_async(get_product_cards)([row[0] for row in rows]),
+            "next": next_url,
+        }
+
+    return await aconditional_json(request, rows, build_payload)
+
+
+@require_safe
+async def product_detail(request, pk):
+    """Картка виробу разом з усіма фото та їх розмірами."""
+    try:
+        product = await catalog_products().aget(pk=pk)
+    except Product.DoesNotExist:
+        raise Http404("Виріб не знайдено")
+    rows = [(
+        product.pk,
+        product.updated_at,
+        product.fabric.updated_at if product.fabric else None,
+        product.category.updated_at if product.category else None,
+    )]
+
+    async def build_payload():
+        card = await sync_to_async(serialize_product)(product)
+        images = []
+        async for image in ProductImage.objects.filter(product_id=product.pk).order_by("-is_main", "pk"):
+            dimensions = await aimage_dimensions(image)
+            images.append({
+                "id": image.pk,
+                "is_main": image.is_main,
+                "thumbnail": image.thumbnail_url,
+                "width": dimensions[0] if dimensions else None,
+                "height": dimensions[1] if dimensions else None,
+            })
+        return {**card, "images": images}
+
+    return await aconditional_json(request, rows, build_payload)
+
+
+@require_safe
+async def product_prices(request, pk):
+    """Ціни виробу в дозволених тканинах з матриці цін: ?fabric=<id> — лише одна тканина."""
+    queryset = ProductFabricPrice.objects.filter(product_id=pk)
+    if "fabric" in request.GET:
+        queryset = queryset.filter(fabric_id=int_param(request, "fabric", 0))
+    results = [
+        {"fabric": {"id": fabric_id, "code": code, "name": name}, "price": price}
+        async for fabric_id, code, name, price in queryset.order_by("fabric__name", "fabric_id")
+        .values_list("fabric_id", "fabric__code", "fabric__name", "price")
+    ]
+    if not results and not await catalog_products().filter(pk=pk).aexists():
+        raise Http404("Виріб не знайдено")
+    return JsonResponse({"product": pk, "results": results})
+
+
+@require_safe
+async def category_list(request):
+    """Дерево категорій виробів (з кешу каталогу)."""
+    response = JsonResponse({"results": await sync_to_async(get_category_tree)()})
+    response.headers["Cache-Control"] = "public, max-age=300"
+    return response
+
+
+@staff_member_required
+def cache_stats(request):
+    """Лічильники влучань / промахів кешу каталогу в цьому процесі."""
+    return JsonResponse(catalog_cache.stats())
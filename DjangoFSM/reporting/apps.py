@@ -0,0 +1,11 @@
+from django.apps import AppConfig
+
+
+class ReportingConfig(AppConfig):
+    default_auto_field = 'django.db.models.BigAutoField'
+    name = 'reporting'
+    verbose_name = "Звіти"
+
+    def ready(self):
+        # Підключаємо сигнали (позначення днів видалених замовлень)
+        from . import signals  # noqa: F401
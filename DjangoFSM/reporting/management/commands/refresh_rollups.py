@@ -0,0 +1,23 @@
+import time
+
+from django.core.management.base import BaseCommand
+
+from reporting.rollups import refresh_rollups
+
+
+class Command(BaseCommand):
+    help = (
+        "Оновлює денні підсумки замовлень для звітів: перераховує лише дні замовлень, "
+        "змінених з часу попереднього запуску. Запускається за розкладом, наприклад "
+        "cron кожні 5 хвилин."
+    )
+
+    def add_arguments(self, parser):
+        parser.add_argument("--full", action="store_true", help="Перебудувати всі підсумки з нуля")
+
+    def handle(self, *args, **options):
+        started = time.perf_counter()
+        days = refresh_rollups(full=options["full"])
+        self.stdout.write(self.style.SUCCESS(
+            f"Перераховано днів: {days} за {time.perf_counter() - started:.2f} с"
+        ))
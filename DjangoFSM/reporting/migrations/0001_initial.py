@@ -0,0 +1,75 @@
+# Generated by Django 5.2.8 on 2026-10-18 11:00
+
+import django.db.models.deletion
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    initial = True
+
+    dependencies = [
+        ('products', '0005_productimage_variants'),
+        ('users', '0001_initial'),
+    ]
+
+    operations = [
+        migrations.CreateModel(
+            name='DirtyDay',
+            fields=[
+                ('id', models.BigAutoField(auto_created=True, primary_key=True, serialize=False, verbose_name='ID')),
+                ('day', models.DateField(unique=True, verbose_name='День')),
+            ],
+            options={
+                'verbose_name': 'День для перерахунку',
+                'verbose_name_plural': 'Дні для перерахунку',
+            },
+        ),
+        migrations.CreateModel(
+            name='RollupWatermark',
+            fields=[
+                ('id', models.BigAutoField(auto_created=True, primary_key=True, serialize=False, verbose_name='ID')),
+                ('name', models.CharField(max_length=50, unique=True, verbose_name='Назва')),
+                ('value', models.DateTimeField(blank=True, null=True, verbose_name='Оброблено до')),
+            ],
+            options={
+                'verbose_name': 'Позначка оновлення звітів',
+                'verbose_name_plural': 'Позначки оновлення звітів',
+            },
+        ),
+        migrations.CreateModel(
+            name='DailyCategoryRollup',
+            fields=[
+                ('id', models.BigAutoField(auto_created=True, primary_key=True, serialize=False, verbose_name='ID')),
+                ('day', models.DateField(verbose_name='День')),
+                ('status', models.CharField(choices=[('draft', 'Чернетка'), ('in_progress', 'В роботі'), ('completed', 'Завершено'), ('canceled', 'Скасовано')], max_length=20, verbose_name='Статус')),
+                ('quantity', models.PositiveIntegerField(default=0, verbose_name='Кількість')),
+                ('revenue', models.DecimalField(decimal_places=2, default=0, max_digits=14, verbose_name='Сума позицій')),
+                ('category', models.ForeignKey(blank=True, db_constraint=False, null=True, on_delete=django.db.models.deletion.DO_NOTHING, related_name='+', to='products.category', verbose_name='Категорія')),
+            ],
+            options={
+                'verbose_name': 'Підсумок категорії за день',
+                'verbose_name_plural': 'Звіт по категоріях',
+                'ordering': ['-day', 'status'],
+                'indexes': [models.Index(fields=['day', 'status'], name='cat_rollup_day_status_idx')],
+            },
+        ),
+        migrations.CreateModel(
+            name='DailyOrderRollup',
+            fields=[
+                ('id', models.BigAutoField(auto_created=True, primary_key=True, serialize=False, verbose_name='ID')),
+                ('day', models.DateField(verbose_name='День')),
+                ('status', models.CharField(choices=[('draft', 'Чернетка'), ('in_progress', 'В роботі'), ('completed', 'Завершено'), ('canceled', 'Скасовано')], max_length=20, verbose_name='Статус')),
+                ('orders_count', models.PositiveIntegerField(default=0, verbose_name='Замовлень')),
+                ('revenue', models.DecimalField(decimal_places=2, default=0, max_digits=14, verbose_name='Виручка')),
+                ('dealer', models.ForeignKey(blank=True, db_constraint=False, null=True, on_delete=django.db.models.deletion.DO_NOTHING, related_name='+', to='users.dealerprofile', verbose_name='Дилер')),
+                ('salon', models.ForeignKey(blank=True, db_constraint=False, null=True, on_delete=django.db.models.deletion.DO_NOTHING, related_name='+', to='users.salesmanagerprofile', verbose_name='Салон')),
+            ],
+            options={
+                'verbose_name': 'Підсумок замовлень за день',
+                'verbose_name_plural': 'Звіт по замовленнях',
+                'ordering': ['-day', 'status'],
+                'indexes': [models.Index(fields=['day', 'status'], name='rollup_day_status_idx')],
+            },
+        ),
+    ]
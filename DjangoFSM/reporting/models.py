@@ -0,0 +1,91 @@
+from django.db import models
+
+from client_orders.models import OrderStatus
+
+# Create your models here.
+
+class DailyOrderRollup(models.Model):
+    """Передагреговані замовлення: день × статус × дилер / салон."""
+    day = models.DateField(verbose_name="День")
+    status = models.CharField(max_length=20, choices=OrderStatus.choices, verbose_name="Статус")
+    dealer = models.ForeignKey(
+        "users.DealerProfile",
+        on_delete=models.DO_NOTHING,
+        db_constraint=False,
+        null=True,
+        blank=True,
+        related_name="+",
+        verbose_name="Дилер"
+    )
+    salon = models.ForeignKey(
+        "users.SalesManagerProfile",
+        on_delete=models.DO_NOTHING,
+        db_constraint=False,
+        null=True,
+        blank=True,
+        related_name="+",
+        verbose_name="Салон"
+    )
+    orders_count = models.PositiveIntegerField(default=0, verbose_name="Замовлень")
+    revenue = models.DecimalField(max_digits=14, decimal_places=2, default=0, verbose_name="Виручка")
+
+    def __str__(self):
+        return f"{self.day} {self.get_status_display()}: {self.revenue}"
+
+    class Meta:
+        verbose_name = "Підсумок замовлень за день"
+        verbose_name_plural = "Звіт по замовленнях"
+        ordering = ["-day", "status"]
+        indexes = [
+            models.Index(fields=["day", "status"], name="rollup_day_status_idx"),
+        ]
+
+
+class DailyCategoryRollup(models.Model):
+    """Передагреговані позиції замовлень: день × статус замовлення × категорія виробу."""
+    day = models.DateField(verbose_name="День")
+    status = models.CharField(max_length=20, choices=OrderStatus.choices, verbose_name="Статус")
+    category = models.ForeignKey(
+        "products.Category",
+        on_delete=models.DO_NOTHING,
+        db_constraint=False,
+        null=True,
+        blank=True,
+        related_name="+",
+        verbose_name="Категорія"
+    )
+    quantity = models.PositiveIntegerField(default=0, verbose_name="Кількість")
+    revenue = models.DecimalField(max_digits=14, decimal_places=2, default=0, verbose_name="Сума позицій")
+
+    def __str__(self):
+        return f"{self.day} {self.category_id}: {self.revenue}"
+
+    class Meta:
+        verbose_name = "Підсумок категорії за день"
+        verbose_name_plural = "Звіт по категоріях"
+        ordering = ["-day", "status"]
+        indexes = [
+            models.Index(fields=["day", "status"], name="cat_rollup_day_status_idx"),
+        ]
+
+
+class RollupWatermark(models.Model):
+    """Момент останнього оновлення підсумків (за ClientOrder.updated_at)."""
+    name = models.CharField(max_length=50, unique=True, verbose_name="Назва")
+    value = models.DateTimeField(null=True, blank=True, verbose_name="Оброблено до")
+
+    def __str__(self):
+        return f"{self.name}: {self.value}"
+
+    class Meta:
+        verbose_name = "Позначка оновлення звітів"
+        verbose_name_plural = "Позначки оновлення звітів"
+
+
+class DirtyDay(models.Model):
+    """День, підсумки якого треба перерахувати (видалення замовлень не змінює updated_at)."""
+    day = models.DateField(unique=True, verbose_name="День")
+
+    class Meta:
+        verbose_name = "День для перерахунку"
+        verbose_name_plural = "Дні для перерахунку"
@@ -0,0 +1,15 @@
+from django.db.models.signals import post_delete
+from django.dispatch import receiver
+from django.utils import timezone
+
+from client_orders.models import ClientOrder
+from .models import DirtyDay
+
+
+@receiver(post_delete, sender=ClientOrder)
+def mark_deleted_order_day(sender, instance, **kwargs):
+    """Видалене замовлення не потрапить у вибірку за updated_at — позначаємо його день."""
+    if instance.created_at is not None:
+        DirtyDay.objects.bulk_create(
+            [DirtyDay(day=timezone.localdate(instance.created_at))], ignore_conflicts=True
+        )
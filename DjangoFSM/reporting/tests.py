@@ -0,0 +1,56 @@
+from decimal import Decimal
+
+from django.test import TestCase
+from django.urls import reverse
+from django.utils import timezone
+
+from DjangoFSM.testing import AdminQueryBudgetMixin
+from client_orders.fsm import transition
+from client_orders.models import ClientOrder, OrderLine, OrderStatus
+from products.tests import make_products
+from .models import DailyCategoryRollup, DailyOrderRollup, DirtyDay
+from .rollups import refresh_rollups
+
+
+class RollupTests(TestCase):
+
+    def setUp(self):
+        self.product = make_products(0, 1)[0]
+        self.order = ClientOrder.objects.create(order_number="R-1")
+        OrderLine.objects.create(order=self.order, product=self.product, quantity=2, unit_price=Decimal("100"))
+
+    def revenue(self, status):
+        return DailyOrderRollup.objects.filter(status=status).values_list("revenue", flat=True).first()
+
+    def test_refresh_builds_rollups(self):
+        self.assertEqual(refresh_rollups(), 1)
+        self.assertEqual(self.revenue(OrderStatus.DRAFT), Decimal("200"))
+        category = DailyCategoryRollup.objects.get()
+        self.assertEqual((category.category_id, category.quantity), (self.product.category_id, 2))
+
+    def test_incremental_refresh_picks_up_changes(self):
+        refresh_rollups()
+        transition(self.order, OrderStatus.IN_PROGRESS)
+        refresh_rollups()
+        self.assertIsNone(self.revenue(OrderStatus.DRAFT))
+        self.assertEqual(self.revenue(OrderStatus.IN_PROGRESS), Decimal("200"))
+
+    def test_deleted_order_day_is_rebuilt(self):
+        refresh_rollups()
+        self.order.delete()
+        self.assertEqual(DirtyDay.objects.get().day, timezone.localdate())
+        refresh_rollups()
+        self.assertFalse(DailyOrderRollup.objects.exists())
+        self.assertFalse(DirtyDay.objects.exists())
+
+
+class DashboardTests(AdminQueryBudgetMixin, TestCase):
+
+    def test_dashboard_reads_only_rollups(self):
+        make_products(0, 1)
+        url = reverse("admin:reporting_dailyorderrollup_changelist")
+        refresh_rollups()
+        baseline = self.count_queries(url)
+        ClientOrder.objects.bulk_create([ClientOrder(order_number=f"R-{i}") for i in range(50)])
+        refresh_rollups()
+        self.assertEqual(self.count_queries(url), baseline)
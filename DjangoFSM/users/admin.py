@@ -1,9 +1,11 @@
 from django.contrib import admin
 from django.contrib.auth.admin import UserAdmin
+from DjangoFSM.search import IndexedSearchAdminMixin
 from .models import User, DealerProfile, SalesManagerProfile
+from .permissions import DEALER_ROLES, SALES_ROLES, RolePermissionAdminMixin, assignable_roles, can_manage_user
 
 
-class DealerProfileInline(admin.StackedInline):
+class DealerProfileInline(RolePermissionAdminMixin, admin.StackedInline):
     """
     Додає профіль дилера до сторінки користувача в адмінці.
     """
@@ -14,7 +16,7 @@ class DealerProfileInline(admin.StackedInline):
     extra = 0  # не додає пустих рядків при редагуванні
 
 
-class SalesManagerProfileInline(admin.StackedInline):
+class SalesManagerProfileInline(RolePermissionAdminMixin, admin.StackedInline):
     """
     Додає профіль менеджера з продажів до сторінки користувача.
     """
@@ -28,7 +30,7 @@ class SalesManagerProfileInline(admin.StackedInline):
 
 
 @admin.register(User)
-class CustomUserAdmin(UserAdmin):
+class CustomUserAdmin(RolePermissionAdminMixin, IndexedSearchAdminMixin, UserAdmin):
     """
     Розширене відображення користувачів у Django Admin.
     Включає додаткові поля (роль, телефон) та профілі.
@@ -47,13 +49,38 @@ class CustomUserAdmin(UserAdmin):
         ("Дати", {"fields": ("last_login", "date_joined")}),
     )
 
+    # Прапорець суперкористувача змінює лише суперкористувач
+    def get_readonly_fields(self, request, obj=None):
+        readonly = super().get_readonly_fields(request, obj)
+        if not request.user.is_superuser:
+            readonly = (*readonly, "is_superuser")
+        return readonly
+
+    # Роль вище власної призначити не можна
+    def formfield_for_choice_field(self, db_field, request, **kwargs):
+        if db_field.name == "role":
+            allowed = assignable_roles(request.user)
+            kwargs["choices"] = [choice for choice in db_field.choices if choice[0] in allowed]
+        return super().formfield_for_choice_field(db_field, request, **kwargs)
+
+    # Суперкористувачів та користувачів з ширшими правами — лише перегляд
+    def has_change_permission(self, request, obj=None):
+        if obj is not None and not can_manage_user(request.user, obj):
+            return False
+        return super().has_change_permission(request, obj)
+
+    def has_delete_permission(self, request, obj=None):
+        if obj is not None and not can_manage_user(request.user, obj):
+            return False
+        return super().has_delete_permission(request, obj)
+
     # Які інлайни відображати залежно від ролі користувача
     def get_inlines(self, request, obj=None):
         if obj is None:
             return []
-        if obj.role in ["DEALER_HEAD", "DEALER_MANAGER"]:
+        if obj.role in DEALER_ROLES:
             return [DealerProfileInline]
-        elif obj.role in ["RETAIL_MANAGER", "SALES_HEAD"]:
+        elif obj.role in SALES_ROLES:
             return [SalesManagerProfileInline]
         return []
 
@@ -65,12 +92,16 @@ class CustomUserAdmin(UserAdmin):
 
 # Реєструємо профілі окремо — для доступу напряму, якщо потрібно
 @admin.register(DealerProfile)
-class DealerProfileAdmin(admin.ModelAdmin):
+class DealerProfileAdmin(RolePermissionAdminMixin, admin.ModelAdmin):
     list_display = ("user", "company_name", "city", "country")
+    list_select_related = ("user",)
     search_fields = ("company_name", "city", "user__username")
+    raw_id_fields = ("user",)
 
 
 @admin.register(SalesManagerProfile)
-class SalesManagerProfileAdmin(admin.ModelAdmin):
+class SalesManagerProfileAdmin(RolePermissionAdminMixin, admin.ModelAdmin):
     list_display = ("user", "salon_name", "city")
-    search_fields = ("salon_name", "city", "user__username")
\ No newline at end of file
+    list_select_related = ("user",)
+    search_fields = ("salon_name", "city", "user__username")
+    raw_id_fields = ("user",)
@@ -4,3 +4,15 @@ from django.apps import AppConfig
 class UsersConfig(AppConfig):
     default_auto_field = 'django.db.models.BigAutoField'
     name = 'users'
+
+    def ready(self):
+        from django.db.models.signals import post_migrate
+        from DjangoFSM import search
+        from .models import User
+
+        # Підключаємо сигнали (інвалідація кешу користувачів, last_login)
+        from . import signals  # noqa: F401
+
+        # Індексований пошук користувачів (у т.ч. для пошуку замовлень за клієнтом)
+        search.register(User, fields=("username", "email", "phone_number"))
+        post_migrate.connect(search.ensure_search_indexes, sender=self)
@@ -0,0 +1,56 @@
+"""
+Бекенд автентифікації з кешем користувачів.
+
+AuthenticationMiddleware на кожному запиті завантажує request.user через
+backend.get_user(). Тут користувач береться з кешу (CACHES["default"]) разом з
+профілями дилера / салону, тож звичайний запит до адмінки чи API не читає
+таблицю користувачів. У кеш потрапляє весь об'єкт, тому перевірка
+session_auth_hash (хеш пароля) працює як і раніше: після зміни пароля
+запис інвалідується сигналом, і старі сесії стають недійсними.
+"""
+from django.conf import settings
+from django.contrib.auth.backends import ModelBackend
+from django.core.cache import cache
+from django.db import transaction
+
+from .models import User
+
+# Профілі, що завантажуються разом з користувачем (зворотні OneToOne)
+PROFILE_RELATIONS = ("dealer_profile", "sales_profile")
+
+
+def user_cache_key(user_id):
+    return f"users:user:{user_id}"
+
+
+def load_user(user_id):
+    """Користувач з профілями одним запитом (відсутній профіль кешується як None)."""
+    return User._default_manager.select_related(*PROFILE_RELATIONS).filter(pk=user_id).first()
+
+
+def cache_user(user_id):
+    """Завантажує користувача з профілями і кладе в кеш; повертає його (або None)."""
+    user = load_user(user_id)
+    if user is not None:
+        cache.set(user_cache_key(user_id), user, getattr(settings, "USER_CACHE_TIMEOUT", 300))
+    return user
+
+
+def invalidate_user(user_id):
+    cache.delete(user_cache_key(user_id))
+
+
+def invalidate_user_on_commit(user_id, using=None):
+    """
+    Видаляє користувача з кешу одразу і ще раз після коміту: паралельний запит
+    між ними міг покласти в кеш ще не закомічений (старий) стан.
+    """
+    invalidate_user(user_id)
+    transaction.on_commit(lambda: invalidate_user(user_id), using=using)
+
+
+class CachedModelBackend(ModelBackend):
+
+    def get_user(self, user_id):
+        user = cache.get(user_cache_key(user_id)) or cache_user(user_id)
+        return user if user is not None and self.user_can_authenticate(user) else None
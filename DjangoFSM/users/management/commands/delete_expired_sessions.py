@@ -0,0 +1,22 @@
+from django.conf import settings
+from django.core.management.base import BaseCommand
+
+from users.sessions import DEFAULT_BATCH_SIZE, delete_expired_sessions
+
+
+class Command(BaseCommand):
+    help = (
+        "Видаляє прострочені сесії з БД невеликими пакетами (кожен — окрема транзакція), "
+        "щоб не блокувати таблицю сесій одним довгим DELETE, як clearsessions."
+    )
+
+    def add_arguments(self, parser):
+        parser.add_argument("--batch-size", type=int, default=DEFAULT_BATCH_SIZE, help="Сесій в одному DELETE")
+        parser.add_argument("--pause", type=float, default=0.0, help="Пауза між пакетами (с)")
+
+    def handle(self, *args, **options):
+        if not settings.SESSION_ENGINE.endswith("db"):
+            self.stdout.write(f"Сесії не зберігаються в БД ({settings.SESSION_ENGINE}) — нічого видаляти.")
+            return
+        deleted = delete_expired_sessions(batch_size=options["batch_size"], pause=options["pause"])
+        self.stdout.write(self.style.SUCCESS(f"Видалено сесій: {deleted}"))
@@ -0,0 +1,162 @@
+"""
+Матриця доступу «роль → дозволи».
+
+Дозволи визначаються полем User.role, а не групами Django: матриця
+компілюється один раз при імпорті модуля в незмінні frozenset, тому перевірка
+дозволу — це пошук у множині без жодного запиту до БД (ModelBackend натомість
+читає групи та дозволи користувача).
+
+Набір дозволів користувача кешується на об'єкті request.user разом з роллю,
+для якої він обчислений, тож після зміни ролі він перераховується автоматично.
+"""
+from types import MappingProxyType
+
+from django.apps import apps
+
+from .models import User
+
+Role = User.Role
+
+VIEW = ("view",)
+EDIT = ("view", "add", "change")
+ALL = ("view", "add", "change", "delete")
+
+CATALOG = ("products.category", "products.product", "products.productimage")
+FABRICS = ("fabric.fabriccategory", "fabric.fabric")
+# Експорти кожен бачить лише власні; усі — ролі з правом видалення (client_orders.admin)
+ORDERS = ("client_orders.clientorder", "client_orders.orderline", "client_orders.orderexport")
+ORDER_LOG = ("client_orders.orderstatuslog",)
+USERS = ("users.user", "users.dealerprofile", "users.salesmanagerprofile")
+# Дашборд звітів показує всі дилери / салони, тому лише для керівництва
+REPORTS = ("reporting.dailyorderrollup",)
+# Облік файлів сховища (mediafiles) — службова інформація
+MEDIA = ("mediafiles.mediablob",)
+# Журнал змін цін і статусів (audit) — лише для перегляду
+AUDIT = ("audit.auditentry",)
+
+# Роль -> [(моделі, дії)]
+ROLE_RULES = {
+    Role.ADMIN: [(CATALOG + FABRICS + ORDERS + USERS, ALL), (ORDER_LOG + REPORTS + MEDIA + AUDIT, VIEW)],
+    Role.OWNER: [(CATALOG + FABRICS + ORDERS + USERS, ALL), (ORDER_LOG + REPORTS + MEDIA + AUDIT, VIEW)],
+    Role.DESIGNER: [(CATALOG + FABRICS, EDIT), (ORDERS, VIEW)],
+    Role.SALES_HEAD: [(ORDERS, ALL), (ORDER_LOG + CATALOG + FABRICS + REPORTS, VIEW)],
+    Role.RETAIL_HEAD: [(ORDERS, EDIT), (ORDER_LOG + CATALOG + FABRICS, VIEW)],
+    Role.RETAIL_MANAGER: [(ORDERS, EDIT), (CATALOG + FABRICS, VIEW)],
+    # Керівник дилерів бачить усі замовлення (order_scope його не обмежує), тож
+    # профілі всіх дилерів — лише для перегляду
+    Role.DEALER_HEAD: [(ORDERS, EDIT), (ORDER_LOG + CATALOG + FABRICS + ("users.dealerprofile",), VIEW)],
+    Role.DEALER_MANAGER: [(ORDERS, EDIT), (CATALOG + FABRICS, VIEW)],
+    Role.PRODUCT_HEAD: [(CATALOG + FABRICS, ALL), (ORDERS + ORDER_LOG, VIEW)],
+    Role.PRODUCT_MANAGER: [(CATALOG + FABRICS, EDIT), (ORDERS, VIEW)],
+    Role.LOGIST_MANAGER: [(ORDERS + ORDER_LOG, VIEW)],
+    Role.QUALITY_MANAGER: [(ORDERS + CATALOG + FABRICS, VIEW)],
+}
+
+DEALER_ROLES = frozenset({Role.DEALER_HEAD, Role.DEALER_MANAGER})
+SALES_ROLES = frozenset({Role.RETAIL_MANAGER, Role.SALES_HEAD})
+
+
+def _compile(rules):
+    matrix = {}
+    for role, entries in rules.items():
+        matrix[role] = frozenset(
+            f"{label}.{action}"
+            for labels, actions in entries
+            for label in labels
+            for action in actions
+        )
+    return MappingProxyType(matrix)
+
+
+# Роль -> frozenset("app_label.model_name.action")
+MATRIX = _compile(ROLE_RULES)
+# Роль -> frozenset(app_label) — для has_module_permission
+MODULES = MappingProxyType({
+    role: frozenset(permission.split(".", 1)[0] for permission in permissions)
+    for role, permissions in MATRIX.items()
+})
+
+EMPTY = frozenset()
+
+
+def role_permissions(user):
+    """Дозволи користувача з кешем на об'єкті (ключ — роль)."""
+    cached = getattr(user, "_role_permissions", None)
+    if cached is None or cached[0] != user.role:
+        cached = (user.role, MATRIX.get(user.role, EMPTY))
+        user._role_permissions = cached
+    return cached[1]
+
+
+def has_role_perm(user, opts, action):
+    """Чи має користувач дію action над моделлю opts (Model._meta)."""
+    if not user.is_active or not user.is_staff:
+        return False
+    if user.is_superuser:
+        return True
+    return f"{opts.app_label}.{opts.model_name}.{action}" in role_permissions(user)
+
+
+def has_role_module_perm(user, app_label):
+    if not user.is_active or not user.is_staff:
+        return False
+    if user.is_superuser:
+        return True
+    return app_label in MODULES.get(user.role, EMPTY)
+
+
+def assignable_roles(user):
+    """
+    Ролі, які користувач може призначати іншим: суперкористувач — будь-які,
+    решта — лише ролі, чиї дозволи не ширші за власні.
+    """
+    if user.is_superuser:
+        return frozenset(Role.values)
+    own = role_permissions(user)
+    return frozenset(role for role in Role.values if MATRIX.get(role, EMPTY) <= own)
+
+
+def can_manage_user(user, target):
+    """Чи може user змінювати обліковий запис target, не розширюючи власних прав."""
+    if user.is_superuser:
+        return True
+    return not target.is_superuser and target.role in assignable_roles(user)
+
+
+def is_autocomplete_for_editable(request):
+    """
+    Чи це запит admin:autocomplete для поля моделі, яку користувач може додавати
+    або змінювати. Варіанти такого поля (напр. клієнт замовлення) доступні і без
+    права перегляду пов'язаної моделі — як раніше у звичайному <select>.
+    """
+    match = request.resolver_match
+    if match is None or match.url_name != "autocomplete":
+        return False
+    try:
+        source = apps.get_model(request.GET["app_label"], request.GET["model_name"])
+    except (KeyError, LookupError, ValueError):
+        return False
+    return has_role_perm(request.user, source._meta, "add") or has_role_perm(request.user, source._meta, "change")
+
+
+class RolePermissionAdminMixin:
+    """Перевірки has_*_permission адмінки за матрицею ролей (без запитів до БД)."""
+
+    def has_module_permission(self, request):
+        return has_role_module_perm(request.user, self.opts.app_label)
+
+    def has_view_permission(self, request, obj=None):
+        return (
+            has_role_perm(request.user, self.opts, "view")
+            or self.has_change_permission(request, obj)
+            or (obj is None and is_autocomplete_for_editable(request))
+        )
+
+    def has_add_permission(self, request, *args):
+        return has_role_perm(request.user, self.opts, "add")
+
+    def has_change_permission(self, request, obj=None):
+        return has_role_perm(request.user, self.opts, "change")
+
+    def has_delete_permission(self, request, obj=None):
+        return has_role_perm(request.user, self.opts, "delete")
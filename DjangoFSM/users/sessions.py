@@ -0,0 +1,75 @@
+"""
+Менше записів від сесій та входів.
+
+* SessionRefreshMiddleware — «ковзний» строк дії сесії без запису на кожен
+  запит: сесія позначається зміненою (і зберігається) не частіше ніж раз на
+  SESSION_REFRESH_INTERVAL секунд. SESSION_SAVE_EVERY_REQUEST має бути вимкнено.
+* update_last_login — замість стандартного обробника user_logged_in пише
+  last_login не частіше ніж раз на LAST_LOGIN_UPDATE_INTERVAL і одним UPDATE
+  лише цього поля (без save() усього користувача).
+* delete_expired_sessions — видалення прострочених сесій невеликими пакетами.
+"""
+import time
+from datetime import timedelta
+
+from django.conf import settings
+from django.contrib.sessions.models import Session
+from django.db import transaction
+from django.utils import timezone
+from django.utils.deprecation import MiddlewareMixin
+
+# Ключ сесії з часом останнього продовження (Unix time)
+REFRESHED_KEY = "_refreshed_at"
+
+DEFAULT_BATCH_SIZE = 1000
+
+
+class SessionRefreshMiddleware(MiddlewareMixin):
+    """Продовжує непорожню сесію не частіше ніж раз на SESSION_REFRESH_INTERVAL."""
+
+    def process_response(self, request, response):
+        session = getattr(request, "session", None)
+        # Сесію, яку запит не читав, не завантажуємо заради перевірки
+        if session is None or not session.accessed or session.modified or session.is_empty():
+            return response
+        interval = getattr(settings, "SESSION_REFRESH_INTERVAL", 300)
+        now = int(time.time())
+        if now - session.get(REFRESHED_KEY, 0) >= interval:
+            session[REFRESHED_KEY] = now
+        return response
+
+
+def update_last_login(sender, user, request=None, **kwargs):
+    """
+    Обробник user_logged_in: оновлює last_login з обмеженням частоти.
+    Сесія після входу і так зберігається, тож у ній одразу фіксується час продовження.
+    """
+    if request is not None and hasattr(request, "session"):
+        request.session[REFRESHED_KEY] = int(time.time())
+    now = timezone.now()
+    interval = timedelta(seconds=getattr(settings, "LAST_LOGIN_UPDATE_INTERVAL", 3600))
+    if user.last_login is not None and now - user.last_login < interval:
+        return
+    user.last_login = now
+    type(user)._default_manager.filter(pk=user.pk).update(last_login=now)
+
+
+def delete_expired_sessions(batch_size=DEFAULT_BATCH_SIZE, pause=0.0, now=None):
+    """
+    Видаляє прострочені сесії БД пакетами по batch_size ключів, кожен пакет — окрема
+    коротка транзакція (без одного довгого DELETE, що блокує таблицю). Повертає кількість.
+    """
+    now = now or timezone.now()
+    deleted = 0
+    while True:
+        keys = list(
+            Session.objects.filter(expire_date__lt=now)
+            .order_by("expire_date")
+            .values_list("session_key", flat=True)[:batch_size]
+        )
+        if not keys:
+            return deleted
+        with transaction.atomic():
+            deleted += Session.objects.filter(session_key__in=keys, expire_date__lt=now).delete()[0]
+        if pause:
+            time.sleep(pause)
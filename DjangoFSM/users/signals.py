@@ -0,0 +1,28 @@
+from django.contrib.auth.signals import user_logged_in
+from django.db.models.signals import post_delete, post_save
+from django.dispatch import receiver
+
+from .backends import cache_user, invalidate_user_on_commit
+from .models import DealerProfile, SalesManagerProfile, User
+from .sessions import update_last_login
+
+# Стандартний обробник зберігає last_login на кожен вхід — замінюємо на обмежений за частотою
+user_logged_in.disconnect(dispatch_uid="update_last_login")
+user_logged_in.connect(update_last_login, dispatch_uid="update_last_login_throttled")
+
+
+@receiver(user_logged_in, dispatch_uid="warm_user_cache")
+def warm_user_cache(sender, user, **kwargs):
+    """Після входу користувач з профілями вже в кеші — перший запит його не читає."""
+    cache_user(user.pk)
+
+
+@receiver([post_save, post_delete], sender=User)
+def invalidate_cached_user(sender, instance, using, **kwargs):
+    invalidate_user_on_commit(instance.pk, using=using)
+
+
+@receiver([post_save, post_delete], sender=DealerProfile)
+@receiver([post_save, post_delete], sender=SalesManagerProfile)
+def invalidate_cached_user_profile(sender, instance, using, **kwargs):
+    invalidate_user_on_commit(instance.user_id, using=using)
@@ -1,3 +1,203 @@
-from django.test import TestCase
+from datetime import timedelta
 
-# Create your tests here.
+from django.contrib.sessions.models import Session
+from django.db import connection
+from django.test import TestCase, override_settings
+from django.test.utils import CaptureQueriesContext
+from django.urls import reverse
+from django.utils import timezone
+
+from DjangoFSM.testing import AdminQueryBudgetMixin
+from .backends import CachedModelBackend
+from .models import DealerProfile, SalesManagerProfile, User
+from .permissions import MATRIX, assignable_roles, has_role_perm
+from .sessions import delete_expired_sessions
+
+
+def make_users(start, count):
+    users = []
+    for i in range(start, start + count):
+        dealer = User.objects.create_user(
+            username=f"dealer{i}",
+            email=f"dealer{i}@example.com",
+            phone_number=f"+38050100{i:04d}",
+            role=User.Role.DEALER_MANAGER,
+        )
+        DealerProfile.objects.create(user=dealer, company_name=f"Дилер {i}", city="Київ", country="Україна")
+        manager = User.objects.create_user(
+            username=f"manager{i}",
+            email=f"manager{i}@example.com",
+            phone_number=f"+38050200{i:04d}",
+            role=User.Role.RETAIL_MANAGER,
+        )
+        SalesManagerProfile.objects.create(user=manager, salon_name=f"Салон {i}", city="Львів")
+        users.append(dealer)
+    return users
+
+
+class AdminQueryBudgetTests(AdminQueryBudgetMixin, TestCase):
+
+    def test_user_changelist(self):
+        self.assertChangelistBudget(User, 6, make_users)
+
+    def test_dealer_profile_changelist(self):
+        self.assertChangelistBudget(DealerProfile, 6, make_users)
+
+    def test_sales_profile_changelist(self):
+        self.assertChangelistBudget(SalesManagerProfile, 6, make_users)
+
+    def test_user_change_view(self):
+        dealer = make_users(0, 5)[0]
+        self.assertChangeViewBudget(dealer, 7)
+
+    def test_dealer_profile_change_view(self):
+        profile = make_users(0, 5)[0].dealer_profile
+        self.assertChangeViewBudget(profile, 7)
+
+
+class RolePermissionTests(TestCase):
+
+    def setUp(self):
+        from client_orders.models import ClientOrder
+
+        self.dealer, other = make_users(0, 2)
+        self.dealer.is_staff = True
+        self.dealer.save()
+        self.own = ClientOrder.objects.create(dealer=self.dealer.dealer_profile, order_number="OWN-1")
+        self.foreign = ClientOrder.objects.create(dealer=other.dealer_profile, order_number="FOREIGN-1")
+
+    def test_matrix_is_immutable(self):
+        self.assertIsInstance(MATRIX[User.Role.DEALER_MANAGER], frozenset)
+        with self.assertRaises(TypeError):
+            MATRIX[User.Role.DEALER_MANAGER] = frozenset()
+
+    def test_permission_check_without_queries(self):
+        from client_orders.models import ClientOrder
+
+        with self.assertNumQueries(0):
+            self.assertTrue(has_role_perm(self.dealer, ClientOrder._meta, "change"))
+            self.assertFalse(has_role_perm(self.dealer, ClientOrder._meta, "delete"))
+            self.assertFalse(has_role_perm(self.dealer, User._meta, "view"))
+
+    def test_role_change_invalidates_cache(self):
+        from products.models import Product
+
+        self.assertFalse(has_role_perm(self.dealer, Product._meta, "change"))
+        self.dealer.role = User.Role.PRODUCT_HEAD
+        self.assertTrue(has_role_perm(self.dealer, Product._meta, "change"))
+
+    def test_dealer_sees_only_own_orders(self):
+        self.client.force_login(self.dealer)
+        response = self.client.get(reverse("admin:client_orders_clientorder_changelist"))
+        self.assertContains(response, "OWN-1")
+        self.assertNotContains(response, "FOREIGN-1")
+        response = self.client.get(reverse("admin:client_orders_clientorder_change", args=[self.foreign.pk]))
+        self.assertEqual(response.status_code, 302)
+        self.assertEqual(self.client.get(reverse("admin:users_user_changelist")).status_code, 403)
+
+    def test_dealer_head_only_views_dealer_profiles(self):
+        self.dealer.role = User.Role.DEALER_HEAD
+        self.assertTrue(has_role_perm(self.dealer, DealerProfile._meta, "view"))
+        self.assertFalse(has_role_perm(self.dealer, DealerProfile._meta, "change"))
+
+
+class UserAdminEscalationTests(TestCase):
+
+    def setUp(self):
+        self.admin = User.objects.create_user(
+            username="admin", email="admin@example.com", phone_number="+380500000001",
+            role=User.Role.ADMIN, is_staff=True,
+        )
+        self.root = User.objects.create_superuser(
+            username="root", email="root@example.com", password="password", phone_number="+380500000002",
+        )
+        self.manager = make_users(0, 1)[0]
+        self.client.force_login(self.admin)
+
+    def test_admin_cannot_grant_superuser(self):
+        url = reverse("admin:users_user_change", args=[self.manager.pk])
+        response = self.client.get(url)
+        self.assertEqual(response.status_code, 200)
+        self.assertNotIn("is_superuser", response.context["adminform"].form.fields)
+
+        data = {
+            "username": self.manager.username, "email": self.manager.email,
+            "phone_number": self.manager.phone_number, "role": User.Role.OWNER,
+            "is_active": "on", "is_staff": "on", "is_superuser": "on",
+            "date_joined_0": "2026-01-01", "date_joined_1": "00:00:00",
+            "dealer_profile-TOTAL_FORMS": "0", "dealer_profile-INITIAL_FORMS": "0",
+        }
+        self.assertEqual(self.client.post(url, data).status_code, 302)
+        self.manager.refresh_from_db()
+        self.assertEqual(self.manager.role, User.Role.OWNER)
+        self.assertFalse(self.manager.is_superuser)
+
+    def test_superuser_account_is_read_only(self):
+        url = reverse("admin:users_user_change", args=[self.root.pk])
+        self.assertFalse(self.client.get(url).context["has_change_permission"])
+        self.client.post(url, {"username": "hijacked"})
+        self.root.refresh_from_db()
+        self.assertEqual(self.root.username, "root")
+
+    def test_roles_above_own_are_not_assignable(self):
+        self.assertIn(User.Role.OWNER, assignable_roles(self.admin))
+        head = User(role=User.Role.DEALER_HEAD)
+        self.assertIn(User.Role.DEALER_MANAGER, assignable_roles(head))
+        self.assertNotIn(User.Role.ADMIN, assignable_roles(head))
+        self.assertNotIn(User.Role.PRODUCT_MANAGER, assignable_roles(head))
+
+
+class SessionAuthTests(TestCase):
+
+    def setUp(self):
+        self.dealer = make_users(0, 1)[0]
+        User.objects.filter(pk=self.dealer.pk).update(is_staff=True)
+        self.client.force_login(self.dealer)
+
+    def session_writes(self, url):
+        with CaptureQueriesContext(connection) as context:
+            self.client.get(url)
+        return [q["sql"] for q in context.captured_queries if "django_session" in q["sql"] and "SELECT" not in q["sql"]]
+
+    def test_user_and_profile_come_from_cache(self):
+        backend = CachedModelBackend()
+        with self.assertNumQueries(0):
+            user = backend.get_user(self.dealer.pk)
+            self.assertEqual(user.dealer_profile.company_name, "Дилер 0")
+        DealerProfile.objects.filter(user=self.dealer).get().save()
+        with self.assertNumQueries(1):
+            backend.get_user(self.dealer.pk)
+
+    def test_cache_is_invalidated_again_on_commit(self):
+        backend = CachedModelBackend()
+        with self.captureOnCommitCallbacks(execute=True):
+            User.objects.filter(pk=self.dealer.pk).get().save()
+            # Паралельний запит до коміту кешує ще старий стан
+            backend.get_user(self.dealer.pk)
+        with self.assertNumQueries(1):
+            backend.get_user(self.dealer.pk)
+
+    def test_deactivated_user_is_rejected(self):
+        user = User.objects.get(pk=self.dealer.pk)
+        user.is_active = False
+        user.save()
+        self.assertIsNone(CachedModelBackend().get_user(self.dealer.pk))
+
+    def test_session_refresh_is_throttled(self):
+        url = "/api/orders/status/"
+        self.assertEqual(self.session_writes(url), [])
+        with override_settings(SESSION_REFRESH_INTERVAL=0):
+            self.assertNotEqual(self.session_writes(url), [])
+
+    def test_last_login_is_throttled(self):
+        last_login = User.objects.get(pk=self.dealer.pk).last_login
+        self.client.force_login(self.dealer)
+        self.assertEqual(User.objects.get(pk=self.dealer.pk).last_login, last_login)
+
+    def test_delete_expired_sessions_in_batches(self):
+        expired = timezone.now() - timedelta(days=1)
+        Session.objects.bulk_create([
+            Session(session_key=f"expired{i}", session_data="", expire_date=expired) for i in range(5)
+        ])
+        self.assertEqual(delete_expired_sessions(batch_size=2), 5)
+        self.assertEqual(Session.objects.count(), 1)